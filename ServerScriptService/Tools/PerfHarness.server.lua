@@ -4,6 +4,7 @@ local RunService = game:GetService("RunService")
 local ReplicatedStorage = game:GetService("ReplicatedStorage")
 local StatsService = game:GetService("Stats")
 local WorkspaceService = game:GetService("Workspace")
+local HttpService = game:GetService("HttpService")
 
 local SAMPLE_INTERVAL = 1
 local FRAME_MAX_BUDGET = 1 / 45 -- ~22ms
@@ -12,6 +13,8 @@ local GC_DELTA_BUDGET_MB = 4
 local PROJECTILE_PART_BUDGET = 350
 local VFX_INSTANCE_BUDGET = 175
 local WARNING_COOLDOWN = 10
+-- Print every sample as "[PerfSample] {json}" so soak-run output can be analysed offline.
+local CAPTURE_SAMPLES = false
 
 local remotesFolder = ReplicatedStorage:FindFirstChild("Remotes")
 if not remotesFolder then
@@ -137,6 +140,12 @@ type PerfSample = {
 
 local function emitSample(sample: PerfSample)
         perfEvent:FireAllClients(sample)
+        if CAPTURE_SAMPLES then
+                local ok, encoded = pcall(HttpService.JSONEncode, HttpService, sample)
+                if ok then
+                        print("[PerfSample] " .. encoded)
+                end
+        end
 end
 
 RunService.Heartbeat:Connect(function(dt: number)
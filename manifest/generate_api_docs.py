@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""Regenerate the ``docs/api/modules`` pages and ``docs/api/index.md`` from the Luau sources.
+
+Modules are discovered and grouped exactly as ``generate_manifest.py`` does
+for ``api_index.json``: Luau files under the Rojo-mapped folders, placed by
+``API_GROUP_RULES``. Each page mirrors one source file
+(``Foo.server.lua`` -> ``modules/.../Foo.server.md``) and lists:
+
+* the leading doc comment of the file as its summary;
+* the functions defined on the table the module returns
+  (``function M.f``, ``function M:m``, ``M.f = function`` and
+  ``M.f = localFunction``), each with its signature and the comment block
+  directly above it;
+* the ``export type`` declarations.
+
+Declarations are found in the token stream of the syntax checker's ``Lexer``,
+so commented-out code is never documented. Comments are then read from the
+source lines around each declaration.
+
+The first line of every page records a key: the SHA-256 of the source, its
+placement and the generator version. A page is re-rendered only when its key
+changes, and stale pages are rendered in a process pool when there are enough
+of them. Pages whose source disappeared are removed, and ``index.md`` is
+rewritten at the end through the same skip-unchanged atomic writer.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if __package__ is None:
+    sys.path.append(str(REPO_ROOT / "tools"))
+from luau_syntax_checker import Lexer, SyntaxError, Token  # type: ignore  # noqa: E402
+
+from generate_manifest import (  # noqa: E402
+    API_AREAS,
+    MIN_PARALLEL_FILES,
+    api_group_for,
+    detect_docstring,
+    language_for,
+    module_kind,
+    split_extension,
+    walk_tree,
+)
+from split_manifest import write_if_changed  # noqa: E402
+
+# Part of every page key; bump it whenever the rendered output changes.
+GENERATOR_VERSION = 1
+DOCS_DIR = REPO_ROOT / "docs" / "api"
+PAGES_DIRNAME = "modules"
+INDEX_FILENAME = "index.md"
+KEY_PREFIX = "<!-- generate_api_docs.py key: "
+KEY_SUFFIX = " -->"
+# Tokens that keep a type declaration going onto the next line.
+TYPE_CONTINUATIONS = {"PIPE", "AMP", "ARROW", "ASSIGN", "COMMA", "QUESTION"}
+# Keywords that may appear inside a return type annotation.
+TYPE_KEYWORDS = {"KW_NIL", "KW_TRUE", "KW_FALSE"}
+DECORATIVE_LINE = re.compile(r"^[-=*#~_\s]*$")
+# Section banners such as ``== Helpers ==`` are not documentation.
+BANNER_LINE = re.compile(r"^[-=*#~]{2,}.*[-=*#~]{2,}$")
+TRAILING_COMMENT = re.compile(r"\s*--[^\"']*$")
+
+INDEX_HEADER = """# FruitSmash API Index
+
+This high-level index groups every documented module by its gameplay or platform area.
+Use it to locate the generated per-module API pages and drill into specific systems.
+"""
+
+
+@dataclass
+class ModuleInfo:
+    """A documented source file, its placement and its page."""
+
+    path: str
+    name: str
+    area: str
+    group: str
+    kind: str
+    page: str  # relative to the docs directory
+    lines: int
+    size_bytes: int
+    has_docstring: bool
+    key: str
+
+
+@dataclass
+class Export:
+    name: str
+    signature: str
+    doc: str
+    line: int
+
+
+@dataclass
+class ModuleApi:
+    summary: str = ""
+    table: Optional[str] = None
+    functions: List[Export] = field(default_factory=list)
+    types: List[Export] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class GenerateStats:
+    pages: int = 0
+    rendered: int = 0
+    removed: List[str] = field(default_factory=list)
+    index_written: bool = False
+
+
+def page_for(rel_path: str) -> str:
+    return f"{PAGES_DIRNAME}/{rel_path[: -len(os.path.splitext(rel_path)[1])]}.md"
+
+
+def page_key(data: bytes, area: str, group: str, kind: str) -> str:
+    digest = hashlib.sha256(f"{GENERATOR_VERSION}\0{area}\0{group}\0{kind}\0".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def collect_modules(repo_root: Path) -> Tuple[List[ModuleInfo], Dict[str, str]]:
+    """Every documented module under ``repo_root`` and its decoded source."""
+
+    modules: List[ModuleInfo] = []
+    sources: Dict[str, str] = {}
+    for rel_path in sorted(walk_tree(repo_root)):
+        if language_for(rel_path) != "Luau":
+            continue
+        placement = api_group_for(rel_path)
+        if placement is None:
+            continue
+        data = (repo_root / rel_path).read_bytes()
+        text = data.decode("utf-8", errors="replace")
+        lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+        filename = rel_path.rsplit("/", 1)[-1]
+        kind = module_kind(filename)
+        modules.append(
+            ModuleInfo(
+                path=rel_path,
+                name=split_extension(filename)[0],
+                area=placement[0],
+                group=placement[1],
+                kind=kind,
+                page=page_for(rel_path),
+                lines=lines,
+                size_bytes=len(data),
+                has_docstring=detect_docstring(text, "Luau"),
+                key=page_key(data, placement[0], placement[1], kind),
+            )
+        )
+        sources[rel_path] = text
+    return modules, sources
+
+
+def stored_key(page_path: Path) -> Optional[str]:
+    try:
+        with page_path.open("r", encoding="utf-8") as handle:
+            first = handle.readline().rstrip("\n")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    if first.startswith(KEY_PREFIX) and first.endswith(KEY_SUFFIX):
+        return first[len(KEY_PREFIX): -len(KEY_SUFFIX)]
+    return None
+
+
+def _clean_comment(lines: Sequence[str]) -> str:
+    cleaned: List[str] = []
+    for raw in lines:
+        line = raw.strip()
+        line = re.sub(r"^--\[=*\[", "", line)
+        line = re.sub(r"\]=*\]$", "", line)
+        line = re.sub(r"^-{2,}\s?", "", line).rstrip()
+        if line and (DECORATIVE_LINE.match(line) or BANNER_LINE.match(line)):
+            continue
+        cleaned.append(line)
+    text = "\n".join(cleaned).strip("\n")
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+def leading_comment(lines: Sequence[str], filename: str) -> str:
+    """The first comment block of the file, skipping ``--!`` directives and a line naming the file."""
+
+    block: List[str] = []
+    cursor = 0
+    while cursor < len(lines) and (not lines[cursor].strip() or lines[cursor].lstrip().startswith("--!")):
+        cursor += 1
+    if cursor < len(lines) and re.match(r"\s*--\[=*\[", lines[cursor]):
+        while cursor < len(lines):
+            block.append(lines[cursor])
+            if re.search(r"\]=*\]\s*$", lines[cursor]):
+                break
+            cursor += 1
+    else:
+        while cursor < len(lines) and lines[cursor].lstrip().startswith("--"):
+            block.append(lines[cursor])
+            cursor += 1
+    text = _clean_comment([line for line in block if not re.match(r"\s*@module\b", line)])
+    first, _, rest = text.partition("\n")
+    if first.strip() == filename:
+        text = rest.strip("\n")
+    return text
+
+
+def comment_above(lines: Sequence[str], line: int) -> str:
+    """The comment block that ends on the line directly above ``line`` (1-based)."""
+
+    cursor = line - 2
+    if cursor < 0:
+        return ""
+    if re.search(r"\]=*\]\s*$", lines[cursor]) and not lines[cursor].lstrip().startswith("--["):
+        end = cursor
+        while cursor >= 0 and not re.match(r"\s*--\[=*\[", lines[cursor]):
+            cursor -= 1
+        return _clean_comment(lines[cursor:end + 1]) if cursor >= 0 else ""
+    start = cursor
+    while start >= 0 and lines[start].lstrip().startswith("--") and not lines[start].lstrip().startswith("--!"):
+        start -= 1
+    return _clean_comment(lines[start + 1:cursor + 1])
+
+
+class _Source:
+    """Token stream plus helpers to slice the original text between tokens."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens: List[Token] = list(Lexer(text).tokens())
+        self.line_starts = [0]
+        for match in re.finditer("\n", text):
+            self.line_starts.append(match.end())
+
+    def kind(self, index: int) -> str:
+        return self.tokens[index].type if 0 <= index < len(self.tokens) else "EOF"
+
+    def offset(self, index: int) -> int:
+        token = self.tokens[index]
+        if token.type == "EOF":
+            return len(self.text)
+        return self.line_starts[token.line - 1] + token.column - 1
+
+    def line_end(self, index: int) -> int:
+        line = self.tokens[index].line
+        return self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.text)
+
+    def span(self, start: int, stop: int) -> str:
+        """Source text from token ``start`` up to token ``stop``, trimmed at the last line break."""
+
+        if self.kind(stop) == "EOF" or self.tokens[stop].line != self.tokens[stop - 1].line:
+            text = self.text[self.offset(start): self.line_end(stop - 1)]
+            text = TRAILING_COMMENT.sub("", text)
+        else:
+            text = self.text[self.offset(start): self.offset(stop)]
+        return text.rstrip()
+
+    def matching(self, index: int, opener: str, closer: str) -> int:
+        depth = 0
+        while self.kind(index) != "EOF":
+            kind = self.kind(index)
+            if kind == opener:
+                depth += 1
+            elif kind == closer:
+                depth -= 1
+                if depth == 0:
+                    return index
+            index += 1
+        return index
+
+    def signature_end(self, lparen: int) -> int:
+        """Index of the first token after a parameter list and its return annotation."""
+
+        cursor = self.matching(lparen, "LPAREN", "RPAREN") + 1
+        if self.kind(cursor) != "COLON":
+            return cursor
+        line = self.tokens[cursor].line
+        depth = 0
+        while self.kind(cursor) != "EOF" and self.tokens[cursor].line == line:
+            kind = self.kind(cursor)
+            if depth == 0 and kind.startswith("KW_") and kind not in TYPE_KEYWORDS:
+                break
+            if depth == 0 and kind == "NAME" and self.kind(cursor - 1) in ("NAME", "RPAREN", "RBRACE"):
+                break
+            if kind in ("LPAREN", "LBRACE", "LBRACKET", "LT"):
+                depth += 1
+            elif kind in ("RPAREN", "RBRACE", "RBRACKET", "GT"):
+                depth -= 1
+            cursor += 1
+        return cursor
+
+    def type_end(self, start: int) -> int:
+        """Index of the first token after the ``export type`` declaration at ``start``."""
+
+        cursor = start
+        while self.kind(cursor) not in ("ASSIGN", "EOF"):
+            cursor += 1
+        cursor += 1
+        depth = 0
+        while self.kind(cursor) != "EOF":
+            kind = self.kind(cursor)
+            previous = self.tokens[cursor - 1]
+            if depth == 0 and kind == "SEMICOLON":
+                break
+            if (
+                depth == 0
+                and self.tokens[cursor].line != previous.line
+                and previous.type not in TYPE_CONTINUATIONS
+                and kind not in TYPE_CONTINUATIONS
+            ):
+                break
+            if kind in ("LPAREN", "LBRACE", "LBRACKET", "LT"):
+                depth += 1
+            elif kind in ("RPAREN", "RBRACE", "RBRACKET", "GT"):
+                depth -= 1
+            cursor += 1
+        return cursor
+
+
+def _returned_table(source: _Source) -> Optional[str]:
+    """Name of the table returned by the final ``return NAME`` of the file."""
+
+    tokens = [token for token in source.tokens if token.type not in ("SEMICOLON", "EOF")]
+    if len(tokens) >= 2 and tokens[-2].type == "KW_RETURN" and tokens[-1].type == "NAME":
+        return tokens[-1].value
+    return None
+
+
+def extract_api(text: str, filename: str) -> ModuleApi:
+    """Summary, exported functions and exported types of one Luau source."""
+
+    api = ModuleApi()
+    lines = text.splitlines()
+    api.summary = leading_comment(lines, filename)
+    try:
+        source = _Source(text)
+    except SyntaxError as exc:
+        api.error = str(exc)
+        return api
+    api.table = _returned_table(source)
+
+    # Definitions are matched by shape rather than by block depth, so a missing
+    # ``end`` earlier in a file does not hide the functions after it.
+    local_functions: Dict[str, int] = {}
+    assigned: List[Tuple[str, int, int]] = []  # (member, line, token index of the value)
+    for index, token in enumerate(source.tokens):
+        kind = token.type
+        if kind == "KW_FUNCTION" and source.kind(index + 1) == "NAME":
+            if source.kind(index - 1) == "KW_LOCAL":
+                local_functions.setdefault(source.tokens[index + 1].value, index)
+                continue
+            owner = source.tokens[index + 1].value
+            if owner != api.table or source.kind(index + 2) not in ("DOT", "COLON"):
+                continue
+            if source.kind(index + 3) != "NAME" or source.kind(index + 4) != "LPAREN":
+                continue
+            separator = "." if source.kind(index + 2) == "DOT" else ":"
+            name = f"{owner}{separator}{source.tokens[index + 3].value}"
+            signature = source.span(index, source.signature_end(index + 4))
+            api.functions.append(Export(name, signature, comment_above(lines, token.line), token.line))
+        elif kind == "KW_EXPORT" and source.kind(index + 1) == "NAME" and source.tokens[index + 1].value == "type":
+            if source.kind(index + 2) == "NAME":
+                signature = source.span(index, source.type_end(index))
+                name = source.tokens[index + 2].value
+                api.types.append(Export(name, signature, comment_above(lines, token.line), token.line))
+        elif (
+            kind == "NAME"
+            and api.table is not None
+            and token.value == api.table
+            and source.kind(index - 1) not in ("DOT", "COLON")
+            and source.kind(index + 1) == "DOT"
+            and source.kind(index + 2) == "NAME"
+            and source.kind(index + 3) == "ASSIGN"
+        ):
+            assigned.append((source.tokens[index + 2].value, token.line, index + 4))
+
+    defined = {export.name for export in api.functions}
+    for member, line, value in assigned:
+        name = f"{api.table}.{member}"
+        if name in defined:
+            continue
+        defined.add(name)
+        doc = comment_above(lines, line)
+        if source.kind(value) == "KW_FUNCTION" and source.kind(value + 1) == "LPAREN":
+            params = source.span(value + 1, source.signature_end(value + 1))
+        elif source.kind(value) == "NAME" and source.tokens[value].value in local_functions:
+            definition = local_functions[source.tokens[value].value]
+            if source.kind(definition + 2) != "LPAREN":
+                continue
+            params = source.span(definition + 2, source.signature_end(definition + 2))
+            doc = doc or comment_above(lines, source.tokens[definition].line)
+        else:
+            continue
+        api.functions.append(Export(name, f"function {name}{params}", doc, line))
+    api.functions.sort(key=lambda export: export.line)
+    return api
+
+
+def _doc_lines(doc: str) -> str:
+    """Comment text with ``@param``-style tags turned into list items so they keep their own lines."""
+
+    return "\n".join(f"- {line}" if line.startswith("@") else line for line in doc.splitlines())
+
+
+def _badge(flag: bool) -> str:
+    return "✅" if flag else "❌"
+
+
+def render_page(module: ModuleInfo, text: str) -> str:
+    api = extract_api(text, module.path.rsplit("/", 1)[-1])
+    out = [
+        f"{KEY_PREFIX}{module.key}{KEY_SUFFIX}",
+        f"# {module.name}",
+        "",
+        f"- **Source:** `{module.path}`",
+        f"- **Category:** {module.area} › {module.group}",
+        f"- **Kind:** {module.kind}",
+        f"- **Lines of code:** {module.lines}",
+        f"- **Size:** {module.size_bytes} bytes",
+        f"- **Has docstrings:** {_badge(module.has_docstring)}",
+        "",
+        "## Summary",
+        "",
+        api.summary or "_This module has no leading doc comment._",
+        "",
+    ]
+    if api.error is not None:
+        out += ["## Exports", "", f"_The source could not be tokenised: {api.error}_", ""]
+        return "\n".join(out)
+
+    out += ["## Functions", ""]
+    if api.functions:
+        for export in api.functions:
+            out += [f"### `{export.name}`", "", "```lua", export.signature, "```", ""]
+            if export.doc:
+                out += [_doc_lines(export.doc), ""]
+    elif api.table is None:
+        out += ["_This script does not return a module table._", ""]
+    else:
+        out += [f"_No functions are defined on `{api.table}`._", ""]
+
+    out += ["## Types", ""]
+    if api.types:
+        for export in api.types:
+            out += [f"### `{export.name}`", "", "```lua", export.signature, "```", ""]
+            if export.doc:
+                out += [_doc_lines(export.doc), ""]
+    else:
+        out += ["_No exported types._", ""]
+    return "\n".join(out)
+
+
+def _render_job(job: Tuple[ModuleInfo, str]) -> str:
+    return render_page(*job)
+
+
+def render_index(modules: Sequence[ModuleInfo]) -> str:
+    groups: Dict[Tuple[str, str], List[ModuleInfo]] = {}
+    for module in modules:
+        groups.setdefault((module.area, module.group), []).append(module)
+
+    out = [INDEX_HEADER]
+    for area_name, description in API_AREAS:
+        names = sorted((group for area, group in groups if area == area_name), key=str.lower)
+        if not names:
+            continue
+        out += [f"## {area_name}", "", description, ""]
+        for group in names:
+            out += [f"### {group}", ""]
+            for module in sorted(groups[(area_name, group)], key=lambda m: m.name.lower()):
+                out.append(
+                    f"- [{module.name}]({module.page}) — {module.kind} • {module.lines} lines"
+                    f" • docstrings {_badge(module.has_docstring)}"
+                )
+            out.append("")
+    return "\n".join(out)
+
+
+def generate(repo_root: Path, docs_dir: Path, jobs: Optional[int] = None, full: bool = False) -> GenerateStats:
+    modules, sources = collect_modules(repo_root)
+    stats = GenerateStats(pages=len(modules))
+    stale = [m for m in modules if full or stored_key(docs_dir / m.page) != m.key]
+
+    work = [(module, sources[module.path]) for module in stale]
+    if len(work) >= MIN_PARALLEL_FILES and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pages = list(pool.map(_render_job, work, chunksize=4))
+    else:
+        pages = [_render_job(job) for job in work]
+    for module, page in zip(stale, pages):
+        if write_if_changed(docs_dir / module.page, page):
+            stats.rendered += 1
+
+    expected = {module.page for module in modules}
+    pages_dir = docs_dir / PAGES_DIRNAME
+    for page_path in sorted(pages_dir.rglob("*.md")):
+        relative = page_path.relative_to(docs_dir).as_posix()
+        if relative not in expected:
+            page_path.unlink()
+            stats.removed.append(relative)
+    for directory in sorted((p for p in pages_dir.rglob("*") if p.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+
+    stats.index_written = write_if_changed(docs_dir / INDEX_FILENAME, render_index(modules))
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate docs/api/modules and docs/api/index.md")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root to scan.")
+    parser.add_argument("--out", type=Path, default=DOCS_DIR, help="API docs directory to write into.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--full", action="store_true", help="Re-render every page, ignoring the stored keys.")
+    args = parser.parse_args(argv)
+
+    stats = generate(args.root.resolve(), args.out.resolve(), jobs=args.jobs, full=args.full)
+    index_note = "rewritten" if stats.index_written else "unchanged"
+    print(
+        f"Documented {stats.pages} modules ({stats.rendered} pages written, "
+        f"{len(stats.removed)} removed); index {index_note}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
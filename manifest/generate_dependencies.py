@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""Regenerate ``dependencies.json`` from the ``require`` graph of the Luau tree.
+
+Module lookups are extracted from the token stream produced by the Luau
+syntax checker's ``Lexer`` rather than with regexes, so comments and strings
+never produce false edges. Instance expressions such as
+``script.Parent:WaitForChild("HUDServer")`` or
+``ReplicatedStorage:WaitForChild("Shared"):FindFirstChild("Flags")`` are
+evaluated symbolically (following simple ``local`` bindings) and resolved to
+files through the ``default.project.json`` mapping. A name assigned from
+``local ok, result = pcall(function() ... return <instance> end)`` is bound to
+what the closure returns.
+
+Edges come in three flavours, mirroring the hand-written manifest:
+
+* ``direct`` – a plain ``require(...)`` call;
+* ``protected`` – a ``require(...)`` nested inside a ``pcall``/``xpcall``;
+* ``dynamic`` – ``pcall(require, module)`` on a looked-up instance.
+
+``direct`` and ``protected`` edges name their module statically and are
+listed under ``requires``; ``dynamic`` edges go to ``dynamic_requires``.
+Modules chosen at runtime (a candidate table walked with ``pcall(require,
+...)``, or whole folders loaded by a registry) cannot be found by lexing, so
+``dynamic_requires`` also keeps hand-written entries from the previous file:
+``{"pattern": "Folder/**"}`` globs and ``{"path": ..., "curated": true}``
+edges. They are merged with the lexed edges on every run, and curated paths
+take part in cycle detection.
+
+Per-file extraction results are cached by content hash, so an edit to one
+script only re-lexes that file. Cycles are found with an iterative Tarjan SCC
+pass that is re-run only over the weakly connected components touched by
+files whose edges changed; other components reuse their cached SCCs.
+
+Other curated fields from the existing manifest (``description``,
+``uses_remotes``, ``notes``, ``provides``, ``external_dependencies`` …) are
+preserved as well.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if __package__ is None:
+    sys.path.append(str(REPO_ROOT / "tools"))
+from luau_syntax_checker import Lexer, SyntaxError, Token  # type: ignore  # noqa: E402
+from rojo_project import ProjectTree  # type: ignore  # noqa: E402
+
+from generate_manifest import load_json_or_none, write_document  # noqa: E402
+from split_manifest import write_if_changed  # noqa: E402
+
+DEPENDENCIES_FILENAME = "dependencies.json"
+CACHE_FILENAME = ".dependencies_cache.json"
+CACHE_VERSION = 2
+
+CHILD_LOOKUP_METHODS = {"WaitForChild", "FindFirstChild"}
+PROTECTED_CALLS = {"pcall", "xpcall"}
+LAYER_PREFIXES = [
+    ("ReplicatedStorage/", "shared"),
+    ("ReplicatedFirst/", "shared"),
+    ("ServerScriptService/", "server"),
+    ("ServerStorage/", "server"),
+    ("StarterPlayer/", "client"),
+    ("StarterGui/", "client"),
+    ("StarterPack/", "client"),
+]
+# Stop tokens that end a ``local x: T`` annotation without an initializer.
+_STATEMENT_TOKENS = {
+    "KW_LOCAL",
+    "KW_FUNCTION",
+    "KW_IF",
+    "KW_FOR",
+    "KW_WHILE",
+    "KW_REPEAT",
+    "KW_RETURN",
+    "KW_END",
+    "KW_DO",
+    "EOF",
+}
+
+# A symbolic instance path: ("game" | "script", step, step, ...) where a step
+# is a child name or ".." for ``.Parent``.
+RawPath = Tuple[str, ...]
+
+
+@dataclass
+class RawEdge:
+    kind: str
+    path: RawPath
+    line: int
+
+
+@dataclass
+class FileExtraction:
+    sha256: str
+    edges: List[RawEdge] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class RequireExtractor:
+    """Walks a token list and records module lookups passed to ``require``."""
+
+    def __init__(self, tokens: Sequence[Token]) -> None:
+        self.tokens = list(tokens)
+        self.bindings: Dict[str, Optional[RawPath]] = {
+            "game": ("game",),
+            "script": ("script",),
+            "workspace": ("game", "Workspace"),
+        }
+        self.edges: List[RawEdge] = []
+        self._protected_spans = self._find_protected_spans()
+        # Local helpers such as ``safeRequire(instance)`` or
+        # ``safeWaitForChild(parent, "Name")``, keyed by function name.
+        self.require_wrappers: Dict[str, int] = {}
+        self.lookup_helpers: Dict[str, Tuple[int, int]] = {}
+        self._find_wrappers()
+        # ``local ok, result = pcall(function() ... return X end)``: the closure's
+        # span and the name that receives what it returns, bound when the walk
+        # reaches that ``return`` so the closure's own locals are known.
+        self._pcall_results: List[Tuple[int, int, str]] = []
+
+    def _type(self, index: int) -> str:
+        if index < len(self.tokens):
+            return self.tokens[index].type
+        return "EOF"
+
+    def _value(self, index: int) -> str:
+        if index < len(self.tokens):
+            return self.tokens[index].value
+        return ""
+
+    def _find_protected_spans(self) -> List[Tuple[int, int]]:
+        """Token ranges enclosed by ``pcall(``/``xpcall(`` argument lists."""
+
+        spans: List[Tuple[int, int]] = []
+        open_stack: List[Tuple[int, bool]] = []
+        for index, tok in enumerate(self.tokens):
+            if tok.type == "LPAREN":
+                prev = self.tokens[index - 1] if index else None
+                is_pcall = prev is not None and prev.type == "NAME" and prev.value in PROTECTED_CALLS
+                open_stack.append((index, is_pcall))
+            elif tok.type == "RPAREN" and open_stack:
+                start, is_pcall = open_stack.pop()
+                if is_pcall:
+                    spans.append((start, index))
+        return spans
+
+    def _is_protected(self, index: int) -> bool:
+        return any(start < index < end for start, end in self._protected_spans)
+
+    def _find_wrappers(self) -> None:
+        """Classify single-purpose helper functions by what they do with their parameters."""
+
+        count = len(self.tokens)
+        for index, tok in enumerate(self.tokens):
+            if tok.type != "KW_FUNCTION" or self._type(index + 1) != "NAME" or self._type(index + 2) != "LPAREN":
+                continue
+            name = self._value(index + 1)
+            params: List[str] = []
+            cursor = index + 3
+            while cursor < count and self._type(cursor) != "RPAREN":
+                if self._type(cursor) == "NAME" and self._type(cursor - 1) in {"LPAREN", "COMMA"}:
+                    params.append(self._value(cursor))
+                cursor += 1
+            body_end = self._block_end(cursor + 1)
+            for pos in range(cursor + 1, body_end):
+                value = self._value(pos)
+                if self._type(pos) != "NAME" or value not in params:
+                    continue
+                prev_type = self._type(pos - 1)
+                if prev_type == "LPAREN" and self._value(pos - 2) == "require":
+                    self.require_wrappers[name] = params.index(value)
+                elif prev_type == "COMMA" and self._value(pos - 2) == "require" and self._value(pos - 4) in PROTECTED_CALLS:
+                    self.require_wrappers[name] = params.index(value)
+                elif (
+                    self._type(pos + 1) == "COLON"
+                    and self._value(pos + 2) in CHILD_LOOKUP_METHODS
+                    and self._type(pos + 3) == "LPAREN"
+                    and self._value(pos + 4) in params
+                ):
+                    self.lookup_helpers[name] = (params.index(value), params.index(self._value(pos + 4)))
+
+    def _block_end(self, index: int) -> int:
+        depth = 1
+        while index < len(self.tokens):
+            tok_type = self.tokens[index].type
+            if tok_type in {"KW_FUNCTION", "KW_IF", "KW_DO", "KW_REPEAT"}:
+                depth += 1
+            elif tok_type in {"KW_END", "KW_UNTIL"}:
+                depth -= 1
+                if depth == 0:
+                    return index
+            index += 1
+        return index
+
+    def _call_args(self, lparen: int) -> List[int]:
+        """Start indices of each top-level argument of the call at ``lparen``."""
+
+        starts = [lparen + 1]
+        depth = 0
+        index = lparen
+        while index < len(self.tokens):
+            tok_type = self.tokens[index].type
+            if tok_type in {"LPAREN", "LBRACE", "LBRACKET"}:
+                depth += 1
+            elif tok_type in {"RPAREN", "RBRACE", "RBRACKET"}:
+                depth -= 1
+                if depth == 0:
+                    break
+            elif tok_type == "COMMA" and depth == 1:
+                starts.append(index + 1)
+            index += 1
+        if self._type(lparen + 1) == "RPAREN":
+            return []
+        return starts
+
+    def extract(self) -> List[RawEdge]:
+        index = 0
+        count = len(self.tokens)
+        while index < count:
+            tok = self.tokens[index]
+            if tok.type == "KW_LOCAL" and self._type(index + 1) == "NAME":
+                index = self._local_binding(index + 1)
+                continue
+            if tok.type == "KW_RETURN":
+                self._bind_pcall_result(index)
+            if tok.type == "NAME":
+                if tok.value == "require" and self._type(index + 1) == "LPAREN":
+                    value, _ = self._expression(index + 2)
+                    if value is not None:
+                        kind = "protected" if self._is_protected(index) else "direct"
+                        self.edges.append(RawEdge(kind, value, tok.line))
+                elif tok.value in self.require_wrappers and self._type(index + 1) == "LPAREN":
+                    args = self._call_args(index + 1)
+                    position = self.require_wrappers[tok.value]
+                    if position < len(args):
+                        value, _ = self._expression(args[position])
+                        if value is not None:
+                            self.edges.append(RawEdge("protected", value, tok.line))
+                elif (
+                    tok.value in PROTECTED_CALLS
+                    and self._type(index + 1) == "LPAREN"
+                    and self._value(index + 2) == "require"
+                    and self._type(index + 3) == "COMMA"
+                ):
+                    value, _ = self._expression(index + 4)
+                    if value is not None:
+                        self.edges.append(RawEdge("dynamic", value, tok.line))
+                elif self._type(index + 1) == "ASSIGN" and (index == 0 or self._type(index - 1) not in {"DOT", "COLON"}):
+                    value, _ = self._expression(index + 2)
+                    self.bindings[tok.value] = value
+            index += 1
+        return self.edges
+
+    def _local_binding(self, index: int) -> int:
+        names: List[str] = []
+        while True:
+            names.append(self._value(index))
+            index += 1
+            if self._type(index) == "COLON":
+                depth = 0
+                while True:
+                    tok_type = self._type(index)
+                    if tok_type in {"LPAREN", "LBRACE", "LBRACKET", "LT"}:
+                        depth += 1
+                    elif tok_type in {"RPAREN", "RBRACE", "RBRACKET", "GT"}:
+                        depth -= 1
+                    elif depth <= 0 and (tok_type in {"ASSIGN", "COMMA"} or tok_type in _STATEMENT_TOKENS):
+                        break
+                    index += 1
+            if self._type(index) != "COMMA" or self._type(index + 1) != "NAME":
+                break
+            index += 1
+        for name in names:
+            self.bindings[name] = None
+        if self._type(index) != "ASSIGN":
+            return index
+        if (
+            len(names) > 1
+            and self._value(index + 1) in PROTECTED_CALLS
+            and self._type(index + 2) == "LPAREN"
+            and self._type(index + 3) == "KW_FUNCTION"
+        ):
+            start, end = self._function_span(index + 3)
+            self._pcall_results.append((start, end, names[1]))
+        else:
+            value, _ = self._expression(index + 1)
+            self.bindings[names[0]] = value
+        # Leave the cursor on the initializer so nested require calls are seen.
+        return index + 1
+
+    def _function_span(self, index: int) -> Tuple[int, int]:
+        """``(function token, closing end)`` of the function at ``index``."""
+
+        cursor = index
+        while self._type(cursor) not in {"LPAREN", "EOF"}:
+            cursor += 1
+        return index, self._block_end(self._matching_paren(cursor) + 1)
+
+    def _bind_pcall_result(self, index: int) -> None:
+        """Bind the pcall result name when ``index`` is a ``return`` of its closure."""
+
+        for start, end, name in self._pcall_results:
+            if not start < index < end:
+                continue
+            nested = any(
+                self._type(pos) == "KW_FUNCTION" and self._function_span(pos)[1] > index
+                for pos in range(start + 1, index)
+            )
+            if nested:
+                continue
+            value, _ = self._expression(index + 1)
+            if value is not None:
+                self.bindings[name] = value
+
+    def _expression(self, index: int) -> Tuple[Optional[RawPath], int]:
+        value, index = self._operand(index)
+        while self._type(index) in {"KW_AND", "KW_OR"}:
+            operator = self._type(index)
+            right, index = self._operand(index + 1)
+            if operator == "KW_AND":
+                value = right
+            elif value is None:
+                value = right
+        return value, index
+
+    def _operand(self, index: int) -> Tuple[Optional[RawPath], int]:
+        tok_type = self._type(index)
+        value: Optional[RawPath]
+        if tok_type == "NAME" and self._value(index) in self.lookup_helpers and self._type(index + 1) == "LPAREN":
+            parent_pos, name_pos = self.lookup_helpers[self._value(index)]
+            args = self._call_args(index + 1)
+            value = None
+            if max(parent_pos, name_pos) < len(args) and self._type(args[name_pos]) == "STRING":
+                parent, _ = self._expression(args[parent_pos])
+                if parent is not None:
+                    value = parent + (self._value(args[name_pos]),)
+            index = self._matching_paren(index + 1) + 1
+        elif tok_type == "NAME":
+            value = self.bindings.get(self._value(index))
+            index += 1
+        elif tok_type == "LPAREN":
+            value, index = self._expression(index + 1)
+            index = self._skip_cast(index)
+            if self._type(index) != "RPAREN":
+                return None, index
+            index += 1
+        else:
+            return None, index
+        return self._suffixes(value, index)
+
+    def _skip_cast(self, index: int) -> int:
+        if self._type(index) != "DOUBLECOLON":
+            return index
+        depth = 0
+        index += 1
+        while self._type(index) != "EOF":
+            tok_type = self._type(index)
+            if tok_type in {"LPAREN", "LBRACE", "LBRACKET", "LT"}:
+                depth += 1
+            elif tok_type in {"RPAREN", "RBRACE", "RBRACKET", "GT"}:
+                if depth == 0:
+                    break
+                depth -= 1
+            index += 1
+        return index
+
+    def _suffixes(self, value: Optional[RawPath], index: int) -> Tuple[Optional[RawPath], int]:
+        while True:
+            tok_type = self._type(index)
+            if tok_type == "DOT" and self._type(index + 1) == "NAME":
+                member = self._value(index + 1)
+                if value is not None:
+                    value = value + ("..",) if member == "Parent" else value + (member,)
+                index += 2
+                continue
+            if tok_type == "COLON" and self._type(index + 1) == "NAME" and self._type(index + 2) == "LPAREN":
+                method = self._value(index + 1)
+                arg_type = self._type(index + 3)
+                arg_value = self._value(index + 3)
+                close = self._matching_paren(index + 2)
+                if value is not None and arg_type == "STRING" and (
+                    method in CHILD_LOOKUP_METHODS or (method == "GetService" and value == ("game",))
+                ):
+                    value = value + (arg_value,)
+                else:
+                    value = None
+                index = close + 1
+                continue
+            if tok_type == "LPAREN":
+                # Calling an instance path yields an unknown value.
+                index = self._matching_paren(index) + 1
+                value = None
+                continue
+            if tok_type == "DOUBLECOLON":
+                return value, self._skip_cast(index)
+            return value, index
+
+    def _matching_paren(self, index: int) -> int:
+        depth = 0
+        while index < len(self.tokens):
+            tok_type = self.tokens[index].type
+            if tok_type == "LPAREN":
+                depth += 1
+            elif tok_type == "RPAREN":
+                depth -= 1
+                if depth == 0:
+                    return index
+            index += 1
+        return len(self.tokens) - 1
+
+
+def extract_file(source: str) -> FileExtraction:
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    try:
+        tokens = list(Lexer(source).tokens())
+    except SyntaxError as exc:  # type: ignore[misc]
+        return FileExtraction(digest, [], f"{exc.line}:{exc.column}: {exc.message}")
+    return FileExtraction(digest, RequireExtractor(tokens).extract())
+
+
+def load_project_index(repo_root: Path) -> Dict[Tuple[str, ...], str]:
+    """Map DataModel instance paths to script files using ``default.project.json``."""
+
+    return ProjectTree(repo_root).script_index()
+
+
+def resolve_raw_path(raw: RawPath, script_instance: Tuple[str, ...]) -> Tuple[str, ...]:
+    current: List[str] = list(script_instance) if raw[0] == "script" else []
+    for step in raw[1:]:
+        if step == "..":
+            if current:
+                current.pop()
+        else:
+            current.append(step)
+    return tuple(current)
+
+
+def layer_for(rel_path: str) -> str:
+    for prefix, layer in LAYER_PREFIXES:
+        if rel_path.startswith(prefix):
+            return layer
+    return "shared"
+
+
+def tarjan_scc(nodes: Iterable[str], graph: Dict[str, List[str]]) -> List[List[str]]:
+    """Iterative Tarjan strongly connected components."""
+
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in nodes:
+        if root in index_of:
+            continue
+        work: List[Tuple[str, int]] = [(root, 0)]
+        while work:
+            node, child_pos = work.pop()
+            if child_pos == 0:
+                index_of[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            children = graph.get(node, [])
+            recursed = False
+            while child_pos < len(children):
+                child = children[child_pos]
+                child_pos += 1
+                if child not in index_of:
+                    work.append((node, child_pos))
+                    work.append((child, 0))
+                    recursed = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[child])
+            if recursed:
+                continue
+            if lowlink[node] == index_of[node]:
+                component: List[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+    return components
+
+
+def weak_components_touching(seeds: Set[str], graph: Dict[str, List[str]]) -> Set[str]:
+    """All nodes weakly connected to ``seeds`` (edges followed both ways)."""
+
+    undirected: Dict[str, Set[str]] = {}
+    for node, children in graph.items():
+        for child in children:
+            undirected.setdefault(node, set()).add(child)
+            undirected.setdefault(child, set()).add(node)
+    seen = set(seeds)
+    frontier = list(seeds)
+    while frontier:
+        node = frontier.pop()
+        for neighbour in undirected.get(node, ()):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                frontier.append(neighbour)
+    return seen
+
+
+def load_cache(path: Path) -> Tuple[Dict[str, FileExtraction], Dict[str, List[str]], List[List[str]]]:
+    data = load_json_or_none(path)
+    if data is None or data.get("version") != CACHE_VERSION:
+        return {}, {}, []
+    files: Dict[str, FileExtraction] = {}
+    for rel_path, entry in data.get("files", {}).items():
+        edges = [RawEdge(kind, tuple(raw), line) for kind, raw, line in entry.get("edges", [])]
+        files[rel_path] = FileExtraction(entry["sha256"], edges, entry.get("error"))
+    return files, data.get("graph", {}), data.get("sccs", [])
+
+
+def save_cache(
+    path: Path,
+    files: Dict[str, FileExtraction],
+    graph: Dict[str, List[str]],
+    sccs: List[List[str]],
+) -> None:
+    payload = {
+        "version": CACHE_VERSION,
+        "files": {
+            rel: {
+                "sha256": result.sha256,
+                "edges": [[edge.kind, list(edge.path), edge.line] for edge in result.edges],
+                **({"error": result.error} if result.error else {}),
+            }
+            for rel, result in sorted(files.items())
+        },
+        "graph": graph,
+        "sccs": sccs,
+    }
+    write_if_changed(path, json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+def extract_scripts(
+    repo_root: Path, scripts: Iterable[str], cached_files: Dict[str, FileExtraction]
+) -> Tuple[Dict[str, FileExtraction], List[str]]:
+    """Extraction results for ``scripts``, re-lexing only files whose hash changed."""
+
+    files: Dict[str, FileExtraction] = {}
+    reextracted: List[str] = []
+    for rel_path in sorted(scripts):
+        source = (repo_root / rel_path).read_text(encoding="utf-8")
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        cached = cached_files.get(rel_path)
+        if cached is not None and cached.sha256 == digest:
+            files[rel_path] = cached
+        else:
+            files[rel_path] = extract_file(source)
+            reextracted.append(rel_path)
+    return files, reextracted
+
+
+def curated_entries(module: dict) -> List[dict]:
+    """Hand-written ``dynamic_requires`` entries of a previous module entry.
+
+    Static lexing cannot see modules picked at runtime, such as a table of
+    candidates fed to ``pcall(require, ...)`` in a loop. Those edges are
+    recorded by hand as ``{"pattern": ...}`` globs or as entries marked
+    ``"curated": true``, and survive every regeneration.
+    """
+
+    return [
+        entry
+        for entry in module.get("dynamic_requires", [])
+        if isinstance(entry, dict) and ("pattern" in entry or entry.get("curated"))
+    ]
+
+
+def build_module_entries(
+    scripts: Dict[str, Tuple[str, ...]],
+    files: Dict[str, FileExtraction],
+    index: Dict[Tuple[str, ...], str],
+    curated: Dict[str, List[dict]],
+) -> Tuple[Dict[str, List[dict]], Dict[str, List[dict]], Dict[str, List[str]]]:
+    """Resolved ``requires``/``dynamic_requires`` per script and the edge graph.
+
+    ``direct`` and ``protected`` (``pcall``-guarded) requires name their
+    module statically and go to ``requires``. ``dynamic`` edges
+    (``pcall(require, module)``) go to ``dynamic_requires`` together with the
+    curated entries, which are merged in after the ones found by lexing.
+    """
+
+    requires: Dict[str, List[dict]] = {}
+    dynamic: Dict[str, List[dict]] = {}
+    graph: Dict[str, List[str]] = {}
+    for rel_path in sorted(scripts):
+        seen: Set[str] = set()
+        requires[rel_path] = []
+        dynamic[rel_path] = []
+        for edge in files[rel_path].edges:
+            target = index.get(resolve_raw_path(edge.path, scripts[rel_path]))
+            if target is None or target in seen:
+                continue
+            seen.add(target)
+            bucket = dynamic if edge.kind == "dynamic" else requires
+            bucket[rel_path].append({"path": target, "type": edge.kind})
+        for entry in curated.get(rel_path, []):
+            if "path" in entry and entry["path"] in seen:
+                continue
+            dynamic[rel_path].append(entry)
+            if "path" in entry:
+                seen.add(entry["path"])
+        graph[rel_path] = [
+            entry["path"] for entry in requires[rel_path] + dynamic[rel_path] if entry.get("path") in scripts
+        ]
+    return requires, dynamic, graph
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    manifest_dir = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Regenerate manifest/dependencies.json")
+    parser.add_argument("--root", type=Path, default=manifest_dir.parent, help="Repository root to scan.")
+    parser.add_argument("--out", type=Path, default=manifest_dir / DEPENDENCIES_FILENAME)
+    parser.add_argument("--full", action="store_true", help="Ignore the extraction cache.")
+    args = parser.parse_args(argv)
+
+    repo_root = args.root.resolve()
+    out_path = args.out.resolve()
+    cache_path = out_path.parent / CACHE_FILENAME
+
+    index = load_project_index(repo_root)
+    scripts = {rel: inst for inst, rel in index.items()}
+    cached_files, cached_graph, cached_sccs = ({}, {}, []) if args.full else load_cache(cache_path)
+
+    files, reextracted = extract_scripts(repo_root, scripts, cached_files)
+
+    previous = load_json_or_none(out_path) or {}
+    previous_modules = {m.get("path"): m for m in previous.get("modules", []) if isinstance(m, dict)}
+    curated = {path: curated_entries(module) for path, module in previous_modules.items()}
+    requires, dynamic, graph = build_module_entries(scripts, files, index, curated)
+
+    changed_nodes = {
+        node for node in set(graph) | set(cached_graph) if graph.get(node) != cached_graph.get(node)
+    }
+    if cached_graph and not args.full:
+        affected = weak_components_touching(changed_nodes, {**cached_graph, **graph})
+        kept = [scc for scc in cached_sccs if not affected.intersection(scc) and all(n in graph for n in scc)]
+        sccs = kept + tarjan_scc(sorted(affected & set(graph)), graph)
+    else:
+        sccs = tarjan_scc(sorted(graph), graph)
+    sccs.sort()
+    cycles = [scc for scc in sccs if len(scc) > 1 or scc[0] in graph.get(scc[0], [])]
+    cycle_of = {node: scc for scc in cycles for node in scc}
+
+    modules = []
+    for rel_path in sorted(scripts):
+        old = previous_modules.get(rel_path, {})
+        entry = {
+            "path": rel_path,
+            "layer": layer_for(rel_path),
+            "description": old.get("description", ""),
+            "requires": requires[rel_path],
+        }
+        if dynamic[rel_path]:
+            entry["dynamic_requires"] = dynamic[rel_path]
+        for key, value in old.items():
+            if key not in entry and key not in {"dynamic_requires", "cycles"}:
+                entry[key] = value
+        if rel_path in cycle_of:
+            entry["cycles"] = [node for node in cycle_of[rel_path] if node != rel_path]
+        modules.append(entry)
+
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    doc = {
+        "generated_at": generated_at,
+        "modules": modules,
+        "external_dependencies": previous.get("external_dependencies", []),
+        "cycles": cycles,
+    }
+    write_document(out_path, doc, previous or None)
+    save_cache(cache_path, files, graph, sccs)
+
+    errors = [rel for rel, result in files.items() if result.error]
+    print(
+        f"Resolved {sum(len(v) for v in graph.values())} edges across {len(graph)} scripts "
+        f"({len(reextracted)} re-extracted, {len(cycles)} cycle(s))."
+    )
+    for rel_path in errors:
+        print(f"  lexer error in {rel_path}: {files[rel_path].error}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
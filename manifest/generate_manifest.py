@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""Regenerate ``repo_manifest.json``, ``toc.json`` and ``api_index.json``.
+
+The generator walks the Rojo-mapped source folders with ``os.scandir`` and
+records per-file size, line count, modification time and whether the file
+opens with a doc comment. Reading files is the expensive part, so results are
+kept in a stat cache: files whose ``(size, mtime_ns)`` is unchanged are not
+read at all, and the rest are re-read (in a process pool when there are enough
+of them) but reused when their content hash matches the cached one. The
+directory aggregates in ``toc.json`` are recomputed only for directories on
+the path of a changed file. Unchanged subtrees are copied from the previous
+``toc.json``.
+
+Git does not keep mtimes, so ``last_modified`` is only taken from the file's
+mtime when its content changed. A file with the same hash as in the cache keeps
+the cached stamp. Without a cache (a fresh clone) a file that matches ``HEAD``
+and the previous entry's size keeps the previous entry's stamp.
+
+Outputs keep the schemas of the hand-generated manifests and are written with
+the same skip-unchanged atomic writer used by ``split_manifest.py``, which is
+re-run at the end so the paginated copy stays in sync. Hand-added fields on a
+``repo_manifest.json`` entry (``remotes_used`` …) are carried over.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import split_manifest
+from split_manifest import write_if_changed
+
+REPO_NAME = "FruitSmash_Repo"
+MANIFEST_FILENAME = "repo_manifest.json"
+TOC_FILENAME = "toc.json"
+API_INDEX_FILENAME = "api_index.json"
+STAT_CACHE_FILENAME = ".manifest_stat_cache.json"
+STAT_CACHE_VERSION = 2
+
+LANGUAGES = {
+    ".lua": "Luau",
+    ".luau": "Luau",
+    ".json": "JSON",
+    ".md": "Markdown",
+}
+COMPOUND_EXTENSIONS = (".server.lua", ".client.lua", ".server.luau", ".client.luau")
+# Generated or tooling-only top-level folders that are not part of the shipped tree.
+EXCLUDED_DIRS = {"docs", "manifest", "tools"}
+# Skipped at any depth.
+IGNORED_DIRS = {"__pycache__", "node_modules"}
+# Only these files are picked up from the repository root.
+ROOT_FILES = {"default.project.json"}
+# Below this many files a process pool costs more than it saves.
+MIN_PARALLEL_FILES = 32
+
+API_AREAS = [
+    (
+        "Client",
+        "Scripts that run on the client, handling controllers, UI, and player-facing tooling.",
+    ),
+    (
+        "Shared",
+        "Modules replicated between server and client that expose configuration, systems, and shared data.",
+    ),
+    (
+        "Server",
+        "Authoritative gameplay and service logic that executes on the Roblox server.",
+    ),
+    (
+        "Server Storage",
+        "Server-only modules kept in storage for templating and offline use.",
+    ),
+]
+# (path prefix, area, group). The longest matching prefix wins.
+API_GROUP_RULES = [
+    ("StarterPlayer/StarterPlayerScripts/Controllers/", "Client", "Controllers"),
+    ("StarterPlayer/StarterPlayerScripts/Tools/", "Client", "Tools"),
+    ("StarterPlayer/StarterPlayerScripts/", "Client", "Core Scripts"),
+    ("StarterGui/", "Client", "User Interface"),
+    ("ReplicatedStorage/Shared/Config/", "Shared", "Configuration"),
+    ("ReplicatedStorage/Shared/Content/", "Shared", "Content"),
+    ("ReplicatedStorage/Shared/Locale/", "Shared", "Localization"),
+    ("ReplicatedStorage/Shared/Systems/", "Shared", "Systems"),
+    ("ReplicatedStorage/Shared/Types/", "Shared", "Types"),
+    ("ReplicatedStorage/Remotes/", "Shared", "Networking Remotes"),
+    ("ReplicatedStorage/Assets/", "Shared", "Assets"),
+    ("ServerScriptService/Analytics/", "Server", "Analytics"),
+    ("ServerScriptService/Combat/", "Server", "Combat Systems"),
+    ("ServerScriptService/Data/", "Server", "Data Services"),
+    ("ServerScriptService/Economy/", "Server", "Economy Services"),
+    ("ServerScriptService/GameServer/", "Server", "GameServer Core"),
+    ("ServerScriptService/Match/", "Server", "Matchmaking"),
+    ("ServerScriptService/Moderation/", "Server", "Moderation"),
+    ("ServerScriptService/Obstacles/", "Server", "Obstacle Systems"),
+    ("ServerScriptService/Shop/", "Server", "Shop Services"),
+    ("ServerScriptService/Tools/", "Server", "Tooling"),
+    ("ServerStorage/ArenaTemplates/", "Server Storage", "Arena Templates"),
+]
+
+
+@dataclass
+class FileRecord:
+    """Scan result for a single source file."""
+
+    path: str
+    size_bytes: int
+    mtime_ns: int
+    sha256: str
+    lines: int
+    has_docstring: bool
+    last_modified: str
+
+    @property
+    def stat_key(self) -> Tuple[int, int]:
+        return (self.size_bytes, self.mtime_ns)
+
+
+def split_extension(filename: str) -> Tuple[str, str]:
+    lowered = filename.lower()
+    for ext in COMPOUND_EXTENSIONS:
+        if lowered.endswith(ext):
+            return filename[: -len(ext)], filename[-len(ext):]
+    stem, ext = os.path.splitext(filename)
+    return stem, ext
+
+
+def language_for(filename: str) -> Optional[str]:
+    return LANGUAGES.get(os.path.splitext(filename)[1].lower())
+
+
+def iso_timestamp(ns: int) -> str:
+    moment = datetime.fromtimestamp(ns / 1_000_000_000, tz=timezone.utc)
+    return moment.replace(tzinfo=None).isoformat() + "Z"
+
+
+def walk_tree(repo_root: Path) -> Dict[str, os.stat_result]:
+    """Return ``{relative_path: stat}`` for every manifest-eligible file."""
+
+    found: Dict[str, os.stat_result] = {}
+    stack: List[Tuple[str, str]] = [(str(repo_root), "")]
+    while stack:
+        abs_dir, rel_dir = stack.pop()
+        with os.scandir(abs_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if entry.is_dir(follow_symlinks=False):
+                    if name in IGNORED_DIRS or (not rel_dir and name in EXCLUDED_DIRS):
+                        continue
+                    stack.append((entry.path, rel_path))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if not rel_dir and name not in ROOT_FILES:
+                    continue
+                if language_for(name) is None:
+                    continue
+                found[rel_path] = entry.stat(follow_symlinks=False)
+    return found
+
+
+def detect_docstring(text: str, language: str) -> bool:
+    """Whether the file opens with a doc comment.
+
+    Luau ``--!`` directives such as ``--!strict`` are skipped first: they are
+    compiler modes, not documentation, so a script with nothing but
+    ``--!strict`` above its code counts as undocumented.
+    """
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if language == "Luau":
+            if line.startswith("--!"):
+                continue
+            return line.startswith("--")
+        if language == "Markdown":
+            return line.startswith("#")
+        return False
+    return False
+
+
+def scan_file(abs_path: str) -> Tuple[str, int, bool]:
+    """Hash, count lines and detect a leading doc comment. Runs inside workers."""
+
+    with open(abs_path, "rb") as handle:
+        data = handle.read()
+    lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        lines += 1
+    language = language_for(abs_path) or ""
+    text = data.decode("utf-8", errors="replace")
+    return hashlib.sha256(data).hexdigest(), lines, detect_docstring(text, language)
+
+
+def git_modified_paths(repo_root: Path) -> Optional[Set[str]]:
+    """Paths that differ from ``HEAD`` or are untracked; ``None`` outside a git checkout."""
+
+    commands = (
+        ["git", "-c", "core.quotepath=off", "diff", "--name-only", "--relative", "HEAD", "--"],
+        ["git", "-c", "core.quotepath=off", "ls-files", "--others", "--exclude-standard"],
+    )
+    paths: Set[str] = set()
+    for command in commands:
+        try:
+            result = subprocess.run(command, cwd=repo_root, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        paths.update(line for line in result.stdout.splitlines() if line)
+    return paths
+
+
+def load_stat_cache(path: Path) -> Dict[str, FileRecord]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STAT_CACHE_VERSION:
+        return {}
+    records: Dict[str, FileRecord] = {}
+    for rel_path, row in data.get("files", {}).items():
+        size, mtime_ns, digest, lines, has_doc, last_modified = row
+        records[rel_path] = FileRecord(rel_path, size, mtime_ns, digest, lines, bool(has_doc), last_modified)
+    return records
+
+
+def save_stat_cache(path: Path, records: Dict[str, FileRecord]) -> None:
+    payload = {
+        "version": STAT_CACHE_VERSION,
+        "files": {
+            rel: [r.size_bytes, r.mtime_ns, r.sha256, r.lines, r.has_docstring, r.last_modified]
+            for rel, r in sorted(records.items())
+        },
+    }
+    write_if_changed(path, json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+def scan_changed(
+    repo_root: Path,
+    stats: Dict[str, os.stat_result],
+    cache: Dict[str, FileRecord],
+    jobs: Optional[int],
+    previous: Optional[Dict[str, dict]] = None,
+) -> Tuple[Dict[str, FileRecord], Set[str]]:
+    """Reuse cached records whose stat key or content hash matches and re-read the rest.
+
+    ``previous`` maps paths to the entries of the last ``repo_manifest.json``;
+    their ``last_modified`` is kept for files that match ``HEAD``. Returns the
+    full record map plus the set of paths that were added, modified or removed
+    since the cached run.
+    """
+
+    records: Dict[str, FileRecord] = {}
+    to_scan: List[str] = []
+    for rel_path, st in stats.items():
+        cached = cache.get(rel_path)
+        if cached is not None and cached.stat_key == (st.st_size, st.st_mtime_ns):
+            records[rel_path] = cached
+        else:
+            to_scan.append(rel_path)
+
+    abs_paths = [str(repo_root / rel) for rel in to_scan]
+    if len(to_scan) >= MIN_PARALLEL_FILES and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(scan_file, abs_paths, chunksize=16))
+    else:
+        results = [scan_file(p) for p in abs_paths]
+
+    changed: Set[str] = set()
+    modified: Optional[Set[str]] = None
+    for rel_path, (digest, lines, has_doc) in zip(to_scan, results):
+        st = stats[rel_path]
+        cached = cache.get(rel_path)
+        if cached is not None and cached.sha256 == digest:
+            last_modified = cached.last_modified
+        else:
+            changed.add(rel_path)
+            last_modified = iso_timestamp(st.st_mtime_ns)
+            old = (previous or {}).get(rel_path)
+            if cached is None and old is not None and old.get("size_bytes") == st.st_size:
+                if modified is None:
+                    # Outside a git checkout the matching size alone has to do.
+                    modified = git_modified_paths(repo_root) or set()
+                if rel_path not in modified:
+                    last_modified = old.get("last_modified", last_modified)
+        records[rel_path] = FileRecord(
+            rel_path, st.st_size, st.st_mtime_ns, digest, lines, has_doc, last_modified
+        )
+
+    changed.update(set(cache) - set(stats))
+    return records, changed
+
+
+def build_manifest(
+    records: Dict[str, FileRecord], generated_at: str, previous: Optional[Dict[str, dict]] = None
+) -> dict:
+    files = []
+    for rel_path in sorted(records):
+        record = records[rel_path]
+        filename = rel_path.rsplit("/", 1)[-1]
+        name, ext = split_extension(filename)
+        entry = {
+            "path": rel_path,
+            "name": name,
+            "ext": ext,
+            "language": language_for(filename),
+            "size_bytes": record.size_bytes,
+            "lines": record.lines,
+            "last_modified": record.last_modified,
+            "has_docstring": record.has_docstring,
+        }
+        for key, value in (previous or {}).get(rel_path, {}).items():
+            entry.setdefault(key, value)
+        files.append(entry)
+    return {
+        "repo_name": REPO_NAME,
+        "generated_at": generated_at,
+        "total_files": len(files),
+        "files": files,
+    }
+
+
+def _index_toc_dirs(node: dict, index: Dict[str, dict]) -> None:
+    if node.get("type") != "directory":
+        return
+    index[node.get("path", ".")] = node
+    for child in node.get("children", []):
+        _index_toc_dirs(child, index)
+
+
+def dirty_directories(changed: Iterable[str]) -> Set[str]:
+    dirty = {"."}
+    for rel_path in changed:
+        parts = rel_path.split("/")[:-1]
+        for depth in range(1, len(parts) + 1):
+            dirty.add("/".join(parts[:depth]))
+    return dirty
+
+
+def _sort_key(node: dict) -> Tuple[int, str]:
+    return (0 if node["type"] == "directory" else 1, node["name"].lower())
+
+
+def build_toc(
+    records: Dict[str, FileRecord],
+    dirty: Set[str],
+    previous: Dict[str, dict],
+) -> dict:
+    """Build the directory tree, reusing clean subtrees from ``previous``."""
+
+    dir_children: Dict[str, Dict[str, None]] = {".": {}}
+    files_by_dir: Dict[str, List[str]] = {}
+    for rel_path in records:
+        parts = rel_path.split("/")
+        parent = "."
+        for depth in range(1, len(parts)):
+            current = "/".join(parts[:depth])
+            dir_children.setdefault(parent, {})[current] = None
+            dir_children.setdefault(current, {})
+            parent = current
+        files_by_dir.setdefault(parent, []).append(rel_path)
+
+    def file_node(rel_path: str) -> dict:
+        record = records[rel_path]
+        return {
+            "name": rel_path.rsplit("/", 1)[-1],
+            "type": "file",
+            "path": rel_path,
+            "line_count": record.lines,
+            "size_bytes": record.size_bytes,
+            "language": language_for(rel_path),
+            "file_count": 1,
+            "total_size_bytes": record.size_bytes,
+        }
+
+    def dir_node(dir_path: str) -> dict:
+        if dir_path not in dirty and dir_path in previous:
+            return previous[dir_path]
+        children = [dir_node(child) for child in dir_children.get(dir_path, {})]
+        children.extend(file_node(rel) for rel in files_by_dir.get(dir_path, []))
+        children.sort(key=_sort_key)
+        return {
+            "name": REPO_NAME if dir_path == "." else dir_path.rsplit("/", 1)[-1],
+            "type": "directory",
+            "path": dir_path,
+            "children": children,
+            "line_count": sum(c["line_count"] for c in children),
+            "file_count": sum(c["file_count"] for c in children),
+            "total_size_bytes": sum(c["total_size_bytes"] for c in children),
+        }
+
+    return dir_node(".")
+
+
+def module_kind(filename: str) -> str:
+    lowered = filename.lower()
+    if lowered.endswith((".server.lua", ".server.luau")):
+        return "ServerScript"
+    if lowered.endswith((".client.lua", ".client.luau")):
+        return "ClientScript"
+    return "ModuleScript"
+
+
+def api_group_for(rel_path: str) -> Optional[Tuple[str, str]]:
+    best: Optional[Tuple[str, str, str]] = None
+    for prefix, area, group in API_GROUP_RULES:
+        if rel_path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, area, group)
+    if best is None:
+        return None
+    prefix, area, group = best
+    if prefix == "ServerScriptService/GameServer/":
+        # Sub-folders of GameServer get their own "GameServer <Folder>" group.
+        remainder = rel_path[len(prefix):].split("/")
+        if len(remainder) > 1:
+            group = f"GameServer {remainder[0]}"
+    return area, group
+
+
+def build_api_index(records: Dict[str, FileRecord], generated_at: str) -> dict:
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    for rel_path in sorted(records):
+        if language_for(rel_path) != "Luau":
+            continue
+        placement = api_group_for(rel_path)
+        if placement is None:
+            continue
+        record = records[rel_path]
+        filename = rel_path.rsplit("/", 1)[-1]
+        name, _ = split_extension(filename)
+        doc_stem = rel_path[: -len(os.path.splitext(rel_path)[1])]
+        groups.setdefault(placement, []).append(
+            {
+                "name": name,
+                "source_path": rel_path,
+                "doc_path": f"docs/api/modules/{doc_stem}.md",
+                "kind": module_kind(filename),
+                "lines": record.lines,
+                "has_docstring": record.has_docstring,
+                "last_modified": record.last_modified,
+            }
+        )
+
+    areas = []
+    for area_name, description in API_AREAS:
+        area_groups = [
+            {"name": group, "modules": sorted(modules, key=lambda m: m["name"].lower())}
+            for (area, group), modules in groups.items()
+            if area == area_name
+        ]
+        if not area_groups:
+            continue
+        area_groups.sort(key=lambda g: g["name"].lower())
+        areas.append({"name": area_name, "description": description, "groups": area_groups})
+    return {"generated_at": generated_at, "areas": areas}
+
+
+def load_json_or_none(path: Path) -> Optional[dict]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_document(path: Path, doc: dict, previous: Optional[dict]) -> bool:
+    """Write ``doc`` unless only its ``generated_at`` stamp would differ."""
+
+    if previous is not None and "generated_at" in previous:
+        unchanged = {**doc, "generated_at": previous["generated_at"]}
+        if unchanged == previous:
+            doc = unchanged
+    return write_if_changed(path, json.dumps(doc, indent=2, ensure_ascii=False) + "\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    manifest_dir = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Regenerate the repository manifests")
+    parser.add_argument("--root", type=Path, default=manifest_dir.parent, help="Repository root to scan.")
+    parser.add_argument("--out", type=Path, default=manifest_dir, help="Directory to write manifests into.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--full", action="store_true", help="Ignore the stat cache and re-read every file.")
+    parser.add_argument("--no-split", action="store_true", help="Skip re-paginating repo_manifest.json.")
+    args = parser.parse_args(argv)
+
+    repo_root = args.root.resolve()
+    out_dir = args.out.resolve()
+    cache_path = out_dir / STAT_CACHE_FILENAME
+    toc_path = out_dir / TOC_FILENAME
+
+    manifest_path = out_dir / MANIFEST_FILENAME
+    previous_manifest = load_json_or_none(manifest_path)
+    previous_files = {
+        entry["path"]: entry
+        for entry in (previous_manifest or {}).get("files", [])
+        if isinstance(entry, dict) and isinstance(entry.get("path"), str)
+    }
+
+    cache = {} if args.full else load_stat_cache(cache_path)
+    stats = walk_tree(repo_root)
+    records, changed = scan_changed(repo_root, stats, cache, args.jobs, previous_files)
+
+    previous_dirs: Dict[str, dict] = {}
+    previous_toc = load_json_or_none(toc_path)
+    if cache and previous_toc is not None:
+        _index_toc_dirs(previous_toc, previous_dirs)
+    dirty = dirty_directories(changed)
+
+    generated_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    manifest_doc = build_manifest(records, generated_at, previous_files)
+    write_document(manifest_path, manifest_doc, previous_manifest)
+    write_document(toc_path, build_toc(records, dirty, previous_dirs), None)
+    api_path = out_dir / API_INDEX_FILENAME
+    api_doc = build_api_index(records, generated_at.split(".")[0] + "Z")
+    write_document(api_path, api_doc, load_json_or_none(api_path))
+    save_stat_cache(cache_path, records)
+
+    if not args.no_split:
+        manifest = split_manifest.load_manifest(manifest_path)
+        buffers = split_manifest.split_entries(manifest)
+        summaries = split_manifest.write_pages(manifest, buffers, out_dir / split_manifest.PAGE_DIRNAME)
+        split_manifest.write_index(manifest, summaries, out_dir / split_manifest.INDEX_FILENAME)
+
+    print(f"Scanned {len(records)} files ({len(changed)} changed since last run).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Query the generated manifests through an indexed SQLite cache.
+
+``dependencies.json``, ``api_index.json`` and ``repo_manifest.json`` are
+compiled into a single SQLite database (``.manifest_index.sqlite``) with
+secondary indexes on path, layer, kind and both ends of every ``requires``
+edge. The database stores the SHA-256 of each source JSON and is rebuilt
+automatically as soon as any of them changes, so queries never see stale data
+and never re-parse the JSON when nothing moved.
+
+Examples::
+
+    # Server ModuleScripts that require GameConfig (directly)
+    python manifest/query_manifest.py modules --layer server --kind ModuleScript --requires GameConfig
+
+    # Largest client scripts
+    python manifest/query_manifest.py modules --layer client --sort size --limit 5
+
+    # Everything RoundDirectorServer pulls in, transitively
+    python manifest/query_manifest.py deps RoundDirectorServer --transitive
+
+    # Who (transitively) depends on GameConfig
+    python manifest/query_manifest.py deps GameConfig --reverse --transitive
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from split_manifest import replacement_mode
+
+MANIFEST_DIR = Path(__file__).resolve().parent
+INDEX_FILENAME = ".manifest_index.sqlite"
+SOURCE_FILES = ("dependencies.json", "api_index.json", "repo_manifest.json")
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE modules (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    layer TEXT,
+    kind TEXT,
+    area TEXT,
+    grp TEXT,
+    language TEXT,
+    lines INTEGER,
+    size_bytes INTEGER,
+    has_docstring INTEGER,
+    last_modified TEXT,
+    description TEXT
+);
+CREATE TABLE requires (
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (src, dst)
+) WITHOUT ROWID;
+CREATE INDEX modules_name ON modules (name);
+CREATE INDEX modules_layer_kind ON modules (layer, kind);
+CREATE INDEX modules_kind ON modules (kind);
+CREATE INDEX modules_lines ON modules (lines);
+CREATE INDEX modules_size ON modules (size_bytes);
+CREATE INDEX requires_dst ON requires (dst, src);
+"""
+
+SORT_COLUMNS = {"path": "path", "lines": "lines DESC", "size": "size_bytes DESC", "name": "name"}
+
+
+def source_hashes(manifest_dir: Path) -> Dict[str, str]:
+    hashes: Dict[str, str] = {}
+    for filename in SOURCE_FILES:
+        path = manifest_dir / filename
+        try:
+            hashes[filename] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            hashes[filename] = ""
+    return hashes
+
+
+def _load(manifest_dir: Path, filename: str) -> dict:
+    path = manifest_dir / filename
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    return data if isinstance(data, dict) else {}
+
+
+def _module_name(path: str) -> str:
+    filename = path.rsplit("/", 1)[-1]
+    for suffix in (".server.lua", ".client.lua", ".server.luau", ".client.luau"):
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return os.path.splitext(filename)[0]
+
+
+def _kind_for(path: str) -> Optional[str]:
+    if path.endswith((".server.lua", ".server.luau")):
+        return "ServerScript"
+    if path.endswith((".client.lua", ".client.luau")):
+        return "ClientScript"
+    if path.endswith((".lua", ".luau")):
+        return "ModuleScript"
+    return None
+
+
+def build_index(db_path: Path, manifest_dir: Path, hashes: Dict[str, str]) -> None:
+    """Compile the source JSON files into a fresh SQLite database."""
+
+    # A private temp file per build, so concurrent rebuilds never share one.
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{db_path.name}.", suffix=".tmp", dir=db_path.parent)
+    os.close(fd)
+    conn: Optional[sqlite3.Connection] = None
+    try:
+        conn = sqlite3.connect(tmp_name)
+        conn.executescript(SCHEMA)
+        rows: Dict[str, dict] = {}
+
+        def row(path: str) -> dict:
+            return rows.setdefault(path, {"path": path, "name": _module_name(path), "kind": _kind_for(path)})
+
+        for entry in _load(manifest_dir, "repo_manifest.json").get("files", []):
+            target = row(entry["path"])
+            target.update(
+                language=entry.get("language"),
+                lines=entry.get("lines"),
+                size_bytes=entry.get("size_bytes"),
+                has_docstring=int(bool(entry.get("has_docstring"))),
+                last_modified=entry.get("last_modified"),
+            )
+        for area in _load(manifest_dir, "api_index.json").get("areas", []):
+            for group in area.get("groups", []):
+                for module in group.get("modules", []):
+                    target = row(module["source_path"])
+                    target.update(area=area.get("name"), grp=group.get("name"), kind=module.get("kind"))
+                    target.setdefault("lines", module.get("lines"))
+                    target.setdefault("language", "Luau")
+        edges: List[Tuple[str, str, str]] = []
+        for module in _load(manifest_dir, "dependencies.json").get("modules", []):
+            target = row(module["path"])
+            target.update(layer=module.get("layer"), description=module.get("description"))
+            target.setdefault("language", "Luau")
+            for key in ("requires", "dynamic_requires"):
+                for edge in module.get(key, []):
+                    if isinstance(edge, dict) and isinstance(edge.get("path"), str):
+                        edges.append((module["path"], edge["path"], edge.get("type", "direct")))
+
+        columns = (
+            "path", "name", "layer", "kind", "area", "grp", "language",
+            "lines", "size_bytes", "has_docstring", "last_modified", "description",
+        )
+        conn.executemany(
+            f"INSERT INTO modules ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(r.get(c) for c in columns) for r in rows.values()],
+        )
+        conn.executemany("INSERT OR IGNORE INTO requires (src, dst, type) VALUES (?, ?, ?)", edges)
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("schema", SCHEMA_VERSION)] + [(f"sha256:{name}", digest) for name, digest in hashes.items()],
+        )
+        conn.commit()
+        conn.close()
+        conn = None
+        os.chmod(tmp_name, replacement_mode(db_path))
+        os.replace(tmp_name, db_path)
+    except BaseException:
+        if conn is not None:
+            conn.close()
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def open_index(manifest_dir: Path = MANIFEST_DIR, *, force_rebuild: bool = False) -> sqlite3.Connection:
+    """Return a connection to an up-to-date index, rebuilding it if needed."""
+
+    db_path = manifest_dir / INDEX_FILENAME
+    hashes = source_hashes(manifest_dir)
+    expected = {("schema", SCHEMA_VERSION)} | {(f"sha256:{n}", d) for n, d in hashes.items()}
+    if not force_rebuild and db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            stored = set(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:
+            stored = set()
+        if stored == expected:
+            conn.row_factory = sqlite3.Row
+            return conn
+        conn.close()
+    build_index(db_path, manifest_dir, hashes)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def resolve_module(conn: sqlite3.Connection, term: str) -> str:
+    """Accept a full path, a path suffix or a bare module name."""
+
+    hit = conn.execute("SELECT path FROM modules WHERE path = ?", (term,)).fetchone()
+    if hit:
+        return hit[0]
+    matches = [r[0] for r in conn.execute("SELECT path FROM modules WHERE name = ?", (term,))]
+    if not matches:
+        matches = [r[0] for r in conn.execute("SELECT path FROM modules WHERE path LIKE ?", (f"%{term}",))]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise LookupError(f"No module matches '{term}'")
+    raise LookupError(f"'{term}' is ambiguous: {', '.join(sorted(matches))}")
+
+
+def dependency_closure(
+    conn: sqlite3.Connection, path: str, *, reverse: bool = False, transitive: bool = True
+) -> List[Tuple[str, int]]:
+    """Breadth-first walk over ``requires`` returning ``(path, depth)`` pairs.
+
+    Each level is a single indexed ``IN`` lookup (``src`` is the primary key
+    prefix, ``dst`` has its own index), and visited paths are never expanded
+    twice, so require cycles terminate.
+    """
+
+    start_col, next_col = ("dst", "src") if reverse else ("src", "dst")
+    seen: Dict[str, int] = {}
+    frontier = [path]
+    depth = 0
+    while frontier and (transitive or depth == 0):
+        depth += 1
+        placeholders = ", ".join("?" for _ in frontier)
+        rows = conn.execute(
+            f"SELECT DISTINCT {next_col} FROM requires WHERE {start_col} IN ({placeholders})",
+            frontier,
+        )
+        frontier = []
+        for (found,) in rows:
+            if found != path and found not in seen:
+                seen[found] = depth
+                frontier.append(found)
+    return sorted(seen.items(), key=lambda item: (item[1], item[0]))
+
+
+def query_modules(
+    conn: sqlite3.Connection,
+    *,
+    layer: Optional[str] = None,
+    kind: Optional[str] = None,
+    area: Optional[str] = None,
+    language: Optional[str] = None,
+    requires: Optional[str] = None,
+    requires_transitive: bool = False,
+    path_like: Optional[str] = None,
+    sort: str = "path",
+    limit: Optional[int] = None,
+) -> List[sqlite3.Row]:
+    clauses: List[str] = []
+    params: List[object] = []
+    for column, value in (("layer", layer), ("kind", kind), ("area", area), ("language", language)):
+        if value is not None:
+            clauses.append(f"m.{column} = ?")
+            params.append(value)
+    if path_like is not None:
+        clauses.append("m.path GLOB ?")
+        params.append(path_like)
+    if requires is not None:
+        target = resolve_module(conn, requires)
+        if requires_transitive:
+            dependents = [p for p, _ in dependency_closure(conn, target, reverse=True)]
+            clauses.append(f"m.path IN ({', '.join('?' for _ in dependents) or 'NULL'})")
+            params.extend(dependents)
+        else:
+            clauses.append("EXISTS (SELECT 1 FROM requires r WHERE r.src = m.path AND r.dst = ?)")
+            params.append(target)
+    sql = "SELECT m.* FROM modules m"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {SORT_COLUMNS[sort]}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return list(conn.execute(sql, params))
+
+
+def _print_rows(rows: Iterable[sqlite3.Row], columns: Sequence[str], as_json: bool) -> None:
+    materialized = [{c: r[c] for c in columns} for r in rows]
+    if as_json:
+        print(json.dumps(materialized, indent=2))
+        return
+    for item in materialized:
+        print("\t".join("" if item[c] is None else str(item[c]) for c in columns))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the repository manifests")
+    parser.add_argument("--manifest-dir", type=Path, default=MANIFEST_DIR)
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of tab-separated rows.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    modules = sub.add_parser("modules", help="Filter modules by metadata and require edges.")
+    modules.add_argument("--layer", choices=["client", "server", "shared"])
+    modules.add_argument("--kind", choices=["ModuleScript", "ServerScript", "ClientScript"])
+    modules.add_argument("--area")
+    modules.add_argument("--language")
+    modules.add_argument("--path", dest="path_like", help="Glob on the repository path.")
+    modules.add_argument("--requires", help="Only modules that require this module.")
+    modules.add_argument("--transitive", action="store_true", help="Make --requires transitive.")
+    modules.add_argument("--sort", choices=sorted(SORT_COLUMNS), default="path")
+    modules.add_argument("--limit", type=int)
+
+    deps = sub.add_parser("deps", help="List a module's dependencies (or dependents).")
+    deps.add_argument("module")
+    deps.add_argument("--reverse", action="store_true", help="List dependents instead.")
+    deps.add_argument("--transitive", action="store_true")
+
+    sql = sub.add_parser("sql", help="Run a read-only SQL query against the index.")
+    sql.add_argument("statement")
+
+    sub.add_parser("rebuild", help="Force a rebuild of the index.")
+
+    args = parser.parse_args(argv)
+    conn = open_index(args.manifest_dir.resolve(), force_rebuild=args.command == "rebuild")
+    try:
+        if args.command == "rebuild":
+            count = conn.execute("SELECT COUNT(*) FROM modules").fetchone()[0]
+            print(f"Indexed {count} modules.")
+        elif args.command == "modules":
+            rows = query_modules(
+                conn,
+                layer=args.layer,
+                kind=args.kind,
+                area=args.area,
+                language=args.language,
+                requires=args.requires,
+                requires_transitive=args.transitive,
+                path_like=args.path_like,
+                sort=args.sort,
+                limit=args.limit,
+            )
+            _print_rows(rows, ("path", "layer", "kind", "lines", "size_bytes"), args.json)
+        elif args.command == "deps":
+            target = resolve_module(conn, args.module)
+            closure = dependency_closure(conn, target, reverse=args.reverse, transitive=args.transitive)
+            if args.json:
+                print(json.dumps([{"path": p, "depth": d} for p, d in closure], indent=2))
+            else:
+                for path, depth in closure:
+                    print(f"{depth}\t{path}")
+        elif args.command == "sql":
+            conn.execute("PRAGMA query_only = ON")
+            cursor = conn.execute(args.statement)
+            columns = [d[0] for d in cursor.description or []]
+            _print_rows(cursor, columns, args.json)
+    except (LookupError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,13 +5,28 @@ This script enforces guardrails so each generated documentation file stays
 within ChatGPT-friendly limits (roughly <=5k lines or <=~2.5MB). It reads the
 existing ``repo_manifest.json`` and emits a paginated set of JSON files along
 with an index that describes the pages.
+
+Pages are content addressed: each one is only rewritten (atomically) when its
+SHA-256 changes, the hash is recorded in the index so consumers can re-fetch
+just the pages that moved, and pages left over from a longer previous run are
+deleted.
+
+``--stream`` paginates without ever holding the whole manifest: the ``files``
+array is decoded one entry at a time and at most one page of entries is kept in
+memory. The page boundaries it picks are identical to the in-memory mode, so
+both produce byte-for-byte the same pages and index.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
+import re
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
 
 MAX_LINES = 5000
 # 2.5 MiB guardrail (roughly 2–3 MB window mentioned in requirements).
@@ -20,6 +35,9 @@ PAGE_DIRNAME = "repo_manifest_pages"
 PAGE_FILENAME_TEMPLATE = "repo_manifest_page_{page}.json"
 INDEX_FILENAME = "repo_manifest_index.json"
 SOURCE_MANIFEST = "repo_manifest.json"
+PAGE_FILENAME_RE = re.compile(r"^repo_manifest_page_(?P<page>\d+)\.json$")
+BASE_KEYS = ("repo_name", "generated_at", "total_files")
+STREAM_CHUNK_CHARS = 1 << 16
 
 
 @dataclass
@@ -66,12 +84,7 @@ def measure_document(doc: dict) -> tuple[int, int, str]:
 
 def split_entries(manifest: dict) -> list[PageBuffer]:
     files = manifest.get("files", [])
-    base_payload = {
-        key: manifest[key]
-        for key in ("repo_name", "generated_at", "total_files")
-        if key in manifest
-    }
-    base_payload["source_manifest"] = SOURCE_MANIFEST
+    base_payload = base_payload_for(manifest)
 
     buffers: list[PageBuffer] = []
     current = PageBuffer(start_index=0, entries=[])
@@ -104,18 +117,316 @@ def split_entries(manifest: dict) -> list[PageBuffer]:
     return buffers
 
 
-def write_pages(manifest: dict, buffers: list[PageBuffer], output_dir: Path) -> list[dict]:
-    base_payload = {
-        key: manifest[key]
-        for key in ("repo_name", "generated_at", "total_files")
-        if key in manifest
-    }
+class ManifestStream:
+    """Incrementally decode a manifest's top-level object from a text handle.
+
+    Values of top-level keys other than ``files`` are decoded whole (they are
+    small scalars); the ``files`` array is yielded element by element, so the
+    buffer only ever holds one chunk plus the entry being decoded.
+    """
+
+    def __init__(self, handle: TextIO, chunk_chars: int = STREAM_CHUNK_CHARS) -> None:
+        self.handle = handle
+        self.chunk_chars = chunk_chars
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of manifest")
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Malformed manifest: expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number (or literal) touching the end of the buffer may continue
+            # in the next chunk; only trust it once something follows it.
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+    def events(self) -> Iterator[Tuple[str, object]]:
+        """Yield ``("key", (name, value))`` and ``("entry", value)`` events."""
+
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed manifest: object keys must be strings")
+            self._expect(":")
+            if key == "files":
+                if self._peek() != "[":
+                    raise ValueError("Manifest is missing expected 'files' list")
+                self.pos += 1
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield "entry", self._value()
+                        if self._peek() == ",":
+                            self.pos += 1
+                            continue
+                        self._expect("]")
+                        break
+                yield "key", (key, None)
+            else:
+                yield "key", (key, self._value())
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("}")
+            return
+
+
+def stream_entries(manifest_path: Path) -> Iterator[dict]:
+    """Yield the ``files`` entries of ``manifest_path`` one at a time."""
+
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        for kind, payload in ManifestStream(handle).events():
+            if kind == "entry":
+                yield payload
+
+
+def load_manifest_header(manifest_path: Path) -> dict:
+    """Return the manifest's top-level keys without materialising ``files``.
+
+    ``files`` is reported as its entry count so callers can still size the
+    index; keys may appear before or after the array.
+    """
+
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+    header: dict = {}
+    count = 0
+    seen_files = False
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        for kind, payload in ManifestStream(handle).events():
+            if kind == "entry":
+                count += 1
+            else:
+                key, value = payload
+                if key == "files":
+                    seen_files = True
+                else:
+                    header[key] = value
+    if not seen_files:
+        raise ValueError("Manifest is missing expected 'files' list")
+    header["files"] = count
+    return header
+
+
+def base_payload_for(manifest: dict) -> dict:
+    base_payload = {key: manifest[key] for key in BASE_KEYS if key in manifest}
     base_payload["source_manifest"] = SOURCE_MANIFEST
+    return base_payload
+
+
+class PageSizer:
+    """Measure a growing page in O(1) per entry.
+
+    ``json.dumps(..., indent=2)`` renders each ``files`` element as its own
+    indent-2 dump shifted right by four spaces, one comma-terminated element
+    per line group, inside a bracketed block. Summing per-entry sizes onto the
+    rendered header therefore gives exactly what ``measure_document`` would
+    report for the full page, without re-serialising it for every candidate.
+    """
+
+    def __init__(self, base_payload: dict) -> None:
+        self.base_payload = base_payload
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.entry_bytes = 0
+        self.entry_newlines = 0
+
+    @staticmethod
+    def entry_size(entry: dict) -> tuple[int, int]:
+        text = json.dumps(entry, indent=2, ensure_ascii=False)
+        newlines = text.count("\n")
+        return len(text.encode("utf-8")) + 4 * (newlines + 1), newlines
+
+    def measure_with(self, entry_size: tuple[int, int], page: int, start: int, end: int) -> tuple[int, int]:
+        header = {
+            **self.base_payload,
+            "page": page,
+            "total_pages": 0,
+            "entry_start_index": start,
+            "entry_end_index": end,
+            "files": None,
+        }
+        header_text = json.dumps(header, indent=2, ensure_ascii=False)
+        count = self.count + 1
+        entry_bytes = self.entry_bytes + entry_size[0]
+        entry_newlines = self.entry_newlines + entry_size[1]
+        list_bytes = len("[\n") + entry_bytes + len(",\n") * (count - 1) + len("\n  ]")
+        list_newlines = 1 + entry_newlines + (count - 1) + 1
+        bytes_len = len(header_text.encode("utf-8")) - len("null") + list_bytes + 1
+        lines = header_text.count("\n") + list_newlines + 1
+        return lines, bytes_len
+
+    def add(self, entry_size: tuple[int, int]) -> None:
+        self.count += 1
+        self.entry_bytes += entry_size[0]
+        self.entry_newlines += entry_size[1]
+
+
+def plan_pages_streaming(manifest_path: Path, base_payload: dict) -> list[tuple[int, int]]:
+    """Return ``(start_index, entry_count)`` per page, mirroring ``split_entries``."""
+
+    plan: list[tuple[int, int]] = []
+    sizer = PageSizer(base_payload)
+    start = 0
+    for idx, entry in enumerate(stream_entries(manifest_path)):
+        if sizer.count == 0:
+            start = idx
+        size = PageSizer.entry_size(entry)
+        lines, bytes_len = sizer.measure_with(size, len(plan) + 1, start + 1, idx + 1)
+        exceeds_limits = lines > MAX_LINES or bytes_len > MAX_BYTES
+        if sizer.count and exceeds_limits:
+            plan.append((start, sizer.count))
+            sizer.reset()
+            start = idx
+        sizer.add(size)
+    if sizer.count:
+        plan.append((start, sizer.count))
+    return plan
+
+
+def iter_page_buffers(manifest_path: Path, plan: list[tuple[int, int]]) -> Iterator[PageBuffer]:
+    """Re-stream the manifest, materialising one planned page at a time."""
+
+    pages = iter(plan)
+    current: Optional[PageBuffer] = None
+    remaining = 0
+    for entry in stream_entries(manifest_path):
+        if current is None:
+            start, remaining = next(pages)
+            current = PageBuffer(start_index=start, entries=[])
+        current.entries.append(entry)
+        remaining -= 1
+        if remaining == 0:
+            yield current
+            current = None
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Path) -> Optional[str]:
+    try:
+        with path.open("rb") as handle:
+            return hashlib.sha256(handle.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def replacement_mode(path: Path) -> int:
+    """Permission bits for a file about to replace ``path``.
+
+    ``tempfile.mkstemp`` creates files as 0600, so the temporary file is given
+    the target's current mode, or the umask default for a new file, before it
+    is renamed into place.
+    """
+
+    try:
+        return path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace ``path`` with ``text`` unless the bytes already match.
+
+    The new content is written to a temporary file in the destination
+    directory and renamed over the target so readers never observe a partially
+    written page. Returns ``True`` when the file was (re)written.
+    """
+
+    if file_hash(path) == content_hash(text):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(text)
+        os.chmod(tmp_name, replacement_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+def remove_orphaned_pages(output_dir: Path, total_pages: int) -> list[Path]:
+    """Delete page files numbered beyond ``total_pages`` left by earlier runs."""
+
+    removed: list[Path] = []
+    if not output_dir.exists():
+        return removed
+    for path in sorted(output_dir.iterdir()):
+        match = PAGE_FILENAME_RE.match(path.name)
+        if match and int(match.group("page")) > total_pages:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def write_pages(
+    manifest: dict,
+    buffers: Iterable[PageBuffer],
+    output_dir: Path,
+    total_pages: Optional[int] = None,
+) -> list[dict]:
+    """Write each page buffer; ``buffers`` may be a lazy iterator when
+    ``total_pages`` is supplied up front (as the streaming mode does)."""
+
+    base_payload = base_payload_for(manifest)
 
     output_dir.mkdir(parents=True, exist_ok=True)
     page_summaries: list[dict] = []
 
-    total_pages = len(buffers)
+    if total_pages is None:
+        buffers = list(buffers)
+        total_pages = len(buffers)
     for page_number, buffer in enumerate(buffers, start=1):
         doc = buffer.as_document(base_payload, page_number, total_pages)
         lines, bytes_len, text = measure_document(doc)
@@ -125,7 +436,7 @@ def write_pages(manifest: dict, buffers: list[PageBuffer], output_dir: Path) ->
             )
         filename = PAGE_FILENAME_TEMPLATE.format(page=page_number)
         path = output_dir / filename
-        path.write_text(text, encoding="utf-8")
+        write_if_changed(path, text)
         page_summaries.append(
             {
                 "page": page_number,
@@ -135,18 +446,16 @@ def write_pages(manifest: dict, buffers: list[PageBuffer], output_dir: Path) ->
                 "entry_end_index": buffer.end_index + 1,
                 "lines": lines,
                 "bytes": bytes_len,
+                "sha256": content_hash(text),
             }
         )
 
+    remove_orphaned_pages(output_dir, total_pages)
     return page_summaries
 
 
-def write_index(manifest: dict, page_summaries: list[dict], index_path: Path) -> None:
-    index_doc = {
-        key: manifest[key]
-        for key in ("repo_name", "generated_at", "total_files")
-        if key in manifest
-    }
+def write_index(manifest: dict, page_summaries: list[dict], index_path: Path) -> bool:
+    index_doc = {key: manifest[key] for key in BASE_KEYS if key in manifest}
     index_doc.update(
         {
             "source_manifest": SOURCE_MANIFEST,
@@ -155,21 +464,55 @@ def write_index(manifest: dict, page_summaries: list[dict], index_path: Path) ->
             "pages": page_summaries,
         }
     )
-    index_path.write_text(
+    return write_if_changed(
+        index_path,
         json.dumps(index_doc, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
     )
 
 
-def main() -> None:
+def paginate_streaming(manifest_path: Path, output_dir: Path, index_path: Path) -> list[dict]:
+    """Paginate ``manifest_path`` with memory bounded by a single page.
+
+    Runs three sequential passes over the file (header, page plan, write) and
+    yields output identical to ``split_entries`` + ``write_pages``.
+    """
+
+    header = load_manifest_header(manifest_path)
+    plan = plan_pages_streaming(manifest_path, base_payload_for(header))
+    summaries = write_pages(
+        header,
+        iter_page_buffers(manifest_path, plan),
+        output_dir,
+        total_pages=len(plan),
+    )
+    write_index(header, summaries, index_path)
+    return summaries
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Decode the files array incrementally instead of loading the whole manifest",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
     repo_root = Path(__file__).resolve().parent
     manifest_path = repo_root / SOURCE_MANIFEST
-    manifest = load_manifest(manifest_path)
+    output_dir = repo_root / PAGE_DIRNAME
+    index_path = repo_root / INDEX_FILENAME
+
+    if args.stream:
+        paginate_streaming(manifest_path, output_dir, index_path)
+        return
 
+    manifest = load_manifest(manifest_path)
     buffers = split_entries(manifest)
-    output_dir = repo_root / PAGE_DIRNAME
     page_summaries = write_pages(manifest, buffers, output_dir)
-    index_path = repo_root / INDEX_FILENAME
     write_index(manifest, page_summaries, index_path)
 
 
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""List the scripts affected by a change: the changed files plus everything that requires them.
+
+Changed paths come from ``git diff --name-only REF`` (plus untracked files)
+with ``--since REF``, or from the positional arguments. The reverse
+require-closure is read from the SQLite index that ``manifest/query_manifest.py``
+keeps over ``manifest/dependencies.json``. That index is rebuilt only when the
+JSON changes, so a lookup costs one indexed query per require depth. It walks
+both ``requires`` and the ``dynamic_requires`` paths, including curated ones.
+A changed file that matches a curated ``{"pattern": "Folder/**"}`` entry
+selects the module that declares the pattern, plus that module's dependents.
+
+The committed graph is enough even when the changed files' own ``require``
+lines moved. A new edge out of a changed file only marks that file as a
+dependent, and it is in the result already. Edges added elsewhere since the
+graph was last regenerated would be missed, so the graph is first compared
+with the tree: when they disagree, every script is selected with a warning,
+or the command fails under ``--strict``. Changes to ``default.project.json``
+remap every script, so they also select the whole tree.
+
+The selection can be fed to the other tools:
+
+* ``--bundle FILE`` writes a ``[{"path", "content"}]`` bundle for
+  ``luau_syntax_checker.py`` and ``task2_auto_fix.py --bundle``;
+* ``--check`` runs the syntax checker over the selection;
+* ``--lint`` runs ``hot_path_lint.py`` over the selection;
+* ``--docs`` prints the ``docs/api/modules`` pages of the selection, mapped
+  the way ``manifest/generate_api_docs.py`` names them.
+
+Usage::
+
+    python tools/affected_scripts.py --since origin/main [--check] [--lint] [--bundle affected.json] [--strict]
+    python tools/affected_scripts.py ReplicatedStorage/Shared/Config/GameConfig.lua
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from hot_path_lint import Estimate, lint
+from luau_syntax_checker import analyze_script
+from rojo_project import PROJECT_FILENAME, is_luau_file, normalise_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_DIR = REPO_ROOT / "manifest"
+if str(MANIFEST_DIR) not in sys.path:
+    sys.path.append(str(MANIFEST_DIR))
+from generate_api_docs import page_for  # noqa: E402
+from generate_dependencies import (  # noqa: E402
+    CACHE_FILENAME,
+    DEPENDENCIES_FILENAME,
+    build_module_entries,
+    curated_entries,
+    extract_scripts,
+    load_cache,
+    load_project_index,
+)
+from generate_manifest import api_group_for, language_for, load_json_or_none  # noqa: E402
+from query_manifest import dependency_closure, open_index  # noqa: E402
+
+DOCS_PREFIX = "docs/api/"
+
+
+class SelectionError(RuntimeError):
+    """Raised when the changed paths cannot be determined."""
+
+
+@dataclass
+class Selection:
+    """Affected scripts keyed by path, with the changed script that pulled each one in."""
+
+    changed: List[str]
+    scripts: Dict[str, int] = field(default_factory=dict)  # path -> require depth from a changed file
+    reasons: Dict[str, str] = field(default_factory=dict)  # path -> changed path it depends on
+    removed: List[str] = field(default_factory=list)
+
+
+def git_changed_paths(root: Path, ref: str) -> List[str]:
+    """Paths that differ between ``ref`` and the working tree, plus untracked files."""
+
+    commands = (
+        ["git", "diff", "--name-only", ref, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    )
+    paths: List[str] = []
+    for command in commands:
+        try:
+            result = subprocess.run(command, cwd=root, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            detail = getattr(exc, "stderr", "") or str(exc)
+            raise SelectionError(f"{' '.join(command[:2])} failed: {detail.strip()}") from exc
+        paths.extend(line.strip() for line in result.stdout.splitlines() if line.strip())
+    return sorted(set(paths))
+
+
+def relative_paths(root: Path, paths: Sequence[str]) -> List[str]:
+    relative = []
+    for path in paths:
+        candidate = Path(path)
+        if candidate.is_absolute():
+            try:
+                candidate = candidate.resolve().relative_to(root)
+            except ValueError:
+                continue
+        relative.append(normalise_path(candidate.as_posix()))
+    return sorted(set(relative))
+
+
+def stale_scripts(root: Path, manifest_dir: Path = MANIFEST_DIR) -> List[str]:
+    """Scripts whose require edges in the tree differ from ``dependencies.json``.
+
+    Uses the same extraction as ``generate_dependencies.py`` and its cache, read
+    only, so unchanged files are not re-lexed.
+    """
+
+    committed = load_json_or_none(manifest_dir / DEPENDENCIES_FILENAME) or {}
+    modules = {m.get("path"): m for m in committed.get("modules", []) if isinstance(m, dict)}
+    index = load_project_index(root)
+    scripts = {rel: inst for inst, rel in index.items()}
+    cached_files, _, _ = load_cache(manifest_dir / CACHE_FILENAME)
+    files, _ = extract_scripts(root, scripts, cached_files)
+    curated = {path: curated_entries(module) for path, module in modules.items()}
+    _, _, graph = build_module_entries(scripts, files, index, curated)
+    stale = []
+    for path in sorted(set(graph) | set(modules)):
+        module = modules.get(path, {})
+        edges = module.get("requires", []) + module.get("dynamic_requires", [])
+        recorded = {edge.get("path") for edge in edges if isinstance(edge, dict) and edge.get("path") in scripts}
+        if path not in graph or path not in modules or set(graph[path]) != recorded:
+            stale.append(path)
+    return stale
+
+
+def pattern_owners(manifest_dir: Path = MANIFEST_DIR) -> List[Tuple[str, str]]:
+    """``(pattern, module path)`` for every curated ``dynamic_requires`` glob."""
+
+    data = load_json_or_none(manifest_dir / DEPENDENCIES_FILENAME) or {}
+    return [
+        (entry["pattern"], module["path"])
+        for module in data.get("modules", [])
+        for entry in module.get("dynamic_requires", [])
+        if isinstance(entry, dict) and isinstance(entry.get("pattern"), str)
+    ]
+
+
+def select(
+    root: Path, changed: Sequence[str], manifest_dir: Path = MANIFEST_DIR, select_all: bool = False
+) -> Selection:
+    """The changed Luau files and their transitive dependents (every script with ``select_all``)."""
+
+    selection = Selection(changed=list(changed))
+    owners = pattern_owners(manifest_dir)
+    conn = open_index(manifest_dir)
+
+    def add(path: str, depth: int, reason: str) -> None:
+        if depth < selection.scripts.get(path, depth + 1):
+            selection.scripts[path] = depth
+            selection.reasons[path] = reason
+
+    try:
+        known = {row[0] for row in conn.execute("SELECT DISTINCT path FROM modules WHERE kind IS NOT NULL")}
+        if select_all or PROJECT_FILENAME in changed:
+            reason = PROJECT_FILENAME if PROJECT_FILENAME in changed else DEPENDENCIES_FILENAME
+            for path in sorted(known):
+                add(path, 0, reason)
+        for path in changed:
+            seeds = [owner for pattern, owner in owners if fnmatch.fnmatchcase(path, pattern)]
+            if is_luau_file(path):
+                if not (root / path).exists():
+                    selection.removed.append(path)
+                else:
+                    add(path, 0, path)
+                seeds.insert(0, path)
+            for seed in seeds:
+                offset = 0 if seed == path else 1
+                if offset:
+                    add(seed, offset, path)
+                for dependent, depth in dependency_closure(conn, seed, reverse=True):
+                    add(dependent, depth + offset, path)
+    finally:
+        conn.close()
+    for path in list(selection.scripts):
+        if not (root / path).exists():
+            del selection.scripts[path]
+            del selection.reasons[path]
+    return selection
+
+
+def write_bundle(root: Path, paths: Sequence[str], out_path: Path) -> None:
+    bundle = [{"path": path, "content": (root / path).read_text(encoding="utf-8")} for path in paths]
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as handle:
+        json.dump(bundle, handle, indent=2)
+        handle.write("\n")
+
+
+def check(root: Path, paths: Sequence[str]) -> List[dict]:
+    diagnostics = []
+    for path in paths:
+        result = analyze_script(path, (root / path).read_text(encoding="utf-8"))
+        if result is not None:
+            diagnostics.append(result)
+    return diagnostics
+
+
+def doc_pages(paths: Sequence[str]) -> List[str]:
+    """API pages of ``paths``, named from the tree so a stale ``api_index.json`` cannot hide one."""
+
+    return sorted(
+        DOCS_PREFIX + page_for(path)
+        for path in paths
+        if language_for(path) == "Luau" and api_group_for(path) is not None
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Changed paths (relative to the repository root)")
+    parser.add_argument("--since", metavar="REF", help="Use the paths changed since this git ref")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--bundle", type=Path, help="Write the selected scripts as a checker/fixer bundle")
+    parser.add_argument("--check", action="store_true", help="Run the Luau syntax checker over the selection")
+    parser.add_argument("--lint", action="store_true", help="Run the hot-path linter over the selection")
+    parser.add_argument("--docs", action="store_true", help="List the API doc pages of the selection")
+    parser.add_argument(
+        "--strict", action="store_true", help="Fail instead of selecting every script when the graph is stale"
+    )
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    if not args.since and not args.paths:
+        print("error: pass changed paths or --since REF", file=sys.stderr)
+        return 1
+    try:
+        changed = relative_paths(root, args.paths)
+        if args.since:
+            changed = sorted(set(changed) | set(git_changed_paths(root, args.since)))
+    except SelectionError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    stale = stale_scripts(root)
+    if stale:
+        shown = ", ".join(stale[:3]) + (", ..." if len(stale) > 3 else "")
+        level = "error" if args.strict else "warning"
+        print(
+            f"{level}: manifest/{DEPENDENCIES_FILENAME} is out of date for {len(stale)} script(s) ({shown}); "
+            "run python manifest/generate_dependencies.py",
+            file=sys.stderr,
+        )
+        if args.strict:
+            return 1
+        print("warning: selecting every script", file=sys.stderr)
+    selection = select(root, changed, select_all=bool(stale))
+    paths = sorted(selection.scripts, key=lambda path: (selection.scripts[path], path))
+    if args.bundle:
+        write_bundle(root, paths, args.bundle)
+    diagnostics = check(root, paths) if args.check else []
+    findings, lint_errors = lint(root, paths, Estimate()) if args.lint else ([], {})
+    docs = doc_pages(paths) if args.docs else []
+
+    if args.json:
+        report: Dict[str, object] = {
+            "changed": selection.changed,
+            "removed": selection.removed,
+            "scripts": [
+                {"path": path, "depth": selection.scripts[path], "because": selection.reasons[path]} for path in paths
+            ],
+        }
+        if args.check:
+            report["diagnostics"] = diagnostics
+        if args.lint:
+            report["findings"] = [vars(finding) for finding in findings]
+            report["lint_errors"] = lint_errors
+        if args.docs:
+            report["docs"] = docs
+        print(json.dumps(report, indent=2))
+    else:
+        for path in paths:
+            depth = selection.scripts[path]
+            reason = selection.reasons[path]
+            if depth:
+                note = f"requires {reason} (depth {depth})"
+            else:
+                note = "changed" if reason == path else f"selected by {reason}"
+            print(f"{path}  # {note}")
+        for path in selection.removed:
+            print(f"{path}  # removed")
+        for diagnostic in diagnostics:
+            print(f"error: {diagnostic['path']}:{diagnostic['line']}: {diagnostic['message']}", file=sys.stderr)
+        for finding in findings:
+            print(f"lint: {finding.path}:{finding.line}: [{finding.rule}] {finding.message}")
+        for page in docs:
+            print(f"doc: {page}")
+        print(f"{len(paths)} affected script(s) from {len(selection.changed)} changed path(s)")
+    return 1 if diagnostics or lint_errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
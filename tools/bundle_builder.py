@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Build the Luau script bundle deterministically, reusing unchanged entries.
+
+The bundle is the ``[{"path", "content"}, ...]`` JSON that
+``luau_syntax_checker.py`` and ``task2_auto_fix.py`` read. This builder walks
+the scripts mapped by ``default.project.json`` in sorted path order and streams
+one entry per line straight to disk::
+
+    [
+    {"path": "...", "sha256": "...", "bytes": 1234, "lines": 56, "content": "..."},
+    ...
+    ]
+
+``sha256`` and ``bytes`` describe the UTF-8 source, and ``lines`` counts lines
+the way ``manifest/generate_manifest.py`` does. Because every entry sits on
+one line with a fixed key order, the previous bundle can be indexed by
+reading only the ``path``/``sha256`` prefix of each line. Entries whose hash
+is unchanged are then copied from it by byte offset instead of being
+re-encoded. The output goes to a temporary file that is renamed over the
+bundle, and the file is not touched at all when nothing changed.
+
+Usage::
+
+    python tools/bundle_builder.py [--out FruitSmash_lua_bundle.json] [--full]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from rojo_project import ProjectTree
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_DIR = REPO_ROOT / "manifest"
+if str(MANIFEST_DIR) not in sys.path:
+    sys.path.append(str(MANIFEST_DIR))
+from split_manifest import replacement_mode  # noqa: E402
+
+DEFAULT_BUNDLE = REPO_ROOT / "FruitSmash_lua_bundle.json"
+ENTRY_PREFIX = b'{"path": '
+# Prefix bytes decoded to find an entry's path and hash; longer paths fall back to encoding.
+PREFIX_WINDOW = 1024
+COPY_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class PreviousEntry:
+    offset: int
+    length: int
+    sha256: str
+
+
+@dataclass
+class BuildStats:
+    entries: int = 0
+    copied: int = 0
+    encoded: int = 0
+    written: bool = False
+
+
+def count_lines(data: bytes) -> int:
+    lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+def encode_entry(path: str, data: bytes) -> bytes:
+    entry = {
+        "path": path,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "bytes": len(data),
+        "lines": count_lines(data),
+        "content": data.decode("utf-8"),
+    }
+    return json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+
+def _entry_head(line: bytes) -> Optional[Tuple[str, str]]:
+    """``(path, sha256)`` from the start of an entry line, without decoding its content."""
+
+    if not line.startswith(ENTRY_PREFIX):
+        return None
+    head = line[:PREFIX_WINDOW].decode("utf-8", errors="ignore")
+    decoder = json.JSONDecoder()
+    try:
+        path, cursor = decoder.raw_decode(head, len(ENTRY_PREFIX))
+        marker = ', "sha256": '
+        if not head.startswith(marker, cursor):
+            return None
+        sha256, _ = decoder.raw_decode(head, cursor + len(marker))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(path, str) or not isinstance(sha256, str) or len(sha256) != 64:
+        return None
+    return path, sha256
+
+
+def index_bundle(bundle_path: Path) -> Tuple[Dict[str, PreviousEntry], List[str]]:
+    """Byte ranges of the entries of a bundle written by this tool, and their order.
+
+    Lines that do not look like entries are ignored, so a bundle built
+    elsewhere simply yields no reusable entries.
+    """
+
+    entries: Dict[str, PreviousEntry] = {}
+    order: List[str] = []
+    try:
+        handle = bundle_path.open("rb")
+    except OSError:
+        return entries, order
+    with handle:
+        offset = 0
+        for line in handle:
+            head = _entry_head(line)
+            if head is not None:
+                body = line.rstrip(b"\r\n")
+                if body.endswith(b","):
+                    body = body[:-1]
+                entries[head[0]] = PreviousEntry(offset, len(body), head[1])
+                order.append(head[0])
+            offset += len(line)
+    return entries, order
+
+
+def script_paths(root: Path) -> List[str]:
+    return sorted(set(ProjectTree(root).script_index().values()))
+
+
+def _copy_range(source: BinaryIO, target: BinaryIO, offset: int, length: int) -> None:
+    source.seek(offset)
+    while length > 0:
+        chunk = source.read(min(COPY_CHUNK, length))
+        if not chunk:
+            raise OSError("previous bundle ended early")
+        target.write(chunk)
+        length -= len(chunk)
+
+
+def build_bundle(root: Path, out_path: Path, full: bool = False) -> BuildStats:
+    """Write the bundle for every synced script under ``root`` to ``out_path``."""
+
+    paths = script_paths(root)
+    previous, previous_order = ({}, []) if full else index_bundle(out_path)
+    sources: List[Tuple[str, bytes, str]] = []
+    for path in paths:
+        data = (root / path).read_bytes()
+        sources.append((path, data, hashlib.sha256(data).hexdigest()))
+
+    stats = BuildStats(entries=len(sources))
+    unchanged = previous_order == paths and all(
+        previous[path].sha256 == digest for path, _, digest in sources
+    )
+    if unchanged and not full:
+        stats.copied = len(sources)
+        return stats
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{out_path.name}.", suffix=".tmp", dir=out_path.parent)
+    old: Optional[BinaryIO] = None
+    try:
+        if previous:
+            old = out_path.open("rb")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(b"[\n")
+            for position, (path, data, digest) in enumerate(sources):
+                reuse = previous.get(path)
+                if old is not None and reuse is not None and reuse.sha256 == digest:
+                    _copy_range(old, handle, reuse.offset, reuse.length)
+                    stats.copied += 1
+                else:
+                    handle.write(encode_entry(path, data))
+                    stats.encoded += 1
+                handle.write(b",\n" if position + 1 < len(sources) else b"\n")
+            handle.write(b"]\n")
+        if old is not None:
+            old.close()
+            old = None
+        # mkstemp creates the file 0600; keep the bundle's mode or use the umask default.
+        os.chmod(tmp_name, replacement_mode(out_path))
+        os.replace(tmp_name, out_path)
+    except BaseException:
+        if old is not None:
+            old.close()
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    stats.written = True
+    return stats
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--out", type=Path, default=DEFAULT_BUNDLE, help="Bundle to write (default: %(default)s)")
+    parser.add_argument("--full", action="store_true", help="Re-encode every entry instead of reusing the old bundle")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    try:
+        stats = build_bundle(root, args.out, full=args.full)
+    except (OSError, UnicodeDecodeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if stats.written:
+        print(f"Wrote {stats.entries} scripts to {args.out} ({stats.copied} reused, {stats.encoded} encoded).")
+    else:
+        print(f"{args.out} is up to date ({stats.entries} scripts).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
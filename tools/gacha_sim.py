@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Simulate melee gacha spins and shop purchases for a large player population.
+
+Odds, the spin cap and prices come straight from ``ShopConfig`` (``Gacha`` and
+``Items``); coin income per level comes from the ``GameConfig.Economy`` clear
+bonus bands. Each simulated player plays ``--levels-per-day`` levels a day.
+After every level they:
+
+1. spin the gacha up to ``SpinsPerLevelCap`` times, like ``MeleeGachaServer``
+   (``Nothing``, unknown items and already-owned weapons are whiffs);
+2. earn the wave and level clear bonuses plus ``--fruit-coins-per-level``;
+3. buy the cheapest melee weapon they do not own yet as soon as they can
+   afford it, then any ``--consumable`` items, once each per level.
+
+Players are simulated as NumPy arrays in chunks spread across processes. The
+report answers "how many spins until a player gets weapon X" (percentiles of
+spins and levels) and "coins spent per 1,000 players per day".
+
+Usage::
+
+    python tools/gacha_sim.py [--players 1000000] [--days 7] [--levels-per-day 20] [--consumable RepairKit] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from luau_config import ConfigError, load_config
+from telemetry_logs import map_shards
+from wave_sim import DEFAULT_WAVES_PER_LEVEL
+from weighted_sampler import NONE, AliasTable, entry_weights
+
+MELEE_KIND = "Melee"
+
+DEFAULT_PLAYERS = 1_000_000
+DEFAULT_DAYS = 7
+DEFAULT_LEVELS_PER_DAY = 20
+DEFAULT_FRUIT_COINS = 150
+DEFAULT_SEED = 1
+CHUNK_PLAYERS = 100_000
+PERCENTILES = (50, 90, 99)
+
+
+class SimulationError(ValueError):
+    """Raised when the shop or economy config cannot drive the simulation."""
+
+
+def outcome_shares(weights: Sequence[float]) -> List[float]:
+    """Exact outcome probabilities of ``MeleeGachaServer.resolveOutcome``.
+
+    Unlike ``WeightedTable.Pick`` the server sums every weight, negative ones
+    included, rolls ``NextNumber() * total`` and returns the first entry whose
+    running total reaches the roll, falling back to the last entry. For
+    non-negative weights this is the plain weighted choice.
+    """
+
+    total = float(sum(weights))
+    if not weights or total <= 0:
+        return [0.0] * len(weights)
+    shares = [0.0] * len(weights)
+    covered = 0.0
+    cumulative = 0.0
+    for index, weight in enumerate(weights):
+        cumulative += weight
+        reach = min(cumulative, total)
+        if reach > covered:
+            shares[index] = (reach - covered) / total
+            covered = reach
+    shares[-1] += (total - covered) / total
+    return shares
+
+
+@dataclass(frozen=True)
+class ShopModel:
+    """Gacha odds, prices and income per level for one simulation."""
+
+    outcome_ids: Tuple[str, ...]
+    outcome_shares: Tuple[float, ...]
+    spins_per_level: int
+    item_ids: Tuple[str, ...]
+    prices: Tuple[float, ...]
+    wishlist: Tuple[int, ...]
+    consumables: Tuple[int, ...]
+    income: Tuple[float, ...]
+
+    def outcome_items(self) -> np.ndarray:
+        """Item index per gacha outcome; ``NONE`` for whiffs and unknown items."""
+
+        index = {item_id: position for position, item_id in enumerate(self.item_ids)}
+        return np.array([index.get(outcome, NONE) for outcome in self.outcome_ids], dtype=np.int64)
+
+
+def bonus_coins(bands: Any, level: int) -> float:
+    """Coins from a ``{ Bands = {...} }`` bonus table at ``level``."""
+
+    selected = None
+    for band in bands.get("Bands", []) if isinstance(bands, dict) else []:
+        if isinstance(band, dict) and level >= band.get("MinLevel", 1):
+            if selected is None or band.get("MinLevel", 1) >= selected.get("MinLevel", 1):
+                selected = band
+    if selected is None:
+        return 0.0
+    return max(float(selected.get("Base", 0)), 0.0) + max(float(selected.get("PerLevel", 0)), 0.0) * max(level, 0)
+
+
+def build_model(
+    levels: int,
+    fruit_coins: float,
+    consumables: Sequence[str],
+    spins_per_level: Optional[int] = None,
+) -> ShopModel:
+    shop = load_config("ShopConfig").exports
+    game = load_config("GameConfig").exports
+    items = shop.get("Items") if isinstance(shop, dict) else None
+    gacha = shop.get("Gacha") if isinstance(shop, dict) else None
+    if not isinstance(items, dict) or not isinstance(gacha, dict) or not isinstance(gacha.get("Table"), list):
+        raise SimulationError("ShopConfig.Items or ShopConfig.Gacha.Table could not be evaluated")
+
+    table = gacha["Table"]
+    outcome_ids = tuple(str(entry.get("ItemId")) if isinstance(entry, dict) else "" for entry in table)
+    shares = outcome_shares(entry_weights(table))
+    if sum(shares) <= 0:
+        raise SimulationError("ShopConfig.Gacha.Table has no positive total weight")
+
+    cap = gacha.get("SpinsPerLevelCap") or 0
+    if spins_per_level is None:
+        spins_per_level = int(cap) if cap > 0 else 1
+    elif cap > 0:
+        spins_per_level = min(spins_per_level, int(cap))
+
+    item_ids = tuple(sorted(items))
+    prices = tuple(float(items[item_id].get("PriceCoins") or 0) for item_id in item_ids)
+    melee = [index for index, item_id in enumerate(item_ids) if items[item_id].get("Kind") == MELEE_KIND]
+    wishlist = tuple(sorted(melee, key=lambda index: (prices[index], item_ids[index])))
+    unknown = [item_id for item_id in consumables if item_id not in items]
+    if unknown:
+        raise SimulationError(f"unknown ShopConfig item(s): {', '.join(unknown)}")
+
+    economy = game.get("Economy") or {}
+    rounds = game.get("Rounds") or {}
+    waves = int(rounds.get("WavesPerLevel") or DEFAULT_WAVES_PER_LEVEL)
+    income = tuple(
+        bonus_coins(economy.get("LevelClearBonus"), level)
+        + waves * bonus_coins(economy.get("WaveClearBonus"), level)
+        + fruit_coins
+        for level in range(1, levels + 1)
+    )
+    return ShopModel(
+        outcome_ids=outcome_ids,
+        outcome_shares=tuple(shares),
+        spins_per_level=spins_per_level,
+        item_ids=item_ids,
+        prices=prices,
+        wishlist=wishlist,
+        consumables=tuple(item_ids.index(item_id) for item_id in consumables),
+        income=income,
+    )
+
+
+# -- simulation ------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Chunk:
+    model: ShopModel
+    players: int
+    days: int
+    levels_per_day: int
+    seed: Tuple[int, int]
+
+
+@dataclass
+class ChunkResult:
+    first_spin: np.ndarray  # (players, items): spins until the item first came up, -1 if never
+    via_gacha: np.ndarray  # (players, items): owned because the gacha granted it
+    owned_level: np.ndarray  # (players, items): level when first owned, -1 if never
+    daily_spend: np.ndarray  # (players, days)
+    item_spend: np.ndarray  # (items,) coins per item over the whole run
+    item_wins: np.ndarray  # (items,) gacha wins per item
+    whiffs: int
+    spins: int
+
+
+def simulate_chunk(chunk: Chunk) -> ChunkResult:
+    model, players = chunk.model, chunk.players
+    rng = np.random.default_rng(list(chunk.seed))
+    items = len(model.item_ids)
+    prices = np.array(model.prices)
+    outcomes = AliasTable.build(model.outcome_shares)
+    outcome_items = model.outcome_items()
+
+    owned = np.zeros((players, items), dtype=bool)
+    first_spin = np.full((players, items), -1, dtype=np.int32)
+    via_gacha = np.zeros((players, items), dtype=bool)
+    owned_level = np.full((players, items), -1, dtype=np.int32)
+    coins = np.zeros(players)
+    daily_spend = np.zeros((players, chunk.days))
+    item_spend = np.zeros(items)
+    item_wins = np.zeros(items, dtype=np.int64)
+    rows = np.arange(players)
+    whiffs = 0
+
+    for level in range(1, chunk.days * chunk.levels_per_day + 1):
+        day = (level - 1) // chunk.levels_per_day
+        spins = outcomes.sample((players, model.spins_per_level), rng)
+        for spin in range(model.spins_per_level):
+            won = outcome_items[spins[:, spin]]
+            valid = won != NONE
+            hit = rows[valid]
+            item = won[valid]
+            first = first_spin[hit, item] < 0
+            first_spin[hit[first], item[first]] = (level - 1) * model.spins_per_level + spin + 1
+            # Already-owned weapons are whiffs (ApplyMeleeToInventory -> AlreadyOwned).
+            fresh = ~owned[hit, item]
+            hit, item = hit[fresh], item[fresh]
+            owned[hit, item] = True
+            via_gacha[hit, item] = True
+            owned_level[hit, item] = level
+            item_wins += np.bincount(item, minlength=items)
+            whiffs += players - hit.size
+
+        coins += model.income[level - 1]
+        # Save for the cheapest missing weapon; never skip ahead in the list.
+        waiting = np.ones(players, dtype=bool)
+        for item in model.wishlist:
+            buy = waiting & ~owned[:, item] & (coins >= prices[item])
+            waiting &= owned[:, item] | buy
+            coins[buy] -= prices[item]
+            owned[buy, item] = True
+            owned_level[buy, item] = level
+            daily_spend[buy, day] += prices[item]
+            item_spend[item] += prices[item] * np.count_nonzero(buy)
+        for item in model.consumables:
+            buy = coins >= prices[item]
+            coins[buy] -= prices[item]
+            daily_spend[buy, day] += prices[item]
+            item_spend[item] += prices[item] * np.count_nonzero(buy)
+
+    total_spins = players * chunk.days * chunk.levels_per_day * model.spins_per_level
+    return ChunkResult(first_spin, via_gacha, owned_level, daily_spend, item_spend, item_wins, whiffs, total_spins)
+
+
+def simulate(
+    model: ShopModel,
+    players: int,
+    days: int,
+    levels_per_day: int,
+    seed: int,
+    jobs: Optional[int] = None,
+) -> ChunkResult:
+    sizes = [min(CHUNK_PLAYERS, players - start) for start in range(0, players, CHUNK_PLAYERS)]
+    chunks = [Chunk(model, size, days, levels_per_day, (seed, index)) for index, size in enumerate(sizes)]
+    results = list(map_shards(simulate_chunk, chunks, jobs))
+    return ChunkResult(
+        first_spin=np.concatenate([result.first_spin for result in results]),
+        via_gacha=np.concatenate([result.via_gacha for result in results]),
+        owned_level=np.concatenate([result.owned_level for result in results]),
+        daily_spend=np.concatenate([result.daily_spend for result in results]),
+        item_spend=sum(result.item_spend for result in results),
+        item_wins=sum(result.item_wins for result in results),
+        whiffs=sum(result.whiffs for result in results),
+        spins=sum(result.spins for result in results),
+    )
+
+
+# -- report ----------------------------------------------------------------------
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    """Percentiles over all players, counting ``-1`` (never) as above every value.
+
+    A percentile that falls among the players who never got there is ``None``.
+    """
+
+    ordered = np.sort(np.where(values < 0, np.iinfo(np.int32).max, values))
+    summary: Dict[str, Optional[float]] = {}
+    for percentile in PERCENTILES:
+        value = ordered[min(int(math.ceil(percentile / 100 * ordered.size)) - 1, ordered.size - 1)]
+        summary[f"p{percentile}"] = None if value == np.iinfo(np.int32).max else float(value)
+    return summary
+
+
+def summarise(model: ShopModel, result: ChunkResult, days: int) -> Dict[str, Any]:
+    players = result.first_spin.shape[0]
+    gacha_items = sorted({int(index) for index in model.outcome_items() if index != NONE})
+    weapons = []
+    for index in sorted(set(gacha_items) | set(model.wishlist), key=lambda index: model.prices[index]):
+        spins = result.first_spin[:, index]
+        weapons.append(
+            {
+                "item": model.item_ids[index],
+                "price": model.prices[index],
+                "spin_odds": sum(
+                    share for outcome, share in zip(model.outcome_ids, model.outcome_shares)
+                    if outcome == model.item_ids[index]
+                ),
+                "won_by_gacha": float(np.mean(result.via_gacha[:, index])),
+                "spins_until_rolled": _percentiles(spins) if index in gacha_items else None,
+                "owned": float(np.mean(result.owned_level[:, index] >= 0)),
+                "levels_until_owned": _percentiles(result.owned_level[:, index]),
+            }
+        )
+    collection = np.where(
+        (result.first_spin[:, gacha_items] >= 0).all(axis=1), result.first_spin[:, gacha_items].max(axis=1), -1
+    ) if gacha_items else np.full(players, -1)
+    per_day = result.daily_spend.sum(axis=0) / players * 1000
+    spenders = result.daily_spend.sum(axis=1)
+    return {
+        "players": players,
+        "days": days,
+        "spins": result.spins,
+        "whiff_rate": result.whiffs / max(result.spins, 1),
+        "weapons": weapons,
+        "spins_until_full_collection": _percentiles(collection),
+        "coins_per_1000_players_per_day": [float(value) for value in per_day],
+        "coins_per_player_total": {
+            "mean": float(spenders.mean()),
+            **{f"p{p}": float(np.percentile(spenders, p)) for p in PERCENTILES},
+        },
+        "coins_by_item": {
+            model.item_ids[index]: float(value) / players * 1000 / days
+            for index, value in enumerate(result.item_spend)
+            if value > 0
+        },
+    }
+
+
+def _cell(value: Optional[float]) -> str:
+    return "never" if value is None else f"{value:g}"
+
+
+def print_report(report: Dict[str, Any], levels_per_day: int) -> None:
+    print(
+        f"{report['players']:,} players, {report['days']} days x {levels_per_day} levels, "
+        f"{report['spins']:,} spins, whiff rate {report['whiff_rate']:.1%} (including duplicates)"
+    )
+    print()
+    header = "".join(f"{f'spins p{p}':>11}" for p in PERCENTILES) + "".join(f"{f'level p{p}':>11}" for p in PERCENTILES)
+    print(f"{'weapon':<12}{'price':>7}{'odds':>8}{'via gacha':>11}{'owned':>8}{header}")
+    for weapon in report["weapons"]:
+        spins = weapon["spins_until_rolled"] or {}
+        cells = "".join(f"{_cell(spins.get(f'p{p}')) if spins else '-':>11}" for p in PERCENTILES)
+        cells += "".join(f"{_cell(weapon['levels_until_owned'][f'p{p}']):>11}" for p in PERCENTILES)
+        print(
+            f"{weapon['item']:<12}{weapon['price']:>7g}{weapon['spin_odds']:>8.1%}"
+            f"{weapon['won_by_gacha']:>11.1%}{weapon['owned']:>8.1%}{cells}"
+        )
+    collection = report["spins_until_full_collection"]
+    cells = ", ".join(f"p{p} {_cell(collection[f'p{p}'])}" for p in PERCENTILES)
+    print(f"spins until every gacha weapon has come up: {cells}")
+    print()
+    print("coins spent per 1,000 players per day:")
+    for day, coins in enumerate(report["coins_per_1000_players_per_day"], start=1):
+        print(f"  day {day:<3}{coins:>14,.0f}")
+    for item_id, coins in sorted(report["coins_by_item"].items(), key=lambda pair: -pair[1]):
+        print(f"  {item_id:<20}{coins:>11,.0f} / day")
+    total = report["coins_per_player_total"]
+    print(
+        f"coins per player over {report['days']} days: mean {total['mean']:,.0f}, "
+        + ", ".join(f"p{p} {total[f'p{p}']:,.0f}" for p in PERCENTILES)
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help="Simulated players (default: 1000000)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Days per player (default: 7)")
+    parser.add_argument(
+        "--levels-per-day", type=int, default=DEFAULT_LEVELS_PER_DAY, help="Levels cleared per day (default: 20)"
+    )
+    parser.add_argument(
+        "--spins-per-level", type=int, default=None, help="Spins per level, capped by SpinsPerLevelCap (default: the cap)"
+    )
+    parser.add_argument(
+        "--fruit-coins-per-level",
+        type=float,
+        default=DEFAULT_FRUIT_COINS,
+        help="Coins from smashed fruit per level, on top of the clear bonuses (default: 150)",
+    )
+    parser.add_argument(
+        "--consumable", action="append", default=[], metavar="ITEM", help="Item bought once per level when affordable"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (default: 1)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if min(args.players, args.days, args.levels_per_day) < 1 or (
+        args.spins_per_level is not None and args.spins_per_level < 0
+    ):
+        print("error: --players, --days and --levels-per-day must be >= 1, --spins-per-level >= 0", file=sys.stderr)
+        return 1
+    try:
+        model = build_model(
+            args.days * args.levels_per_day, args.fruit_coins_per_level, args.consumable, args.spins_per_level
+        )
+    except (ConfigError, SimulationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    result = simulate(model, args.players, args.days, args.levels_per_day, args.seed, args.jobs)
+    report = summarise(model, result, args.days)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.levels_per_day)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
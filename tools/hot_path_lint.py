@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""Lint per-frame callbacks for costly calls and rank findings by call frequency.
+
+Roots are callbacks bound to per-frame signals, ``RunService.Heartbeat``,
+``RenderStepped``, ``Stepped``, ``PreRender``, ``PreAnimation``,
+``PreSimulation`` and ``PostSimulation``, through ``:Connect`` or
+``:ConnectParallel``, plus ``RunService:BindToRenderStep``. The callback is
+either an inline ``function`` or a file-local function name. Rules run over
+its body and, transitively, over every file-local function it calls
+(``local function f``, ``function M.f``/``M:f``, ``local f = function``).
+
+Each finding gets an estimated rate in calls per second:
+
+* a per-frame signal fires ``--fps`` times a second;
+* a connection made inside a function and not stored in a module-level local
+  (``ProjectileMotionServer.Bind``) is assumed to be live ``--instances``
+  times at once;
+* every enclosing ``for``/``while``/``repeat`` multiplies by
+  ``--loop-iterations``;
+* an early ``if <clock> - last < INTERVAL then return end`` guard caps the
+  rest of the body at ``1 / INTERVAL``. ``INTERVAL`` is a number or a literal
+  module local such as ``SAMPLE_INTERVAL``;
+* every enclosing ``if``/``elseif``/``else`` branch multiplies by
+  ``--branch-share``, the share of calls assumed to take it.
+
+Findings inside a branch, such as the cleanup in an
+``if expired then Despawn() return end`` exit, are marked ``conditional``:
+they only run on some frames, and at the same rate an unconditional finding
+sorts first. Code after such an exit is not discounted, because it still runs
+on most frames.
+
+Only files that mention a per-frame signal are lexed, so a whole-repo run
+stays well under a second.
+
+Usage::
+
+    python tools/hot_path_lint.py [PATH ...] [--rule get-service] [--min-rate 1] [--max-rate 1000] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from luau_config import BLOCK_OPENERS, EXPRESSION_CONTEXT
+from luau_literals import evaluate_locals, skip_annotation
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError, Token
+from rojo_project import ProjectTree, normalise_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PER_FRAME_SIGNALS = (
+    "Heartbeat",
+    "RenderStepped",
+    "Stepped",
+    "PreRender",
+    "PreAnimation",
+    "PreSimulation",
+    "PostSimulation",
+)
+CONNECT_METHODS = {"Connect", "ConnectParallel"}
+CLOCK_CALLS = {"os.clock", "os.time", "tick", "time", "workspace.GetServerTimeNow", "Workspace.GetServerTimeNow"}
+COMPARISONS = {"LT", "LE", "GT", "GE"}
+DEFAULT_FPS = 60.0
+DEFAULT_INSTANCES = 10
+DEFAULT_LOOP_ITERATIONS = 20
+DEFAULT_BRANCH_SHARE = 0.1
+MAX_CALL_DEPTH = 8
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    message: str
+
+
+RULES = {
+    rule.id: rule
+    for rule in (
+        Rule("instance-query", "{name} allocates a new table of instances on every call"),
+        Rule("instance-new", "Instance.new on a hot path; pool and reuse instances"),
+        Rule("destroy", ":Destroy() on a hot path; pool or reparent instead"),
+        Rule("clone", ":Clone() on a hot path; pool and reuse instances"),
+        Rule("get-service", "GetService on a hot path; hoist it to a module-level local"),
+        Rule("child-lookup", "{name} walks the tree on every call; cache the reference"),
+        Rule("string-in-loop", "{name} builds a string every iteration; cache or compare without it"),
+        Rule("closure", "function expression allocates a closure on every call"),
+        Rule("connect", ":Connect on a hot path adds a handler on every call"),
+    )
+}
+INSTANCE_QUERIES = {"GetDescendants", "GetChildren", "GetTagged", "GetPlayers"}
+CHILD_LOOKUPS = {
+    "FindFirstChild",
+    "FindFirstChildOfClass",
+    "FindFirstChildWhichIsA",
+    "FindFirstAncestor",
+    "FindFirstAncestorOfClass",
+    "FindFirstAncestorWhichIsA",
+    "FindFirstDescendant",
+    "WaitForChild",
+}
+STRING_FUNCTIONS = {"lower", "upper", "format", "rep", "sub", "gsub", "split", "reverse"}
+
+
+@dataclass
+class Finding:
+    rule: str
+    path: str
+    line: int
+    column: int
+    rate: float
+    message: str
+    via: Tuple[str, ...]
+    conditional: bool = False
+
+
+@dataclass(frozen=True)
+class Estimate:
+    fps: float = DEFAULT_FPS
+    instances: int = DEFAULT_INSTANCES
+    loop_iterations: int = DEFAULT_LOOP_ITERATIONS
+    branch_share: float = DEFAULT_BRANCH_SHARE
+
+
+class ScriptScan:
+    """Hot-path analysis of one tokenised script."""
+
+    def __init__(self, path: str, tokens: Sequence[Token], estimate: Estimate) -> None:
+        self.path = path
+        self.tokens = tokens
+        self.estimate = estimate
+        self.constants = {
+            name: float(value)
+            for name, value in evaluate_locals(tokens).items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        self.functions: Dict[str, int] = {}
+        self.module_locals: Set[str] = set()
+        self._spans: Optional[List[Tuple[int, int]]] = None
+        self._index_definitions()
+
+    def _kind(self, index: int) -> str:
+        return self.tokens[index].type if index < len(self.tokens) else "EOF"
+
+    def _value(self, index: int) -> str:
+        return self.tokens[index].value if index < len(self.tokens) else ""
+
+    def _dotted(self, index: int) -> Tuple[str, int]:
+        """Read ``NAME(.NAME)*[:NAME]`` at ``index``; return it with ``:`` as ``.`` and the next index."""
+
+        parts = [self._value(index)]
+        index += 1
+        while self._kind(index) == "DOT" and self._kind(index + 1) == "NAME":
+            parts.append(self._value(index + 1))
+            index += 2
+        # ``name: Type`` annotations also use a colon; only method calls continue the chain.
+        if self._kind(index) == "COLON" and self._kind(index + 1) == "NAME":
+            if self._kind(index + 2) in ("LPAREN", "STRING", "LBRACE"):
+                parts.append(self._value(index + 1))
+                index += 2
+        return ".".join(parts), index
+
+    def _opens_block(self, index: int) -> bool:
+        kind = self._kind(index)
+        if kind == "KW_IF":
+            return index == 0 or self.tokens[index - 1].type not in EXPRESSION_CONTEXT
+        return kind in BLOCK_OPENERS or kind == "KW_REPEAT"
+
+    def _index_definitions(self) -> None:
+        depth = 0
+        for index, token in enumerate(self.tokens):
+            kind = token.type
+            if depth == 0 and kind == "KW_LOCAL" and self._kind(index + 1) == "NAME":
+                cursor = index + 1
+                while self._kind(cursor) == "NAME":
+                    self.module_locals.add(self._value(cursor))
+                    cursor += 1
+                    while self._kind(cursor) not in ("COMMA", "ASSIGN", "EOF") and cursor - index < 64:
+                        if self._kind(cursor) in ("KW_LOCAL", "KW_FUNCTION", "KW_END"):
+                            break
+                        cursor += 1
+                    if self._kind(cursor) != "COMMA":
+                        break
+                    cursor += 1
+            if kind == "KW_FUNCTION" and self._kind(index + 1) == "NAME":
+                name, _ = self._dotted(index + 1)
+                self.functions.setdefault(name, index)
+                if depth == 0 and self._kind(index - 1) == "KW_LOCAL":
+                    self.module_locals.add(name)
+            elif kind == "KW_FUNCTION" and index >= 2 and self._kind(index - 1) == "ASSIGN":
+                if self._kind(index - 2) == "NAME" and self._kind(index - 3) in ("KW_LOCAL", "DOT", "COLON"):
+                    target = index - 2
+                    while self._kind(target - 1) == "DOT" and self._kind(target - 2) == "NAME":
+                        target -= 2
+                    name, _ = self._dotted(target)
+                    self.functions.setdefault(name, index)
+            if self._opens_block(index):
+                depth += 1
+            elif kind in ("KW_END", "KW_UNTIL"):
+                depth = max(depth - 1, 0)
+
+    def function_span(self, index: int) -> Tuple[List[str], int, int]:
+        """Parameters, first body token and closing ``end`` of the function at ``index``."""
+
+        cursor = index + 1
+        while self._kind(cursor) not in ("LPAREN", "EOF"):
+            cursor += 1
+        params = []
+        depth = 0
+        while self._kind(cursor) != "EOF":
+            kind = self._kind(cursor)
+            if kind in ("LPAREN", "LBRACE", "LBRACKET", "LT"):
+                depth += 1
+            elif kind in ("RPAREN", "RBRACE", "RBRACKET", "GT"):
+                depth -= 1
+                if depth == 0:
+                    break
+            elif depth == 1 and kind in ("NAME", "ELLIPSIS") and self._kind(cursor - 1) in ("LPAREN", "COMMA"):
+                params.append(self._value(cursor))
+            cursor += 1
+        body = cursor + 1
+        depth = 1
+        cursor = body
+        while self._kind(cursor) != "EOF":
+            if self._opens_block(cursor):
+                depth += 1
+            elif self._kind(cursor) in ("KW_END", "KW_UNTIL"):
+                depth -= 1
+                if depth == 0:
+                    break
+            cursor += 1
+        return params, body, cursor
+
+    def _inside_function(self, index: int) -> bool:
+        if self._spans is None:
+            self._spans = [
+                (cursor, self.function_span(cursor)[2])
+                for cursor, token in enumerate(self.tokens)
+                if token.type == "KW_FUNCTION"
+            ]
+        return any(start < index < end for start, end in self._spans)
+
+    def roots(self) -> Iterator[Tuple[str, int, float]]:
+        """Yield ``(label, function token index, calls per second)`` for every per-frame callback."""
+
+        for index, token in enumerate(self.tokens):
+            if token.type != "NAME":
+                continue
+            handler: Optional[int] = None
+            if (
+                token.value in PER_FRAME_SIGNALS
+                and self._kind(index - 1) == "DOT"
+                and self._kind(index + 1) == "COLON"
+                and self._value(index + 2) in CONNECT_METHODS
+                and self._kind(index + 3) == "LPAREN"
+            ):
+                handler = index + 4
+                label = token.value
+            elif token.value == "BindToRenderStep" and self._kind(index + 1) == "LPAREN":
+                handler = self._argument(index + 1, 2)
+                label = "BindToRenderStep"
+            if handler is None:
+                continue
+            function = self._handler_function(handler)
+            if function is None:
+                continue
+            rate = self.estimate.fps
+            if self._per_object(index):
+                rate *= self.estimate.instances
+            yield f"{label}@{token.line}", function, rate
+
+    def _argument(self, lparen: int, position: int) -> Optional[int]:
+        depth = 0
+        found = 0
+        cursor = lparen
+        while self._kind(cursor) != "EOF":
+            kind = self._kind(cursor)
+            if kind in ("LPAREN", "LBRACE", "LBRACKET"):
+                depth += 1
+            elif kind in ("RPAREN", "RBRACE", "RBRACKET"):
+                depth -= 1
+                if depth == 0:
+                    return None
+            elif kind == "COMMA" and depth == 1:
+                found += 1
+                if found == position:
+                    return cursor + 1
+            cursor += 1
+        return None
+
+    def _handler_function(self, index: int) -> Optional[int]:
+        if self._kind(index) == "KW_FUNCTION":
+            return index
+        if self._kind(index) == "NAME":
+            name, end = self._dotted(index)
+            if self._kind(end) in ("RPAREN", "COMMA"):
+                return self.functions.get(name)
+        return None
+
+    def _per_object(self, index: int) -> bool:
+        """True when the connection at ``index`` is made per call of an enclosing function."""
+
+        start = index
+        while self._kind(start - 1) in ("NAME", "DOT", "COLON"):
+            start -= 1
+        if not self._inside_function(start):
+            return False
+        stored = (
+            self._kind(start - 1) == "ASSIGN"
+            and self._kind(start - 2) == "NAME"
+            and self._kind(start - 3) not in ("DOT", "COLON", "KW_LOCAL")
+            and self._value(start - 2) in self.module_locals
+        )
+        return not stored
+
+    def walk(
+        self, function: int, rate: float, via: Tuple[str, ...], findings: List[Finding], conditional: bool = False
+    ) -> None:
+        params, body, end = self.function_span(function)
+        first_param = params[0] if params else None
+        clock_names: Set[str] = set()
+        # One ``(multiplier, is_branch)`` pair per open block.
+        factors: List[Tuple[float, bool]] = []
+        pending_loop = False
+        cap: Optional[float] = None
+        cursor = body
+        while cursor < end:
+            token = self.tokens[cursor]
+            kind = token.type
+            current = rate if cap is None else min(rate, cap)
+            for factor, _ in factors:
+                current *= factor
+            branched = conditional or any(branch for _, branch in factors)
+            if kind in ("KW_FOR", "KW_WHILE"):
+                pending_loop = True
+            elif kind == "KW_DO":
+                factors.append((float(self.estimate.loop_iterations) if pending_loop else 1.0, False))
+                pending_loop = False
+            elif kind == "KW_REPEAT":
+                factors.append((float(self.estimate.loop_iterations), False))
+            elif kind == "KW_FUNCTION":
+                self._report(findings, "closure", token, current, via, "function", branched)
+                _, _, nested_end = self.function_span(cursor)
+                self.walk(cursor, current, via, findings, branched)
+                cursor = nested_end + 1
+                continue
+            elif kind == "KW_IF" and self._opens_block(cursor):
+                interval = None if factors else self._throttle_interval(cursor, clock_names, first_param)
+                if interval:
+                    cap = 1.0 / interval if cap is None else min(cap, 1.0 / interval)
+                    factors.append((1.0, False))
+                else:
+                    factors.append((self.estimate.branch_share, True))
+            elif kind in ("KW_END", "KW_UNTIL"):
+                if factors:
+                    factors.pop()
+            elif kind == "NAME" and self._kind(cursor - 1) not in ("DOT", "COLON"):
+                in_loop = any(factor > 1 for factor, branch in factors if not branch)
+                cursor = self._expression(cursor, current, via, findings, clock_names, first_param, in_loop, branched)
+                continue
+            cursor += 1
+
+    def _expression(
+        self,
+        index: int,
+        rate: float,
+        via: Tuple[str, ...],
+        findings: List[Finding],
+        clock_names: Set[str],
+        first_param: Optional[str],
+        in_loop: bool,
+        conditional: bool,
+    ) -> int:
+        """Apply the rules to the name chain starting at ``index``; return the index after it."""
+
+        name, after = self._dotted(index)
+        token = self.tokens[index]
+        parts = name.split(".")
+        method = parts[-1]
+        called = self._kind(after) in ("LPAREN", "STRING", "LBRACE")
+        if not called:
+            if self._kind(after) == "ASSIGN" and self._is_clock_call(after + 1):
+                clock_names.add(name)
+            elif (
+                self._kind(after) == "PLUS"
+                and self._kind(after + 1) == "ASSIGN"
+                and first_param is not None
+                and self._value(after + 2) == first_param
+            ):
+                # ``elapsed += dt`` accumulates frame time like a clock.
+                clock_names.add(name)
+            elif self._kind(index - 1) == "KW_LOCAL":
+                cursor = skip_annotation(self.tokens, after)
+                if self._kind(cursor) == "ASSIGN" and self._is_clock_call(cursor + 1):
+                    clock_names.add(name)
+            return after
+        colon_call = len(parts) > 1 and self._kind(after - 2) == "COLON"
+        if name == "Instance.new":
+            self._report(findings, "instance-new", token, rate, via, name, conditional)
+        elif colon_call and method in INSTANCE_QUERIES:
+            self._report(findings, "instance-query", token, rate, via, f":{method}()", conditional)
+        elif colon_call and method == "Destroy":
+            self._report(findings, "destroy", token, rate, via, name, conditional)
+        elif colon_call and method == "Clone":
+            self._report(findings, "clone", token, rate, via, name, conditional)
+        elif colon_call and method == "GetService":
+            self._report(findings, "get-service", token, rate, via, name, conditional)
+        elif colon_call and method in CHILD_LOOKUPS:
+            self._report(findings, "child-lookup", token, rate, via, f":{method}()", conditional)
+        elif colon_call and method in CONNECT_METHODS:
+            self._report(findings, "connect", token, rate, via, name, conditional)
+        elif in_loop and method in STRING_FUNCTIONS and (parts[0] == "string" or colon_call):
+            self._report(findings, "string-in-loop", token, rate, via, f"string.{method}", conditional)
+        elif name in self.functions and len(via) < MAX_CALL_DEPTH and name not in via:
+            self.walk(self.functions[name], rate, via + (name,), findings, conditional)
+        return after
+
+    def _is_clock_call(self, index: int) -> bool:
+        if self._kind(index) != "NAME":
+            return False
+        name, after = self._dotted(index)
+        return name in CLOCK_CALLS and self._kind(after) == "LPAREN"
+
+    def _throttle_interval(self, index: int, clock_names: Set[str], first_param: Optional[str]) -> Optional[float]:
+        """Interval of an ``if <clock comparison> then return end`` guard at ``index``, if it is one."""
+
+        cursor = index + 1
+        condition: List[int] = []
+        while self._kind(cursor) not in ("KW_THEN", "EOF"):
+            condition.append(cursor)
+            cursor += 1
+        if self._kind(cursor + 1) != "KW_RETURN" or self._kind(cursor + 2) != "KW_END":
+            return None
+        if not any(self._kind(i) in COMPARISONS for i in condition):
+            return None
+        timed = False
+        interval = None
+        for position in condition:
+            kind = self._kind(position)
+            if kind == "NAME" and self._kind(position - 1) not in ("DOT", "COLON"):
+                name, _ = self._dotted(position)
+                if name in clock_names or self._is_clock_call(position):
+                    timed = True
+                elif name in self.constants and self.constants[name] > 0:
+                    interval = self.constants[name]
+            elif kind == "NUMBER":
+                try:
+                    value = float(self._value(position))
+                except ValueError:
+                    continue
+                if value > 0:
+                    interval = value
+        return interval if timed else None
+
+    def _report(
+        self,
+        findings: List[Finding],
+        rule: str,
+        token: Token,
+        rate: float,
+        via: Tuple[str, ...],
+        name: str,
+        conditional: bool,
+    ) -> None:
+        findings.append(
+            Finding(
+                rule=rule,
+                path=self.path,
+                line=token.line,
+                column=token.column,
+                rate=rate,
+                message=RULES[rule].message.format(name=name),
+                via=via,
+                conditional=conditional,
+            )
+        )
+
+
+def lint_source(path: str, source: str, estimate: Estimate) -> List[Finding]:
+    """Findings for one script, merged per location and rule (rates add up)."""
+
+    if not any(signal in source for signal in PER_FRAME_SIGNALS) and "BindToRenderStep" not in source:
+        return []
+    scan = ScriptScan(path, list(Lexer(source).tokens()), estimate)
+    findings: List[Finding] = []
+    for label, function, rate in scan.roots():
+        scan.walk(function, rate, (label,), findings)
+    merged: Dict[Tuple[int, int, str], Finding] = {}
+    for finding in findings:
+        key = (finding.line, finding.column, finding.rule)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = finding
+        else:
+            via = existing.via if existing.rate >= finding.rate else finding.via
+            existing.rate += finding.rate
+            existing.via = via
+            existing.conditional = existing.conditional and finding.conditional
+    return list(merged.values())
+
+
+def script_paths(root: Path, selected: Sequence[str]) -> List[str]:
+    scripts = sorted(ProjectTree(root).script_index().values())
+    if not selected:
+        return scripts
+    wanted = [normalise_path(path) for path in selected]
+    return [path for path in scripts if any(path == w or path.startswith(w + "/") for w in wanted)]
+
+
+def lint(root: Path, paths: Sequence[str], estimate: Estimate) -> Tuple[List[Finding], Dict[str, str]]:
+    findings: List[Finding] = []
+    errors: Dict[str, str] = {}
+    for path in paths:
+        try:
+            source = (root / path).read_text(encoding="utf-8")
+            findings.extend(lint_source(path, source, estimate))
+        except (OSError, UnicodeDecodeError) as exc:
+            errors[path] = str(exc)
+        except LuauSyntaxError as exc:
+            errors[path] = f"line {exc.line}: {exc.message}"
+    findings.sort(
+        key=lambda finding: (-finding.rate, finding.conditional, finding.path, finding.line, finding.column)
+    )
+    return findings, errors
+
+
+def _rate(value: float) -> str:
+    return f"{value:,.0f}/s" if value >= 10 else f"{value:.2g}/s"
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Files or directories to lint (default: every synced script)")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--rule", action="append", choices=sorted(RULES), help="Only report these rules")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="Per-frame signal rate (default: 60)")
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=DEFAULT_INSTANCES,
+        help="Live connections assumed for callbacks connected per object (default: 10)",
+    )
+    parser.add_argument(
+        "--loop-iterations", type=int, default=DEFAULT_LOOP_ITERATIONS, help="Iterations per loop (default: 20)"
+    )
+    parser.add_argument(
+        "--branch-share",
+        type=float,
+        default=DEFAULT_BRANCH_SHARE,
+        help="Share of calls assumed to enter an if/elseif/else branch (default: 0.1)",
+    )
+    parser.add_argument("--min-rate", type=float, default=0.0, help="Hide findings below this many calls/s")
+    parser.add_argument("--max-rate", type=float, help="Exit with status 1 if any finding reaches this rate")
+    parser.add_argument("--json", action="store_true", help="Emit findings as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.fps <= 0 or args.instances < 1 or args.loop_iterations < 1:
+        print("error: --fps, --instances and --loop-iterations must be positive", file=sys.stderr)
+        return 1
+    if not 0 < args.branch_share <= 1:
+        print("error: --branch-share must be in (0, 1]", file=sys.stderr)
+        return 1
+    root = args.root.resolve()
+    paths = script_paths(root, args.paths)
+    if args.paths and not paths:
+        print(f"error: no synced scripts under {', '.join(args.paths)}", file=sys.stderr)
+        return 1
+    estimate = Estimate(args.fps, args.instances, args.loop_iterations, args.branch_share)
+    findings, errors = lint(root, paths, estimate)
+    findings = [
+        finding
+        for finding in findings
+        if finding.rate >= args.min_rate and (not args.rule or finding.rule in args.rule)
+    ]
+
+    if args.json:
+        print(json.dumps({"findings": [asdict(finding) for finding in findings], "errors": errors}, indent=2))
+    else:
+        for finding in findings:
+            print(
+                f"{_rate(finding.rate):>10}  {finding.path}:{finding.line}:{finding.column}  "
+                f"[{finding.rule}] {finding.message}  "
+                f"({'conditional, ' if finding.conditional else ''}via {' -> '.join(finding.via)})"
+            )
+        for path, error in errors.items():
+            print(f"error: {path}: {error}", file=sys.stderr)
+        print(f"{len(findings)} finding(s) in {len(paths)} script(s)")
+    if args.max_rate is not None and any(finding.rate >= args.max_rate for finding in findings):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
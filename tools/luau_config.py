@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""Evaluate the static tables of Luau config modules into Python values.
+
+Balance tools need ``FruitConfig``, ``GameConfig``, ``ShopConfig`` and
+``Flags`` without copying numbers by hand. This module walks the top-level
+statements of a module with ``luau_syntax_checker.Lexer`` tokens and
+``luau_literals.LiteralReader``:
+
+* ``local NAME = <literal>`` becomes a local (``DEFAULT_FLAGS``, ``C = {}``);
+* ``NAME.a.b = <literal>`` assigns into a local table (``C.Turrets = {...}``);
+* ``return NAME`` picks the exported table.
+
+Function bodies and other blocks are skipped. Roblox constructors such as
+``Color3.fromRGB(...)`` or ``Vector3.new(...)`` become ``RobloxValue``
+placeholders, ``Enum.Font.Code`` becomes an ``EnumItem``, and runtime values
+such as ``game.PlaceId`` stay ``Symbol``. Statements that are not static are
+listed in ``ConfigModule.skipped`` instead of failing the module.
+
+Results are pickled under ``tools/.luau_config_cache/`` keyed by the SHA-256
+of the source, and memoised in-process by size and mtime, so repeated loads
+cost a ``stat`` call.
+
+Usage::
+
+    python tools/luau_config.py [GameConfig ShopConfig path/to/Module.lua ...] [--json] [--no-cache]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from luau_literals import CallHandler, LiteralError, LiteralReader, Symbol, skip_annotation
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError, Token
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_DIR = REPO_ROOT / "ReplicatedStorage" / "Shared" / "Config"
+CONFIG_MODULES = {
+    "FruitConfig": CONFIG_DIR / "FruitConfig.lua",
+    "GameConfig": CONFIG_DIR / "GameConfig.lua",
+    "ShopConfig": CONFIG_DIR / "ShopConfig.lua",
+    "Flags": CONFIG_DIR / "Flags.lua",
+}
+CACHE_DIR = Path(__file__).resolve().parent / ".luau_config_cache"
+# Bump whenever evaluation results change shape so stale pickles are ignored.
+EVALUATOR_VERSION = 2
+
+# Roblox datatype constructors evaluated to placeholders, by type.
+ROBLOX_CONSTRUCTORS = {
+    "Color3": ("new", "fromRGB", "fromHSV", "fromHex"),
+    "Vector3": ("new",),
+    "Vector2": ("new",),
+    "UDim": ("new",),
+    "UDim2": ("new", "fromScale", "fromOffset"),
+    "CFrame": ("new", "Angles", "fromEulerAnglesXYZ", "lookAt"),
+    "BrickColor": ("new",),
+    "NumberRange": ("new",),
+    "NumberSequence": ("new",),
+    "NumberSequenceKeypoint": ("new",),
+    "ColorSequence": ("new",),
+    "ColorSequenceKeypoint": ("new",),
+    "TweenInfo": ("new",),
+    "Rect": ("new",),
+}
+# Tokens that open a block closed by ``end`` (``do`` covers ``for``/``while``).
+BLOCK_OPENERS = {"KW_FUNCTION", "KW_IF", "KW_DO"}
+# After these tokens ``if`` starts an if-expression, which has no ``end``.
+EXPRESSION_CONTEXT = {
+    "ASSIGN", "COMMA", "LPAREN", "LBRACKET", "LBRACE", "KW_RETURN", "KW_AND", "KW_OR", "KW_NOT",
+    "PLUS", "MINUS", "MUL", "DIV", "FLOORDIV", "MOD", "POW", "CONCAT",
+    "EQ", "NE", "LT", "LE", "GT", "GE", "DOUBLECOLON",
+}
+
+
+class ConfigError(LiteralError):
+    """Raised when a config module cannot be read or tokenised."""
+
+
+@dataclass(frozen=True)
+class RobloxValue:
+    """Placeholder for a Roblox datatype built by a constructor call."""
+
+    type: str
+    constructor: str
+    args: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class EnumItem:
+    """Placeholder for an ``Enum.<Type>.<Item>`` reference."""
+
+    enum_type: str
+    name: str
+
+    @property
+    def path(self) -> str:
+        return f"Enum.{self.enum_type}.{self.name}"
+
+
+@dataclass
+class ConfigModule:
+    """Static values of one module."""
+
+    path: str
+    sha256: str
+    export_name: Optional[str]
+    exports: Any
+    locals: Dict[str, Any] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+
+def _constructor(type_name: str, constructor: str) -> CallHandler:
+    def build(args: List[Any]) -> RobloxValue:
+        return RobloxValue(type_name, constructor, tuple(args))
+
+    return build
+
+
+ROBLOX_CALLS: Dict[str, CallHandler] = {
+    f"{type_name}.{constructor}": _constructor(type_name, constructor)
+    for type_name, constructors in ROBLOX_CONSTRUCTORS.items()
+    for constructor in constructors
+}
+
+
+def resolve_name(path: str) -> Any:
+    parts = path.split(".")
+    if len(parts) == 3 and parts[0] == "Enum":
+        return EnumItem(parts[1], parts[2])
+    if len(parts) == 2 and parts[0] in ROBLOX_CONSTRUCTORS and parts[1] in ("zero", "one", "xAxis", "yAxis", "zAxis"):
+        return RobloxValue(parts[0], parts[1], ())
+    return None
+
+
+def _statement_starts(tokens: Sequence[Token]) -> Iterator[int]:
+    """Yield the index of every token that may start a top-level statement.
+
+    Block depth follows ``function``/``if``/``do``/``repeat`` against
+    ``end``/``until``; bracket depth keeps table constructors and argument
+    lists from looking like statements.
+    """
+
+    blocks = 0
+    brackets = 0
+    previous: Optional[str] = None
+    for index, token in enumerate(tokens):
+        kind = token.type
+        if blocks == 0 and brackets == 0:
+            yield index
+        if kind in ("LPAREN", "LBRACE", "LBRACKET"):
+            brackets += 1
+        elif kind in ("RPAREN", "RBRACE", "RBRACKET"):
+            brackets = max(brackets - 1, 0)
+        elif kind in BLOCK_OPENERS or kind == "KW_REPEAT":
+            if not (kind == "KW_IF" and previous in EXPRESSION_CONTEXT):
+                blocks += 1
+        elif kind in ("KW_END", "KW_UNTIL"):
+            blocks = max(blocks - 1, 0)
+        previous = kind
+
+
+def _dotted_target(tokens: Sequence[Token], index: int) -> Tuple[Optional[List[str]], int]:
+    """Parse ``NAME(.NAME)* =`` at ``index``; return the path and the ``=`` index."""
+
+    if tokens[index].type != "NAME":
+        return None, index
+    parts = [tokens[index].value]
+    cursor = index + 1
+    while cursor + 1 < len(tokens) and tokens[cursor].type == "DOT" and tokens[cursor + 1].type == "NAME":
+        parts.append(tokens[cursor + 1].value)
+        cursor += 2
+    if cursor < len(tokens) and tokens[cursor].type == "ASSIGN":
+        return parts, cursor
+    return None, index
+
+
+def _field_table(constants: Dict[str, Any], parts: List[str]) -> Optional[Dict[Any, Any]]:
+    """Return the table that ``parts[:-1]`` names, promoting empty ``{}`` lists to dicts."""
+
+    parent: Dict[Any, Any] = constants
+    for part in parts[:-1]:
+        child = parent.get(part)
+        if isinstance(child, list) and not child:
+            child = parent[part] = {}
+        if not isinstance(child, dict):
+            return None
+        parent = child
+    return parent
+
+
+def evaluate_module(source_path: Union[str, Path]) -> ConfigModule:
+    """Evaluate the static top-level statements of a Luau module (uncached)."""
+
+    path = Path(source_path)
+    try:
+        data = path.read_bytes()
+        tokens = list(Lexer(data.decode("utf-8")).tokens())
+    except (OSError, UnicodeDecodeError, LuauSyntaxError) as exc:
+        raise ConfigError(f"{path}: {exc}") from exc
+
+    constants: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    export_name: Optional[str] = None
+    exports: Any = None
+    resume = 0
+
+    def read(start: int, target: str) -> Tuple[Any, int]:
+        reader = LiteralReader(tokens, constants, ROBLOX_CALLS, resolve_name)
+        reader.index = start
+        return reader.assigned_value(target), reader.index
+
+    for index in _statement_starts(tokens):
+        if index < resume:
+            continue
+        token = tokens[index]
+        if token.type == "KW_LOCAL" and index + 1 < len(tokens) and tokens[index + 1].type == "NAME":
+            name = tokens[index + 1].value
+            cursor = skip_annotation(tokens, index + 2)
+            if tokens[cursor].type != "ASSIGN":
+                continue
+            try:
+                constants[name], resume = read(cursor + 1, name)
+                skipped.pop(name, None)
+            except LiteralError as exc:
+                constants.pop(name, None)
+                skipped[name] = str(exc)
+        elif token.type == "NAME":
+            parts, assign = _dotted_target(tokens, index)
+            if parts is None or len(parts) < 2 or parts[0] not in constants:
+                continue
+            target = ".".join(parts)
+            container = _field_table(constants, parts)
+            if container is None:
+                skipped[target] = f"{'.'.join(parts[:-1])} is not a static table"
+                continue
+            try:
+                container[parts[-1]], resume = read(assign + 1, target)
+                skipped.pop(target, None)
+            except LiteralError as exc:
+                container.pop(parts[-1], None)
+                skipped[target] = str(exc)
+        elif token.type == "KW_RETURN":
+            following = tokens[index + 1]
+            if following.type == "NAME" and following.value in constants:
+                export_name = following.value
+                exports = constants[export_name]
+            else:
+                try:
+                    exports, resume = read(index + 1, "return value")
+                except LiteralError as exc:
+                    skipped["return"] = str(exc)
+
+    module_locals = {name: value for name, value in constants.items() if name != export_name}
+    return ConfigModule(
+        path=str(path),
+        sha256=hashlib.sha256(data).hexdigest(),
+        export_name=export_name,
+        exports=exports,
+        locals=module_locals,
+        skipped=skipped,
+    )
+
+
+# -- caching ---------------------------------------------------------------------
+
+_MEMO: Dict[str, Tuple[int, int, ConfigModule]] = {}
+
+
+def resolve_module_path(name_or_path: Union[str, Path]) -> Path:
+    if isinstance(name_or_path, str) and name_or_path in CONFIG_MODULES:
+        return CONFIG_MODULES[name_or_path]
+    path = Path(name_or_path)
+    if not path.is_file():
+        raise ConfigError(f"Config module not found: {name_or_path}")
+    return path
+
+
+def load_config(name_or_path: Union[str, Path], cache: bool = True) -> ConfigModule:
+    """Return the evaluated module, from memory or the on-disk cache when possible.
+
+    ``name_or_path`` is a key of ``CONFIG_MODULES`` or a path to a ``.lua``
+    file. The returned object is shared between calls; copy it before mutating.
+    """
+
+    key = str(name_or_path)
+    memo = _MEMO.get(key) if cache else None
+    if memo is not None:
+        try:
+            stat = os.stat(memo[2].path)
+        except OSError:
+            stat = None
+        if stat is not None and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+
+    path = resolve_module_path(name_or_path).resolve()
+    try:
+        stat = path.stat()
+    except OSError as exc:
+        raise ConfigError(f"{path}: {exc}") from exc
+
+    module: Optional[ConfigModule] = None
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    cache_file = CACHE_DIR / f"{digest}-v{EVALUATOR_VERSION}.pickle"
+    if cache:
+        try:
+            with open(cache_file, "rb") as handle:
+                module = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            module = None
+    if module is None:
+        module = evaluate_module(path)
+        if cache:
+            CACHE_DIR.mkdir(exist_ok=True)
+            temp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp, "wb") as handle:
+                pickle.dump(module, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, cache_file)
+    module.path = str(path)
+    if cache:
+        _MEMO[key] = (stat.st_size, stat.st_mtime_ns, module)
+    return module
+
+
+def clear_cache() -> None:
+    _MEMO.clear()
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+# -- output ----------------------------------------------------------------------
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert evaluated values to JSON types; placeholders become tagged objects."""
+
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, RobloxValue):
+        return {"$type": value.type, "constructor": value.constructor, "args": to_jsonable(value.args)}
+    if isinstance(value, EnumItem):
+        return {"$enum": value.path}
+    if isinstance(value, Symbol):
+        return {"$symbol": value.name}
+    return value
+
+
+def _render(value: Any) -> str:
+    if isinstance(value, RobloxValue):
+        return f"{value.type}.{value.constructor}({', '.join(_render(arg) for arg in value.args)})"
+    if isinstance(value, EnumItem):
+        return value.path
+    if isinstance(value, Symbol):
+        return f"<{value.name}>"
+    if isinstance(value, str):
+        return json.dumps(value)
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def flatten(value: Any, prefix: str) -> Iterator[Tuple[str, Any]]:
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            child = f"{prefix}[{key}]" if isinstance(key, int) else f"{prefix}.{key}"
+            yield from flatten(item, child)
+    elif isinstance(value, list) and value:
+        for position, item in enumerate(value, start=1):
+            yield from flatten(item, f"{prefix}[{position}]")
+    else:
+        yield prefix, value
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=list(CONFIG_MODULES),
+        help=f"Module names ({', '.join(CONFIG_MODULES)}) or .lua paths (default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Emit the values as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Evaluate without reading or writing the cache")
+    parser.add_argument("--clear-cache", action="store_true", help=f"Delete {CACHE_DIR.name}/ first")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.clear_cache:
+        clear_cache()
+    modules: Dict[str, ConfigModule] = {}
+    try:
+        for name in args.modules:
+            modules[name] = load_config(name, cache=not args.no_cache)
+    except ConfigError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        doc = {
+            name: {
+                "path": os.path.relpath(module.path, REPO_ROOT),
+                "sha256": module.sha256,
+                "export": module.export_name,
+                "exports": to_jsonable(module.exports),
+                "locals": to_jsonable(module.locals),
+                "skipped": module.skipped,
+            }
+            for name, module in modules.items()
+        }
+        print(json.dumps(doc, indent=2))
+        return 0
+
+    for name, module in modules.items():
+        print(f"{name} ({os.path.relpath(module.path, REPO_ROOT)}, exports {module.export_name or '-'})")
+        if module.export_name is not None:
+            for key, value in flatten(module.exports, module.export_name):
+                print(f"  {key} = {_render(value)}")
+        for local, value in module.locals.items():
+            for key, item in flatten(value, f"local {local}"):
+                print(f"  {key} = {_render(item)}")
+        for target, reason in module.skipped.items():
+            print(f"  skipped {target}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so cached pickles and isinstance checks
+    # share one set of classes with the simulators that import luau_config.
+    import luau_config
+
+    raise SystemExit(luau_config.main(sys.argv[1:]))
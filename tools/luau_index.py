@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""Index identifiers and member accesses across the Luau tree for fast lookups.
+
+Every script mapped by ``default.project.json`` is lexed, so comments and
+string contents never match. Each occurrence is recorded under a symbol:
+
+* a bare identifier (``FruitConfig``, ``spawnWave``);
+* a member chain up to the accessed member (``FruitConfig.Get``,
+  ``TelemetryServer.Track``, ``self.state:Reset``). The chain restarts after
+  a call or an index expression, and ``name: Type`` annotations are not
+  mistaken for method calls.
+
+Each occurrence also has a role: ``def`` (``local x``, ``function M.f``),
+``call``, ``write`` (``M.f = ...``) or ``read``. Calls whose first argument
+is a string literal keep that literal, so ``--arg`` answers "who tracks event
+X". Queries take a symbol or a glob pattern (``*.Track``, ``Fruit*``).
+
+The index lives in ``tools/.luau_index.sqlite``. Symbols are interned, and
+occurrences are rows of integers in a ``WITHOUT ROWID`` table keyed by
+symbol. Files are checked by size and mtime, then by SHA-256, and only the
+files whose content changed are re-lexed. The refresh runs before every
+lookup, so results are never stale, and it costs one ``stat`` per script
+when nothing moved.
+
+Other tools can use it as a library::
+
+    from luau_index import lookup, open_index
+
+    with closing(open_index()) as conn:
+        for hit in lookup(conn, "TelemetryServer.Track", role="call"):
+            print(hit.path, hit.line, hit.arg)
+
+Usage::
+
+    python tools/luau_index.py [--json] lookup FruitConfig.Get [--role call] [--arg ID] [--path 'ServerScriptService/*']
+    python tools/luau_index.py symbols '*.Track'
+    python tools/luau_index.py refresh [--full]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError, Token
+from rojo_project import ProjectTree
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_PATH = Path(__file__).resolve().parent / ".luau_index.sqlite"
+SCHEMA_VERSION = "1"
+ROLES = ("read", "call", "write", "def")
+CALL_STARTERS = {"LPAREN", "STRING", "LBRACE"}
+GLOB_CHARS = set("*?[")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE symbols (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE occurrences (
+    symbol INTEGER NOT NULL,
+    file INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    role INTEGER NOT NULL,
+    arg TEXT,
+    PRIMARY KEY (symbol, file, line, col)
+) WITHOUT ROWID;
+CREATE INDEX occurrences_file ON occurrences (file);
+"""
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    symbol: str
+    path: str
+    line: int
+    column: int
+    role: str
+    arg: Optional[str] = None
+
+
+@dataclass
+class RefreshStats:
+    files: int = 0
+    indexed: int = 0
+    removed: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def _call_arg(tokens: Sequence[Token], index: int) -> Optional[str]:
+    """The string literal passed first to the call starting at ``tokens[index]``, if any."""
+
+    tok = tokens[index]
+    if tok.type == "STRING":
+        return tok.value
+    if tok.type == "LPAREN" and index + 2 < len(tokens):
+        first, after = tokens[index + 1], tokens[index + 2]
+        if first.type == "STRING" and after.type in ("COMMA", "RPAREN"):
+            return first.value
+    return None
+
+
+def scan_tokens(tokens: Sequence[Token]) -> Iterator[Tuple[str, int, int, int, Optional[str]]]:
+    """Yield ``(symbol, line, column, role, arg)`` for every identifier occurrence."""
+
+    count = len(tokens)
+    chain: Optional[str] = None
+    declaring = False  # inside the name list of ``local a, b`` or ``local function f``
+    defining = False  # inside the name of ``function M.f`` / ``function M:m``
+    for index, tok in enumerate(tokens):
+        kind = tok.type
+        if kind != "NAME":
+            if kind not in ("DOT", "COLON"):
+                chain = None
+                defining = kind == "KW_FUNCTION"
+            declaring = kind == "KW_LOCAL" or (declaring and kind in ("COMMA", "KW_FUNCTION"))
+            continue
+
+        prev = tokens[index - 1] if index else None
+        next_type = tokens[index + 1].type if index + 1 < count else "EOF"
+        if chain is not None and prev is not None and prev.type == "DOT":
+            symbol = f"{chain}.{tok.value}"
+        elif chain is not None and prev is not None and prev.type == "COLON":
+            symbol = f"{chain}:{tok.value}"
+        else:
+            symbol = tok.value
+        # ``:name`` only continues a chain when it is called; otherwise the colon starts a type annotation.
+        continues = next_type == "DOT" or (
+            next_type == "COLON"
+            and index + 3 < count
+            and tokens[index + 2].type == "NAME"
+            and tokens[index + 3].type in CALL_STARTERS
+        )
+        chain = symbol if continues else None
+
+        arg = None
+        if declaring or (defining and not continues):
+            role = "def"
+        elif defining or (prev is not None and prev.type == "COLON" and symbol == tok.value):
+            role = "read"
+        elif next_type in CALL_STARTERS:
+            role = "call"
+            arg = _call_arg(tokens, index + 1)
+        elif next_type == "ASSIGN":
+            role = "write"
+        else:
+            role = "read"
+        if not continues:
+            defining = False
+        yield symbol, tok.line, tok.column, ROLES.index(role), arg
+
+
+def scan_source(source: str) -> List[Tuple[str, int, int, int, Optional[str]]]:
+    return list(scan_tokens(list(Lexer(source).tokens())))
+
+
+def script_paths(root: Path) -> List[str]:
+    return sorted(set(ProjectTree(root).script_index().values()))
+
+
+def _symbol_ids(conn: sqlite3.Connection, names: Sequence[str], cache: Dict[str, int]) -> None:
+    missing = sorted({name for name in names if name not in cache})
+    if not missing:
+        return
+    conn.executemany("INSERT OR IGNORE INTO symbols (name) VALUES (?)", [(name,) for name in missing])
+    for start in range(0, len(missing), 500):
+        batch = missing[start:start + 500]
+        placeholders = ", ".join("?" for _ in batch)
+        cache.update(conn.execute(f"SELECT name, id FROM symbols WHERE name IN ({placeholders})", batch))
+
+
+def refresh_index(conn: sqlite3.Connection, root: Path = REPO_ROOT, full: bool = False) -> RefreshStats:
+    """Bring the index in line with the scripts on disk, re-lexing only changed files."""
+
+    started = time.perf_counter()
+    paths = script_paths(root)
+    stats = RefreshStats(files=len(paths))
+    known = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT path, id, size, mtime_ns, sha256, error FROM files")
+    }
+    symbol_cache: Dict[str, int] = {}
+    with conn:
+        for path in paths:
+            try:
+                info = os.stat(root / path)
+            except OSError as exc:
+                stats.errors[path] = str(exc)
+                continue
+            previous = known.get(path)
+            if not full and previous is not None and previous[1:3] == (info.st_size, info.st_mtime_ns):
+                if previous[4]:
+                    stats.errors[path] = previous[4]
+                continue
+            data = (root / path).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if not full and previous is not None and previous[3] == digest:
+                conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                    (info.st_size, info.st_mtime_ns, previous[0]),
+                )
+                if previous[4]:
+                    stats.errors[path] = previous[4]
+                continue
+
+            error = None
+            try:
+                found = scan_source(data.decode("utf-8"))
+            except (UnicodeDecodeError, LuauSyntaxError) as exc:
+                found, error = [], str(exc)
+                stats.errors[path] = error
+            if previous is None:
+                file_id = conn.execute(
+                    "INSERT INTO files (path, size, mtime_ns, sha256, error) VALUES (?, ?, ?, ?, ?)",
+                    (path, info.st_size, info.st_mtime_ns, digest, error),
+                ).lastrowid
+            else:
+                file_id = previous[0]
+                conn.execute("DELETE FROM occurrences WHERE file = ?", (file_id,))
+                conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, sha256 = ?, error = ? WHERE id = ?",
+                    (info.st_size, info.st_mtime_ns, digest, error, file_id),
+                )
+            _symbol_ids(conn, [item[0] for item in found], symbol_cache)
+            conn.executemany(
+                "INSERT OR REPLACE INTO occurrences (symbol, file, line, col, role, arg) VALUES (?, ?, ?, ?, ?, ?)",
+                [(symbol_cache[symbol], file_id, line, col, role, arg) for symbol, line, col, role, arg in found],
+            )
+            stats.indexed += 1
+
+        for path in sorted(set(known) - set(paths)):
+            conn.execute("DELETE FROM occurrences WHERE file = ?", (known[path][0],))
+            conn.execute("DELETE FROM files WHERE id = ?", (known[path][0],))
+            stats.removed += 1
+        if stats.indexed or stats.removed:
+            conn.execute("DELETE FROM symbols WHERE id NOT IN (SELECT DISTINCT symbol FROM occurrences)")
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def open_index(
+    root: Path = REPO_ROOT, db_path: Path = INDEX_PATH, *, refresh: bool = True, full: bool = False
+) -> sqlite3.Connection:
+    """Return a connection to the index, refreshed against ``root`` unless ``refresh`` is false."""
+
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+    except sqlite3.DatabaseError:
+        version = None
+    if version is None or version[0] != SCHEMA_VERSION:
+        conn.close()
+        for stale in (db_path, db_path.with_name(db_path.name + "-journal")):
+            if stale.exists():
+                stale.unlink()
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('schema', ?)", (SCHEMA_VERSION,))
+        conn.commit()
+    if refresh:
+        refresh_index(conn, root, full=full)
+    return conn
+
+
+def _symbol_clause(pattern: str) -> Tuple[str, str]:
+    return ("s.name GLOB ?", pattern) if GLOB_CHARS & set(pattern) else ("s.name = ?", pattern)
+
+
+def lookup(
+    conn: sqlite3.Connection,
+    pattern: str,
+    *,
+    role: Optional[str] = None,
+    arg: Optional[str] = None,
+    path_glob: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Occurrence]:
+    """Occurrences of the symbols matching ``pattern``, ordered by path and position."""
+
+    clause, value = _symbol_clause(pattern)
+    clauses, params = [clause], [value]
+    if role is not None:
+        clauses.append("o.role = ?")
+        params.append(ROLES.index(role))
+    if arg is not None:
+        clauses.append("o.arg = ?")
+        params.append(arg)
+    if path_glob is not None:
+        clauses.append("f.path GLOB ?")
+        params.append(path_glob)
+    sql = (
+        "SELECT s.name, f.path, o.line, o.col, o.role, o.arg FROM symbols s"
+        " JOIN occurrences o ON o.symbol = s.id JOIN files f ON f.id = o.file"
+        f" WHERE {' AND '.join(clauses)} ORDER BY f.path, o.line, o.col"
+    )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [
+        Occurrence(name, path, line, col, ROLES[role_id], hit_arg)
+        for name, path, line, col, role_id, hit_arg in conn.execute(sql, params)
+    ]
+
+
+def symbols(conn: sqlite3.Connection, pattern: str) -> List[Tuple[str, int]]:
+    """Matching symbol names with their occurrence counts, most used first."""
+
+    clause, value = _symbol_clause(pattern)
+    return list(
+        conn.execute(
+            "SELECT s.name, COUNT(*) FROM symbols s JOIN occurrences o ON o.symbol = s.id"
+            f" WHERE {clause} GROUP BY s.id ORDER BY COUNT(*) DESC, s.name",
+            (value,),
+        )
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH, help="Index database (default: %(default)s)")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index as it is, without checking files")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    find = sub.add_parser("lookup", help="List the occurrences of a symbol or glob pattern.")
+    find.add_argument("pattern", help="Symbol such as FruitConfig.Get, or a glob such as '*.Track'")
+    find.add_argument("--role", choices=ROLES, help="Only occurrences with this role")
+    find.add_argument("--arg", help="Only calls whose first argument is this string literal")
+    find.add_argument("--path", dest="path_glob", help="Glob on the repository path")
+    find.add_argument("--limit", type=int)
+
+    names = sub.add_parser("symbols", help="List the symbols matching a glob pattern with their counts.")
+    names.add_argument("pattern")
+
+    rebuild = sub.add_parser("refresh", help="Update the index and report what changed.")
+    rebuild.add_argument("--full", action="store_true", help="Re-lex every file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    root = args.root.resolve()
+    full = args.command == "refresh" and args.full
+    try:
+        conn = open_index(root, args.index, refresh=False)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        stats = None
+        if not args.no_refresh or args.command == "refresh":
+            stats = refresh_index(conn, root, full=full)
+        if args.command == "refresh":
+            if args.json:
+                print(json.dumps(asdict(stats), indent=2))
+            else:
+                print(
+                    f"Indexed {stats.indexed} of {stats.files} scripts ({stats.removed} removed) "
+                    f"in {stats.seconds * 1000:.0f} ms."
+                )
+                for path, message in sorted(stats.errors.items()):
+                    print(f"warning: {path}: {message}", file=sys.stderr)
+        elif args.command == "lookup":
+            hits = lookup(
+                conn, args.pattern, role=args.role, arg=args.arg, path_glob=args.path_glob, limit=args.limit
+            )
+            if args.json:
+                print(json.dumps([asdict(hit) for hit in hits], indent=2))
+            else:
+                for hit in hits:
+                    note = f"  {json.dumps(hit.arg)}" if hit.arg is not None else ""
+                    print(f"{hit.path}:{hit.line}:{hit.column}  {hit.role}  {hit.symbol}{note}")
+        else:
+            counts = symbols(conn, args.pattern)
+            if args.json:
+                print(json.dumps([{"symbol": name, "count": count} for name, count in counts], indent=2))
+            else:
+                for name, count in counts:
+                    print(f"{count}\t{name}")
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
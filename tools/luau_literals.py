@@ -0,0 +1,416 @@
+"""Evaluate literal Luau expressions from ``luau_syntax_checker`` tokens.
+
+Offline tools need constants and table constructors out of Luau modules (event
+specs, budgets, config tables) without running Roblox. ``LiteralReader`` walks
+the token stream and evaluates the static subset of expressions: strings,
+numbers, booleans, ``nil``, table constructors, arithmetic/concatenation/
+comparison/logical operators, references to earlier constants (including
+``A.b.c`` lookups into tables) and calls registered by the caller. Anything
+else raises ``LiteralError``; identifiers that are not known constants come
+back as ``Symbol`` so callers can tell a function reference from a value.
+
+Tables come back as ``list`` (array part only), ``dict`` (keyed part only) or a
+``dict`` with 1-based integer keys when both parts are present.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from luau_syntax_checker import Token
+
+
+class LiteralError(ValueError):
+    """Raised when an expression is not a static literal."""
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A bare or dotted identifier that is not a known constant."""
+
+    name: str
+
+
+CallHandler = Callable[[List[Any]], Any]
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v", "\\": "\\", '"': '"', "'": "'", "\n": "\n"}
+
+# Binary operator precedence (higher binds tighter); '..' and '^' are right-associative.
+BINARY_PRECEDENCE = {
+    "KW_OR": 1,
+    "KW_AND": 2,
+    "LT": 3, "GT": 3, "LE": 3, "GE": 3, "NE": 3, "EQ": 3,
+    "CONCAT": 4,
+    "PLUS": 5, "MINUS": 5,
+    "MUL": 6, "DIV": 6, "FLOORDIV": 6, "MOD": 6,
+    "POW": 8,
+}
+UNARY_PRECEDENCE = 7
+RIGHT_ASSOCIATIVE = {"CONCAT", "POW"}
+# Tokens that would continue an expression we cannot evaluate (calls, indexing).
+CONTINUATIONS = {"DOT", "COLON", "LPAREN", "LBRACKET", "STRING", "LBRACE"}
+# Type assertions (``expr :: Type``) end at these tokens, or at any token that
+# cannot continue a type once a complete type has been read.
+CAST_STOP = {"COMMA", "SEMICOLON", "RBRACE", "RPAREN", "RBRACKET", "ASSIGN"}
+TYPE_END = {"NAME", "STRING", "KW_NIL", "KW_TRUE", "KW_FALSE", "RBRACE", "RPAREN", "RBRACKET", "GT", "QUESTION"}
+TYPE_CONTINUATIONS = {"PIPE", "AMP", "QUESTION", "DOT", "ARROW", "LT"}
+
+
+def unescape_luau(raw: str) -> str:
+    """Decode the escape sequences the lexer leaves in string tokens."""
+
+    if "\\" not in raw:
+        return raw
+    out: List[str] = []
+    index = 0
+    while index < len(raw):
+        ch = raw[index]
+        if ch != "\\" or index + 1 >= len(raw):
+            out.append(ch)
+            index += 1
+            continue
+        escape = raw[index + 1]
+        if escape in _ESCAPES:
+            out.append(_ESCAPES[escape])
+            index += 2
+        elif escape == "x":
+            out.append(chr(int(raw[index + 2:index + 4], 16)))
+            index += 4
+        elif escape == "u" and raw[index + 2:index + 3] == "{":
+            close = raw.index("}", index)
+            out.append(chr(int(raw[index + 3:close], 16)))
+            index = close + 1
+        elif escape.isdigit():
+            match = re.match(r"\d{1,3}", raw[index + 1:])
+            assert match is not None
+            out.append(chr(int(match.group(0))))
+            index += 1 + len(match.group(0))
+        elif escape == "z":
+            index += 2
+            while index < len(raw) and raw[index].isspace():
+                index += 1
+        else:
+            out.append(escape)
+            index += 2
+    return "".join(out)
+
+
+def parse_luau_number(text: str) -> float:
+    cleaned = text.replace("_", "")
+    lowered = cleaned.lower()
+    if lowered.startswith("0x"):
+        return int(lowered, 16)
+    if lowered.startswith("0b"):
+        return int(lowered, 2)
+    value = float(cleaned)
+    return int(value) if value.is_integer() and "." not in cleaned and "e" not in lowered else value
+
+
+def _truthy(value: Any) -> bool:
+    return value is not None and value is not False
+
+
+def _number(value: Any, op: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise LiteralError(f"operator {op} needs numbers, got {value!r}")
+    return value
+
+
+def _tidy(value: float) -> float:
+    """Keep integral results as ``int`` so ``1 + 1`` prints like Luau's ``2``."""
+
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2**53:
+        return int(value)
+    return value
+
+
+def _binary(op: str, left: Any, right: Any) -> Any:
+    if op == "CONCAT":
+        parts = []
+        for value in (left, right):
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise LiteralError(f"cannot concatenate {value!r}")
+            parts.append(value if isinstance(value, str) else _lua_number_text(value))
+        return parts[0] + parts[1]
+    if op == "EQ":
+        return left == right
+    if op == "NE":
+        return left != right
+    if op in ("LT", "GT", "LE", "GE"):
+        if type(left) is not type(right) and not (isinstance(left, (int, float)) and isinstance(right, (int, float))):
+            raise LiteralError(f"cannot compare {left!r} and {right!r}")
+        return {"LT": left < right, "GT": left > right, "LE": left <= right, "GE": left >= right}[op]
+    a, b = _number(left, op), _number(right, op)
+    if op == "PLUS":
+        return _tidy(a + b)
+    if op == "MINUS":
+        return _tidy(a - b)
+    if op == "MUL":
+        return _tidy(a * b)
+    if op == "DIV":
+        if b == 0:
+            return math.copysign(math.inf, a) if a else math.nan
+        return a / b
+    if op == "FLOORDIV":
+        return _tidy(math.floor(a / b)) if b else (math.copysign(math.inf, a) if a else math.nan)
+    if op == "MOD":
+        return _tidy(a - math.floor(a / b) * b) if b else math.nan
+    if op == "POW":
+        return _tidy(float(a) ** b)
+    raise LiteralError(f"unsupported operator {op}")
+
+
+def _lua_number_text(value: float) -> str:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class LiteralReader:
+    """Evaluate literal expressions (tables, operators, registered calls) from tokens.
+
+    ``calls`` maps a dotted callee (``makeField``, ``Color3.fromRGB``) to a
+    handler that receives the evaluated arguments. ``resolve`` is asked for
+    dotted names that are not constants (``Enum.Font.Code``); returning
+    ``None`` leaves them as ``Symbol``.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[Token],
+        constants: Dict[str, Any],
+        calls: Optional[Dict[str, CallHandler]] = None,
+        resolve: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.tokens = tokens
+        self.constants = constants
+        self.calls = calls or {}
+        self.resolve = resolve
+        self.index = 0
+
+    def _peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def _take(self, token_type: str) -> Token:
+        token = self._peek()
+        if token.type != token_type:
+            raise LiteralError(f"line {token.line}: expected {token_type}, found {token.type} {token.value!r}")
+        self.index += 1
+        return token
+
+    def value(self, limit: int = 0) -> Any:
+        """Parse an expression whose binary operators bind tighter than ``limit``."""
+
+        token = self._peek()
+        if token.type in ("MINUS", "KW_NOT", "LEN"):
+            self.index += 1
+            operand = self.value(UNARY_PRECEDENCE)
+            if token.type == "MINUS":
+                left: Any = _tidy(-_number(operand, "-"))
+            elif token.type == "KW_NOT":
+                left = not _truthy(operand)
+            elif isinstance(operand, (str, list)):
+                left = len(operand)
+            else:
+                raise LiteralError(f"line {token.line}: cannot take the length of {operand!r}")
+        else:
+            left = self._primary()
+            if self._peek().type == "DOUBLECOLON":
+                self._skip_cast()
+
+        while True:
+            op = self._peek().type
+            precedence = BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence <= limit:
+                return left
+            self.index += 1
+            right = self.value(precedence - 1 if op in RIGHT_ASSOCIATIVE else precedence)
+            if op == "KW_AND":
+                left = right if _truthy(left) else left
+            elif op == "KW_OR":
+                left = left if _truthy(left) else right
+            else:
+                left = _binary(op, left, right)
+
+    def assigned_value(self, target: str) -> Any:
+        """Read the right-hand side of ``target = <expr>`` as one literal value."""
+
+        value = self.value()
+        following = self._peek()
+        if following.type in CONTINUATIONS or following.type == "COMMA":
+            raise LiteralError(f"line {following.line}: {target} is not a single literal")
+        if isinstance(value, Symbol):
+            raise LiteralError(f"{target} refers to {value.name}, which is not a literal")
+        return value
+
+    def _primary(self) -> Any:
+        token = self._peek()
+        if token.type == "STRING":
+            self.index += 1
+            return unescape_luau(token.value)
+        if token.type == "NUMBER":
+            self.index += 1
+            return parse_luau_number(token.value)
+        if token.type in ("KW_TRUE", "KW_FALSE"):
+            self.index += 1
+            return token.type == "KW_TRUE"
+        if token.type == "KW_NIL":
+            self.index += 1
+            return None
+        if token.type == "LBRACE":
+            return self.table()
+        if token.type == "LPAREN":
+            self.index += 1
+            inner = self.value()
+            self._take("RPAREN")
+            return inner
+        if token.type == "NAME":
+            return self._name()
+        raise LiteralError(f"line {token.line}: unsupported expression starting with {token.value!r}")
+
+    def _name(self) -> Any:
+        parts = [self._take("NAME").value]
+        while self._peek().type == "DOT" and self._peek(1).type == "NAME":
+            self.index += 1
+            parts.append(self._take("NAME").value)
+        path = ".".join(parts)
+        if self._peek().type in ("LPAREN", "STRING", "LBRACE"):
+            return self._call(path)
+        if self._peek().type in CONTINUATIONS:
+            raise LiteralError(f"line {self._peek().line}: {path} is followed by {self._peek().value!r}")
+        if parts[0] in self.constants:
+            value = self.constants[parts[0]]
+            for part in parts[1:]:
+                if not isinstance(value, dict) or part not in value:
+                    return Symbol(path)
+                value = value[part]
+            return value
+        if self.resolve is not None:
+            resolved = self.resolve(path)
+            if resolved is not None:
+                return resolved
+        return Symbol(path)
+
+    def _skip_cast(self) -> None:
+        """Skip a ``:: Type`` assertion; it does not change the value."""
+
+        self._take("DOUBLECOLON")
+        depth = 0
+        last: Optional[str] = None
+        while True:
+            kind = self._peek().type
+            if kind == "EOF":
+                return
+            if depth == 0:
+                if kind in CAST_STOP:
+                    return
+                if last in TYPE_END and kind not in TYPE_CONTINUATIONS:
+                    return
+            if kind in ("LPAREN", "LBRACE", "LBRACKET", "LT"):
+                depth += 1
+            elif kind in ("RPAREN", "RBRACE", "RBRACKET", "GT"):
+                depth -= 1
+            self.index += 1
+            last = kind
+
+    def _call(self, path: str) -> Any:
+        handler = self.calls.get(path)
+        if handler is None:
+            raise LiteralError(f"line {self._peek().line}: unsupported call {path}()")
+        if self._peek().type == "STRING":
+            args: List[Any] = [self._primary()]
+        elif self._peek().type == "LBRACE":
+            args = [self.table()]
+        else:
+            self._take("LPAREN")
+            args = []
+            while self._peek().type != "RPAREN":
+                args.append(self.value())
+                if self._peek().type == "COMMA":
+                    self.index += 1
+            self._take("RPAREN")
+        return handler(args)
+
+    def table(self) -> Any:
+        self._take("LBRACE")
+        keyed: Dict[Any, Any] = {}
+        array: List[Any] = []
+        while self._peek().type != "RBRACE":
+            if self._peek().type == "NAME" and self._peek(1).type == "ASSIGN":
+                key = self._take("NAME").value
+                self.index += 1
+                keyed[key] = self.value()
+            elif self._peek().type == "LBRACKET":
+                self.index += 1
+                key = self.value()
+                self._take("RBRACKET")
+                self._take("ASSIGN")
+                keyed[key] = self.value()
+            else:
+                array.append(self.value())
+            if self._peek().type in ("COMMA", "SEMICOLON"):
+                self.index += 1
+            elif self._peek().type != "RBRACE":
+                raise LiteralError(f"line {self._peek().line}: unexpected {self._peek().value!r} in table")
+        self._take("RBRACE")
+        if keyed and array:
+            keyed.update({index + 1: item for index, item in enumerate(array)})
+            return keyed
+        return keyed if keyed else array
+
+
+def skip_annotation(tokens: Sequence[Token], cursor: int) -> int:
+    """Skip an optional ``: Type`` after a local's name, up to the ``=`` at depth 0."""
+
+    count = len(tokens)
+    if cursor >= count or tokens[cursor].type != "COLON":
+        return cursor
+    depth = 0
+    while cursor < count:
+        kind = tokens[cursor].type
+        if kind in ("LBRACE", "LPAREN", "LBRACKET"):
+            depth += 1
+        elif kind in ("RBRACE", "RPAREN", "RBRACKET"):
+            depth -= 1
+        elif depth == 0 and kind in ("ASSIGN", "KW_LOCAL", "KW_FUNCTION"):
+            break
+        cursor += 1
+    return cursor
+
+
+def evaluate_locals(
+    tokens: Sequence[Token],
+    names: Optional[set] = None,
+    calls: Optional[Dict[str, CallHandler]] = None,
+) -> Dict[str, Any]:
+    """Evaluate ``local NAME[: type] = <literal expression>`` statements in order.
+
+    Each literal local is available to the ones after it. Locals that are not
+    pure literals are skipped, unless they are listed in ``names``, in which
+    case the ``LiteralError`` propagates.
+    """
+
+    constants: Dict[str, Any] = {}
+    index = 0
+    count = len(tokens)
+    while index < count:
+        token = tokens[index]
+        if token.type != "KW_LOCAL" or index + 1 >= count or tokens[index + 1].type != "NAME":
+            index += 1
+            continue
+        name = tokens[index + 1].value
+        cursor = skip_annotation(tokens, index + 2)
+        if cursor < count and tokens[cursor].type == "ASSIGN":
+            reader = LiteralReader(tokens, constants, calls)
+            reader.index = cursor + 1
+            try:
+                constants[name] = reader.assigned_value(name)
+                index = reader.index
+                continue
+            except LiteralError:
+                if names is not None and name in names:
+                    raise
+        index += 1
+    return constants
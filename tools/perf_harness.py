@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""Analyse captured PerfHarness samples and compare soak runs.
+
+``ServerScriptService/Tools/PerfHarness.server.lua`` samples the server once per
+``SAMPLE_INTERVAL`` and, with ``CAPTURE_SAMPLES`` enabled, prints each sample as
+``[PerfSample] {json}``. This tool reads those lines (plain or gzip logs, or
+JSON Lines exports of ``PerfHarnessUpdate`` payloads) and reports, per metric,
+percentiles over fixed-length windows and the rate at which each budget check
+in the harness fires. ``[PerfHarness]`` warning lines are counted by kind.
+
+Budgets are evaluated from the harness source itself, so a changed budget is
+picked up without editing this file; samples carrying different ``budgets``
+are reported.
+
+``compare`` treats every window of a run as one observation (consecutive 1 s
+samples are strongly correlated) and runs a two-sided Mann-Whitney U test per
+metric and per violation rate. It exits with status 1 when the candidate is
+significantly worse than the baseline, so it can gate a soak job.
+
+Usage::
+
+    python tools/perf_harness.py summary captures/soak-a/ [--window 60] [--windows] [--json]
+    python tools/perf_harness.py compare baseline.log candidate.log.gz [--stat 0.95] [--alpha 0.01]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from luau_literals import LiteralError, evaluate_locals
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError
+from telemetry_logs import MAX_LINE_BYTES, expand_inputs, map_shards, open_log
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HARNESS_SOURCE = REPO_ROOT / "ServerScriptService" / "Tools" / "PerfHarness.server.lua"
+SAMPLE_PREFIX = b"[PerfSample] "
+WARNING_PREFIX = b"[PerfHarness] "
+DEFAULT_WINDOW = 60.0
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Luau local -> Budgets attribute.
+BUDGET_LOCALS = {
+    "SAMPLE_INTERVAL": "sample_interval",
+    "FRAME_MAX_BUDGET": "frame_max",
+    "FRAME_AVG_BUDGET": "frame_average",
+    "GC_DELTA_BUDGET_MB": "gc_delta",
+    "PROJECTILE_PART_BUDGET": "projectiles",
+    "VFX_INSTANCE_BUDGET": "vfx",
+}
+# ``PerfSample.budgets`` key -> Budgets attribute.
+SAMPLE_BUDGET_KEYS = {
+    "frameMax": "frame_max",
+    "frameAverage": "frame_average",
+    "gcDelta": "gc_delta",
+    "projectiles": "projectiles",
+    "vfx": "vfx",
+}
+
+# (sample field, label, display scale); frame times are seconds in the sample.
+METRICS: Tuple[Tuple[str, str, float], ...] = (
+    ("dtMax", "dtMax (ms)", 1000.0),
+    ("dtAverage", "dtAverage (ms)", 1000.0),
+    ("gcDeltaMb", "gcDelta (MB)", 1.0),
+    ("projectileParts", "projectileParts", 1.0),
+    ("vfxInstances", "vfxInstances", 1.0),
+    ("totalMemoryMb", "totalMemory (MB)", 1.0),
+    ("totalInstances", "totalInstances", 1.0),
+)
+# Warning kinds in the order the harness checks them, with the message prefix it prints.
+KINDS: Tuple[Tuple[str, str], ...] = (
+    ("frame", "Frame budget exceeded"),
+    ("frameAvg", "Frame average high"),
+    ("gc", "GC allocation"),
+    ("projectile", "Projectile part count"),
+    ("vfx", "VFX instance count"),
+)
+
+
+class HarnessError(ValueError):
+    """Raised when the harness budgets cannot be read."""
+
+
+@dataclass(frozen=True)
+class Budgets:
+    sample_interval: float
+    frame_max: float
+    frame_average: float
+    gc_delta: float
+    projectiles: float
+    vfx: float
+
+
+def load_budgets(source_path: Path = HARNESS_SOURCE) -> Budgets:
+    """Evaluate the budget locals at the top of ``PerfHarness.server.lua``."""
+
+    try:
+        tokens = list(Lexer(Path(source_path).read_text(encoding="utf-8")).tokens())
+        constants = evaluate_locals(tokens, set(BUDGET_LOCALS))
+    except (LiteralError, LuauSyntaxError) as exc:
+        raise HarnessError(f"{source_path}: {exc}") from exc
+    values: Dict[str, float] = {}
+    for local, attribute in BUDGET_LOCALS.items():
+        value = constants.get(local)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise HarnessError(f"{source_path}: {local} is not a number literal")
+        values[attribute] = float(value)
+    return Budgets(**values)
+
+
+# -- capture reading -------------------------------------------------------------
+
+
+@dataclass
+class CaptureChunk:
+    """Samples read from one capture file, in file order."""
+
+    path: str
+    columns: Dict[str, List[float]] = field(default_factory=lambda: {name: [] for name, _, _ in METRICS})
+    timestamps: List[float] = field(default_factory=list)
+    budgets: Counter = field(default_factory=Counter)
+    warnings: Counter = field(default_factory=Counter)
+    malformed: int = 0
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def classify_warning(message: str) -> Optional[str]:
+    for kind, prefix in KINDS:
+        if message.startswith(prefix):
+            return kind
+    return None
+
+
+def read_capture(path: str) -> CaptureChunk:
+    """Collect ``PerfSample`` records and ``[PerfHarness]`` warnings from ``path``."""
+
+    chunk = CaptureChunk(path)
+    columns = chunk.columns
+    with open_log(path) as handle:
+        for line in handle:
+            if len(line) > MAX_LINE_BYTES:
+                continue
+            pos = line.find(SAMPLE_PREFIX)
+            if pos >= 0:
+                payload = line[pos + len(SAMPLE_PREFIX):]
+            elif line.lstrip().startswith(b"{"):
+                payload = line
+            else:
+                pos = line.find(WARNING_PREFIX)
+                if pos >= 0:
+                    message = line[pos + len(WARNING_PREFIX):].decode("utf-8", "replace").strip()
+                    chunk.warnings[classify_warning(message) or "other"] += 1
+                continue
+            try:
+                sample = json.loads(payload)
+            except ValueError:
+                sample = None
+            if not isinstance(sample, dict) or "dtMax" not in sample:
+                chunk.malformed += 1
+                continue
+            chunk.timestamps.append(_number(sample.get("timestamp")))
+            for name, _, _ in METRICS:
+                columns[name].append(_number(sample.get(name)))
+            budgets = sample.get("budgets")
+            if isinstance(budgets, dict):
+                chunk.budgets[tuple(_number(budgets.get(key)) for key in SAMPLE_BUDGET_KEYS)] += 1
+    return chunk
+
+
+@dataclass
+class Run:
+    """All samples of one capture as column arrays on a continuous timeline."""
+
+    files: List[str]
+    elapsed: np.ndarray
+    columns: Dict[str, np.ndarray]
+    budgets: Counter
+    warnings: Counter
+    malformed: int
+
+    @property
+    def samples(self) -> int:
+        return int(self.elapsed.size)
+
+
+def load_run(paths: Sequence[str], budgets: Budgets, jobs: Optional[int] = None) -> Run:
+    """Read every capture under ``paths`` (files in parallel, kept in order).
+
+    ``timestamp`` is ``os.clock()`` on the server, so it restarts with each
+    server. Elapsed time advances by the timestamp delta and by one sample
+    interval across a reset or a missing timestamp.
+    """
+
+    files = expand_inputs(paths)
+    chunks = list(map_shards(read_capture, files, jobs))
+    stamps = np.array([t for chunk in chunks for t in chunk.timestamps], dtype=np.float64)
+    columns = {
+        name: np.array([v for chunk in chunks for v in chunk.columns[name]], dtype=np.float64)
+        for name, _, _ in METRICS
+    }
+    steps = np.diff(stamps, prepend=np.nan)
+    steps[~(steps > 0)] = budgets.sample_interval
+    elapsed = np.cumsum(steps) - budgets.sample_interval if steps.size else steps
+    budget_counts: Counter = Counter()
+    warnings: Counter = Counter()
+    for chunk in chunks:
+        budget_counts.update(chunk.budgets)
+        warnings.update(chunk.warnings)
+    return Run(
+        files=files,
+        elapsed=elapsed,
+        columns=columns,
+        budgets=budget_counts,
+        warnings=warnings,
+        malformed=sum(chunk.malformed for chunk in chunks),
+    )
+
+
+# -- analysis --------------------------------------------------------------------
+
+
+def violations(run: Run, budgets: Budgets) -> Dict[str, np.ndarray]:
+    """Per-sample flags for each warning kind, mirroring the harness checks.
+
+    The frame checks are an ``if``/``elseif`` pair in the harness, so a sample
+    over the frame-max budget never counts as a frame-average violation.
+    """
+
+    cols = run.columns
+    frame = cols["dtMax"] > budgets.frame_max
+    return {
+        "frame": frame,
+        "frameAvg": ~frame & (cols["dtAverage"] > budgets.frame_average),
+        "gc": cols["gcDeltaMb"] > budgets.gc_delta,
+        "projectile": cols["projectileParts"] > budgets.projectiles,
+        "vfx": cols["vfxInstances"] > budgets.vfx,
+    }
+
+
+def window_bounds(run: Run, window: float) -> List[Tuple[int, int]]:
+    """Index ranges ``[start, end)`` of the samples in each window."""
+
+    if not run.samples:
+        return []
+    ids = np.floor(run.elapsed / window).astype(np.int64)
+    edges = np.flatnonzero(np.diff(ids)) + 1
+    starts = np.concatenate(([0], edges))
+    ends = np.concatenate((edges, [run.samples]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _quantiles(values: np.ndarray, quantiles: Sequence[float]) -> List[Optional[float]]:
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return [None] * len(quantiles)
+    return [float(v) for v in np.quantile(finite, quantiles)]
+
+
+def window_table(run: Run, budgets: Budgets, window: float, quantiles: Sequence[float]) -> List[Dict[str, Any]]:
+    """One row per window with metric quantiles (display units) and violation rates."""
+
+    flags = violations(run, budgets)
+    rows = []
+    for start, end in window_bounds(run, window):
+        row: Dict[str, Any] = {
+            "start": float(run.elapsed[start]),
+            "end": float(run.elapsed[end - 1]),
+            "samples": end - start,
+            "metrics": {},
+            "violations": {},
+        }
+        for name, _, scale in METRICS:
+            values = _quantiles(run.columns[name][start:end], quantiles)
+            row["metrics"][name] = [None if v is None else v * scale for v in values]
+        for kind, _ in KINDS:
+            row["violations"][kind] = float(flags[kind][start:end].mean())
+        rows.append(row)
+    return rows
+
+
+def budget_mismatches(run: Run, budgets: Budgets) -> Dict[Tuple[float, ...], int]:
+    """Sample budget tuples that differ from the source budgets, with counts."""
+
+    expected = tuple(getattr(budgets, attribute) for attribute in SAMPLE_BUDGET_KEYS.values())
+    return {
+        seen: count
+        for seen, count in run.budgets.items()
+        if not all(math.isclose(a, b, rel_tol=1e-9) for a, b in zip(seen, expected))
+    }
+
+
+def summarise(run: Run, budgets: Budgets, window: float, quantiles: Sequence[float]) -> Dict[str, Any]:
+    rows = window_table(run, budgets, window, quantiles)
+    flags = violations(run, budgets)
+    metrics = {}
+    for name, label, scale in METRICS:
+        values = run.columns[name]
+        finite = values[np.isfinite(values)]
+        overall = _quantiles(values, quantiles)
+        worst = [row["metrics"][name][-1] for row in rows if row["metrics"][name][-1] is not None]
+        metrics[name] = {
+            "label": label,
+            "count": int(finite.size),
+            "mean": float(finite.mean()) * scale if finite.size else None,
+            "max": float(finite.max()) * scale if finite.size else None,
+            "quantiles": {f"p{q * 100:g}": None if v is None else v * scale for q, v in zip(quantiles, overall)},
+            "worst_window": max(worst) if worst else None,
+        }
+    rates = {}
+    for kind, _ in KINDS:
+        per_window = [row["violations"][kind] for row in rows]
+        worst_index = int(np.argmax(per_window)) if per_window else None
+        rates[kind] = {
+            "samples": int(flags[kind].sum()),
+            "rate": float(flags[kind].mean()) if run.samples else 0.0,
+            "worst_window_rate": per_window[worst_index] if worst_index is not None else 0.0,
+            "worst_window_start": rows[worst_index]["start"] if worst_index is not None else None,
+            "printed": run.warnings.get(kind, 0),
+        }
+    return {
+        "files": len(run.files),
+        "samples": run.samples,
+        "malformed": run.malformed,
+        "duration": float(run.elapsed[-1]) + budgets.sample_interval if run.samples else 0.0,
+        "window": window,
+        "windows": len(rows),
+        "budgets": budgets.__dict__,
+        "budget_mismatches": [
+            {"budgets": dict(zip(SAMPLE_BUDGET_KEYS, seen)), "samples": count}
+            for seen, count in budget_mismatches(run, budgets).items()
+        ],
+        "metrics": metrics,
+        "violations": rates,
+        "other_warnings": run.warnings.get("other", 0),
+        "window_rows": rows,
+    }
+
+
+# -- significance testing --------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TestResult:
+    baseline: Optional[float]
+    candidate: Optional[float]
+    superiority: Optional[float]
+    z: Optional[float]
+    p_value: Optional[float]
+
+
+def mann_whitney(baseline: np.ndarray, candidate: np.ndarray) -> TestResult:
+    """Two-sided Mann-Whitney U test (normal approximation, tie-corrected).
+
+    ``superiority`` is P(candidate > baseline) + P(tie) / 2, so 0.5 means no
+    shift and values above 0.5 mean the candidate tends to be larger.
+    """
+
+    a = baseline[np.isfinite(baseline)]
+    b = candidate[np.isfinite(candidate)]
+    medians = (float(np.median(a)) if a.size else None, float(np.median(b)) if b.size else None)
+    if not a.size or not b.size:
+        return TestResult(*medians, None, None, None)
+    n1, n2 = a.size, b.size
+    combined = np.concatenate((a, b))
+    _, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+    # Average 1-based rank of each distinct value.
+    average_rank = np.cumsum(counts) - (counts - 1) / 2.0
+    rank_sum = float(average_rank[inverse[n1:]].sum())
+    u = rank_sum - n2 * (n2 + 1) / 2.0
+    superiority = u / (n1 * n2)
+    n = n1 + n2
+    tie_term = float((counts.astype(np.float64) ** 3 - counts).sum()) / (n * (n - 1)) if n > 1 else 0.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return TestResult(*medians, superiority, 0.0, 1.0)
+    delta = u - n1 * n2 / 2.0
+    z = (delta - math.copysign(0.5, delta)) / math.sqrt(variance) if delta else 0.0
+    return TestResult(*medians, superiority, z, math.erfc(abs(z) / math.sqrt(2)))
+
+
+def window_statistic(run: Run, bounds: List[Tuple[int, int]], name: str, stat: float) -> np.ndarray:
+    values = run.columns[name]
+    out = np.full(len(bounds), np.nan)
+    for index, (start, end) in enumerate(bounds):
+        part = values[start:end]
+        part = part[np.isfinite(part)]
+        if part.size:
+            out[index] = np.quantile(part, stat)
+    return out
+
+
+def compare(
+    baseline: Run,
+    candidate: Run,
+    budgets: Budgets,
+    window: float,
+    stat: float,
+    alpha: float,
+) -> Dict[str, Any]:
+    """Test every metric (per-window ``stat`` quantile) and violation rate."""
+
+    base_bounds = window_bounds(baseline, window)
+    cand_bounds = window_bounds(candidate, window)
+    base_flags = violations(baseline, budgets)
+    cand_flags = violations(candidate, budgets)
+    rows = []
+
+    def add(name: str, label: str, scale: float, result: TestResult) -> None:
+        worse = result.superiority is not None and result.superiority > 0.5
+        significant = result.p_value is not None and result.p_value < alpha
+        rows.append(
+            {
+                "name": name,
+                "label": label,
+                "baseline": None if result.baseline is None else result.baseline * scale,
+                "candidate": None if result.candidate is None else result.candidate * scale,
+                "superiority": result.superiority,
+                "z": result.z,
+                "p_value": result.p_value,
+                "verdict": ("regression" if worse else "improvement") if significant else "no change",
+            }
+        )
+
+    for name, label, scale in METRICS:
+        add(
+            name,
+            f"{label} p{stat * 100:g}",
+            scale,
+            mann_whitney(
+                window_statistic(baseline, base_bounds, name, stat),
+                window_statistic(candidate, cand_bounds, name, stat),
+            ),
+        )
+    for kind, _ in KINDS:
+        base_rates = np.array([base_flags[kind][s:e].mean() for s, e in base_bounds])
+        cand_rates = np.array([cand_flags[kind][s:e].mean() for s, e in cand_bounds])
+        add(f"violations.{kind}", f"{kind} violation rate (%)", 100.0, mann_whitney(base_rates, cand_rates))
+    return {
+        "window": window,
+        "stat": stat,
+        "alpha": alpha,
+        "windows": {"baseline": len(base_bounds), "candidate": len(cand_bounds)},
+        "samples": {"baseline": baseline.samples, "candidate": candidate.samples},
+        "results": rows,
+        "regressions": [row["name"] for row in rows if row["verdict"] == "regression"],
+    }
+
+
+# -- output ----------------------------------------------------------------------
+
+
+def _format(value: Optional[float], digits: int = 1) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    return f"{value:.{digits}f}"
+
+
+def _minutes(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    return f"{seconds / 60:.1f}m"
+
+
+def print_budgets(budgets: Budgets, source: Path) -> None:
+    print(
+        f"Budgets from {source.name}: frame max {budgets.frame_max * 1000:.1f} ms, "
+        f"frame avg {budgets.frame_average * 1000:.1f} ms, GC delta {budgets.gc_delta:g} MB, "
+        f"projectiles {budgets.projectiles:g}, VFX {budgets.vfx:g}"
+    )
+
+
+def print_mismatches(run: Run, budgets: Budgets, label: str = "") -> None:
+    for seen, count in budget_mismatches(run, budgets).items():
+        print(
+            f"warning: {count} {label}sample(s) carry budgets {dict(zip(SAMPLE_BUDGET_KEYS, seen))} "
+            "that differ from the harness source",
+            file=sys.stderr,
+        )
+
+
+def print_summary(doc: Dict[str, Any], quantiles: Sequence[float], show_windows: bool) -> None:
+    print(
+        f"{doc['samples']:,} samples from {doc['files']} file(s) over {_minutes(doc['duration'])} "
+        f"({doc['windows']} window(s) of {doc['window']:g}s), {doc['malformed']} malformed"
+    )
+    labels = [f"p{q * 100:g}" for q in quantiles]
+    header = "".join(f"{label:>10}" for label in labels)
+    print(f"\n{'metric':<20}{header}{'max':>10}{'worst win':>11}")
+    for name, metric in doc["metrics"].items():
+        if not metric["count"]:
+            continue
+        values = "".join(f"{_format(metric['quantiles'][label]):>10}" for label in labels)
+        print(f"{metric['label']:<20}{values}{_format(metric['max']):>10}{_format(metric['worst_window']):>11}")
+    print(f"\n{'violation':<20}{'samples':>10}{'rate':>10}{'worst win':>11}{'at':>9}{'printed':>9}")
+    for kind, rate in doc["violations"].items():
+        print(
+            f"{kind:<20}{rate['samples']:>10}{rate['rate'] * 100:>9.2f}%{rate['worst_window_rate'] * 100:>10.1f}%"
+            f"{_minutes(rate['worst_window_start']):>9}{rate['printed']:>9}"
+        )
+    if show_windows:
+        print(f"\n{'window':<10}{'n':>5}" + "".join(f"{label[:14]:>16}" for _, label, _ in METRICS[:5]) + "  violations")
+        for row in doc["window_rows"]:
+            cells = "".join(f"{_format(row['metrics'][name][-1]):>16}" for name, _, _ in METRICS[:5])
+            fired = ",".join(f"{kind}={rate * 100:.0f}%" for kind, rate in row["violations"].items() if rate)
+            print(f"{_minutes(row['start']):<10}{row['samples']:>5}{cells}  {fired or '-'}")
+
+
+def print_comparison(doc: Dict[str, Any]) -> None:
+    windows = doc["windows"]
+    print(
+        f"Windows of {doc['window']:g}s: baseline {windows['baseline']}, candidate {windows['candidate']}; "
+        f"Mann-Whitney U, alpha {doc['alpha']:g}"
+    )
+    print(f"\n{'measure':<34}{'baseline':>10}{'candidate':>11}{'P(c>b)':>8}{'p':>10}  verdict")
+    for row in doc["results"]:
+        if row["baseline"] is None and row["candidate"] is None:
+            continue
+        p_value = "-" if row["p_value"] is None else f"{row['p_value']:.2g}"
+        print(
+            f"{row['label']:<34}{_format(row['baseline'], 2):>10}{_format(row['candidate'], 2):>11}"
+            f"{_format(row['superiority'], 2):>8}{p_value:>10}  {row['verdict']}"
+        )
+    if doc["regressions"]:
+        print(f"\nRegressions: {', '.join(doc['regressions'])}")
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=HARNESS_SOURCE, help="PerfHarness.server.lua to read budgets from")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="Window length in seconds (default: 60)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    summary = sub.add_parser("summary", help="Windowed percentiles and violation rates for one run")
+    summary.add_argument("inputs", nargs="+", help="Capture files or directories (plain or .gz)")
+    summary.add_argument(
+        "--quantiles",
+        default=",".join(f"{q:g}" for q in DEFAULT_QUANTILES),
+        help="Comma-separated quantiles to report (default: 0.5,0.95,0.99)",
+    )
+    summary.add_argument("--windows", action="store_true", help="Also print one row per window")
+
+    comparison = sub.add_parser("compare", help="Test a candidate run against a baseline run")
+    comparison.add_argument("baseline", help="Baseline capture file or directory")
+    comparison.add_argument("candidate", help="Candidate capture file or directory")
+    comparison.add_argument("--stat", type=float, default=0.95, help="Per-window quantile compared for metrics (default: 0.95)")
+    comparison.add_argument("--alpha", type=float, default=0.01, help="Significance level (default: 0.01)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.window <= 0:
+        print("error: --window must be positive", file=sys.stderr)
+        return 1
+    try:
+        budgets = load_budgets(args.source)
+        if args.command == "summary":
+            runs = {"": load_run(args.inputs, budgets, args.jobs)}
+        else:
+            runs = {
+                "baseline ": load_run([args.baseline], budgets, args.jobs),
+                "candidate ": load_run([args.candidate], budgets, args.jobs),
+            }
+    except (OSError, HarnessError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    for label, run in runs.items():
+        if not run.samples:
+            print(f"error: no PerfSample records found in the {label}capture", file=sys.stderr)
+            return 1
+        print_mismatches(run, budgets, label)
+
+    if args.command == "summary":
+        quantiles = [float(part) for part in args.quantiles.split(",") if part.strip()]
+        doc = summarise(runs[""], budgets, args.window, quantiles)
+        if args.json:
+            print(json.dumps(doc, indent=2))
+        else:
+            print_budgets(budgets, args.source)
+            print_summary(doc, quantiles, args.windows)
+        return 0
+
+    doc = compare(runs["baseline "], runs["candidate "], budgets, args.window, args.stat, args.alpha)
+    if args.json:
+        print(json.dumps(doc, indent=2))
+    else:
+        print_budgets(budgets, args.source)
+        print_comparison(doc)
+    return 1 if doc["regressions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
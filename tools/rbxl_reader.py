@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""Lazily inspect binary Roblox place files (``<roblox!`` ``.rbxl``).
+
+The file is memory-mapped and only its chunk headers are read up front. INST
+and PROP chunks are indexed by class id and property name by decoding just the
+first few bytes of their LZ4 stream, so a query such as "every Script source"
+decompresses only the Source/Name PROP chunks it touches, the (small) INST
+chunks that map referents to classes and the single PRNT chunk; the bulk of
+the property data is never decoded. LZ4 blocks are decoded in pure Python;
+zstd-compressed chunks need the optional ``zstandard`` package.
+
+Usage::
+
+    python tools/rbxl_reader.py chunks            # chunk table, no decompression
+    python tools/rbxl_reader.py scripts [--source] [--json]
+    python tools/rbxl_reader.py hashes [--json]
+    python tools/rbxl_reader.py drift [--json]    # place scripts vs Rojo tree
+
+``drift`` maps each embedded script to its DataModel path and compares it with
+the ``.lua`` file that ``default.project.json`` syncs to the same instance.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from rojo_project import ProjectTree
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PLACE = REPO_ROOT / "FruitSmash_V2.rbxl"
+
+MAGIC = b"<roblox!"
+SIGNATURE = b"\x89\xff\r\n\x1a\n"
+HEADER_SIZE = 32
+CHUNK_HEADER_SIZE = 16
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+SCRIPT_CLASSES = ("Script", "LocalScript", "ModuleScript")
+# Property type ids whose values are length-prefixed byte strings.
+STRING_TYPES = {0x01, 0x1D}
+ROOT_REFERENT = -1
+
+
+class PlaceFormatError(ValueError):
+    """Raised when the place file does not follow the binary format."""
+
+
+def lz4_block_decompress(src: bytes, limit: Optional[int] = None) -> bytes:
+    """Decode a raw LZ4 block, stopping early once ``limit`` bytes exist."""
+
+    dst = bytearray()
+    pos = 0
+    end = len(src)
+    while pos < end:
+        token = src[pos]
+        pos += 1
+        literal = token >> 4
+        if literal == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                literal += extra
+                if extra != 255:
+                    break
+        dst += src[pos:pos + literal]
+        pos += literal
+        if pos >= end or (limit is not None and len(dst) >= limit):
+            break
+        offset = src[pos] | (src[pos + 1] << 8)
+        pos += 2
+        if offset == 0 or offset > len(dst):
+            raise PlaceFormatError("Corrupt LZ4 block: invalid match offset")
+        match = token & 15
+        if match == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                match += extra
+                if extra != 255:
+                    break
+        match += 4
+        start = len(dst) - offset
+        if offset >= match:
+            dst += dst[start:start + match]
+        else:
+            # Overlapping copy: the match repeats the last ``offset`` bytes.
+            pattern = bytes(dst[start:])
+            dst += (pattern * (match // offset + 1))[:match]
+        if limit is not None and len(dst) >= limit:
+            break
+    return bytes(dst)
+
+
+def zstd_decompress(src: bytes, size: int) -> bytes:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise PlaceFormatError(
+            "Chunk is zstd-compressed; install the 'zstandard' package to read it"
+        ) from exc
+    return zstandard.ZstdDecompressor().decompress(src, max_output_size=size)
+
+
+@dataclass(frozen=True)
+class Chunk:
+    name: str
+    offset: int
+    compressed_length: int
+    uncompressed_length: int
+
+    @property
+    def data_offset(self) -> int:
+        return self.offset + CHUNK_HEADER_SIZE
+
+    @property
+    def stored_length(self) -> int:
+        return self.compressed_length or self.uncompressed_length
+
+
+class Cursor:
+    """Little-endian reader over a decompressed chunk payload."""
+
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def u8(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def u32(self) -> int:
+        (value,) = struct.unpack_from("<I", self.data, self.pos)
+        self.pos += 4
+        return value
+
+    def string(self) -> bytes:
+        length = self.u32()
+        value = self.data[self.pos:self.pos + length]
+        if len(value) != length:
+            raise PlaceFormatError("Truncated string in chunk payload")
+        self.pos += length
+        return bytes(value)
+
+    def interleaved_i32(self, count: int) -> List[int]:
+        """Decode ``count`` byte-interleaved, zigzag-encoded 32-bit integers."""
+
+        raw = self.data[self.pos:self.pos + 4 * count]
+        if len(raw) != 4 * count:
+            raise PlaceFormatError("Truncated integer array in chunk payload")
+        self.pos += 4 * count
+        planes = [raw[i * count:(i + 1) * count] for i in range(4)]
+        values = []
+        for b0, b1, b2, b3 in zip(*planes):
+            encoded = (b0 << 24) | (b1 << 16) | (b2 << 8) | b3
+            values.append((encoded >> 1) ^ -(encoded & 1))
+        return values
+
+    def referents(self, count: int) -> List[int]:
+        total = 0
+        result = []
+        for delta in self.interleaved_i32(count):
+            total += delta
+            result.append(total)
+        return result
+
+
+@dataclass
+class ClassInfo:
+    class_id: int
+    name: str
+    chunk: Chunk
+    referents: Optional[List[int]] = None
+    props: Dict[str, Chunk] = field(default_factory=dict)
+
+
+@dataclass
+class ScriptRecord:
+    referent: int
+    class_name: str
+    path: Tuple[str, ...]
+    source: bytes
+
+    @property
+    def dotted_path(self) -> str:
+        return ".".join(self.path)
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.source).hexdigest()
+
+    @property
+    def lines(self) -> int:
+        if not self.source:
+            return 0
+        return self.source.count(b"\n") + (0 if self.source.endswith(b"\n") else 1)
+
+
+class PlaceFile:
+    """Memory-mapped view of a binary place with lazily decoded chunks."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._handle = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._handle.close()
+            raise
+        self.class_count = 0
+        self.instance_count = 0
+        self.chunks: List[Chunk] = []
+        self.classes: Dict[int, ClassInfo] = {}
+        self._class_by_name: Dict[str, List[ClassInfo]] = {}
+        self._parents: Optional[Dict[int, int]] = None
+        self._names: Dict[int, bytes] = {}
+        self._named_classes: set = set()
+        self._referent_class: Optional[Dict[int, int]] = None
+        self._read_header()
+        self._index_chunks()
+
+    def __enter__(self) -> "PlaceFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+        self._handle.close()
+
+    # -- chunk index -----------------------------------------------------
+
+    def _read_header(self) -> None:
+        header = self._map[:HEADER_SIZE]
+        if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+            raise PlaceFormatError(f"{self.path} is not a binary Roblox place/model")
+        if header[8:14] != SIGNATURE:
+            raise PlaceFormatError(f"{self.path} has a damaged binary signature")
+        version, self.class_count, self.instance_count = struct.unpack_from("<Hii", header, 14)
+        if version != 0:
+            raise PlaceFormatError(f"Unsupported binary format version {version}")
+
+    def _index_chunks(self) -> None:
+        pos = HEADER_SIZE
+        size = len(self._map)
+        while pos + CHUNK_HEADER_SIZE <= size:
+            raw_name, compressed, uncompressed, _ = struct.unpack_from("<4sIII", self._map, pos)
+            chunk = Chunk(raw_name.rstrip(b"\x00").decode("ascii"), pos, compressed, uncompressed)
+            if chunk.data_offset + chunk.stored_length > size:
+                raise PlaceFormatError(f"Chunk {chunk.name} at {pos} runs past end of file")
+            self.chunks.append(chunk)
+            pos = chunk.data_offset + chunk.stored_length
+            if chunk.name == "END":
+                break
+
+        for chunk in self.chunks:
+            if chunk.name == "INST":
+                cursor = Cursor(self.peek(chunk, 4))
+                class_id = cursor.u32()
+                name_length = Cursor(self.peek(chunk, 8), 4).u32()
+                name = Cursor(self.peek(chunk, 8 + name_length), 4).string().decode("utf-8")
+                info = ClassInfo(class_id, name, chunk)
+                self.classes[class_id] = info
+                self._class_by_name.setdefault(name, []).append(info)
+        for chunk in self.chunks:
+            if chunk.name == "PROP":
+                class_id = Cursor(self.peek(chunk, 4)).u32()
+                name_length = Cursor(self.peek(chunk, 8), 4).u32()
+                prop = Cursor(self.peek(chunk, 8 + name_length), 4).string().decode("utf-8")
+                info = self.classes.get(class_id)
+                if info is None:
+                    raise PlaceFormatError(f"PROP chunk references unknown class id {class_id}")
+                info.props[prop] = chunk
+
+    def peek(self, chunk: Chunk, length: int) -> bytes:
+        """Return the first ``length`` decompressed bytes of ``chunk``.
+
+        LZ4 streams open with literals, so the class id / name headers used for
+        indexing come out of the first token without decoding the rest.
+        """
+
+        stored = self._map[chunk.data_offset:chunk.data_offset + chunk.stored_length]
+        if not chunk.compressed_length:
+            return stored[:length]
+        if stored[:4] == ZSTD_MAGIC:
+            return zstd_decompress(stored, chunk.uncompressed_length)[:length]
+        return lz4_block_decompress(stored, limit=length)[:length]
+
+    def payload(self, chunk: Chunk) -> bytes:
+        stored = self._map[chunk.data_offset:chunk.data_offset + chunk.stored_length]
+        if not chunk.compressed_length:
+            return stored
+        if stored[:4] == ZSTD_MAGIC:
+            data = zstd_decompress(stored, chunk.uncompressed_length)
+        else:
+            data = lz4_block_decompress(stored)
+        if len(data) != chunk.uncompressed_length:
+            raise PlaceFormatError(
+                f"{chunk.name} chunk at {chunk.offset} decompressed to {len(data)} bytes, "
+                f"expected {chunk.uncompressed_length}"
+            )
+        return data
+
+    # -- instance data ---------------------------------------------------
+
+    def class_referents(self, info: ClassInfo) -> List[int]:
+        if info.referents is None:
+            cursor = Cursor(self.payload(info.chunk))
+            cursor.u32()
+            cursor.string()
+            cursor.u8()  # object format (1 for services)
+            count = cursor.u32()
+            info.referents = cursor.referents(count)
+        return info.referents
+
+    def string_property(self, info: ClassInfo, prop: str) -> List[bytes]:
+        """Return ``prop`` for every instance of ``info`` (empty if absent)."""
+
+        chunk = info.props.get(prop)
+        if chunk is None:
+            return []
+        cursor = Cursor(self.payload(chunk))
+        cursor.u32()
+        cursor.string()
+        type_id = cursor.u8()
+        if type_id not in STRING_TYPES:
+            raise PlaceFormatError(f"{info.name}.{prop} has non-string type 0x{type_id:02x}")
+        return [cursor.string() for _ in self.class_referents(info)]
+
+    def parents(self) -> Dict[int, int]:
+        if self._parents is None:
+            chunk = next((c for c in self.chunks if c.name == "PRNT"), None)
+            if chunk is None:
+                raise PlaceFormatError("Place has no PRNT chunk")
+            cursor = Cursor(self.payload(chunk))
+            version = cursor.u8()
+            if version != 0:
+                raise PlaceFormatError(f"Unsupported PRNT version {version}")
+            count = cursor.u32()
+            children = cursor.referents(count)
+            parents = cursor.referents(count)
+            self._parents = dict(zip(children, parents))
+        return self._parents
+
+    def _referent_classes(self) -> Dict[int, int]:
+        """Map referents to class ids (decompresses every INST chunk once)."""
+
+        if self._referent_class is None:
+            mapping: Dict[int, int] = {}
+            for info in self.classes.values():
+                for referent in self.class_referents(info):
+                    mapping[referent] = info.class_id
+            self._referent_class = mapping
+        return self._referent_class
+
+    def name_of(self, referent: int) -> str:
+        if referent not in self._names:
+            class_id = self._referent_classes()[referent]
+            info = self.classes[class_id]
+            if class_id not in self._named_classes:
+                self._named_classes.add(class_id)
+                names = self.string_property(info, "Name")
+                self._names.update(zip(self.class_referents(info), names))
+            self._names.setdefault(referent, info.name.encode("utf-8"))
+        return self._names[referent].decode("utf-8", errors="replace")
+
+    def instance_path(self, referent: int) -> Tuple[str, ...]:
+        parents = self.parents()
+        path: List[str] = []
+        seen = set()
+        current = referent
+        while current != ROOT_REFERENT and current not in seen:
+            seen.add(current)
+            path.append(self.name_of(current))
+            current = parents.get(current, ROOT_REFERENT)
+        return tuple(reversed(path))
+
+    def iter_scripts(self) -> Iterator[ScriptRecord]:
+        for class_name in SCRIPT_CLASSES:
+            for info in self._class_by_name.get(class_name, []):
+                sources = self.string_property(info, "Source")
+                referents = self.class_referents(info)
+                if not sources:
+                    sources = [b""] * len(referents)
+                for referent, source in zip(referents, sources):
+                    yield ScriptRecord(referent, class_name, self.instance_path(referent), source)
+
+
+def normalise_source(data: bytes) -> bytes:
+    return data.replace(b"\r\n", b"\n").rstrip(b"\n")
+
+
+def drift_report(place: PlaceFile, repo_root: Path) -> Dict[str, object]:
+    """Compare embedded scripts with the files Rojo would sync to them.
+
+    Sources are compared after normalising CRLF line endings and trailing
+    newlines, which Studio and Rojo do not preserve consistently.
+    """
+
+    project = ProjectTree(repo_root).script_index()
+    report: Dict[str, List[dict]] = {
+        "changed": [],
+        "missing_in_repo": [],
+        "missing_in_place": [],
+        "duplicate_in_place": [],
+    }
+    seen: Dict[Tuple[str, ...], ScriptRecord] = {}
+    unchanged = 0
+    for script in place.iter_scripts():
+        if script.path in seen:
+            report["duplicate_in_place"].append(
+                {"instance": script.dotted_path, "class": script.class_name}
+            )
+            continue
+        seen[script.path] = script
+        rel_path = project.get(script.path)
+        if rel_path is None:
+            entry = {"instance": script.dotted_path, "class": script.class_name, "sha256": script.sha256}
+            # Older builds kept Rojo's ``.server``/``.client`` suffix in the
+            # instance name; point at the file it most likely came from.
+            stem, _, suffix = script.path[-1].rpartition(".")
+            if stem and suffix in ("server", "client"):
+                candidate = project.get(script.path[:-1] + (stem,))
+                if candidate:
+                    entry["candidate"] = candidate
+            report["missing_in_repo"].append(entry)
+            continue
+        file_bytes = (repo_root / rel_path).read_bytes()
+        if normalise_source(file_bytes) == normalise_source(script.source):
+            unchanged += 1
+            continue
+        report["changed"].append(
+            {
+                "instance": script.dotted_path,
+                "path": rel_path,
+                "place_sha256": script.sha256,
+                "file_sha256": hashlib.sha256(file_bytes).hexdigest(),
+                "place_lines": script.lines,
+                "file_lines": ScriptRecord(0, "", (), file_bytes).lines,
+            }
+        )
+    for instance, rel_path in sorted(project.items(), key=lambda item: item[1]):
+        if instance not in seen:
+            report["missing_in_place"].append({"instance": ".".join(instance), "path": rel_path})
+    summary = {"unchanged": unchanged, **{key: len(value) for key, value in report.items()}}
+    return {"summary": summary, **report}
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--place", type=Path, default=DEFAULT_PLACE, help="Binary place file to read")
+    common.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root for drift checks")
+    common.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("chunks", parents=[common], help="List chunk headers without decompressing")
+    scripts = sub.add_parser(
+        "scripts", parents=[common], help="List embedded Script/LocalScript/ModuleScript instances"
+    )
+    scripts.add_argument("--source", action="store_true", help="Include script sources")
+    sub.add_parser("hashes", parents=[common], help="Print the SHA-256 of every embedded script source")
+    sub.add_parser("drift", parents=[common], help="Compare embedded scripts with the Rojo-synced .lua files")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        place = PlaceFile(args.place)
+    except (OSError, PlaceFormatError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    with place:
+        if args.command == "chunks":
+            rows = [
+                {
+                    "name": chunk.name,
+                    "offset": chunk.offset,
+                    "compressed": chunk.compressed_length,
+                    "uncompressed": chunk.uncompressed_length,
+                }
+                for chunk in place.chunks
+            ]
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print(f"{place.class_count} classes, {place.instance_count} instances, {len(rows)} chunks")
+                for row in rows:
+                    print(f"{row['offset']:>8}  {row['name']:<4}  {row['compressed']:>7}  {row['uncompressed']:>7}")
+            return 0
+
+        if args.command in ("scripts", "hashes"):
+            records = sorted(place.iter_scripts(), key=lambda record: record.path)
+            if args.json:
+                rows = []
+                for record in records:
+                    row = {"instance": record.dotted_path, "class": record.class_name}
+                    if args.command == "hashes":
+                        row["sha256"] = record.sha256
+                    else:
+                        row["lines"] = record.lines
+                        if args.source:
+                            row["source"] = record.source.decode("utf-8", errors="replace")
+                    rows.append(row)
+                print(json.dumps(rows, indent=2, ensure_ascii=False))
+            elif args.command == "hashes":
+                for record in records:
+                    print(f"{record.sha256}  {record.dotted_path}")
+            else:
+                for record in records:
+                    print(f"{record.class_name:<12} {record.lines:>6}  {record.dotted_path}")
+                    if args.source:
+                        print(record.source.decode("utf-8", errors="replace"))
+            return 0
+
+        report = drift_report(place, args.root.resolve())
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        summary = report["summary"]
+        print(
+            "Drift: {unchanged} unchanged, {changed} changed, {missing_in_repo} only in place, "
+            "{missing_in_place} only in repo, {duplicate_in_place} duplicate".format(**summary)
+        )
+        for item in report["changed"]:
+            print(f"- changed: {item['instance']} <-> {item['path']} "
+                  f"({item['place_lines']} vs {item['file_lines']} lines)")
+        for item in report["missing_in_repo"]:
+            hint = f" -> likely {item['candidate']}" if "candidate" in item else ""
+            print(f"- only in place: {item['instance']} ({item['class']}){hint}")
+        for item in report["missing_in_place"]:
+            print(f"- only in repo: {item['path']} ({item['instance']})")
+        for item in report["duplicate_in_place"]:
+            print(f"- duplicate in place: {item['instance']}")
+    return 1 if any(report[key] for key in ("changed", "missing_in_repo", "duplicate_in_place")) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
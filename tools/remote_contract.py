@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""Verify remote usage against the RemoteBootstrap contract in one pass over the tree.
+
+``ReplicatedStorage/Remotes/RemoteBootstrap.lua`` creates the frozen set of
+remotes through ``getOrCreateEvent("RE_...")`` and
+``getOrCreateFunction("RF_...")``. Every synced script is lexed once, and
+each token is handled once:
+
+* string literals are scanned with an Aho-Corasick automaton over the
+  contract names, so ``"RE_TargetHP"`` and names embedded in longer strings
+  (``"Remotes/RE_TargetHP"``) count as references. The cost is linear in the
+  literal text, whatever the number of names;
+* ``Remotes.X`` on a local bound to ``require(...RemoteBootstrap)``, and
+  ``WaitForChild``/``FindFirstChild`` lookups on a remotes folder, are remote
+  lookups. Literals shaped like ``RE_X``/``RF_X`` are treated as lookups too;
+* remotes created elsewhere (``Instance.new("RemoteEvent")`` with a ``.Name``,
+  or helpers called with ``"RemoteEvent"``/``"RemoteFunction"``) extend the
+  known set;
+* ``FireServer``/``OnClientEvent``/``InvokeServer``/... on a remote, directly
+  or through a local bound on the same line, record which side uses which API.
+
+It reports errors for unknown remote names, a client/server API used on the
+wrong side, and event APIs on functions (or the reverse). It warns about unused
+contract remotes and remotes that only one side ever touches.
+
+Usage::
+
+    python tools/remote_contract.py [--json] [--strict]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError, Token
+from rojo_project import ProjectTree
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_DIR = REPO_ROOT / "manifest"
+if str(MANIFEST_DIR) not in sys.path:
+    sys.path.append(str(MANIFEST_DIR))
+from generate_dependencies import layer_for  # noqa: E402
+
+CONTRACT_SOURCE = "ReplicatedStorage/Remotes/RemoteBootstrap.lua"
+CONTRACT_MODULE = "RemoteBootstrap"
+CONTRACT_HELPERS = {"getOrCreateEvent": "RemoteEvent", "getOrCreateFunction": "RemoteFunction"}
+REMOTE_CLASSES = {"RemoteEvent", "RemoteFunction", "UnreliableRemoteEvent"}
+LOOKUP_METHODS = {"WaitForChild", "FindFirstChild"}
+# Locals that conventionally hold the RemoteBootstrap table even when it is required through a pcall wrapper.
+CONTRACT_LOCAL_NAMES = {"remotes", "remotesmodule", "remotebootstrap"}
+REMOTE_NAME = re.compile(r"^R[EF]_[A-Za-z0-9_]+$")
+SERVER_API = {"FireClient", "FireAllClients", "OnServerEvent", "OnServerInvoke", "InvokeClient"}
+CLIENT_API = {"FireServer", "OnClientEvent", "OnClientInvoke", "InvokeServer"}
+FUNCTION_API = {"OnServerInvoke", "InvokeClient", "OnClientInvoke", "InvokeServer"}
+# For one-sided checks: an API use on one side expects one of these on the other.
+COUNTERPARTS = {
+    "FireClient": {"OnClientEvent"},
+    "FireAllClients": {"OnClientEvent"},
+    "OnClientEvent": {"FireClient", "FireAllClients"},
+    "FireServer": {"OnServerEvent"},
+    "OnServerEvent": {"FireServer"},
+    "InvokeServer": {"OnServerInvoke"},
+    "OnServerInvoke": {"InvokeServer"},
+    "InvokeClient": {"OnClientInvoke"},
+    "OnClientInvoke": {"InvokeClient"},
+}
+
+
+class ContractError(ValueError):
+    """Raised when the RemoteBootstrap contract cannot be read."""
+
+
+class PatternAutomaton:
+    """Aho-Corasick automaton over a fixed set of names."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                following = self.goto[state].get(char)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto[state][char] = following
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = following
+            self.output[state].append(pattern)
+        # Breadth-first failure links; the root's children fail back to the root.
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(char, 0)
+                self.output[following] = self.output[following] + self.output[self.fail[following]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(start, pattern)`` for every occurrence in ``text``."""
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                yield index - len(pattern) + 1, pattern
+
+
+def _identifier_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+@dataclass(frozen=True)
+class Site:
+    path: str
+    line: int
+    column: int
+
+
+@dataclass
+class FileScan:
+    """Everything one script says about remotes."""
+
+    path: str
+    layer: str
+    references: Dict[str, List[Site]] = field(default_factory=lambda: defaultdict(list))
+    lookups: Dict[str, List[Site]] = field(default_factory=lambda: defaultdict(list))
+    created: Dict[str, Tuple[str, Site]] = field(default_factory=dict)
+    api: List[Tuple[str, str, Site]] = field(default_factory=list)  # (remote, member, site)
+
+
+@dataclass
+class Issue:
+    severity: str
+    kind: str
+    remote: str
+    message: str
+    sites: List[Site]
+
+
+def read_contract(root: Path) -> Dict[str, str]:
+    """Remote name -> class for every remote RemoteBootstrap creates."""
+
+    source = root / CONTRACT_SOURCE
+    try:
+        tokens = list(Lexer(source.read_text(encoding="utf-8")).tokens())
+    except (OSError, LuauSyntaxError) as exc:
+        raise ContractError(f"{source}: {exc}") from exc
+    contract: Dict[str, str] = {}
+    for index, token in enumerate(tokens[:-3]):
+        if (
+            token.type == "NAME"
+            and token.value in CONTRACT_HELPERS
+            and tokens[index + 1].type == "LPAREN"
+            and tokens[index + 2].type == "STRING"
+        ):
+            contract[tokens[index + 2].value] = CONTRACT_HELPERS[token.value]
+    if not contract:
+        raise ContractError(f"{source}: no getOrCreateEvent/getOrCreateFunction calls found")
+    return contract
+
+
+class _Scanner:
+    """Single forward pass over one script's tokens."""
+
+    def __init__(self, scan: FileScan, tokens: Sequence[Token], automaton: PatternAutomaton, ignored: Set[str]):
+        self.scan = scan
+        self.tokens = tokens
+        self.automaton = automaton
+        self.ignored = ignored
+        self.contract_locals: Set[str] = set()
+        self.bindings: Dict[str, str] = {}  # local -> remote name
+        self.pending_class: Optional[Tuple[str, str]] = None  # (local, remote class) from Instance.new
+
+    def _kind(self, index: int) -> str:
+        return self.tokens[index].type if 0 <= index < len(self.tokens) else "EOF"
+
+    def _value(self, index: int) -> str:
+        return self.tokens[index].value if 0 <= index < len(self.tokens) else ""
+
+    def _site(self, index: int) -> Site:
+        token = self.tokens[index]
+        return Site(self.scan.path, token.line, token.column)
+
+    def run(self) -> None:
+        for index, token in enumerate(self.tokens):
+            if token.type == "STRING":
+                self._string(index)
+            elif token.type == "NAME":
+                self._name(index)
+
+    def _assigned_local(self, index: int) -> Optional[str]:
+        """The ``NAME`` in ``[local] NAME = ...`` on the same line before ``index``, if any."""
+
+        line = self.tokens[index].line
+        cursor = index - 1
+        depth = 0
+        while cursor >= 0 and self.tokens[cursor].line == line:
+            kind = self._kind(cursor)
+            if kind in ("RPAREN", "RBRACKET", "RBRACE"):
+                depth += 1
+            elif kind in ("LPAREN", "LBRACKET", "LBRACE"):
+                depth -= 1
+            elif kind == "ASSIGN" and depth <= 0:
+                target = cursor - 1
+                if self._kind(target) == "NAME" and self._kind(target - 1) not in ("DOT", "COLON"):
+                    return self._value(target)
+                # ``local name: Type = ...``
+                while target >= 0 and self.tokens[target].line == line and self._kind(target) != "KW_LOCAL":
+                    target -= 1
+                if self._kind(target) == "KW_LOCAL" and self._kind(target + 1) == "NAME":
+                    return self._value(target + 1)
+                return None
+            cursor -= 1
+        return None
+
+    def _ends_expression(self, index: int) -> bool:
+        following = index + 1
+        return (
+            self._kind(following) in ("DOUBLECOLON", "SEMICOLON", "EOF")
+            or self.tokens[following].line != self.tokens[index].line
+        )
+
+    def _bind(self, index: int, remote: str) -> None:
+        name = self._assigned_local(index)
+        if name is not None:
+            self.bindings[name] = remote
+        after = index + 1
+        if self._kind(after) == "RPAREN":
+            after += 1
+        self._api_after(after, remote)
+
+    def _api_after(self, index: int, remote: str) -> None:
+        if self._kind(index) in ("DOT", "COLON") and self._kind(index + 1) == "NAME":
+            member = self._value(index + 1)
+            if member in SERVER_API or member in CLIENT_API:
+                self.scan.api.append((remote, member, self._site(index + 1)))
+
+    def _string(self, index: int) -> None:
+        value = self._value(index)
+        if value in REMOTE_CLASSES:
+            self._creation(index, value)
+            return
+        matched = False
+        for start, name in self.automaton.find(value):
+            end = start + len(name)
+            if (start == 0 or not _identifier_char(value[start - 1])) and (
+                end == len(value) or not _identifier_char(value[end])
+            ):
+                self.scan.references[name].append(self._site(index))
+                matched = matched or (start == 0 and end == len(value))
+        if self._is_lookup(index) and value not in self.ignored:
+            self.scan.lookups[value].append(self._site(index))
+            matched = True
+        elif REMOTE_NAME.match(value):
+            self.scan.lookups[value].append(self._site(index))
+            matched = True
+        if matched:
+            self._bind(index, value)
+
+    def _is_lookup(self, index: int) -> bool:
+        """``<remotes folder>:WaitForChild("X")`` or ``FindFirstChild``."""
+
+        if not (
+            self._kind(index - 1) == "LPAREN"
+            and self._value(index - 2) in LOOKUP_METHODS
+            and self._kind(index - 3) == "COLON"
+        ):
+            return False
+        receiver = index - 4
+        if self._kind(receiver) == "NAME":
+            return "remote" in self._value(receiver).lower()
+        # ``...:WaitForChild("Remotes"):WaitForChild("X")``
+        return self._kind(receiver) == "RPAREN" and self._value(receiver - 1) == "Remotes"
+
+    def _creation(self, index: int, remote_class: str) -> None:
+        """``Instance.new("RemoteEvent")`` or ``helper("Name", "RemoteFunction")``."""
+
+        if self._value(index - 2) == "new" and self._value(index - 4) == "Instance":
+            name = self._assigned_local(index)
+            if name is not None:
+                self.pending_class = (name, remote_class)
+            return
+        cursor = index - 1
+        while cursor >= 0 and self._kind(cursor) in ("COMMA", "STRING"):
+            if self._kind(cursor) == "STRING" and self._kind(cursor - 1) == "LPAREN":
+                self.scan.created[self._value(cursor)] = (remote_class, self._site(cursor))
+                return
+            cursor -= 1
+
+    def _name(self, index: int) -> None:
+        value = self._value(index)
+        previous = self._kind(index - 1)
+        if previous in ("DOT", "COLON"):
+            owner = self._value(index - 2) if self._kind(index - 2) == "NAME" else None
+            if owner in self.contract_locals and previous == "DOT" and self._kind(index - 3) not in ("DOT", "COLON"):
+                self.scan.lookups[value].append(self._site(index))
+                self.scan.references[value].append(self._site(index))
+                self._bind(index, value)
+            elif (
+                value == "Name"
+                and self.pending_class is not None
+                and owner == self.pending_class[0]
+                and self._kind(index + 1) == "ASSIGN"
+                and self._kind(index + 2) == "STRING"
+            ):
+                self.scan.created[self._value(index + 2)] = (self.pending_class[1], self._site(index + 2))
+                self.pending_class = None
+            return
+        if value == "require" and self._kind(index + 1) == "LPAREN":
+            cursor = index + 2
+            depth = 1
+            while depth and self._kind(cursor) != "EOF":
+                kind = self._kind(cursor)
+                depth += kind == "LPAREN"
+                depth -= kind == "RPAREN"
+                if self._value(cursor) == CONTRACT_MODULE:
+                    name = self._assigned_local(index)
+                    if name is not None:
+                        self.contract_locals.add(name)
+                    break
+                cursor += 1
+        elif value.lower() in CONTRACT_LOCAL_NAMES:
+            self.contract_locals.add(value)
+        elif value in self.contract_locals:
+            pass
+        elif value in self.bindings and self._kind(index - 1) != "KW_LOCAL":
+            self._api_after(index + 1, self.bindings[value])
+            if self._kind(index - 1) == "ASSIGN" and self._ends_expression(index):
+                # ``local remote = useTokenRemoteInstance :: RemoteFunction``
+                alias = self._assigned_local(index)
+                if alias is not None and alias != value:
+                    self.bindings[alias] = self.bindings[value]
+        if value in self.contract_locals and self._kind(index - 1) == "ASSIGN" and self._ends_expression(index):
+            # ``local Remotes = remotesModule :: any`` aliases the table.
+            alias = self._assigned_local(index)
+            if alias is not None:
+                self.contract_locals.add(alias)
+
+
+def scan_source(
+    path: str, source: str, automaton: PatternAutomaton, ignored: Set[str], contract_path: str = CONTRACT_SOURCE
+) -> FileScan:
+    scan = FileScan(path=path, layer=layer_for(path))
+    if path == contract_path:
+        return scan
+    _Scanner(scan, list(Lexer(source).tokens()), automaton, ignored).run()
+    return scan
+
+
+def script_paths(root: Path) -> List[str]:
+    return sorted(set(ProjectTree(root).script_index().values()))
+
+
+def _ignored_lookups(paths: Sequence[str]) -> Set[str]:
+    """Names of scripts and folders next to RemoteBootstrap, which are not remotes."""
+
+    folder = CONTRACT_SOURCE.rsplit("/", 1)[0]
+    names = {"Remotes"}
+    for path in paths:
+        if path.startswith(folder + "/"):
+            names.add(path.rsplit("/", 1)[-1].split(".", 1)[0])
+    return names
+
+
+def verify(contract: Dict[str, str], scans: Sequence[FileScan]) -> List[Issue]:
+    issues: List[Issue] = []
+    created: Dict[str, Tuple[str, Site]] = {}
+    for scan in scans:
+        created.update(scan.created)
+    known = set(contract) | set(created)
+
+    lookups: Dict[str, List[Site]] = defaultdict(list)
+    references: Dict[str, List[Site]] = defaultdict(list)
+    for scan in scans:
+        for name, sites in scan.lookups.items():
+            lookups[name].extend(sites)
+        for name, sites in scan.references.items():
+            references[name].extend(sites)
+
+    for name in sorted(set(lookups) - known):
+        message = f"{name} is not created by RemoteBootstrap or any script"
+        issues.append(Issue("error", "unknown", name, message, lookups[name]))
+    for name in sorted(set(contract) - set(references) - set(lookups)):
+        message = f"{name} is created by RemoteBootstrap but never referenced"
+        issues.append(Issue("warning", "unused", name, message, []))
+    for name, (remote_class, site) in sorted(created.items()):
+        if name in contract and contract[name] != remote_class:
+            message = f"{name} is created as {remote_class}; the contract says {contract[name]}"
+            issues.append(Issue("error", "kind", name, message, [site]))
+
+    members: Dict[str, Dict[str, List[Site]]] = defaultdict(lambda: defaultdict(list))
+    for scan in scans:
+        for remote, member, site in scan.api:
+            members[remote][member].append(site)
+            side = "server" if member in SERVER_API else "client"
+            if scan.layer in ("server", "client") and scan.layer != side:
+                message = f"{member} is a {side} API but {scan.path} runs on the {scan.layer}"
+                issues.append(Issue("error", "side", remote, message, [site]))
+            remote_class = contract.get(remote) or created.get(remote, ("", site))[0]
+            if remote_class and (member in FUNCTION_API) != (remote_class == "RemoteFunction"):
+                issues.append(Issue("error", "kind", remote, f"{member} used on {remote_class} {remote}", [site]))
+    for remote in sorted(members):
+        used = members[remote]
+        for member in sorted(used):
+            if not COUNTERPARTS[member] & set(used):
+                message = f"{remote}: {member} is used but nothing uses {' or '.join(sorted(COUNTERPARTS[member]))}"
+                issues.append(Issue("warning", "one-sided", remote, message, used[member]))
+    return issues
+
+
+def run(root: Path) -> Tuple[Dict[str, str], List[Issue], Dict[str, str]]:
+    contract = read_contract(root)
+    automaton = PatternAutomaton(contract)
+    paths = script_paths(root)
+    ignored = _ignored_lookups(paths)
+    scans = []
+    errors: Dict[str, str] = {}
+    for path in paths:
+        try:
+            scans.append(scan_source(path, (root / path).read_text(encoding="utf-8"), automaton, ignored))
+        except (OSError, UnicodeDecodeError) as exc:
+            errors[path] = str(exc)
+        except LuauSyntaxError as exc:
+            errors[path] = f"line {exc.line}: {exc.message}"
+    return contract, verify(contract, scans), errors
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--strict", action="store_true", help="Exit with status 1 on warnings too")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        contract, issues, errors = run(args.root.resolve())
+    except ContractError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        report = {"contract": contract, "issues": [asdict(issue) for issue in issues], "errors": errors}
+        print(json.dumps(report, indent=2))
+    else:
+        for issue in issues:
+            where = ", ".join(f"{site.path}:{site.line}" for site in issue.sites[:3])
+            more = f" (+{len(issue.sites) - 3} more)" if len(issue.sites) > 3 else ""
+            print(f"{issue.severity}: [{issue.kind}] {issue.message}" + (f"  at {where}{more}" if where else ""))
+        for path, error in errors.items():
+            print(f"error: {path}: {error}", file=sys.stderr)
+        counts = {severity: sum(issue.severity == severity for issue in issues) for severity in ("error", "warning")}
+        print(f"{len(contract)} contract remotes; {counts['error']} error(s), {counts['warning']} warning(s)")
+    failing = {"error", "warning"} if args.strict else {"error"}
+    return 1 if errors or any(issue.severity in failing for issue in issues) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
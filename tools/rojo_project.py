@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""Resolve repository paths to DataModel instances the way Rojo syncs them.
+
+``default.project.json`` is loaded into a compact instance tree (one slotted
+node per instance, carrying its class name and source path) with two indexes:
+repository path -> node and instance path -> node. Directory mounts follow
+Rojo's rules: sub-directories become ``Folder`` instances (or the script named
+by an ``init*.lua`` inside them), ``X.server.lua`` becomes a ``Script``,
+``X.client.lua`` a ``LocalScript`` and any other ``.lua``/``.luau`` a
+``ModuleScript``. Files Rojo has no middleware for (Markdown, ``.gitkeep``) are
+skipped.
+
+``ProjectTree.refresh(path)`` re-syncs only the subtree a changed file or
+directory belongs to, so long-running tools can keep one tree warm instead of
+rescanning every mount.
+
+Usage::
+
+    python tools/rojo_project.py resolve ServerScriptService/GameServer/ArenaServer.lua
+    python tools/rojo_project.py locate ServerScriptService.GameServer.ArenaServer
+    python tools/rojo_project.py tree [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PROJECT_FILENAME = "default.project.json"
+
+# Longest suffix first so ``.server.lua`` wins over ``.lua``.
+FILE_CLASSES: Tuple[Tuple[str, str], ...] = (
+    (".server.luau", "Script"),
+    (".client.luau", "LocalScript"),
+    (".server.lua", "Script"),
+    (".client.lua", "LocalScript"),
+    (".luau", "ModuleScript"),
+    (".lua", "ModuleScript"),
+    (".json", "ModuleScript"),
+    (".txt", "StringValue"),
+    (".csv", "LocalizationTable"),
+)
+SCRIPT_CLASSES = {"Script", "LocalScript", "ModuleScript"}
+# Rojo treats these as metadata / nested projects rather than instances.
+SKIPPED_SUFFIXES = (".meta.json", ".project.json", ".model.json")
+INIT_STEM = "init"
+
+InstancePath = Tuple[str, ...]
+
+
+def classify_file(filename: str) -> Optional[Tuple[str, str]]:
+    """Return ``(instance name, class name)`` for a synced file, or ``None``."""
+
+    lowered = filename.lower()
+    if lowered.endswith(SKIPPED_SUFFIXES):
+        return None
+    for suffix, class_name in FILE_CLASSES:
+        if lowered.endswith(suffix):
+            return filename[: -len(suffix)], class_name
+    return None
+
+
+def is_luau_file(path: str) -> bool:
+    return path.lower().endswith((".lua", ".luau"))
+
+
+def normalise_path(path: str) -> str:
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.rstrip("/")
+
+
+class Node:
+    """One instance in the synced tree."""
+
+    __slots__ = ("name", "class_name", "parent", "children", "source", "script", "sources", "synced", "path")
+
+    def __init__(
+        self,
+        name: str,
+        class_name: str,
+        parent: Optional["Node"],
+        source: Optional[str] = None,
+        synced: bool = False,
+    ) -> None:
+        self.name = name
+        self.class_name = class_name
+        self.parent = parent
+        self.children: List[Node] = []
+        # Repository path the node was synced from (file or directory).
+        self.source = source
+        # Script file backing the node: the file itself or a directory's init.
+        self.script: Optional[str] = None
+        # Every repository path mapped to the node in ``by_source``; a directory
+        # can hold several init files (``init.lua`` and ``init.client.lua``).
+        self.sources: List[str] = []
+        # True for nodes created from the filesystem rather than the project.
+        self.synced = synced
+        self.path: InstancePath = () if parent is None else parent.path + (name,)
+
+    @property
+    def dotted_path(self) -> str:
+        return ".".join(self.path)
+
+    def walk(self) -> Iterator["Node"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def as_dict(self) -> dict:
+        doc: dict = {"name": self.name, "className": self.class_name}
+        if self.script or self.source:
+            doc["path"] = self.script or self.source
+        if self.children:
+            doc["children"] = [child.as_dict() for child in self.children]
+        return doc
+
+
+class ProjectTree:
+    """In-memory Rojo tree with path <-> instance indexes."""
+
+    def __init__(self, repo_root: Path = REPO_ROOT, project_file: str = PROJECT_FILENAME) -> None:
+        self.repo_root = Path(repo_root)
+        self.project_file = normalise_path(project_file)
+        self.root = Node("DataModel", "DataModel", None)
+        self.by_source: Dict[str, Node] = {}
+        self.by_instance: Dict[InstancePath, Node] = {}
+        # (repository path, node) for every ``$path`` mount, longest path first.
+        self.mounts: List[Tuple[str, Node]] = []
+        self.load()
+
+    # -- building --------------------------------------------------------
+
+    def load(self) -> None:
+        """(Re)load the whole tree from the project file."""
+
+        with (self.repo_root / self.project_file).open("r", encoding="utf-8") as handle:
+            project = json.load(handle)
+        tree = project.get("tree", {})
+        self.root = Node(project.get("name", "DataModel"), tree.get("$className", "DataModel"), None)
+        self.root.path = ()
+        self.by_source = {}
+        self.by_instance = {(): self.root}
+        self.mounts = []
+        self._visit_project(tree, self.root)
+        self.mounts.sort(key=lambda item: len(item[0]), reverse=True)
+
+    def _visit_project(self, spec: dict, node: Node) -> None:
+        path = spec.get("$path")
+        if isinstance(path, str):
+            rel = normalise_path(path)
+            self.mounts.append((rel, node))
+            if (self.repo_root / rel).is_dir():
+                node.source = rel
+                self._map_source(rel, node)
+                self._sync_dir(node, rel)
+            else:
+                classified = classify_file(rel.rsplit("/", 1)[-1])
+                if classified and "$className" not in spec:
+                    node.class_name = classified[1]
+                node.source = node.script = rel
+                self._map_source(rel, node)
+        for key, child_spec in spec.items():
+            if key.startswith("$") or not isinstance(child_spec, dict):
+                continue
+            class_name = child_spec.get("$className")
+            if class_name is None:
+                # Rojo infers services from their name directly under the DataModel.
+                class_name = key if node is self.root else "Folder"
+            child = self._attach(Node(key, class_name, node))
+            self._visit_project(child_spec, child)
+
+    def _attach(self, node: Node) -> Node:
+        assert node.parent is not None
+        node.parent.children.append(node)
+        self.by_instance.setdefault(node.path, node)
+        return node
+
+    def _map_source(self, rel: str, node: Node) -> None:
+        self.by_source[rel] = node
+        node.sources.append(rel)
+
+    def _unmap_sources(self, node: Node, keep: Optional[str] = None) -> None:
+        for rel in node.sources:
+            if rel != keep and self.by_source.get(rel) is node:
+                del self.by_source[rel]
+        node.sources = [rel for rel in node.sources if rel == keep]
+
+    def _sync_dir(self, node: Node, rel_dir: str) -> None:
+        """Populate ``node`` from the directory ``rel_dir``."""
+
+        try:
+            entries = sorted(os.scandir(self.repo_root / rel_dir), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.is_file():
+                classified = classify_file(entry.name)
+                if classified and classified[0] == INIT_STEM:
+                    rel = f"{rel_dir}/{entry.name}"
+                    if node.synced or node.class_name == "Folder":
+                        node.class_name = classified[1]
+                    node.script = rel
+                    self._map_source(rel, node)
+        for entry in entries:
+            self._sync_entry(node, f"{rel_dir}/{entry.name}", entry.is_dir())
+
+    def _sync_entry(self, parent: Node, rel: str, is_dir: bool) -> Optional[Node]:
+        name = rel.rsplit("/", 1)[-1]
+        if is_dir:
+            child = self._attach(Node(name, "Folder", parent, source=rel, synced=True))
+            self._map_source(rel, child)
+            self._sync_dir(child, rel)
+            return child
+        classified = classify_file(name)
+        if classified is None:
+            return None
+        instance_name, class_name = classified
+        if instance_name == INIT_STEM:
+            return None
+        child = self._attach(Node(instance_name, class_name, parent, source=rel, synced=True))
+        child.script = rel
+        self._map_source(rel, child)
+        return child
+
+    def _detach(self, node: Node) -> None:
+        assert node.parent is not None
+        node.parent.children.remove(node)
+        for item in node.walk():
+            self._unmap_sources(item)
+            if self.by_instance.get(item.path) is item:
+                del self.by_instance[item.path]
+        # Re-expose a same-named sibling that the removed node shadowed.
+        if node.path not in self.by_instance:
+            for sibling in node.parent.children:
+                if sibling.name == node.name:
+                    self.by_instance[node.path] = sibling
+                    break
+
+    # -- incremental updates ---------------------------------------------
+
+    def _mount_for(self, rel: str) -> Optional[Tuple[str, Node]]:
+        for mount_path, node in self.mounts:
+            if rel == mount_path or rel.startswith(mount_path + "/"):
+                return mount_path, node
+        return None
+
+    def refresh(self, path: str) -> bool:
+        """Re-sync whatever ``path`` (added, changed or deleted) belongs to.
+
+        Only the directory entry containing ``path`` directly under its nearest
+        already-synced ancestor directory is rebuilt; changes to an ``init``
+        script re-sync that directory since they change its class. Returns
+        ``False`` when the path is outside every ``$path`` mount.
+        """
+
+        rel = normalise_path(path)
+        if rel == self.project_file:
+            self.load()
+            return True
+        mount = self._mount_for(rel)
+        if mount is None:
+            return False
+        mount_path, mount_node = mount
+        is_dir_mount = mount_node.source == mount_path and mount_node.script != mount_path
+        if is_dir_mount != (self.repo_root / mount_path).is_dir():
+            # A mount appeared, vanished or changed kind; rebuild from the project.
+            self.load()
+            return True
+        if rel == mount_path:
+            if is_dir_mount:
+                self._resync_children(mount_node, rel)
+            else:
+                self.load()
+            return True
+
+        # Find the deepest synced directory above ``rel`` that still exists.
+        parts = rel.split("/")
+        anchor_dir, anchor = mount_path, mount_node
+        for depth in range(len(parts) - 1, mount_path.count("/"), -1):
+            candidate = "/".join(parts[:depth])
+            node = self.by_source.get(candidate)
+            if node is not None and node.source == candidate and (self.repo_root / candidate).is_dir():
+                anchor_dir, anchor = candidate, node
+                break
+        entry_name = rel[len(anchor_dir) + 1:].split("/", 1)[0]
+        entry_rel = f"{anchor_dir}/{entry_name}"
+
+        classified = classify_file(entry_name)
+        if classified and classified[0] == INIT_STEM:
+            if anchor.synced:
+                self._resync_children(anchor, anchor_dir)
+            else:
+                # A mount's class comes from the project file as well; reload.
+                self.load()
+            return True
+
+        existing = self.by_source.get(entry_rel)
+        if existing is not None and existing is not anchor:
+            self._detach(existing)
+        abs_entry = self.repo_root / entry_rel
+        if abs_entry.exists():
+            node = self._sync_entry(anchor, entry_rel, abs_entry.is_dir())
+            if node is not None:
+                self._sort_children(anchor)
+        return True
+
+    def _resync_children(self, node: Node, rel_dir: str) -> None:
+        for child in [child for child in node.children if child.synced]:
+            self._detach(child)
+        if node.script and node.script != node.source:
+            self._unmap_sources(node, keep=node.source)
+            node.script = None
+            if node.synced:
+                node.class_name = "Folder"
+        self._sync_dir(node, rel_dir)
+        self._sort_children(node)
+
+    @staticmethod
+    def _sort_children(node: Node) -> None:
+        # Project-defined children first (in file order), then synced entries
+        # by source name, matching a fresh load.
+        project_children = [child for child in node.children if not child.synced]
+        synced = sorted(
+            (child for child in node.children if child.synced),
+            key=lambda child: (child.source or "").rsplit("/", 1)[-1],
+        )
+        node.children[:] = synced + project_children
+
+    # -- queries ---------------------------------------------------------
+
+    def node_for_path(self, path: str) -> Optional[Node]:
+        return self.by_source.get(normalise_path(path))
+
+    def node_at(self, instance: InstancePath) -> Optional[Node]:
+        return self.by_instance.get(tuple(instance))
+
+    def resolve(self, path: str) -> Optional[Tuple[InstancePath, str]]:
+        """Return ``(instance path, class name)`` for a repository path.
+
+        Paths that are not on disk yet (for example a file about to be
+        created) are resolved from their mount using the same naming rules.
+        """
+
+        rel = normalise_path(path)
+        node = self.by_source.get(rel)
+        if node is not None:
+            return node.path, node.class_name
+        mount = self._mount_for(rel)
+        if mount is None:
+            return None
+        mount_path, mount_node = mount
+        parts = rel[len(mount_path) + 1:].split("/") if rel != mount_path else []
+        if not parts:
+            return mount_node.path, mount_node.class_name
+        classified = classify_file(parts[-1])
+        if classified is None:
+            return mount_node.path + tuple(parts), "Folder"
+        name, class_name = classified
+        if name == INIT_STEM:
+            return mount_node.path + tuple(parts[:-1]), class_name
+        return mount_node.path + tuple(parts[:-1]) + (name,), class_name
+
+    def script_index(self) -> Dict[InstancePath, str]:
+        """Map instance paths of Luau scripts to the files that back them."""
+
+        index: Dict[InstancePath, str] = {}
+        for node in self.root.walk():
+            if node.script and node.class_name in SCRIPT_CLASSES and is_luau_file(node.script):
+                index[node.path] = node.script
+        return index
+
+
+def parse_instance(text: str) -> InstancePath:
+    return tuple(part for part in text.replace("/", ".").split(".") if part)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Repository root")
+    parser.add_argument("--project", default=PROJECT_FILENAME, help="Project file relative to the root")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    sub = parser.add_subparsers(dest="command", required=True)
+    resolve = sub.add_parser("resolve", help="Map repository paths to DataModel instances")
+    resolve.add_argument("paths", nargs="+")
+    locate = sub.add_parser("locate", help="Map dotted instance paths back to repository files")
+    locate.add_argument("instances", nargs="+")
+    sub.add_parser("tree", help="Print the synced instance tree")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    tree = ProjectTree(args.root.resolve(), args.project)
+    status = 0
+
+    if args.command == "tree":
+        if args.json:
+            print(json.dumps(tree.root.as_dict(), indent=2))
+        else:
+            for node in tree.root.walk():
+                source = f"  <- {node.script or node.source}" if (node.script or node.source) else ""
+                print(f"{'  ' * len(node.path)}{node.name} ({node.class_name}){source}")
+        return 0
+
+    rows = []
+    if args.command == "resolve":
+        for path in args.paths:
+            resolved = tree.resolve(path)
+            if resolved is None:
+                status = 1
+            rows.append(
+                {
+                    "path": normalise_path(path),
+                    "instance": ".".join(resolved[0]) if resolved else None,
+                    "className": resolved[1] if resolved else None,
+                }
+            )
+    else:
+        for text in args.instances:
+            node = tree.node_at(parse_instance(text))
+            if node is None:
+                status = 1
+            rows.append(
+                {
+                    "instance": text,
+                    "path": (node.script or node.source) if node else None,
+                    "className": node.class_name if node else None,
+                }
+            )
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        for row in rows:
+            if args.command == "resolve":
+                print(f"{row['path']} -> {row['instance'] or '?'} ({row['className'] or 'unmapped'})")
+            else:
+                print(f"{row['instance']} -> {row['path'] or '?'} ({row['className'] or 'not found'})")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""Estimate saved profile sizes at growth percentiles and project save bandwidth.
+
+The payload is rebuilt from the Luau sources the way the servers assemble it:
+
+* ``SaveSchema.lua`` ``Defaults`` and its ``SaveData`` type;
+* ``ProfileServer.lua``'s ``ProfileData`` type on top (``Inventory``,
+  ``Settings.Locale``), wrapped as ``{ SchemaVersion, Profile }``;
+* the ``DailyRewards`` block that ``DailyRewardsServer`` adds to the container.
+
+Every map or array in the profile grows with days played. Catalogue-backed
+inventory fields use ``ShopConfig`` ids and are capped by the catalogue; the
+other fields (``Upgrades``, ``Cosmetics.Trails``/``Emotes``, ...) grow without
+limit. Zero-valued counters (``Coins``, ``Stats.*``) grow by
+``--counter-rate`` per day. Days played are log-normal across players.
+
+Sizes are measured as ``HttpService:JSONEncode`` would write them: compact
+separators, ``[]`` for empty tables, arrays for sequential tables,
+integers without a decimal point and raw UTF-8 strings. Results are compared
+with the DataStore value limit and turned into save bytes per minute per
+server.
+
+Usage::
+
+    python tools/save_size.py [--players 5000] [--median-days 14] [--rate Upgrades=0.5] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from luau_config import ConfigError, load_config
+from luau_literals import LiteralError, evaluate_locals
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError, Token
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_SOURCE = REPO_ROOT / "ReplicatedStorage" / "Shared" / "Types" / "SaveSchema.lua"
+PROFILE_SERVER_SOURCE = REPO_ROOT / "ServerScriptService" / "Data" / "ProfileServer.lua"
+DAILY_REWARDS_SOURCE = REPO_ROOT / "ServerScriptService" / "Economy" / "DailyRewardsServer.lua"
+LOCALIZER_SOURCE = REPO_ROOT / "ReplicatedStorage" / "Shared" / "Systems" / "Localizer.lua"
+
+#: Maximum size of one DataStore value, in bytes.
+DATASTORE_VALUE_LIMIT = 4 * 1024 * 1024
+#: SaveService.SAVE_COOLDOWN_SECONDS outside Studio: at most one write per player per 6 s.
+SAVE_COOLDOWN_SECONDS = 6
+# Inventory fields backed by a ShopConfig catalogue: field path -> item Kind.
+CATALOGUES = {
+    "Inventory.OwnedMelee": "Melee",
+    "Inventory.MeleeLoadout": "Melee",
+    "Inventory.TokenCounts": "Token",
+    "Inventory.UtilityQueue": "Utility",
+}
+# Entries per day played for growing fields; anything else uses DEFAULT_RATE.
+GROWTH_RATES = {
+    "Upgrades": 0.5,
+    "Cosmetics.Trails": 0.2,
+    "Cosmetics.Emotes": 0.2,
+    "Inventory.OwnedMelee": 0.3,
+    "Inventory.MeleeLoadout": 0.3,
+    "Inventory.TokenCounts": 0.5,
+    "Inventory.UtilityQueue": 0.3,
+}
+DEFAULT_RATE = 0.25
+DEFAULT_COUNTER_RATE = 1000.0
+DEFAULT_MEDIAN_DAYS = 14.0
+DEFAULT_DAYS_SIGMA = 1.2
+DEFAULT_PLAYERS = 5000
+DEFAULT_SERVER_PLAYERS = 12
+DEFAULT_SAVES_PER_MINUTE = 1.0
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+DEFAULT_SEED = 1
+SECONDS_PER_DAY = 86400
+
+
+class SaveSizeError(ValueError):
+    """Raised when the schema sources cannot be read."""
+
+
+# -- Luau type aliases -------------------------------------------------------------
+
+
+@dataclass
+class LuauType:
+    """A simplified Luau type: record, map, array, a named type or anything else."""
+
+    kind: str
+    name: str = ""
+    fields: Dict[str, "LuauType"] = field(default_factory=dict)
+    key: Optional["LuauType"] = None
+    value: Optional["LuauType"] = None
+    optional: bool = False
+
+
+OTHER = LuauType("other")
+
+
+class _TypeReader:
+    """Reads ``type Name = ...`` aliases; unsupported forms become ``other``."""
+
+    def __init__(self, tokens: Sequence[Token]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def _next(self) -> Token:
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def aliases(self) -> Dict[str, LuauType]:
+        found: Dict[str, LuauType] = {}
+        while self._peek().type != "EOF":
+            token = self._next()
+            if token.type == "NAME" and token.value == "type" and self._peek().type == "NAME":
+                name = self._next().value
+                if self._peek().type == "LT":
+                    self._skip_balanced("LT", "GT")
+                if self._peek().type == "ASSIGN":
+                    self._next()
+                    found[name] = self.type()
+        return found
+
+    def _skip_balanced(self, open_type: str, close_type: str) -> None:
+        depth = 0
+        while self._peek().type != "EOF":
+            token = self._next()
+            if token.type == open_type:
+                depth += 1
+            elif token.type == close_type:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def type(self) -> LuauType:
+        members = [self._single()]
+        while self._peek().type in ("PIPE", "AMP"):
+            self._next()
+            members.append(self._single())
+        # ``{ [string]: number } | {}``: the empty table only documents the default.
+        chosen = next((m for m in members if not (m.kind == "record" and not m.fields)), members[0])
+        chosen.optional = chosen.optional or any(m.optional or m.name == "nil" for m in members)
+        return chosen
+
+    def _single(self) -> LuauType:
+        token = self._peek()
+        if token.type == "LBRACE":
+            result = self._table()
+        elif token.type == "NAME":
+            self._next()
+            name = token.value
+            while self._peek().type == "DOT" and self._peek(1).type == "NAME":
+                self._next()
+                name += "." + self._next().value
+            if self._peek().type == "LT":
+                self._skip_balanced("LT", "GT")
+            if name == "typeof" and self._peek().type == "LPAREN":
+                self._skip_balanced("LPAREN", "RPAREN")
+                result = LuauType("other")
+            else:
+                result = LuauType("name", name=name)
+        elif token.type == "LPAREN":
+            self._skip_balanced("LPAREN", "RPAREN")
+            if self._peek().type == "ARROW":
+                self._next()
+                self.type()
+            result = LuauType("other")
+        elif token.type == "KW_NIL":
+            self._next()
+            result = LuauType("name", name="nil")
+        elif token.type in ("STRING", "KW_TRUE", "KW_FALSE"):
+            self._next()
+            result = LuauType("name", name="string" if token.type == "STRING" else "boolean")
+        else:
+            self._next()
+            result = LuauType("other")
+        while self._peek().type == "QUESTION":
+            self._next()
+            result.optional = True
+        return result
+
+    def _table(self) -> LuauType:
+        self._next()  # {
+        if self._peek().type == "RBRACE":
+            self._next()
+            return LuauType("record")
+        if self._peek().type == "LBRACKET":
+            self._next()
+            key = self.type()
+            self._expect("RBRACKET")
+            self._expect("COLON")
+            value = self.type()
+            self._close_table()
+            if key.kind == "name" and key.name == "number":
+                return LuauType("array", value=value)
+            return LuauType("map", key=key, value=value)
+        if self._peek().type == "NAME" and self._peek(1).type == "COLON":
+            record = LuauType("record")
+            while self._peek().type == "NAME" and self._peek(1).type == "COLON":
+                name = self._next().value
+                self._next()
+                record.fields[name] = self.type()
+                if self._peek().type in ("COMMA", "SEMICOLON"):
+                    self._next()
+            self._close_table()
+            return record
+        element = self.type()
+        self._close_table()
+        return LuauType("array", value=element)
+
+    def _expect(self, token_type: str) -> None:
+        if self._peek().type == token_type:
+            self._next()
+
+    def _close_table(self) -> None:
+        depth = 1
+        while depth and self._peek().type != "EOF":
+            token = self._next()
+            if token.type == "LBRACE":
+                depth += 1
+            elif token.type == "RBRACE":
+                depth -= 1
+
+
+def read_type_aliases(source: Path) -> Dict[str, LuauType]:
+    try:
+        tokens = list(Lexer(Path(source).read_text(encoding="utf-8")).tokens())
+    except (OSError, LuauSyntaxError) as exc:
+        raise SaveSizeError(f"{source}: {exc}") from exc
+    return _TypeReader(tokens).aliases()
+
+
+def resolve(luau_type: LuauType, aliases: Dict[str, LuauType], depth: int = 0) -> LuauType:
+    """Follow named aliases (bounded, for recursive types)."""
+
+    while luau_type.kind == "name" and luau_type.name in aliases and depth < 16:
+        optional = luau_type.optional
+        luau_type = aliases[luau_type.name]
+        luau_type = LuauType(**{**vars(luau_type), "optional": luau_type.optional or optional})
+        depth += 1
+    return luau_type
+
+
+def merge_types(base: LuauType, overlay: LuauType, base_aliases, overlay_aliases) -> LuauType:
+    """``overlay`` (SaveSchema) fields win, except where ``base`` has a richer record."""
+
+    base = resolve(base, base_aliases)
+    overlay = resolve(overlay, overlay_aliases)
+    if base.kind == "record" and overlay.kind == "record":
+        merged = LuauType("record", optional=base.optional and overlay.optional)
+        for name in list(base.fields) + [name for name in overlay.fields if name not in base.fields]:
+            if name in base.fields and name in overlay.fields:
+                merged.fields[name] = merge_types(
+                    base.fields[name], overlay.fields[name], base_aliases, overlay_aliases
+                )
+            elif name in base.fields:
+                merged.fields[name] = _resolve_deep(base.fields[name], base_aliases)
+            else:
+                merged.fields[name] = _resolve_deep(overlay.fields[name], overlay_aliases)
+        return merged
+    return _resolve_deep(overlay, overlay_aliases)
+
+
+def _resolve_deep(luau_type: LuauType, aliases: Dict[str, LuauType], depth: int = 0) -> LuauType:
+    luau_type = resolve(luau_type, aliases)
+    if depth > 16:
+        return luau_type
+    copy = LuauType(**{**vars(luau_type), "fields": {}})
+    for name, field_type in luau_type.fields.items():
+        copy.fields[name] = _resolve_deep(field_type, aliases, depth + 1)
+    if luau_type.key is not None:
+        copy.key = _resolve_deep(luau_type.key, aliases, depth + 1)
+    if luau_type.value is not None:
+        copy.value = _resolve_deep(luau_type.value, aliases, depth + 1)
+    return copy
+
+
+# -- JSONEncode ------------------------------------------------------------------
+
+
+def _roblox_value(value: Any) -> Any:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, dict):
+        if not value:
+            return []
+        keys = list(value)
+        if all(isinstance(key, int) and not isinstance(key, bool) for key in keys) and sorted(keys) == list(
+            range(1, len(keys) + 1)
+        ):
+            return [_roblox_value(value[index]) for index in range(1, len(keys) + 1)]
+        return {str(key): _roblox_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_roblox_value(item) for item in value]
+    raise TypeError(f"JSONEncode cannot encode {type(value).__name__}")
+
+
+def json_encode(value: Any) -> str:
+    """Text ``HttpService:JSONEncode`` produces for ``value``."""
+
+    return json.dumps(_roblox_value(value), separators=(",", ":"), ensure_ascii=False)
+
+
+def encoded_size(value: Any) -> int:
+    return len(json_encode(value).encode("utf-8"))
+
+
+# -- profile model ---------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class GrowingField:
+    path: str
+    kind: str  # "map" or "array"
+    element: str  # value kind for maps, element kind for arrays
+    ids: Tuple[str, ...]  # catalogue ids, or empty for synthetic ids
+    capped: bool
+    rate: float
+
+
+@dataclass
+class SaveModel:
+    template: Dict[str, Any]  # the full container with default values
+    growing: List[GrowingField]
+    counters: List[str]  # dotted paths (inside Profile) of zero-valued counters
+    optional: Dict[str, str]  # optional fields filled once a profile has grown
+    counter_rate: float
+
+
+def _default_for(luau_type: LuauType, locale: str, name: str) -> Any:
+    if luau_type.kind == "record":
+        return {
+            key: _default_for(value, locale, key) for key, value in luau_type.fields.items() if not value.optional
+        }
+    if luau_type.kind in ("map", "array"):
+        return {}
+    if luau_type.kind == "name":
+        if luau_type.name == "number":
+            return 0
+        if luau_type.name == "boolean":
+            return False
+        if luau_type.name == "string":
+            return locale if name == "Locale" else ""
+    return None
+
+
+def _overlay_defaults(template: Any, defaults: Any) -> Any:
+    if isinstance(template, dict) and isinstance(defaults, dict):
+        for key, value in defaults.items():
+            template[key] = _overlay_defaults(template.get(key), value)
+        return template
+    if isinstance(defaults, list) and not defaults and isinstance(template, dict):
+        return template
+    return defaults
+
+
+def _walk(luau_type: LuauType, path: str) -> Iterator[Tuple[str, LuauType]]:
+    yield path, luau_type
+    for name, field_type in luau_type.fields.items():
+        yield from _walk(field_type, f"{path}.{name}" if path else name)
+
+
+def _element_kind(luau_type: Optional[LuauType]) -> str:
+    if luau_type is None or luau_type.kind != "name":
+        return "string"
+    return luau_type.name if luau_type.name in ("number", "boolean", "string") else "string"
+
+
+def _local(source: Path, name: str, default: Any) -> Any:
+    try:
+        tokens = list(Lexer(source.read_text(encoding="utf-8")).tokens())
+        return evaluate_locals(tokens, set()).get(name, default)
+    except (OSError, LiteralError, LuauSyntaxError):
+        return default
+
+
+def build_model(rates: Dict[str, float], counter_rate: float) -> SaveModel:
+    schema_aliases = read_type_aliases(SCHEMA_SOURCE)
+    profile_aliases = read_type_aliases(PROFILE_SERVER_SOURCE)
+    if "SaveData" not in schema_aliases or "ProfileData" not in profile_aliases:
+        raise SaveSizeError("SaveData (SaveSchema.lua) or ProfileData (ProfileServer.lua) type not found")
+    profile_type = merge_types(
+        LuauType("name", name="ProfileData"), LuauType("name", name="SaveData"), profile_aliases, schema_aliases
+    )
+
+    schema = load_config(SCHEMA_SOURCE).exports
+    defaults = schema.get("Defaults") if isinstance(schema, dict) else None
+    if not isinstance(defaults, dict):
+        raise SaveSizeError(f"{SCHEMA_SOURCE}: Defaults not found")
+    locale = str(_local(LOCALIZER_SOURCE, "DEFAULT_LOCALE", "en"))
+    profile = _overlay_defaults(_default_for(profile_type, locale, ""), defaults)
+
+    items = (load_config("ShopConfig").exports or {}).get("Items") or {}
+    growing = []
+    counters = []
+    optional = {}
+    for path, luau_type in _walk(profile_type, ""):
+        if luau_type.kind in ("map", "array"):
+            kind_filter = CATALOGUES.get(path)
+            ids = tuple(sorted(i for i, item in items.items() if kind_filter and item.get("Kind") == kind_filter))
+            capped = bool(ids) and (luau_type.kind == "map" or path == "Inventory.MeleeLoadout")
+            growing.append(
+                GrowingField(
+                    path=path,
+                    kind=luau_type.kind,
+                    element=_element_kind(luau_type.value),
+                    ids=ids,
+                    capped=capped,
+                    rate=rates.get(path, GROWTH_RATES.get(path, DEFAULT_RATE)),
+                )
+            )
+        elif luau_type.kind == "name" and luau_type.name == "number" and _get(profile, path) == 0:
+            counters.append(path)
+        elif luau_type.optional and luau_type.kind == "name" and luau_type.name == "string":
+            melee = sorted(i for i, item in items.items() if item.get("Kind") == "Melee")
+            optional[path] = max(melee, key=len) if melee else "x" * 12
+
+    container = {
+        "SchemaVersion": _local(PROFILE_SERVER_SOURCE, "DEFAULT_SCHEMA_VERSION", 1),
+        "Profile": profile,
+        # DailyRewardsServer.save: counters near realistic magnitudes.
+        "DailyRewards": {
+            "streak": _local(DAILY_REWARDS_SOURCE, "MAX_STREAK", 7),
+            "lastClaimUtcDay": 20000,
+            "lastClaimTimestamp": 1_700_000_000,
+            "lastTokenIndex": 1,
+            "version": _local(DAILY_REWARDS_SOURCE, "DAILY_SAVE_VERSION", 1),
+        },
+    }
+    return SaveModel(container, growing, counters, optional, counter_rate)
+
+
+def _get(table: Dict[str, Any], path: str) -> Any:
+    value: Any = table
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _set(table: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        table = table.setdefault(part, {})
+    table[parts[-1]] = value
+
+
+def _synthetic_id(path: str, index: int) -> str:
+    stem = path.rsplit(".", 1)[-1].rstrip("s") or "Item"
+    return f"{stem}_{index + 1:04d}"
+
+
+def _element(kind: str, value: str) -> Any:
+    return {"number": 3, "boolean": True}.get(kind, value)
+
+
+def build_profile(model: SaveModel, days: float, counts: Dict[str, int]) -> Dict[str, Any]:
+    """The container for a player with ``days`` played and ``counts`` entries per field."""
+
+    container = json.loads(json.dumps(model.template))
+    profile = container["Profile"]
+    for spec in model.growing:
+        count = counts.get(spec.path, 0)
+        names = [spec.ids[i % len(spec.ids)] if spec.ids else _synthetic_id(spec.path, i) for i in range(count)]
+        if spec.kind == "map":
+            value: Any = {name: _element(spec.element, name) for name in names}
+        else:
+            value = [_element(spec.element, name) for name in names]
+        _set(profile, spec.path, value)
+    for path in model.counters:
+        _set(profile, path, int(days * model.counter_rate))
+    if days >= 1:
+        for path, sample in model.optional.items():
+            _set(profile, path, sample)
+    return container
+
+
+def entry_counts(model: SaveModel, days: float, rng: Optional[np.random.Generator] = None) -> Dict[str, int]:
+    """Entries per growing field; Poisson around ``rate * days`` when ``rng`` is given."""
+
+    counts = {}
+    for spec in model.growing:
+        mean = spec.rate * days
+        count = int(rng.poisson(mean)) if rng is not None else int(mean)
+        if spec.capped:
+            count = min(count, len(spec.ids))
+        counts[spec.path] = count
+    return counts
+
+
+# -- report ----------------------------------------------------------------------
+
+
+def days_at(percentile: float, median_days: float, sigma: float) -> float:
+    return median_days * math.exp(sigma * NormalDist().inv_cdf(percentile / 100))
+
+
+def days_until_limit(model: SaveModel, limit: int) -> Optional[float]:
+    """Days of play until a profile growing at the configured rates reaches ``limit``."""
+
+    first, second = 1000.0, 2000.0
+    size_first = encoded_size(build_profile(model, first, entry_counts(model, first)))
+    size_second = encoded_size(build_profile(model, second, entry_counts(model, second)))
+    slope = (size_second - size_first) / (second - first)
+    if slope <= 0:
+        return None
+    return first + (limit - size_first) / slope
+
+
+def build_report(args: argparse.Namespace, model: SaveModel) -> Dict[str, Any]:
+    rows = []
+    for percentile in args.percentiles:
+        days = days_at(percentile, args.median_days, args.days_sigma)
+        counts = entry_counts(model, days)
+        size = encoded_size(build_profile(model, days, counts))
+        rows.append(
+            {
+                "percentile": percentile,
+                "days": days,
+                "bytes": size,
+                "limit_share": size / args.limit,
+                "entries": counts,
+            }
+        )
+
+    rng = np.random.default_rng(args.seed)
+    days_played = args.median_days * np.exp(args.days_sigma * rng.standard_normal(args.players))
+    sizes = np.array([encoded_size(build_profile(model, d, entry_counts(model, d, rng))) for d in days_played])
+    mean_size = float(sizes.mean())
+    expected = args.server_players * args.saves_per_minute * mean_size
+    worst = args.server_players * (60 / SAVE_COOLDOWN_SECONDS) * float(np.percentile(sizes, 99))
+    return {
+        "default_bytes": encoded_size(model.template),
+        "limit": args.limit,
+        "growing_fields": {
+            spec.path: {"rate": spec.rate, "cap": len(spec.ids) if spec.capped else None} for spec in model.growing
+        },
+        "percentiles": rows,
+        "population": {
+            "players": args.players,
+            "mean_bytes": mean_size,
+            **{f"p{p}_bytes": float(np.percentile(sizes, p)) for p in (50, 90, 99)},
+            "max_bytes": int(sizes.max()),
+            "over_limit": int((sizes > args.limit).sum()),
+        },
+        "server": {
+            "players": args.server_players,
+            "saves_per_minute": args.saves_per_minute,
+            "bytes_per_minute": expected,
+            "cooldown_bound_bytes_per_minute": worst,
+        },
+        "days_until_limit": days_until_limit(model, args.limit),
+    }
+
+
+def _kb(value: float) -> str:
+    return f"{value / 1024:,.1f} KB"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"default save: {report['default_bytes']} bytes; DataStore limit {_kb(report['limit'])}")
+    print()
+    print(f"{'percentile':>10}{'days':>9}{'size':>12}{'of limit':>10}  largest fields")
+    for row in report["percentiles"]:
+        largest = sorted(row["entries"].items(), key=lambda pair: -pair[1])[:3]
+        fields = ", ".join(f"{path} {count}" for path, count in largest if count)
+        print(
+            f"{row['percentile']:>10g}{row['days']:>9.1f}{_kb(row['bytes']):>12}{row['limit_share']:>10.3%}  {fields}"
+        )
+    population = report["population"]
+    print()
+    print(
+        f"{population['players']:,} sampled players: mean {_kb(population['mean_bytes'])}, "
+        f"p99 {_kb(population['p99_bytes'])}, max {_kb(population['max_bytes'])}, "
+        f"{population['over_limit']} over the limit"
+    )
+    server = report["server"]
+    print(
+        f"per server ({server['players']} players, {server['saves_per_minute']:g} saves/min each): "
+        f"{_kb(server['bytes_per_minute'])}/min; "
+        f"cooldown-bound worst case {_kb(server['cooldown_bound_bytes_per_minute'])}/min"
+    )
+    days = report["days_until_limit"]
+    if days is None:
+        print("profiles stop growing; the DataStore limit is never reached")
+    else:
+        print(f"a profile growing at these rates reaches the limit after {days:,.0f} days ({days / 365:,.1f} years)")
+
+
+def parse_rate(text: str) -> Tuple[str, float]:
+    path, _, value = text.partition("=")
+    if not path or not value:
+        raise argparse.ArgumentTypeError(f"expected PATH=ENTRIES_PER_DAY, got {text!r}")
+    return path.strip(), float(value)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help="Sampled profiles (default: 5000)")
+    parser.add_argument(
+        "--median-days", type=float, default=DEFAULT_MEDIAN_DAYS, help="Median days played (default: 14)"
+    )
+    parser.add_argument(
+        "--days-sigma", type=float, default=DEFAULT_DAYS_SIGMA, help="Log-normal spread of days played (default: 1.2)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=parse_rate,
+        action="append",
+        default=[],
+        metavar="PATH=N",
+        help="Entries per day for a growing field, e.g. Cosmetics.Trails=0.1",
+    )
+    parser.add_argument(
+        "--counter-rate", type=float, default=DEFAULT_COUNTER_RATE, help="Daily growth of zero-valued counters"
+    )
+    parser.add_argument(
+        "--percentiles",
+        type=lambda text: [float(value) for value in text.split(",")],
+        default=list(DEFAULT_PERCENTILES),
+        help="Growth percentiles to report (default: 50,90,99,99.9)",
+    )
+    parser.add_argument(
+        "--server-players", type=int, default=DEFAULT_SERVER_PLAYERS, help="Players per server (default: 12)"
+    )
+    parser.add_argument(
+        "--saves-per-minute", type=float, default=DEFAULT_SAVES_PER_MINUTE, help="Saves per player per minute"
+    )
+    parser.add_argument("--limit", type=int, default=DATASTORE_VALUE_LIMIT, help="DataStore value limit in bytes")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (default: 1)")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.players < 1 or args.median_days <= 0 or args.days_sigma < 0:
+        print("error: --players must be >= 1, --median-days > 0 and --days-sigma >= 0", file=sys.stderr)
+        return 1
+    if any(not 0 < percentile < 100 for percentile in args.percentiles):
+        print("error: --percentiles must be between 0 and 100", file=sys.stderr)
+        return 1
+    try:
+        model = build_model(dict(args.rate), args.counter_rate)
+    except (ConfigError, SaveSizeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    unknown = sorted(set(dict(args.rate)) - {spec.path for spec in model.growing})
+    if unknown:
+        print(f"error: not a growing field: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    report = build_report(args, model)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
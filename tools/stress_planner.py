@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""Predict soak-test load for StressConfig settings and find the safe frontier.
+
+``ServerScriptService/Tools/BotLoad.server.lua`` applies ``StressConfig`` on
+top of ``GameConfig``:
+
+* ``FruitRateMultiplier`` multiplies both ``Turrets.BaseShotsPerSecond`` and
+  ``Turrets.ShotsPerLevelPct``;
+* ``TargetLaneCount`` fixes the lane count and disables unlocks and the
+  expansion rate penalty (0 keeps the ``GameConfig.Lanes`` curve);
+* ``ForceObstacles`` enables obstacles from level 1;
+* ``NpcBatters`` destroys up to ``MaxSwingsPerCycle`` fruit every
+  ``SearchIntervalSeconds`` (plus ``SwingDelaySeconds`` per swing).
+
+For every configuration on a sweep grid and every level, the turret rules from
+``wave_sim`` give the fruit spawn rate. Little's law then gives concurrent
+projectile parts (fruit in flight, one part each, grape bundles counted per
+grape) and VFX instances (``--vfx-per-event`` instances alive for
+``--vfx-lifetime`` seconds per smash or impact). A ``--quantile`` of each
+(compound Poisson, normal approximation) is compared with
+``PROJECTILE_PART_BUDGET`` and ``VFX_INSTANCE_BUDGET`` from
+``PerfHarness.server.lua`` at the worst level. Spawn load is parts plus
+mini-turret tracers created per second and is only a constraint with
+``--spawn-budget``.
+
+The report evaluates the current StressConfig and prints the feasible
+frontier: the highest ``FruitRateMultiplier`` that stays within budget for
+each lane count, obstacle and NPC setting.
+
+Usage::
+
+    python tools/stress_planner.py [--multipliers 0.25:10:0.25] [--lanes 0,1-12] [--levels 1-100] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from luau_config import ConfigError, load_config
+from luau_literals import LiteralError, evaluate_locals
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError
+from perf_harness import HarnessError, load_budgets
+from telemetry_logs import map_shards
+from wave_sim import (
+    BURST_THREE,
+    BURST_TWO,
+    DEFAULT_LANE_LENGTH,
+    SimulationError,
+    WaveModel,
+    build_model,
+    parse_levels,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STRESS_SOURCE = REPO_ROOT / "ServerScriptService" / "Tools" / "StressConfig.lua"
+STRESS_LOCAL = "Config"
+
+# BotLoad.server.lua defaults for NpcBatters fields.
+NPC_DEFAULTS = {"MaxSwingsPerCycle": 15, "SwingDelaySeconds": 0.0, "SearchIntervalSeconds": 0.2}
+MIN_SEARCH_INTERVAL = 0.05
+# VFXBus.Emit falls back to this lifetime when an effect defines none.
+DEFAULT_VFX_LIFETIME = 0.5
+DEFAULT_VFX_PER_EVENT = 3
+DEFAULT_MINI_TURRETS = 1
+DEFAULT_QUANTILE = 0.999
+DEFAULT_MULTIPLIERS = "0.25:10:0.25"
+DEFAULT_LANES = "0,1-12"
+BINDING_LABELS = {"parts": "parts", "vfx": "VFX", "spawn_per_second": "spawn"}
+
+
+class PlannerError(ValueError):
+    """Raised when StressConfig or the grid cannot be evaluated."""
+
+
+@dataclass(frozen=True)
+class NpcModel:
+    """Removal capacity of the NPC batter loop in ``BotLoad.server.lua``."""
+
+    swings: int
+    cycle_seconds: float
+
+    @property
+    def capacity(self) -> float:
+        return self.swings / self.cycle_seconds
+
+
+@dataclass(frozen=True)
+class StressSettings:
+    multiplier: float
+    lanes: int
+    obstacles: bool
+    npc: bool
+
+
+def load_stress_config(source: Path = STRESS_SOURCE) -> Dict[str, Any]:
+    try:
+        tokens = list(Lexer(Path(source).read_text(encoding="utf-8")).tokens())
+        config = evaluate_locals(tokens, {STRESS_LOCAL}).get(STRESS_LOCAL)
+    except (OSError, LiteralError, LuauSyntaxError) as exc:
+        raise PlannerError(f"{source}: {exc}") from exc
+    if not isinstance(config, dict):
+        raise PlannerError(f"{source}: {STRESS_LOCAL} table not found")
+    return config
+
+
+def npc_model(config: Dict[str, Any]) -> NpcModel:
+    npc = config.get("NpcBatters") if isinstance(config.get("NpcBatters"), dict) else {}
+    values = {key: npc.get(key, default) for key, default in NPC_DEFAULTS.items()}
+    swings = max(1, int(float(values["MaxSwingsPerCycle"]) + 0.5))
+    delay = max(0.0, float(values["SwingDelaySeconds"]))
+    search = max(MIN_SEARCH_INTERVAL, float(values["SearchIntervalSeconds"]))
+    return NpcModel(swings, search + swings * delay)
+
+
+def current_settings(config: Dict[str, Any]) -> StressSettings:
+    npc = config.get("NpcBatters")
+    lanes = config.get("TargetLaneCount")
+    return StressSettings(
+        multiplier=float(config.get("FruitRateMultiplier") or 1),
+        lanes=int(lanes) if isinstance(lanes, (int, float)) and lanes > 0 else 0,
+        obstacles=config.get("ForceObstacles") is not False,
+        npc=isinstance(npc, dict) and npc.get("Enabled") is True,
+    )
+
+
+# -- per-level tables ------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class LevelTables:
+    """Per-level constants that do not depend on the StressConfig knobs."""
+
+    levels: np.ndarray
+    curve_lanes: np.ndarray  # GameConfig lane count per level
+    curve_penalty: np.ndarray  # expansion rate multiplier per level
+    parts_per_spawn: np.ndarray  # E[parts] per fruit spawn
+    flight_parts: np.ndarray  # E[parts * flight seconds]
+    flight_parts_sq: np.ndarray  # E[parts^2 * flight seconds]
+    short_parts: np.ndarray  # as flight_parts with flight capped at half an NPC cycle
+    short_parts_sq: np.ndarray
+
+
+def level_tables(model: WaveModel, levels: Sequence[int], npc: NpcModel) -> LevelTables:
+    rows = []
+    for level in levels:
+        bag = model.bag(level)
+        shares = np.bincount(bag, minlength=len(model.fruit)) / bag.size
+        low = np.array([fruit.count_min for fruit in model.fruit], dtype=np.float64)
+        high = np.array([fruit.count_max for fruit in model.fruit], dtype=np.float64)
+        counts = [np.arange(a, b + 1) for a, b in zip(low.astype(int), high.astype(int))]
+        first = np.array([values.mean() for values in counts])
+        second = np.array([(values ** 2).mean() for values in counts])
+        flight = model.lane_length / np.maximum([fruit.speed for fruit in model.fruit], 1e-9)
+        short = np.minimum(flight, npc.cycle_seconds / 2)
+        rows.append(
+            (
+                model.lane_count(level),
+                model.rate_multiplier(level),
+                shares @ first,
+                shares @ (first * flight),
+                shares @ (second * flight),
+                shares @ (first * short),
+                shares @ (second * short),
+            )
+        )
+    columns = np.array(rows, dtype=np.float64).T
+    return LevelTables(np.asarray(levels, dtype=np.float64), *columns)
+
+
+# -- grid evaluation -------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class GridChunk:
+    model: WaveModel
+    tables: LevelTables
+    npc: NpcModel
+    settings: Tuple[StressSettings, ...]
+    enable_obstacles_at: float
+    tracers_per_second: float
+    vfx_per_event: float
+    vfx_lifetime: float
+    z: float
+
+
+def _burst_mean(model: WaveModel, level: np.ndarray, lanes: np.ndarray) -> np.ndarray:
+    """Expected lanes fired per shot: ``computeBurstCount`` clamped to ``lanes``."""
+
+    base, step, cap = BURST_THREE
+    three = np.where(
+        (lanes >= 3) & (level >= model.three_at_once_level),
+        np.clip(base + np.maximum(level - model.three_at_once_level, 0) * step, base, cap),
+        0.0,
+    )
+    base, step, cap = BURST_TWO
+    two = np.where(
+        (lanes >= 2) & (level >= model.two_at_once_level),
+        np.clip(base + np.maximum(level - model.two_at_once_level, 0) * step, base, cap),
+        0.0,
+    )
+    single = two * np.minimum(2, lanes) + (1 - two) * np.minimum(1, lanes)
+    expected = three * np.minimum(3, lanes) + (1 - three) * single
+    return np.where(lanes > 0, expected, 0.0)
+
+
+def evaluate_chunk(chunk: GridChunk) -> Dict[str, np.ndarray]:
+    """Load per setting at the worst level, as arrays aligned with ``chunk.settings``."""
+
+    model, tables = chunk.model, chunk.tables
+    multiplier = np.array([s.multiplier for s in chunk.settings])[:, None]
+    forced = np.array([s.lanes for s in chunk.settings])[:, None]
+    obstacles = np.array([s.obstacles for s in chunk.settings])[:, None]
+    npc = np.array([s.npc for s in chunk.settings])[:, None]
+    level = tables.levels[None, :]
+
+    lanes = np.where(forced > 0, forced, tables.curve_lanes[None, :])
+    penalty = np.where(forced > 0, 1.0, tables.curve_penalty[None, :])
+    # BotLoad scales BaseShotsPerSecond and ShotsPerLevelPct by the multiplier.
+    shots = model.base_shots * multiplier * (1 + model.shots_per_level_pct * multiplier * np.maximum(level - 1, 0))
+    spawns = np.where(lanes > 0, shots * penalty, 0.0) * _burst_mean(model, level, lanes)
+
+    removed = np.where(npc, np.minimum(1.0, chunk.npc.capacity / np.maximum(spawns, 1e-12)), 0.0)
+    parts_mean = spawns * ((1 - removed) * tables.flight_parts + removed * tables.short_parts)
+    parts_var = spawns * ((1 - removed) * tables.flight_parts_sq + removed * tables.short_parts_sq)
+    parts_rate = spawns * tables.parts_per_spawn
+    vfx_mean = parts_rate * chunk.vfx_per_event * chunk.vfx_lifetime
+    vfx_var = parts_rate * chunk.vfx_lifetime * chunk.vfx_per_event ** 2
+    active = obstacles | (level >= chunk.enable_obstacles_at)
+    spawn_load = parts_rate + np.where(active, chunk.tracers_per_second, 0.0)
+
+    parts = parts_mean + chunk.z * np.sqrt(parts_var)
+    vfx = vfx_mean + chunk.z * np.sqrt(vfx_var)
+    worst = parts.argmax(axis=1)
+    rows = np.arange(len(chunk.settings))
+    return {
+        "worst_level": tables.levels[worst],
+        "parts_mean": parts_mean.max(axis=1),
+        "parts": parts.max(axis=1),
+        "vfx": vfx.max(axis=1),
+        "spawn_per_second": spawn_load.max(axis=1),
+        "shots_per_second": (shots * penalty)[rows, worst],
+    }
+
+
+def sweep(
+    chunks: List[GridChunk],
+    jobs: Optional[int],
+) -> Tuple[List[StressSettings], Dict[str, np.ndarray]]:
+    results = list(map_shards(evaluate_chunk, chunks, jobs))
+    settings = [setting for chunk in chunks for setting in chunk.settings]
+    merged = {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+    return settings, merged
+
+
+def over_budget(metrics: Dict[str, np.ndarray], limits: Dict[str, Optional[float]]) -> Dict[str, np.ndarray]:
+    """Per metric, which settings exceed their budget; ``None`` limits are skipped."""
+
+    return {key: metrics[key] > limit for key, limit in limits.items() if limit is not None}
+
+
+def frontier(
+    settings: List[StressSettings],
+    metrics: Dict[str, np.ndarray],
+    limits: Dict[str, Optional[float]],
+) -> List[Dict[str, Any]]:
+    """Highest feasible multiplier per (lanes, obstacles, npc) and the budget that binds next."""
+
+    over = over_budget(metrics, limits)
+    ok = ~np.logical_or.reduce(list(over.values()))
+
+    groups: Dict[Tuple[int, bool, bool], List[int]] = {}
+    for index, setting in enumerate(settings):
+        groups.setdefault((setting.lanes, setting.obstacles, setting.npc), []).append(index)
+    rows = []
+    for (lanes, obstacles, npc), indices in sorted(groups.items()):
+        indices.sort(key=lambda index: settings[index].multiplier)
+        best = None
+        for index in indices:
+            if not ok[index]:
+                break
+            best = index
+        blocked = next((index for index in indices if not ok[index]), None)
+        rows.append(
+            {
+                "lanes": lanes,
+                "obstacles": obstacles,
+                "npc": npc,
+                "max_multiplier": settings[best].multiplier if best is not None else None,
+                "parts": float(metrics["parts"][best]) if best is not None else None,
+                "vfx": float(metrics["vfx"][best]) if best is not None else None,
+                "spawn_per_second": float(metrics["spawn_per_second"][best]) if best is not None else None,
+                "next_multiplier": settings[blocked].multiplier if blocked is not None else None,
+                "binding": [key for key, flags in over.items() if flags[blocked]] if blocked is not None else [],
+            }
+        )
+    return rows
+
+
+# -- CLI -------------------------------------------------------------------------
+
+
+def parse_range(text: str) -> List[float]:
+    """``start:stop:step`` (inclusive) or a comma-separated list of numbers."""
+
+    if text.count(":") == 2:
+        start, stop, step = (float(value) for value in text.split(":"))
+        if step <= 0 or stop < start:
+            raise ValueError(f"bad range {text!r}")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + index * step, 6) for index in range(count)]
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+def parse_lanes(text: str) -> List[int]:
+    lanes = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            low, high = (int(value) for value in part.split("-", 1))
+            lanes.extend(range(low, high + 1))
+        elif part:
+            lanes.append(int(part))
+    if not lanes or min(lanes) < 0:
+        raise ValueError("lane counts must be >= 0 (0 keeps the GameConfig curve)")
+    return sorted(set(lanes))
+
+
+def _lane_label(lanes: int) -> str:
+    return "curve" if lanes == 0 else str(lanes)
+
+
+def _on(flag: bool) -> str:
+    return "on" if flag else "off"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    budgets = report["budgets"]
+    spawn = f", spawn {budgets['spawn']:g}/s" if budgets["spawn"] is not None else ""
+    print(
+        f"budgets: projectile parts {budgets['projectiles']:g}, VFX instances {budgets['vfx']:g}{spawn} "
+        f"(q{report['quantile']:g}, levels {report['levels'][0]}-{report['levels'][-1]}, "
+        f"{report['configurations']:,} configurations)"
+    )
+    current = report["current"]
+    setting = current["settings"]
+    print(
+        f"StressConfig: x{setting['multiplier']:g}, lanes {_lane_label(setting['lanes'])}, "
+        f"obstacles {_on(setting['obstacles'])}, NPC batters {_on(setting['npc'])} -> "
+        f"parts {current['parts']:.0f}, VFX {current['vfx']:.0f}, spawn {current['spawn_per_second']:.1f}/s "
+        f"at level {current['worst_level']:g}: "
+        + ("within budget" if current["feasible"] else "OVER BUDGET (" + ", ".join(current["binding"]) + ")")
+    )
+    print()
+    print("highest FruitRateMultiplier within budget (budget exceeded at the next grid step):")
+    combos = [(False, False), (False, True), (True, False), (True, True)]
+    print(f"{'lanes':>6}" + "".join(f"{f'obst {_on(o)}, npc {_on(n)}':>22}" for o, n in combos))
+    cells: Dict[Tuple[int, bool, bool], Dict[str, Any]] = {
+        (row["lanes"], row["obstacles"], row["npc"]): row for row in report["frontier"]
+    }
+    for lanes in sorted({row["lanes"] for row in report["frontier"]}):
+        line = f"{_lane_label(lanes):>6}"
+        for obstacles, npc in combos:
+            row = cells.get((lanes, obstacles, npc))
+            if row is None:
+                line += f"{'-':>22}"
+                continue
+            best = "none" if row["max_multiplier"] is None else f"x{row['max_multiplier']:g}"
+            binding = f" ({', '.join(BINDING_LABELS[key] for key in row['binding'])})" if row["binding"] else ""
+            line += f"{best + binding:>22}"
+        print(line)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--multipliers", default=DEFAULT_MULTIPLIERS, help="FruitRateMultiplier grid, start:stop:step or a list"
+    )
+    parser.add_argument("--lanes", default=DEFAULT_LANES, help="TargetLaneCount grid; 0 keeps the GameConfig curve")
+    parser.add_argument("--levels", default="1-100", help="Levels checked for the worst case (default: 1-100)")
+    parser.add_argument("--quantile", type=float, default=DEFAULT_QUANTILE, help="Load quantile compared with budgets")
+    parser.add_argument("--lane-length", type=float, default=DEFAULT_LANE_LENGTH, help="Lane length in studs")
+    parser.add_argument("--vfx-per-event", type=float, default=DEFAULT_VFX_PER_EVENT, help="VFX instances per smash")
+    parser.add_argument("--vfx-lifetime", type=float, default=DEFAULT_VFX_LIFETIME, help="VFX lifetime in seconds")
+    parser.add_argument("--mini-turrets", type=int, default=DEFAULT_MINI_TURRETS, help="Mini turrets per arena")
+    parser.add_argument("--spawn-budget", type=float, default=None, help="Optional cap on instances created per second")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        multipliers = parse_range(args.multipliers)
+        lane_grid = parse_lanes(args.lanes)
+        levels = parse_levels(args.levels)
+        if not 0.5 <= args.quantile < 1:
+            raise ValueError("--quantile must be in [0.5, 1)")
+        config = load_stress_config()
+        budgets = load_budgets()
+        model = build_model(args.lane_length, 0.0)
+        obstacles = load_config("GameConfig").exports.get("Obstacles") or {}
+    except (ValueError, PlannerError, HarnessError, ConfigError, SimulationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    npc = npc_model(config)
+    tables = level_tables(model, levels, npc)
+    turret = obstacles.get("MiniTurret") or {}
+    interval = (float(turret.get("FireIntervalMin", 2.5)) + float(turret.get("FireIntervalMax", 3.5))) / 2
+    current = current_settings(config)
+    common = dict(
+        model=model,
+        tables=tables,
+        npc=npc,
+        enable_obstacles_at=float(obstacles.get("EnableAtLevel", 1)),
+        tracers_per_second=args.mini_turrets / max(interval, 1e-9),
+        vfx_per_event=args.vfx_per_event,
+        vfx_lifetime=args.vfx_lifetime,
+        z=NormalDist().inv_cdf(args.quantile),
+    )
+    chunks = [GridChunk(settings=(current,), **common)]
+    for lanes in lane_grid:
+        chunks.append(
+            GridChunk(
+                settings=tuple(
+                    StressSettings(multiplier, lanes, forced, npc_on)
+                    for multiplier, forced, npc_on in itertools.product(multipliers, (False, True), (False, True))
+                ),
+                **common,
+            )
+        )
+    settings, metrics = sweep(chunks, args.jobs)
+    limits = {"parts": budgets.projectiles, "vfx": budgets.vfx, "spawn_per_second": args.spawn_budget}
+    current_over = [key for key, flags in over_budget(metrics, limits).items() if flags[0]]
+
+    report = {
+        "budgets": {"projectiles": budgets.projectiles, "vfx": budgets.vfx, "spawn": args.spawn_budget},
+        "quantile": args.quantile,
+        "levels": [levels[0], levels[-1]],
+        "configurations": len(settings) - 1,
+        "current": {
+            "settings": vars(current),
+            "feasible": not current_over,
+            "binding": current_over,
+            **{key: float(values[0]) for key, values in metrics.items()},
+        },
+        "frontier": frontier(settings[1:], {key: values[1:] for key, values in metrics.items()}, limits),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""Stream ``[Telemetry]`` lines out of server logs and summarise them.
+
+``TelemetryServer.emitPrint`` writes each event as ``[Telemetry] {json}`` to
+server output. This analyzer reads plain or gzip-compressed log files in large
+binary blocks and locates the prefix with ``bytes.find``; only the bytes after
+a match are handed to the JSON decoder, so chat, warnings and
+``[TelemetrySummary]`` lines cost nothing beyond the scan.
+
+Work is split into shards (whole gzip files, byte ranges of large plain files)
+that run on a process pool. Each shard returns per-event counts, timestamp
+ranges and a mergeable quantile sketch per numeric field; the shard results are
+merged in the parent. Memory is bounded by the block size, the longest line and
+the sketch/field caps below, independent of how much log data is read.
+
+Usage::
+
+    python tools/telemetry_logs.py logs/ server-*.log.gz [--jobs N] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+PREFIX = b"[Telemetry] "
+GZIP_MAGIC = b"\x1f\x8b"
+LOG_SUFFIXES = (".log", ".txt", ".out", ".gz")
+BLOCK_SIZE = 1 << 20
+# Plain files larger than this are split into byte ranges across workers.
+SHARD_BYTES = 64 << 20
+# Lines longer than this are skipped rather than buffered without limit, and counted as malformed.
+MAX_LINE_BYTES = 1 << 20
+# Stands in for the payload of a telemetry line longer than MAX_LINE_BYTES; it
+# never decodes, so readers count the line as malformed.
+OVERSIZED_PAYLOAD = b""
+# Cardinality caps keep a summary bounded even for malformed or hostile logs.
+MAX_EVENTS = 256
+MAX_FIELDS_PER_EVENT = 64
+OVERFLOW_KEY = "<other>"
+# Envelope keys added by ``buildPayload``; ``timestamp`` is tracked separately.
+ENVELOPE_FIELDS = {"event", "timestamp", "v"}
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# -- input discovery and sharding ------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A unit of work: a whole file or a byte range of a plain file."""
+
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+
+
+def is_gzip(path: str) -> bool:
+    with open(path, "rb") as handle:
+        return handle.read(2) == GZIP_MAGIC
+
+
+def expand_inputs(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the log files beneath them (sorted)."""
+
+    files: List[str] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file() and child.name.lower().endswith(LOG_SUFFIXES):
+                    files.append(str(child))
+        elif path.is_file():
+            files.append(str(path))
+        else:
+            raise FileNotFoundError(f"Log input not found: {raw}")
+    return files
+
+
+def plan_shards(files: Sequence[str], shard_bytes: int = SHARD_BYTES) -> List[Shard]:
+    shards: List[Shard] = []
+    for path in files:
+        size = os.path.getsize(path)
+        if is_gzip(path) or size <= shard_bytes:
+            shards.append(Shard(path))
+            continue
+        for start in range(0, size, shard_bytes):
+            shards.append(Shard(path, start, min(start + shard_bytes, size)))
+    return shards
+
+
+def map_shards(
+    worker: Callable[[T], R],
+    items: Sequence[T],
+    jobs: Optional[int] = None,
+) -> Iterator[R]:
+    """Run ``worker`` over ``items`` on a process pool (inline for one job)."""
+
+    if jobs == 1 or len(items) <= 1:
+        for item in items:
+            yield worker(item)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, items)
+
+
+# -- line scanning ---------------------------------------------------------------
+
+
+def open_log(path: str) -> BinaryIO:
+    if is_gzip(path):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    return open(path, "rb")
+
+
+def _matches(buffer: bytes) -> Iterator[bytes]:
+    """Yield the payload after ``PREFIX`` on every complete line in ``buffer``."""
+
+    find = buffer.find
+    pos = find(PREFIX)
+    while pos >= 0:
+        eol = find(b"\n", pos)
+        if eol < 0:
+            eol = len(buffer)
+        if eol - (buffer.rfind(b"\n", 0, pos) + 1) > MAX_LINE_BYTES:
+            yield OVERSIZED_PAYLOAD
+        else:
+            yield buffer[pos + len(PREFIX):eol].rstrip(b"\r")
+        pos = find(PREFIX, eol)
+
+
+def iter_payloads(shard: Shard, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield raw JSON payload bytes for each ``[Telemetry]`` line in ``shard``.
+
+    A byte-range shard owns the lines that *start* inside its range: it skips
+    the partial line it begins in and finishes the line it ends in. A
+    telemetry line longer than ``MAX_LINE_BYTES`` yields ``OVERSIZED_PAYLOAD``.
+    """
+
+    with open_log(shard.path) as handle:
+        remaining: Optional[int] = None
+        if shard.end is not None:
+            if shard.start > 0:
+                handle.seek(shard.start - 1)
+                handle.readline()
+            remaining = shard.end - handle.tell()
+            if remaining <= 0:
+                return
+        carry = b""
+        # Set while discarding the tail of a line longer than MAX_LINE_BYTES, so
+        # its remainder is never mistaken for the start of a fresh line.
+        skipping = False
+        reported = False
+        tail = b""
+        # Set once the range is used up while a line is still open: read on to its newline.
+        finishing = False
+        while True:
+            size = block_size if remaining is None else min(block_size, remaining)
+            block = handle.read(size) if size > 0 else b""
+            if remaining is not None:
+                remaining -= len(block)
+            if not block and remaining is not None and (carry or skipping):
+                # Finish the line that straddles the end of the range.
+                remaining = None
+                finishing = True
+                continue
+            line_done = finishing and b"\n" in block
+            if line_done:
+                block = block[: block.index(b"\n") + 1]
+            if not block:
+                if carry:
+                    yield from _matches(carry)
+                return
+            if skipping:
+                newline = block.find(b"\n")
+                # ``tail`` holds the end of the previous block, for a prefix split across blocks.
+                segment = tail + (block if newline < 0 else block[:newline])
+                if not reported and PREFIX in segment:
+                    reported = True
+                    yield OVERSIZED_PAYLOAD
+                if newline < 0:
+                    tail = segment[-(len(PREFIX) - 1):]
+                    continue
+                skipping = False
+                block = block[newline + 1:]
+            buffer = carry + block if carry else block
+            last_newline = buffer.rfind(b"\n")
+            if last_newline < 0:
+                carry = buffer
+            else:
+                carry = buffer[last_newline + 1:]
+                yield from _matches(buffer[: last_newline + 1])
+            if len(carry) > MAX_LINE_BYTES:
+                reported = PREFIX in carry
+                if reported:
+                    yield OVERSIZED_PAYLOAD
+                tail = carry[-(len(PREFIX) - 1):]
+                carry = b""
+                skipping = True
+            if line_done:
+                return
+
+
+def iter_events(shard: Shard, stats: Optional["ScanStats"] = None) -> Iterator[dict]:
+    """Decode each telemetry payload in ``shard`` into a dict."""
+
+    loads = json.loads
+    for payload in iter_payloads(shard):
+        if stats is not None:
+            stats.matched += 1
+        try:
+            event = loads(payload)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            if stats is not None:
+                stats.malformed += 1
+            continue
+        yield event
+
+
+# -- mergeable summaries ---------------------------------------------------------
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch with logarithmic buckets (DDSketch-style).
+
+    Any two sketches built with the same accuracy merge by adding bucket
+    counts. Each side keeps at most ``max_bins`` buckets; beyond that the
+    smallest-magnitude buckets are folded together, which only costs accuracy
+    at the low tail.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "max_bins", "positive", "negative", "zero", "count")
+
+    MIN_MAGNITUDE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    @staticmethod
+    def _collapse(store: Dict[int, int], max_bins: int) -> None:
+        if len(store) <= max_bins:
+            return
+        keys = sorted(store)
+        overflow = keys[: len(keys) - max_bins + 1]
+        target = overflow[-1]
+        total = sum(store.pop(key) for key in overflow)
+        store[target] = total
+
+    def add(self, value: float, weight: int = 1) -> None:
+        if value > self.MIN_MAGNITUDE:
+            store = self.positive
+            key = self._key(value)
+        elif value < -self.MIN_MAGNITUDE:
+            store = self.negative
+            key = self._key(-value)
+        else:
+            self.zero += weight
+            self.count += weight
+            return
+        store[key] = store.get(key, 0) + weight
+        self.count += weight
+        if len(store) > self.max_bins:
+            self._collapse(store, self.max_bins)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+            self._collapse(mine, self.max_bins)
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+
+@dataclass
+class FieldStats:
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.sketch.add(value)
+
+    def merge(self, other: "FieldStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def as_dict(self, quantiles: Sequence[float]) -> dict:
+        doc = {
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else None,
+        }
+        for q in quantiles:
+            estimate = self.sketch.quantile(q)
+            if estimate is not None:
+                # Bucket midpoints can overshoot the observed range; clamp them.
+                estimate = min(max(estimate, self.minimum), self.maximum)
+            doc[f"p{q * 100:g}"] = estimate
+        return doc
+
+
+@dataclass
+class EventStats:
+    count: int = 0
+    first_timestamp: Optional[float] = None
+    last_timestamp: Optional[float] = None
+    fields: Dict[str, FieldStats] = field(default_factory=dict)
+
+    def _field(self, name: str) -> FieldStats:
+        stats = self.fields.get(name)
+        if stats is None:
+            if len(self.fields) >= MAX_FIELDS_PER_EVENT:
+                name = OVERFLOW_KEY
+                stats = self.fields.get(name)
+            if stats is None:
+                stats = self.fields[name] = FieldStats()
+        return stats
+
+    def add(self, event: dict) -> None:
+        self.count += 1
+        timestamp = event.get("timestamp")
+        if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+        for key, value in event.items():
+            if key in ENVELOPE_FIELDS or isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if value != value or value in (math.inf, -math.inf):
+                continue
+            self._field(key).add(float(value))
+
+    def merge(self, other: "EventStats") -> None:
+        self.count += other.count
+        for mine in ("first_timestamp", "last_timestamp"):
+            theirs = getattr(other, mine)
+            current = getattr(self, mine)
+            if theirs is None:
+                continue
+            if current is None:
+                setattr(self, mine, theirs)
+            elif mine == "first_timestamp":
+                setattr(self, mine, min(current, theirs))
+            else:
+                setattr(self, mine, max(current, theirs))
+        for name, stats in other.fields.items():
+            target = self.fields.get(name)
+            if target is None and len(self.fields) >= MAX_FIELDS_PER_EVENT:
+                name = OVERFLOW_KEY
+                target = self.fields.get(name)
+            if target is None:
+                self.fields[name] = stats
+            else:
+                target.merge(stats)
+
+
+@dataclass
+class ScanStats:
+    shards: int = 0
+    bytes: int = 0
+    matched: int = 0
+    malformed: int = 0
+
+
+@dataclass
+class LogSummary:
+    scan: ScanStats = field(default_factory=ScanStats)
+    events: Dict[str, EventStats] = field(default_factory=dict)
+
+    def add(self, event: dict) -> None:
+        name = event.get("event")
+        name = name if isinstance(name, str) else OVERFLOW_KEY
+        stats = self.events.get(name)
+        if stats is None:
+            if len(self.events) >= MAX_EVENTS:
+                name = OVERFLOW_KEY
+                stats = self.events.get(name)
+            if stats is None:
+                stats = self.events[name] = EventStats()
+        stats.add(event)
+
+    def merge(self, other: "LogSummary") -> None:
+        for attr in ("shards", "bytes", "matched", "malformed"):
+            setattr(self.scan, attr, getattr(self.scan, attr) + getattr(other.scan, attr))
+        for name, stats in other.events.items():
+            target = self.events.get(name)
+            if target is None and len(self.events) >= MAX_EVENTS:
+                name = OVERFLOW_KEY
+                target = self.events.get(name)
+            if target is None:
+                self.events[name] = stats
+            else:
+                target.merge(stats)
+
+    def as_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> dict:
+        return {
+            "scan": vars(self.scan).copy(),
+            "events": {
+                name: {
+                    "count": stats.count,
+                    "first_timestamp": stats.first_timestamp,
+                    "last_timestamp": stats.last_timestamp,
+                    "fields": {key: value.as_dict(quantiles) for key, value in sorted(stats.fields.items())},
+                }
+                for name, stats in sorted(self.events.items(), key=lambda item: -item[1].count)
+            },
+        }
+
+
+def summarise_shard(shard: Shard) -> LogSummary:
+    summary = LogSummary()
+    summary.scan.shards = 1
+    if shard.end is not None:
+        summary.scan.bytes = shard.end - shard.start
+    else:
+        summary.scan.bytes = os.path.getsize(shard.path)
+    for event in iter_events(shard, summary.scan):
+        summary.add(event)
+    return summary
+
+
+def analyse(paths: Iterable[str], jobs: Optional[int] = None) -> LogSummary:
+    shards = plan_shards(expand_inputs(paths))
+    merged = LogSummary()
+    for partial in map_shards(summarise_shard, shards, jobs):
+        merged.merge(partial)
+    return merged
+
+
+def _format(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.4g}"
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Log files or directories (plain or .gz)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--quantiles",
+        default=",".join(f"{q:g}" for q in DEFAULT_QUANTILES),
+        help="Comma-separated quantiles to report (default: 0.5,0.95,0.99)",
+    )
+    parser.add_argument("--json", action="store_true", help="Emit the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    quantiles = [float(part) for part in args.quantiles.split(",") if part.strip()]
+    try:
+        summary = analyse(args.inputs, args.jobs)
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    doc = summary.as_dict(quantiles)
+    if args.json:
+        print(json.dumps(doc, indent=2))
+        return 0
+
+    scan = doc["scan"]
+    print(
+        f"Scanned {scan['bytes']:,} bytes in {scan['shards']} shard(s): "
+        f"{scan['matched']:,} telemetry lines, {scan['malformed']:,} malformed."
+    )
+    for name, stats in doc["events"].items():
+        print(f"\n{name}: {stats['count']:,} events")
+        for key, field_doc in stats["fields"].items():
+            pieces = " ".join(
+                f"{label}={_format(field_doc[label])}" for label in field_doc if label.startswith("p")
+            )
+            print(
+                f"  {key:<20} n={field_doc['count']:<8} min={_format(field_doc['min'])} "
+                f"mean={_format(field_doc['mean'])} max={_format(field_doc['max'])} {pieces}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""Break round time down by phase from ``round_phase`` telemetry.
+
+``RoundDirectorServer.logPhase`` tracks a ``round_phase`` event (``arenaId``,
+``phase``, ``level``, ``wave``) each time an arena enters Prep, Wave,
+LevelComplete, Shop, Defeat or Aborted; ``match_start``/``match_end`` bracket
+the match and ``wave_complete`` marks the end of each wave. This report walks
+those events in log order and, per open match (keyed by arena, since an arena
+runs one match at a time), times every phase until the next transition. Time
+between ``wave_complete`` and the next phase is reported as ``InterWave``;
+``Level`` is the whole level from Prep to the next level's Prep or the end.
+
+Per-level phase totals feed one ``FieldStats`` (count/min/mean/max plus a
+mergeable quantile sketch) per level band and phase. Bands follow the
+``minLevel`` entries of ``ROSTER_BANDS`` in ``RoundDirectorServer.lua`` unless
+``--bands`` overrides them. A match only holds its current phase, level start
+and a small per-phase total table, and open matches live in an LRU table
+capped at ``--max-open`` (idle ones are closed after ``--idle-seconds``), so
+memory does not grow with the number of matches. Outliers come from a bounded
+top-K per band/phase: levels whose phase time is above both p99 and
+``--outlier-factor`` times p50 are flagged.
+
+Telemetry timestamps are whole Unix seconds, so durations have one-second
+resolution. Files are treated as separate servers and processed in parallel.
+
+Usage::
+
+    python tools/telemetry_phases.py logs/ [--jobs N] [--csv phases.csv] [--html phases.html] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import html
+import json
+import math
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from luau_literals import evaluate_locals
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError
+from telemetry_logs import FieldStats, Shard, expand_inputs, iter_events, map_shards
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ROUND_DIRECTOR_SOURCE = REPO_ROOT / "ServerScriptService" / "GameServer" / "RoundDirectorServer.lua"
+BANDS_LOCAL = "ROSTER_BANDS"
+
+PHASE_EVENT = "round_phase"
+MATCH_START_EVENTS = ("MatchStart", "match_start")
+MATCH_END_EVENTS = ("MatchEnd", "match_end")
+WAVE_END_EVENTS = ("Wave", "wave_complete")
+INTER_WAVE = "InterWave"
+LEVEL_TOTAL = "Level"
+PHASE_ORDER = ("Prep", "Wave", INTER_WAVE, "LevelComplete", "Shop", "Defeat", "Aborted", LEVEL_TOTAL)
+
+DEFAULT_MAX_OPEN = 50_000
+DEFAULT_IDLE_SECONDS = 2 * 3600
+DEFAULT_TOP = 20
+DEFAULT_OUTLIER_FACTOR = 3.0
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def load_level_bands(source: Path = ROUND_DIRECTOR_SOURCE) -> List[int]:
+    """``minLevel`` of each ``ROSTER_BANDS`` entry (``[1]`` if none can be read)."""
+
+    try:
+        tokens = list(Lexer(Path(source).read_text(encoding="utf-8")).tokens())
+        bands = evaluate_locals(tokens, {BANDS_LOCAL}).get(BANDS_LOCAL) or []
+    except (OSError, ValueError, LuauSyntaxError):
+        return [1]
+    levels = sorted({int(band["minLevel"]) for band in bands if isinstance(band, dict) and "minLevel" in band})
+    return levels or [1]
+
+
+def band_label(level: Optional[float], bands: Sequence[int]) -> str:
+    if level is None:
+        return "unknown"
+    index = 0
+    for position, start in enumerate(bands):
+        if level >= start:
+            index = position
+        else:
+            break
+    start = bands[index]
+    if index + 1 < len(bands):
+        return f"{start}-{bands[index + 1] - 1}"
+    return f"{start}+"
+
+
+def _number(value: object) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+@dataclass
+class OpenMatch:
+    """Constant-size state for one running match."""
+
+    label: str
+    last_seen: float
+    level: Optional[float] = None
+    level_started: Optional[float] = None
+    phase: Optional[str] = None
+    phase_started: Optional[float] = None
+    totals: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class PhaseReport:
+    bands: Tuple[int, ...]
+    top: int = DEFAULT_TOP
+    stats: Dict[Tuple[str, str], FieldStats] = field(default_factory=dict)
+    # Min-heaps of (seconds, match label, level) holding the largest values seen.
+    longest: Dict[Tuple[str, str], List[Tuple[float, str, float]]] = field(default_factory=dict)
+    matches: int = 0
+    unterminated: int = 0
+    evicted: int = 0
+
+    def add_level(self, match: OpenMatch) -> None:
+        if match.level is None or not match.totals:
+            return
+        band = band_label(match.level, self.bands)
+        for phase, seconds in match.totals.items():
+            key = (band, phase)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = FieldStats()
+            stats.add(seconds)
+            heap = self.longest.setdefault(key, [])
+            entry = (seconds, match.label, match.level)
+            if len(heap) < self.top:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def merge(self, other: "PhaseReport") -> None:
+        for key, stats in other.stats.items():
+            if key in self.stats:
+                self.stats[key].merge(stats)
+            else:
+                self.stats[key] = stats
+        for key, heap in other.longest.items():
+            merged = self.longest.get(key, []) + heap
+            self.longest[key] = heapq.nlargest(self.top, merged)
+            heapq.heapify(self.longest[key])
+        self.matches += other.matches
+        self.unterminated += other.unterminated
+        self.evicted += other.evicted
+
+    def rows(self) -> List[dict]:
+        def order(key: Tuple[str, str]) -> Tuple[int, int]:
+            band, phase = key
+            band_start = int(band.split("-")[0].rstrip("+")) if band[0].isdigit() else -1
+            rank = PHASE_ORDER.index(phase) if phase in PHASE_ORDER else len(PHASE_ORDER)
+            return band_start, rank
+
+        rows = []
+        for key in sorted(self.stats, key=order):
+            doc = self.stats[key].as_dict(QUANTILES)
+            rows.append({"band": key[0], "phase": key[1], **doc})
+        return rows
+
+    def outliers(self, factor: float) -> List[dict]:
+        flagged = []
+        for key, heap in self.longest.items():
+            doc = self.stats[key].as_dict(QUANTILES)
+            p50, p99 = doc["p50"], doc["p99"]
+            if p50 is None or p99 is None:
+                continue
+            threshold = max(p99, factor * p50)
+            for seconds, label, level in sorted(heap, reverse=True):
+                if seconds > threshold:
+                    flagged.append(
+                        {"band": key[0], "phase": key[1], "match": label, "level": level, "seconds": seconds, "p50": p50, "p99": p99}
+                    )
+        flagged.sort(key=lambda item: -item["seconds"] / max(item["p50"], 1.0))
+        return flagged
+
+
+class PhaseTracker:
+    """Feeds events into a ``PhaseReport`` while keeping open matches bounded."""
+
+    def __init__(self, report: PhaseReport, source: str, max_open: int, idle_seconds: float) -> None:
+        self.report = report
+        self.source = source
+        self.max_open = max_open
+        self.idle_seconds = idle_seconds
+        self.open: "OrderedDict[str, OpenMatch]" = OrderedDict()
+
+    def _close_phase(self, match: OpenMatch, now: float) -> None:
+        if match.phase is not None and match.phase_started is not None:
+            elapsed = max(0.0, now - match.phase_started)
+            match.totals[match.phase] = match.totals.get(match.phase, 0.0) + elapsed
+        match.phase = None
+        match.phase_started = None
+
+    def _close_level(self, match: OpenMatch, now: float) -> None:
+        self._close_phase(match, now)
+        if match.level_started is not None and match.totals:
+            match.totals[LEVEL_TOTAL] = max(0.0, now - match.level_started)
+        self.report.add_level(match)
+        match.totals = {}
+        match.level_started = None
+
+    def _finish(self, key: str, now: float, terminated: bool) -> None:
+        match = self.open.pop(key)
+        self._close_level(match, now)
+        self.report.matches += 1
+        if not terminated:
+            self.report.unterminated += 1
+
+    def _open(self, key: str, now: float) -> OpenMatch:
+        match = self.open.get(key)
+        if match is None:
+            match = self.open[key] = OpenMatch(label=f"{self.source}:{key}@{now:.0f}", last_seen=now)
+            while len(self.open) > self.max_open:
+                oldest = next(iter(self.open))
+                self._finish(oldest, self.open[oldest].last_seen, terminated=False)
+                self.report.evicted += 1
+        else:
+            self.open.move_to_end(key)
+        match.last_seen = now
+        return match
+
+    def _expire(self, now: float) -> None:
+        while self.open:
+            key, match = next(iter(self.open.items()))
+            if now - match.last_seen <= self.idle_seconds:
+                break
+            self._finish(key, match.last_seen, terminated=False)
+
+    def process(self, payload: dict) -> None:
+        now = _number(payload.get("timestamp"))
+        arena = payload.get("arenaId")
+        if now is None or arena is None:
+            return
+        key = str(arena)
+        event = payload.get("event")
+        self._expire(now)
+
+        if event in MATCH_START_EVENTS:
+            if key in self.open:
+                self._finish(key, now, terminated=False)
+            self._open(key, now)
+            return
+        if event in MATCH_END_EVENTS:
+            if key in self.open:
+                self._finish(key, now, terminated=True)
+            return
+        if event in WAVE_END_EVENTS:
+            match = self.open.get(key)
+            if match is not None and match.phase == "Wave":
+                self._close_phase(match, now)
+                match.phase, match.phase_started = INTER_WAVE, now
+                self._open(key, now)
+            return
+        if event != PHASE_EVENT:
+            return
+
+        phase = payload.get("phase")
+        if not isinstance(phase, str) or not phase:
+            return
+        level = _number(payload.get("level"))
+        match = self._open(key, now)
+        if phase == "Prep" or (level is not None and level != match.level):
+            self._close_level(match, now)
+            match.level = level
+            match.level_started = now
+        else:
+            self._close_phase(match, now)
+        if match.level_started is None:
+            match.level_started = now
+        match.phase, match.phase_started = phase, now
+
+    def finish(self) -> None:
+        for key in list(self.open):
+            self._finish(key, self.open[key].last_seen, terminated=False)
+
+
+@dataclass
+class PhaseTask:
+    path: str
+    bands: Tuple[int, ...]
+    top: int
+    max_open: int
+    idle_seconds: float
+
+
+def phase_task(task: PhaseTask) -> PhaseReport:
+    report = PhaseReport(task.bands, task.top)
+    tracker = PhaseTracker(report, Path(task.path).name, task.max_open, task.idle_seconds)
+    for payload in iter_events(Shard(task.path)):
+        tracker.process(payload)
+    tracker.finish()
+    return report
+
+
+def analyse_phases(
+    paths: Iterable[str],
+    bands: Sequence[int],
+    jobs: Optional[int] = None,
+    top: int = DEFAULT_TOP,
+    max_open: int = DEFAULT_MAX_OPEN,
+    idle_seconds: float = DEFAULT_IDLE_SECONDS,
+) -> PhaseReport:
+    tasks = [PhaseTask(path, tuple(bands), top, max_open, idle_seconds) for path in expand_inputs(paths)]
+    merged = PhaseReport(tuple(bands), top)
+    for partial in map_shards(phase_task, tasks, jobs):
+        merged.merge(partial)
+    return merged
+
+
+# -- output ----------------------------------------------------------------------
+
+COLUMNS = ("band", "phase", "count", "mean", "p50", "p95", "p99", "min", "max")
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def write_csv(path: Path, rows: Sequence[dict]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow([row[column] if column in ("band", "phase", "count") else _format(row[column]) for column in COLUMNS])
+
+
+def render_html(report: PhaseReport, rows: Sequence[dict], outliers: Sequence[dict]) -> str:
+    def table(headers: Sequence[str], body: Iterable[Sequence[object]]) -> str:
+        head = "".join(f"<th>{html.escape(name)}</th>" for name in headers)
+        lines = ["<table>", f"<tr>{head}</tr>"]
+        for cells in body:
+            lines.append("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in cells) + "</tr>")
+        lines.append("</table>")
+        return "\n".join(lines)
+
+    phase_table = table(
+        [*COLUMNS[:3], *(f"{name} (s)" for name in COLUMNS[3:])],
+        ([row[c] if c in ("band", "phase", "count") else _format(row[c]) for c in COLUMNS] for row in rows),
+    )
+    outlier_table = table(
+        ("band", "phase", "match", "level", "seconds", "p50", "p99"),
+        (
+            (item["band"], item["phase"], item["match"], f"{item['level']:g}", _format(item["seconds"]), _format(item["p50"]), _format(item["p99"]))
+            for item in outliers
+        ),
+    )
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html><head><meta charset="utf-8"><title>Round phase durations</title>',
+            "<style>body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:2em}"
+            "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}td:nth-child(-n+3){text-align:left}</style>",
+            "</head><body>",
+            "<h1>Round phase durations</h1>",
+            f"<p>{report.matches:,} matches ({report.unterminated:,} without match_end, {report.evicted:,} evicted).</p>",
+            phase_table,
+            f"<h2>Outliers ({len(outliers)})</h2>",
+            outlier_table,
+            "</body></html>",
+            "",
+        ]
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Log files or directories (plain or .gz)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--bands", help="Comma-separated band start levels (default: ROSTER_BANDS)")
+    parser.add_argument("--max-open", type=int, default=DEFAULT_MAX_OPEN, help="Open matches kept per file")
+    parser.add_argument("--idle-seconds", type=float, default=DEFAULT_IDLE_SECONDS, help="Close matches idle this long")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Longest levels kept per band/phase")
+    parser.add_argument("--outlier-factor", type=float, default=DEFAULT_OUTLIER_FACTOR, help="Also require this multiple of p50")
+    parser.add_argument("--csv", type=Path, help="Write the band/phase table as CSV")
+    parser.add_argument("--html", type=Path, help="Write an HTML report")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        bands = [int(part) for part in args.bands.split(",")] if args.bands else load_level_bands()
+        report = analyse_phases(args.inputs, sorted(set(bands)), args.jobs, args.top, args.max_open, args.idle_seconds)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    rows = report.rows()
+    outliers = report.outliers(args.outlier_factor)
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.html:
+        args.html.write_text(render_html(report, rows, outliers), encoding="utf-8")
+    if args.json:
+        doc = {
+            "matches": report.matches,
+            "unterminated": report.unterminated,
+            "evicted": report.evicted,
+            "phases": rows,
+            "outliers": outliers,
+        }
+        print(json.dumps(doc, indent=2))
+        return 0
+
+    print(f"{report.matches:,} matches ({report.unterminated:,} without match_end, {report.evicted:,} evicted)\n")
+    print(f"{'band':<8} {'phase':<14} {'count':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for row in rows:
+        print(
+            f"{row['band']:<8} {row['phase']:<14} {row['count']:>8,} {_format(row['mean']):>8} {_format(row['p50']):>8} "
+            f"{_format(row['p95']):>8} {_format(row['p99']):>8} {_format(row['max']):>8}"
+        )
+    if outliers:
+        print(f"\n{len(outliers)} outlier level(s):")
+        for item in outliers[:20]:
+            print(
+                f"  {item['match']} level {item['level']:g} {item['phase']}: {_format(item['seconds'])}s "
+                f"(band {item['band']} p50 {_format(item['p50'])}s, p99 {_format(item['p99'])}s)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
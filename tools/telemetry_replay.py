@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""Rebuild ``[TelemetrySummary]`` match summaries offline from telemetry logs.
+
+``TelemetryServer.processAggregateEvent`` folds MatchStart/Wave/TokenUse/
+ObstacleHit/MatchEnd payloads into an ``AggregateState`` per match and prints a
+summary when the match ends. When a server dies those summaries are lost with
+it. This tool replays the same state machine over the ``[Telemetry]`` lines in
+collected logs: the alias index (match → arena → party → session), the
+completion table that stops late events reopening a finished match, and the
+summary formatting (``formatNumber``/``sanitizeIdentifierForSummary``) are
+ported one-for-one.
+
+Differences from the live server, all forced by working offline:
+
+* The completion TTL runs on the log's own clock (the payload ``timestamp``)
+  instead of ``os.clock()``, and the summary ``timestamp`` is the MatchEnd
+  payload's rather than the time of printing.
+* Open states live in an LRU table capped at ``--max-open``; the least recently
+  touched state is dropped when a new one would exceed it, so replaying months
+  of logs keeps memory flat. Evictions are counted in the report.
+
+Each input file is treated as one server's output and replayed on its own, so
+files run in parallel; pass ``--single-stream`` when rotated files of one
+server must be replayed as a single ordered stream.
+
+Usage::
+
+    python tools/telemetry_replay.py logs/ [--jobs N] [--max-open 50000] [--output summaries.log]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from telemetry_logs import ScanStats, Shard, expand_inputs, iter_events, map_shards
+from telemetry_spec import lua_tonumber, lua_tostring
+
+SUMMARY_PREFIX = "[TelemetrySummary] "
+AGGREGATE_COMPLETION_TTL = 60
+DEFAULT_MAX_OPEN = 50_000
+WAVE_COIN_KEYS = ("coins", "coinDelta", "coinsDelta", "coinsAwarded", "coinsEarned", "coinsGained")
+# Lookup order shared by findAggregateState and resolvePrimaryKey.
+KEY_FIELDS = (("match", "matchId"), ("arena", "arenaId"), ("party", "partyId"), ("session", "sessionId"))
+
+
+def _finite(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _round_half_away(value: float) -> int:
+    return math.floor(value + 0.5) if value >= 0 else -math.floor(-value + 0.5)
+
+
+def make_aggregate_key(kind: str, value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        trimmed = value.strip()
+        return f"{kind}:{trimmed}" if trimmed else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{kind}:{lua_tostring(value)}" if _finite(value) else None
+    return f"{kind}:{lua_tostring(value)}"
+
+
+def sanitize_identifier(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not _finite(value):
+            return None
+        if abs(value - math.floor(value)) < 1e-6:
+            return str(_round_half_away(value))
+        return lua_tostring(value)
+    return lua_tostring(value)
+
+
+def format_number(value: float) -> str:
+    if not _finite(value):
+        return "0"
+    if abs(value - math.floor(value)) < 1e-6:
+        return str(_round_half_away(value))
+    formatted = f"{value:.2f}".rstrip("0")
+    formatted = formatted[:-1] if formatted.endswith(".") else formatted
+    return formatted or "0"
+
+
+def escape_json_string(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+    )
+
+
+def render_summary(fields: Sequence[Tuple[str, Any]]) -> str:
+    """Format summary fields exactly like ``formatSummaryEntry``."""
+
+    pieces: List[str] = []
+    for key, value in fields:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            pieces.append(f'"{key}":{"true" if value else "false"}')
+        elif isinstance(value, (int, float)):
+            if _finite(value):
+                pieces.append(f'"{key}":{format_number(value)}')
+        else:
+            printable = sanitize_identifier(value)
+            if printable is not None:
+                pieces.append(f'"{key}":"{escape_json_string(printable)}"')
+    return SUMMARY_PREFIX + "{" + ",".join(pieces) + "}"
+
+
+class AggregateState:
+    __slots__ = (
+        "primary_key", "aliases", "wave_count", "total_coins", "tokens_used", "deaths", "started_at",
+        "last_arena", "last_party", "last_match", "last_session", "last_level", "last_outcome",
+        "last_reason", "last_timestamp", "completed",
+    )
+
+    def __init__(self, primary_key: str) -> None:
+        self.primary_key = primary_key
+        self.aliases = {primary_key}
+        self.clear()
+
+    def clear(self) -> None:
+        self.wave_count = 0
+        self.total_coins: float = 0
+        self.tokens_used = 0
+        self.deaths = 0
+        self.started_at: Any = None
+        self.last_arena: Optional[str] = None
+        self.last_party: Optional[str] = None
+        self.last_match: Optional[str] = None
+        self.last_session: Optional[str] = None
+        self.last_level: Optional[float] = None
+        self.last_outcome: Optional[str] = None
+        self.last_reason: Optional[str] = None
+        self.last_timestamp: Any = None
+        self.completed = False
+
+
+@dataclass
+class ReplayStats:
+    events: int = 0
+    summaries: int = 0
+    evicted: int = 0
+    suppressed: int = 0
+    open_at_end: int = 0
+
+    def merge(self, other: "ReplayStats") -> None:
+        for name in vars(self):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+class AggregateReplay:
+    """The ``processAggregateEvent`` state machine with a bounded open-state table."""
+
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN, completion_ttl: float = AGGREGATE_COMPLETION_TTL) -> None:
+        self.max_open = max_open
+        self.completion_ttl = completion_ttl
+        self.index: Dict[str, AggregateState] = {}
+        # Open states in least-recently-touched order (states hash by identity).
+        self.open: "OrderedDict[AggregateState, None]" = OrderedDict()
+        # Completion marks in the order they were set, so expiry pops from the front.
+        self.completed_keys: "OrderedDict[str, float]" = OrderedDict()
+        self.clock = 0.0
+        self.stats = ReplayStats()
+
+    # -- bookkeeping ----------------------------------------------------------
+
+    def _touch(self, state: AggregateState) -> None:
+        if state in self.open:
+            self.open.move_to_end(state)
+            return
+        self.open[state] = None
+        while len(self.open) > self.max_open:
+            evicted, _ = self.open.popitem(last=False)
+            self._forget(evicted)
+            self.stats.evicted += 1
+
+    def _forget(self, state: AggregateState) -> None:
+        for key in state.aliases:
+            if self.index.get(key) is state:
+                del self.index[key]
+
+    def _prune_completion(self) -> None:
+        completed = self.completed_keys
+        while completed:
+            key, marked = next(iter(completed.items()))
+            if self.clock - marked <= self.completion_ttl:
+                break
+            del completed[key]
+
+    def _register(self, state: AggregateState, key: Optional[str]) -> None:
+        if key:
+            self.index[key] = state
+            state.aliases.add(key)
+
+    def _clear_aliases(self, state: AggregateState) -> None:
+        for key in list(state.aliases):
+            if key != state.primary_key:
+                state.aliases.discard(key)
+                if self.index.get(key) is state:
+                    del self.index[key]
+        self.index[state.primary_key] = state
+        state.aliases.add(state.primary_key)
+
+    def _update_context(self, state: AggregateState, payload: dict) -> None:
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, str) and timestamp:
+            state.last_timestamp = timestamp
+        level = payload.get("level")
+        level = level if _finite(level) else lua_tonumber(level)
+        if _finite(level):
+            state.last_level = level
+        for attr, key in (("last_outcome", "outcome"), ("last_reason", "reason")):
+            value = payload.get(key)
+            if isinstance(value, str) and value:
+                setattr(state, attr, value)
+        for kind, field_name in (("arena", "arenaId"), ("party", "partyId"), ("match", "matchId"), ("session", "sessionId")):
+            key = make_aggregate_key(kind, payload.get(field_name))
+            if key:
+                self._register(state, key)
+                setattr(state, f"last_{kind}", sanitize_identifier(payload.get(field_name)))
+
+    def _reset(self, state: AggregateState, payload: dict) -> None:
+        self._clear_aliases(state)
+        state.clear()
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, str) and timestamp:
+            state.started_at = timestamp
+            state.last_timestamp = timestamp
+        self._update_context(state, payload)
+
+    def _find(self, payload: dict) -> Optional[AggregateState]:
+        for kind, field_name in KEY_FIELDS:
+            key = make_aggregate_key(kind, payload.get(field_name))
+            if key:
+                state = self.index.get(key)
+                if state is not None or kind == "session":
+                    return state
+        return None
+
+    def _create(self, payload: dict) -> Optional[AggregateState]:
+        self._prune_completion()
+        primary = None
+        for kind, field_name in KEY_FIELDS:
+            primary = make_aggregate_key(kind, payload.get(field_name))
+            if primary:
+                break
+        if not primary:
+            return None
+        if primary in self.completed_keys:
+            self.stats.suppressed += 1
+            return None
+        state = AggregateState(primary)
+        self.index[primary] = state
+        self._reset(state, payload)
+        return state
+
+    def _find_or_create(self, payload: dict) -> Optional[AggregateState]:
+        state = self._find(payload)
+        if state is None:
+            state = self._create(payload)
+        if state is not None:
+            self._touch(state)
+        return state
+
+    def _mark_completed(self, state: AggregateState) -> None:
+        self._prune_completion()
+        for key in state.aliases:
+            self.completed_keys.pop(key, None)
+            self.completed_keys[key] = self.clock
+
+    def summary_fields(self, state: AggregateState, payload: Optional[dict]) -> List[Tuple[str, Any]]:
+        total_coins = state.total_coins if _finite(state.total_coins) else 0
+        waves = max(state.wave_count, 0)
+        payload = payload or {}
+        return [
+            ("event", "MatchSummary"),
+            ("timestamp", payload.get("timestamp", self.clock)),
+            ("arena", state.last_arena),
+            ("party", state.last_party),
+            ("match", state.last_match),
+            ("session", state.last_session),
+            ("level", state.last_level),
+            ("outcome", state.last_outcome or payload.get("outcome")),
+            ("reason", state.last_reason or payload.get("reason")),
+            ("waves", waves),
+            ("totalCoins", total_coins),
+            ("avgCoinsPerWave", total_coins / waves if waves > 0 else 0),
+            ("tokensUsed", state.tokens_used),
+            ("deaths", state.deaths),
+            ("startedAt", state.started_at),
+            ("endedAt", state.last_timestamp or payload.get("timestamp")),
+        ]
+
+    # -- event handling -------------------------------------------------------
+
+    def process(self, payload: dict) -> Optional[str]:
+        """Feed one payload; returns the summary line when it completes a match."""
+
+        event = payload.get("event")
+        if not isinstance(event, str):
+            return None
+        self.stats.events += 1
+        timestamp = payload.get("timestamp")
+        if _finite(timestamp) and timestamp > self.clock:
+            self.clock = float(timestamp)
+
+        if event == "MatchStart":
+            for kind, field_name in KEY_FIELDS:
+                key = make_aggregate_key(kind, payload.get(field_name))
+                if key:
+                    self.completed_keys.pop(key, None)
+            state = self._find(payload)
+            if state is None:
+                state = self._create(payload)
+            else:
+                self._reset(state, payload)
+            if state is not None:
+                self._update_context(state, payload)
+                self._touch(state)
+            return None
+
+        if event in ("MatchEnd", "Wave", "TokenUse", "ObstacleHit"):
+            state = self._find_or_create(payload)
+            if state is None:
+                return None
+            if event == "MatchEnd":
+                if state.completed:
+                    return None
+                self._update_context(state, payload)
+                state.completed = True
+                line = render_summary(self.summary_fields(state, payload))
+                self._mark_completed(state)
+                self.open.pop(state, None)
+                self._forget(state)
+                self.stats.summaries += 1
+                return line
+            if event == "Wave":
+                state.wave_count += 1
+                self._update_context(state, payload)
+                for key in WAVE_COIN_KEYS:
+                    coins = lua_tonumber(payload.get(key)) if payload.get(key) is not None else None
+                    if _finite(coins):
+                        state.total_coins += coins
+                        break
+            elif event == "TokenUse":
+                state.tokens_used += 1
+                self._update_context(state, payload)
+            else:
+                state.deaths += 1
+                self._update_context(state, payload)
+            return None
+
+        state = self._find(payload)
+        if state is not None:
+            self._update_context(state, payload)
+            self._touch(state)
+        return None
+
+    def finish(self) -> None:
+        self.stats.open_at_end = len(self.open)
+
+
+# -- drivers ---------------------------------------------------------------------
+
+
+@dataclass
+class ReplayTask:
+    paths: Tuple[str, ...]
+    spool: str
+    max_open: int
+
+
+def replay_task(task: ReplayTask) -> Tuple[str, ReplayStats, ScanStats]:
+    """Replay ``task.paths`` as one stream, spooling summary lines to a file."""
+
+    replay = AggregateReplay(task.max_open)
+    scan = ScanStats()
+    with open(task.spool, "w", encoding="utf-8") as out:
+        for path in task.paths:
+            scan.shards += 1
+            scan.bytes += os.path.getsize(path)
+            for payload in iter_events(Shard(path), scan):
+                line = replay.process(payload)
+                if line is not None:
+                    out.write(line + "\n")
+    replay.finish()
+    return task.spool, replay.stats, scan
+
+
+def replay_logs(
+    paths: Iterable[str],
+    out: TextIO,
+    jobs: Optional[int] = None,
+    max_open: int = DEFAULT_MAX_OPEN,
+    single_stream: bool = False,
+) -> Tuple[ReplayStats, ScanStats]:
+    """Replay every log file (in parallel unless ``single_stream``) into ``out``.
+
+    Summaries are written per file in input order. Workers spool to temporary
+    files so the parent never holds more than one file's output.
+    """
+
+    files = expand_inputs(paths)
+    groups = [tuple(files)] if single_stream else [(path,) for path in files]
+    spool_dir = tempfile.mkdtemp(prefix="telemetry-replay-")
+    totals = ReplayStats()
+    scan_totals = ScanStats()
+    try:
+        tasks = [ReplayTask(group, os.path.join(spool_dir, f"{number:05d}.log"), max_open) for number, group in enumerate(groups)]
+        for spool, stats, scan in map_shards(replay_task, tasks, jobs):
+            totals.merge(stats)
+            for name in vars(scan_totals):
+                setattr(scan_totals, name, getattr(scan_totals, name) + getattr(scan, name))
+            with open(spool, encoding="utf-8") as handle:
+                shutil.copyfileobj(handle, out)
+            os.unlink(spool)
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+    return totals, scan_totals
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Log files or directories (plain or .gz)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-open", type=int, default=DEFAULT_MAX_OPEN, help="Open match states kept per stream")
+    parser.add_argument("--single-stream", action="store_true", help="Replay all inputs, in order, as one server")
+    parser.add_argument("--output", type=Path, help="Write summary lines here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.max_open < 1:
+        print("error: --max-open must be at least 1", file=sys.stderr)
+        return 1
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                stats, scan = replay_logs(args.inputs, out, args.jobs, args.max_open, args.single_stream)
+        else:
+            stats, scan = replay_logs(args.inputs, sys.stdout, args.jobs, args.max_open, args.single_stream)
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"Replayed {stats.events:,} events from {scan.shards} file(s): {stats.summaries:,} summaries, "
+        f"{stats.open_at_end:,} matches still open, {stats.evicted:,} evicted, "
+        f"{stats.suppressed:,} late events ignored after completion.",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Read ``TelemetryServer``'s event specs from Luau and mirror its coercions.
+
+``EVENT_SPECS`` in ``ServerScriptService/Analytics/TelemetryServer.lua`` lists,
+per event, its aliases and a ``makeField(name, sources, coerceX, default)`` for
+every normalized field. This module evaluates those literal tables with
+``luau_literals`` (including the ``*_SOURCES`` locals they reference), so
+offline tools follow the server's rules instead of a hand-copied list. Python ports of the ``coerce*`` helpers,
+``canonicalizeEventKey`` and ``normalizeEventData`` live here as well.
+
+Run directly to print the extracted specs::
+
+    python tools/telemetry_spec.py [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from luau_literals import LiteralError, Symbol, evaluate_locals
+from luau_syntax_checker import Lexer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TELEMETRY_SOURCE = REPO_ROOT / "ServerScriptService" / "Analytics" / "TelemetryServer.lua"
+SPECS_LOCAL = "EVENT_SPECS"
+RESERVED_LOCAL = "RESERVED_EXTRA_KEYS"
+DEFAULT_EXTRA_LIMIT = 6
+
+# Column type produced by each transform, used for stable storage types.
+TRANSFORM_TYPES = {
+    "coerceInteger": "int",
+    "coerceNumber": "float",
+    "coerceSeconds": "float",
+    "coerceBoolean": "bool",
+    "coerceString": "str",
+    "coerceIdentifier": "str",
+}
+# Transform used for a column whose fields disagree, keyed by the widened type.
+TYPE_TRANSFORMS = {"int": "coerceInteger", "float": "coerceNumber", "bool": "coerceBoolean", "str": "coerceString"}
+
+
+class SpecError(LiteralError):
+    """Raised when the Luau spec tables cannot be evaluated."""
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    sources: Tuple[str, ...]
+    transform: Optional[str] = None
+    default: Any = None
+
+    @property
+    def column_type(self) -> str:
+        return TRANSFORM_TYPES.get(self.transform or "", "any")
+
+
+@dataclass
+class EventSpec:
+    name: str
+    aliases: Tuple[str, ...] = ()
+    fields: List[FieldSpec] = field(default_factory=list)
+    copy_unknown_simple: bool = False
+    extra_limit: int = DEFAULT_EXTRA_LIMIT
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TelemetrySpec:
+    events: Dict[str, EventSpec]
+    reserved_extra_keys: Tuple[str, ...]
+    source_sha256: str
+    lookup: Dict[str, EventSpec] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.lookup:
+            # Mirrors the EVENT_LOOKUP loop (which walks EVENT_SPECS with pairs).
+            for name in self.events:
+                spec = self.events[name]
+                for alias in (name, *spec.aliases):
+                    key = canonicalize_event_key(alias)
+                    if key:
+                        self.lookup[key] = spec
+
+    def resolve(self, event_name: str) -> Optional[EventSpec]:
+        key = canonicalize_event_key(event_name)
+        return self.lookup.get(key) if key else None
+
+    def column_types(self) -> Dict[str, str]:
+        """Merge field types across events (conflicting types widen)."""
+
+        types: Dict[str, str] = {}
+        for spec in self.events.values():
+            for field_spec in spec.fields:
+                types[field_spec.name] = widen_type(types.get(field_spec.name), field_spec.column_type)
+        return types
+
+    def column_transforms(self) -> Dict[str, str]:
+        """Coercion per column; fields whose transforms disagree use the widened type's."""
+
+        seen: Dict[str, set] = {}
+        for spec in self.events.values():
+            for field_spec in spec.fields:
+                if field_spec.transform:
+                    seen.setdefault(field_spec.name, set()).add(field_spec.transform)
+        types = self.column_types()
+        transforms: Dict[str, str] = {}
+        for name, options in seen.items():
+            if len(options) == 1:
+                transforms[name] = next(iter(options))
+            elif types[name] in TYPE_TRANSFORMS:
+                transforms[name] = TYPE_TRANSFORMS[types[name]]
+        return transforms
+
+
+def widen_type(current: Optional[str], new: str) -> str:
+    if current is None or current == new:
+        return new
+    if {current, new} <= {"int", "float"}:
+        return "float"
+    return "str" if "any" not in (current, new) else "any"
+
+
+# -- Luau literal evaluation ----------------------------------------------------
+
+def _make_field(args: List[Any]) -> Dict[str, Any]:
+    """Mirror ``makeField(name, source, transform, default)`` as a plain dict."""
+
+    args = args + [None] * (4 - len(args))
+    return {"name": args[0], "source": args[1], "transform": args[2], "default": args[3]}
+
+
+def _sources(value: Any, name: str) -> Tuple[str, ...]:
+    if value is None:
+        return (name,)
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return tuple(value)
+    raise SpecError(f"field {name!r} has an unsupported source {value!r}")
+
+
+def load_spec(source_path: Path = TELEMETRY_SOURCE) -> TelemetrySpec:
+    """Extract ``EVENT_SPECS`` and ``RESERVED_EXTRA_KEYS`` from the Luau source."""
+
+    data = Path(source_path).read_bytes()
+    tokens = list(Lexer(data.decode("utf-8")).tokens())
+    try:
+        constants = evaluate_locals(tokens, {SPECS_LOCAL, RESERVED_LOCAL}, {"makeField": _make_field})
+    except LiteralError as exc:
+        raise SpecError(f"{source_path}: {exc}") from exc
+    raw_specs = constants.get(SPECS_LOCAL)
+    if not isinstance(raw_specs, dict):
+        raise SpecError(f"{source_path}: {SPECS_LOCAL} table not found")
+
+    events: Dict[str, EventSpec] = {}
+    for event_name, raw in raw_specs.items():
+        if not isinstance(raw, dict):
+            raise SpecError(f"{event_name}: spec is not a table")
+        fields: List[FieldSpec] = []
+        for raw_field in raw.get("fields") or []:
+            name = raw_field["name"]
+            transform = raw_field["transform"]
+            fields.append(
+                FieldSpec(
+                    name=name,
+                    sources=_sources(raw_field["source"], name),
+                    transform=transform.name if isinstance(transform, Symbol) else None,
+                    default=raw_field["default"],
+                )
+            )
+        extra_limit = raw.get("extraLimit")
+        events[event_name] = EventSpec(
+            name=event_name,
+            aliases=tuple(raw.get("aliases") or ()),
+            fields=fields,
+            copy_unknown_simple=bool(raw.get("copyUnknownSimple")),
+            extra_limit=int(extra_limit) if isinstance(extra_limit, (int, float)) else DEFAULT_EXTRA_LIMIT,
+            defaults=dict(raw.get("defaults") or {}),
+        )
+    reserved = constants.get(RESERVED_LOCAL) or {}
+    return TelemetrySpec(
+        events=events,
+        reserved_extra_keys=tuple(sorted(key for key, flag in reserved.items() if flag)),
+        source_sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+
+# -- Python ports of the TelemetryServer helpers --------------------------------
+
+_LUA_NUMBER_RE = re.compile(r"^\s*[-+]?(0[xX][0-9a-fA-F]+|(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?)\s*$")
+
+
+def lua_tonumber(value: Any) -> Optional[float]:
+    """``tonumber``: numbers pass through, numeric strings parse, else ``None``."""
+
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and _LUA_NUMBER_RE.match(value):
+        text = value.strip()
+        sign = -1 if text.startswith("-") else 1
+        body = text.lstrip("+-")
+        if body.lower().startswith("0x"):
+            return sign * int(body, 16)
+        return float(text)
+    return None
+
+
+def lua_tostring(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e16:
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+def _finite(value: Optional[float]) -> bool:
+    return value is not None and value == value and value not in (math.inf, -math.inf)
+
+
+def coerce_integer(value: Any) -> Optional[int]:
+    numeric = lua_tonumber(value)
+    if not _finite(numeric):
+        return None
+    if numeric >= 0:
+        return int(math.floor(numeric + 0.5))
+    return -int(math.floor(-numeric + 0.5))
+
+
+def coerce_number(value: Any) -> Optional[float]:
+    numeric = lua_tonumber(value)
+    return numeric if _finite(numeric) else None
+
+
+def coerce_seconds(value: Any) -> Optional[float]:
+    numeric = coerce_number(value)
+    if numeric is None:
+        return None
+    scaled = numeric * 1000 + (0.5 if numeric >= 0 else -0.5)
+    return math.floor(scaled) / 1000
+
+
+def coerce_string(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        trimmed = value.strip()
+        return trimmed or None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return lua_tostring(value) if _finite(value) else None
+    return None
+
+
+def coerce_identifier(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        trimmed = value.strip()
+        return trimmed or None
+    integer = coerce_integer(value)
+    return str(integer) if integer is not None else None
+
+
+def coerce_boolean(value: Any) -> Optional[bool]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "1", "yes", "y"):
+            return True
+        if lowered in ("false", "0", "no", "n"):
+            return False
+    return None
+
+
+COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "coerceInteger": coerce_integer,
+    "coerceNumber": coerce_number,
+    "coerceSeconds": coerce_seconds,
+    "coerceString": coerce_string,
+    "coerceIdentifier": coerce_identifier,
+    "coerceBoolean": coerce_boolean,
+}
+
+
+def canonicalize_event_key(event_name: str) -> str:
+    lowered = event_name.strip().lower()
+    canonical = re.sub(r"[^0-9a-z]", "", lowered)
+    return canonical or lowered
+
+
+def normalize_event_data(spec: TelemetrySpec, event_name: str, data: Any) -> Tuple[str, Dict[str, Any]]:
+    """Port of ``normalizeEventData``: apply field specs, extras and defaults.
+
+    Luau iterates ``pairs`` in an unspecified order when copying unknown simple
+    values; this port uses the payload's key order instead.
+    """
+
+    event_spec = spec.resolve(event_name)
+    normalized: Dict[str, Any] = {}
+    raw = data if isinstance(data, dict) else None
+    if event_spec is None:
+        if raw is not None:
+            normalized.update((key, value) for key, value in raw.items() if isinstance(key, str))
+        elif data is not None:
+            normalized["value"] = data
+        return event_name, normalized
+
+    for field_spec in event_spec.fields:
+        value = None
+        if raw is not None:
+            for source in field_spec.sources:
+                value = raw.get(source)
+                if value is not None:
+                    break
+        if value is None:
+            value = field_spec.default
+        if value is not None and field_spec.transform:
+            try:
+                value = COERCERS[field_spec.transform](value)
+            except Exception:  # pcall(transform, rawValue) swallows errors
+                value = None
+        if value is not None:
+            normalized[field_spec.name] = value
+
+    if event_spec.copy_unknown_simple and raw is not None:
+        added = 0
+        reserved = spec.reserved_extra_keys
+        for key, value in raw.items():
+            if isinstance(key, str) and key not in normalized and key not in reserved:
+                if isinstance(value, (str, int, float)):
+                    normalized[key] = value
+                    added += 1
+                    if added >= event_spec.extra_limit:
+                        break
+    for key, value in event_spec.defaults.items():
+        normalized.setdefault(key, value)
+    return event_spec.name, normalized
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=TELEMETRY_SOURCE, help="TelemetryServer.lua to read")
+    parser.add_argument("--json", action="store_true", help="Emit the specs as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        spec = load_spec(args.source)
+    except (OSError, SpecError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.json:
+        doc = {
+            "source_sha256": spec.source_sha256,
+            "reserved_extra_keys": list(spec.reserved_extra_keys),
+            "events": {
+                name: {
+                    "aliases": list(event.aliases),
+                    "copyUnknownSimple": event.copy_unknown_simple,
+                    "extraLimit": event.extra_limit,
+                    "fields": [
+                        {"name": f.name, "sources": list(f.sources), "transform": f.transform, "type": f.column_type}
+                        for f in event.fields
+                    ],
+                }
+                for name, event in spec.events.items()
+            },
+        }
+        print(json.dumps(doc, indent=2))
+        return 0
+    for name, event in spec.events.items():
+        aliases = ", ".join(event.aliases)
+        print(f"{name} (aliases: {aliases}; extras: {event.extra_limit if event.copy_unknown_simple else 0})")
+        for f in event.fields:
+            print(f"  {f.name:<16} {f.column_type:<6} {f.transform or '-':<18} <- {', '.join(f.sources)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
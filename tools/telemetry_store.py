@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""Ingest ``[Telemetry]`` log lines into a columnar on-disk store and query it.
+
+Each ingested shard (see ``telemetry_logs.plan_shards``) becomes a partition
+directory holding one ``.npy`` file per column, so a query memory-maps only the
+columns it reads and skips partitions whose time range or event counts cannot
+match. Column types come from ``EVENT_SPECS`` in ``TelemetryServer`` (via
+``telemetry_spec``): a field declared with ``coerceInteger`` is always int64,
+``coerceSeconds``/``coerceNumber`` float64, ``coerceBoolean`` int8 and
+``coerceString``/``coerceIdentifier`` a dictionary-encoded string column, and
+values are run through the same coercion on the way in. Extra simple values
+(``copyUnknownSimple``) get a type from their JSON kind.
+
+Null encodings: ``NaN`` for floats, ``INT_NULL`` for ints, ``-1`` for bools and
+dictionary codes. ``store.json`` records the schema and, per partition, the
+source file, its size/mtime, row count, event counts and min/max timestamp.
+Re-running ``ingest`` skips files whose size and mtime have not changed.
+
+Usage::
+
+    python tools/telemetry_store.py ingest logs/ --store telemetry-store [--jobs N]
+    python tools/telemetry_store.py info --store telemetry-store
+    python tools/telemetry_store.py query --store telemetry-store --event Wave \\
+        --columns level,wave,coins [--since T] [--until T] [--stats | --group-by level | --limit 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from telemetry_logs import ScanStats, Shard, expand_inputs, iter_events, map_shards, plan_shards
+from telemetry_spec import COERCERS, REPO_ROOT, TELEMETRY_SOURCE, TelemetrySpec, lua_tostring, load_spec
+
+MANIFEST_DIR = REPO_ROOT / "manifest"
+if str(MANIFEST_DIR) not in sys.path:
+    sys.path.append(str(MANIFEST_DIR))
+from split_manifest import write_if_changed  # noqa: E402
+
+STORE_FORMAT = 1
+STORE_INDEX = "store.json"
+INT_NULL = int(np.iinfo(np.int64).min)
+ENVELOPE_TYPES = {"event": "str", "timestamp": "float", "v": "int"}
+# Cap on distinct columns per partition; keeps a noisy extra from exploding the layout.
+MAX_COLUMNS = 256
+
+DTYPES = {"int": np.int64, "float": np.float64, "bool": np.int8, "str": np.int32}
+TYPECODES = {"int": "q", "float": "d", "bool": "b", "str": "i"}
+
+
+# -- column builders -------------------------------------------------------------
+
+
+class ColumnBuilder:
+    """Append-only column backed by ``array`` so a shard stays compact in memory."""
+
+    __slots__ = ("kind", "values", "dictionary", "codes")
+
+    def __init__(self, kind: str, rows: int = 0) -> None:
+        self.kind = kind
+        self.values = array(TYPECODES[kind])
+        self.dictionary: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.pad(rows)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def pad(self, rows: int) -> None:
+        missing = rows - len(self.values)
+        if missing > 0:
+            null = {"int": INT_NULL, "float": math.nan}.get(self.kind, -1)
+            self.values.extend(array(self.values.typecode, [null]) * missing)
+
+    def append(self, value: Any) -> None:
+        """Append an already-coerced value (``None`` appends a null)."""
+
+        if value is None:
+            self.pad(len(self.values) + 1)
+        elif self.kind == "str":
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.dictionary)
+                self.dictionary.append(value)
+            self.values.append(code)
+        elif self.kind == "bool":
+            self.values.append(1 if value else 0)
+        else:
+            try:
+                self.values.append(value)
+            except OverflowError:
+                self.pad(len(self.values) + 1)
+
+    def decoded(self) -> List[Any]:
+        if self.kind == "str":
+            return [self.dictionary[code] if code >= 0 else None for code in self.values]
+        if self.kind == "int":
+            return [None if value == INT_NULL else value for value in self.values]
+        if self.kind == "bool":
+            return [None if value < 0 else bool(value) for value in self.values]
+        return [None if value != value else value for value in self.values]
+
+    def as_strings(self) -> "ColumnBuilder":
+        """Re-encode this column as strings (used when an extra changes kind)."""
+
+        converted = ColumnBuilder("str")
+        for value in self.decoded():
+            converted.append(None if value is None else lua_tostring(value))
+        return converted
+
+
+def json_kind(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return None
+
+
+def coerce_for(kind: str, value: Any) -> Any:
+    """Coerce an extra value into an existing column of ``kind``."""
+
+    if kind == "str":
+        return value if isinstance(value, str) else lua_tostring(value)
+    if kind == "float":
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+# -- ingestion -------------------------------------------------------------------
+
+
+@dataclass
+class IngestTask:
+    shard: Shard
+    directory: str
+    spec: TelemetrySpec
+
+
+def build_partition(task: IngestTask) -> dict:
+    """Read one shard into column builders and write it as ``.npy`` files."""
+
+    spec = task.spec
+    spec_types = spec.column_types()
+    transforms = spec.column_transforms()
+    columns: Dict[str, ColumnBuilder] = {name: ColumnBuilder(kind) for name, kind in ENVELOPE_TYPES.items()}
+    scan = ScanStats(shards=1)
+    rejected: Dict[str, int] = {}
+    dropped: Dict[str, int] = {}
+    event_counts: Dict[str, int] = {}
+    rows = 0
+
+    for event in iter_events(task.shard, scan):
+        name = event.get("event")
+        if not isinstance(name, str):
+            scan.malformed += 1
+            continue
+        resolved = spec.resolve(name)
+        name = resolved.name if resolved is not None else name
+        event_counts[name] = event_counts.get(name, 0) + 1
+        columns["event"].append(name)
+        timestamp = event.get("timestamp")
+        columns["timestamp"].append(coerce_for("float", timestamp) if json_kind(timestamp) == "float" else None)
+        version = event.get("v")
+        columns["v"].append(version if isinstance(version, int) and not isinstance(version, bool) else None)
+
+        for key, value in event.items():
+            if key in ENVELOPE_TYPES or value is None:
+                continue
+            builder = columns.get(key)
+            transform = transforms.get(key)
+            if transform is not None:
+                coerced = COERCERS[transform](value)
+                if coerced is None:
+                    rejected[key] = rejected.get(key, 0) + 1
+                if builder is None:
+                    builder = columns[key] = ColumnBuilder(spec_types[key], rows)
+                builder.append(coerced)
+                continue
+            kind = json_kind(value)
+            if kind is None:
+                dropped[key] = dropped.get(key, 0) + 1
+                continue
+            if builder is None:
+                if len(columns) >= MAX_COLUMNS:
+                    dropped[key] = dropped.get(key, 0) + 1
+                    continue
+                builder = columns[key] = ColumnBuilder(kind, rows)
+            elif builder.kind != kind and builder.kind != "str":
+                builder = columns[key] = builder.as_strings()
+            builder.append(coerce_for(builder.kind, value))
+
+        rows += 1
+        for builder in columns.values():
+            if len(builder) < rows:
+                builder.pad(rows)
+
+    directory = Path(task.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, builder in columns.items():
+        np.save(directory / f"{name}.npy", np.frombuffer(builder.values, dtype=DTYPES[builder.kind]))
+        if builder.kind == "str":
+            (directory / f"{name}.dict.json").write_text(json.dumps(builder.dictionary), encoding="utf-8")
+
+    times = np.frombuffer(columns["timestamp"].values, dtype=np.float64)
+    finite = times[~np.isnan(times)]
+    return {
+        "source": task.shard.path,
+        "start": task.shard.start,
+        "end": task.shard.end,
+        "rows": rows,
+        "min_time": float(finite.min()) if finite.size else None,
+        "max_time": float(finite.max()) if finite.size else None,
+        "events": dict(sorted(event_counts.items())),
+        "columns": {name: builder.kind for name, builder in columns.items()},
+        "malformed": scan.malformed,
+        "rejected": rejected,
+        "dropped": dropped,
+    }
+
+
+def load_index(store: Path) -> dict:
+    path = store / STORE_INDEX
+    if not path.exists():
+        return {"format": STORE_FORMAT, "spec_sha256": None, "partitions": []}
+    index = json.loads(path.read_text(encoding="utf-8"))
+    if index.get("format") != STORE_FORMAT:
+        raise ValueError(f"{path}: unsupported store format {index.get('format')!r}")
+    return index
+
+
+def write_index(store: Path, index: dict) -> None:
+    write_if_changed(store / STORE_INDEX, json.dumps(index, indent=2) + "\n")
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def ingest(
+    paths: Iterable[str],
+    store: Path,
+    spec: TelemetrySpec,
+    jobs: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Add new or changed log files to ``store``; returns (ingested, skipped) files.
+
+    A change to the spec source invalidates every partition, since column types
+    may have moved.
+    """
+
+    store.mkdir(parents=True, exist_ok=True)
+    index = load_index(store)
+    if index.get("spec_sha256") != spec.source_sha256:
+        for partition in index["partitions"]:
+            shutil.rmtree(store / partition["id"], ignore_errors=True)
+        index = {"format": STORE_FORMAT, "spec_sha256": spec.source_sha256, "partitions": []}
+
+    by_source: Dict[str, List[dict]] = {}
+    for partition in index["partitions"]:
+        by_source.setdefault(partition["source"], []).append(partition)
+
+    files = [os.path.abspath(path) for path in expand_inputs(paths)]
+    pending: List[str] = []
+    stamps: Dict[str, Tuple[int, int]] = {}
+    for path in files:
+        stamps[path] = _file_stamp(path)
+        existing = by_source.get(path)
+        if existing and all((p["size"], p["mtime_ns"]) == stamps[path] for p in existing):
+            continue
+        pending.append(path)
+
+    kept = [p for p in index["partitions"] if p["source"] not in pending]
+    for partition in index["partitions"]:
+        if partition["source"] in pending:
+            shutil.rmtree(store / partition["id"], ignore_errors=True)
+    next_id = max((int(p["id"][1:]) + 1 for p in index["partitions"]), default=0)
+
+    tasks: List[IngestTask] = []
+    for number, shard in enumerate(plan_shards(pending), start=next_id):
+        tasks.append(IngestTask(shard, str(store / f"p{number:05d}"), spec))
+    for task, partition in zip(tasks, map_shards(build_partition, tasks, jobs)):
+        size, mtime_ns = stamps[task.shard.path]
+        kept.append({"id": Path(task.directory).name, "size": size, "mtime_ns": mtime_ns, **partition})
+
+    index["partitions"] = kept
+    index["columns"] = merged_schema(kept)
+    write_index(store, index)
+    return len(pending), len(files) - len(pending)
+
+
+def merged_schema(partitions: Sequence[dict]) -> Dict[str, str]:
+    schema: Dict[str, str] = {}
+    for partition in partitions:
+        for name, kind in partition["columns"].items():
+            current = schema.get(name)
+            schema[name] = kind if current in (None, kind) else "str"
+    return dict(sorted(schema.items()))
+
+
+# -- queries ---------------------------------------------------------------------
+
+
+@dataclass
+class ColumnSlice:
+    """Rows of one column from one partition; strings stay dictionary codes."""
+
+    kind: str
+    values: np.ndarray
+    dictionary: Optional[List[str]] = None
+
+    def valid(self) -> np.ndarray:
+        if self.kind == "float":
+            return ~np.isnan(self.values)
+        if self.kind == "int":
+            return self.values != INT_NULL
+        return self.values >= 0
+
+    def decode(self) -> List[Any]:
+        if self.kind == "str":
+            assert self.dictionary is not None
+            return [self.dictionary[code] if code >= 0 else None for code in self.values.tolist()]
+        if self.kind == "bool":
+            return [None if value < 0 else bool(value) for value in self.values.tolist()]
+        mask = self.valid()
+        return [value if ok else None for value, ok in zip(self.values.tolist(), mask.tolist())]
+
+    def numeric(self) -> np.ndarray:
+        """Valid values as float64 (strings are not numeric)."""
+
+        if self.kind == "str":
+            return np.empty(0)
+        return self.values[self.valid()].astype(np.float64)
+
+
+def open_column(directory: Path, name: str, kind: str) -> ColumnSlice:
+    values = np.load(directory / f"{name}.npy", mmap_mode="r")
+    dictionary = None
+    if kind == "str":
+        dictionary = json.loads((directory / f"{name}.dict.json").read_text(encoding="utf-8"))
+    return ColumnSlice(kind, values, dictionary)
+
+
+def scan(
+    store: Path,
+    columns: Sequence[str],
+    event: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[Dict[str, ColumnSlice]]:
+    """Yield the selected columns of every matching partition, filtered to rows.
+
+    Partitions are pruned with their recorded event counts and time range
+    before any column file is opened. Columns a partition never saw come back
+    as all-null.
+    """
+
+    index = load_index(store)
+    for partition in index["partitions"]:
+        if event is not None and event not in partition["events"]:
+            continue
+        low, high = partition["min_time"], partition["max_time"]
+        if since is not None and (high is None or high < since):
+            continue
+        if until is not None and (low is None or low > until):
+            continue
+        directory = store / partition["id"]
+        mask: Optional[np.ndarray] = None
+        if event is not None:
+            names = open_column(directory, "event", "str")
+            assert names.dictionary is not None
+            mask = names.values == names.dictionary.index(event)
+        if since is not None or until is not None:
+            times = np.load(directory / "timestamp.npy", mmap_mode="r")
+            in_range = np.ones(times.shape, dtype=bool)
+            if since is not None:
+                in_range &= times >= since
+            if until is not None:
+                in_range &= times <= until
+            mask = in_range if mask is None else mask & in_range
+        if mask is not None and not mask.any():
+            continue
+
+        selected: Dict[str, ColumnSlice] = {}
+        for name in columns:
+            kind = partition["columns"].get(name)
+            if kind is None:
+                kind = index.get("columns", {}).get(name, "float")
+                null = {"int": INT_NULL, "float": math.nan}.get(kind, -1)
+                rows = int(mask.sum()) if mask is not None else partition["rows"]
+                selected[name] = ColumnSlice(kind, np.full(rows, null, dtype=DTYPES[kind]), [])
+                continue
+            column = open_column(directory, name, kind)
+            if mask is not None:
+                column.values = column.values[mask]
+            selected[name] = column
+        yield selected
+
+
+def _format(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.6g}"
+
+
+def _format_time(value: Optional[float]) -> str:
+    return "-" if value is None else lua_tostring(value)
+
+
+def column_stats(store: Path, names: Sequence[str], **filters: Any) -> Dict[str, dict]:
+    """Count/min/mean/max and p50/p95/p99 for numeric columns, top values for strings."""
+
+    numeric: Dict[str, List[np.ndarray]] = {name: [] for name in names}
+    counts: Dict[str, Dict[str, int]] = {name: {} for name in names}
+    for selected in scan(store, names, **filters):
+        for name, column in selected.items():
+            if column.kind == "str":
+                tally = counts[name]
+                codes, hits = np.unique(column.values[column.values >= 0], return_counts=True)
+                for code, hit in zip(codes.tolist(), hits.tolist()):
+                    label = column.dictionary[code]  # type: ignore[index]
+                    tally[label] = tally.get(label, 0) + hit
+            else:
+                numeric[name].append(column.numeric())
+    result: Dict[str, dict] = {}
+    for name in names:
+        if counts[name]:
+            top = sorted(counts[name].items(), key=lambda item: -item[1])[:10]
+            result[name] = {"count": sum(counts[name].values()), "distinct": len(counts[name]), "top": dict(top)}
+            continue
+        values = np.concatenate(numeric[name]) if numeric[name] else np.empty(0)
+        if not values.size:
+            result[name] = {"count": 0}
+            continue
+        p50, p95, p99 = np.quantile(values, [0.5, 0.95, 0.99]).tolist()
+        result[name] = {
+            "count": int(values.size),
+            "min": float(values.min()),
+            "mean": float(values.mean()),
+            "max": float(values.max()),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+    return result
+
+
+def group_counts(store: Path, key: str, **filters: Any) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for selected in scan(store, [key], **filters):
+        for value in selected[key].decode():
+            label = "<null>" if value is None else str(value)
+            totals[label] = totals.get(label, 0) + 1
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+# -- CLI -------------------------------------------------------------------------
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--store", type=Path, required=True, help="Store directory")
+    common.add_argument("--json", action="store_true", help="Emit JSON instead of text")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", parents=[common], help="Add log files to the store")
+    ingest_parser.add_argument("inputs", nargs="+", help="Log files or directories (plain or .gz)")
+    ingest_parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    ingest_parser.add_argument("--spec", type=Path, default=TELEMETRY_SOURCE, help="TelemetryServer.lua to read")
+
+    commands.add_parser("info", parents=[common], help="Show partitions, per-file time ranges and schema")
+
+    query_parser = commands.add_parser("query", parents=[common], help="Read selected columns")
+    query_parser.add_argument("--columns", default="", help="Comma-separated column names")
+    query_parser.add_argument("--event", help="Only rows of this (canonical) event name")
+    query_parser.add_argument("--since", type=float, help="Only rows with timestamp >= this Unix time")
+    query_parser.add_argument("--until", type=float, help="Only rows with timestamp <= this Unix time")
+    mode = query_parser.add_mutually_exclusive_group()
+    mode.add_argument("--stats", action="store_true", help="Summarise the selected columns")
+    mode.add_argument("--group-by", help="Count rows per value of this column")
+    query_parser.add_argument("--limit", type=int, default=20, help="Rows to print (0 for all)")
+    return parser.parse_args(argv)
+
+
+def _info(store: Path) -> dict:
+    index = load_index(store)
+    files: Dict[str, dict] = {}
+    for partition in index["partitions"]:
+        entry = files.setdefault(
+            partition["source"], {"partitions": 0, "rows": 0, "min_time": None, "max_time": None}
+        )
+        entry["partitions"] += 1
+        entry["rows"] += partition["rows"]
+        for key, pick in (("min_time", min), ("max_time", max)):
+            if partition[key] is not None:
+                entry[key] = partition[key] if entry[key] is None else pick(entry[key], partition[key])
+    return {"spec_sha256": index.get("spec_sha256"), "files": files, "columns": index.get("columns", {})}
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        if args.command == "ingest":
+            spec = load_spec(args.spec)
+            ingested, skipped = ingest(args.inputs, args.store, spec, args.jobs)
+            doc: Any = {"ingested": ingested, "skipped": skipped}
+            if not args.json:
+                print(f"Ingested {ingested} file(s), {skipped} unchanged.")
+                return 0
+        elif args.command == "info":
+            doc = _info(args.store)
+            if not args.json:
+                for source, entry in doc["files"].items():
+                    print(
+                        f"{source}: {entry['rows']:,} rows in {entry['partitions']} partition(s), "
+                        f"time {_format_time(entry['min_time'])}..{_format_time(entry['max_time'])}"
+                    )
+                print("\nColumns: " + ", ".join(f"{name}:{kind}" for name, kind in doc["columns"].items()))
+                return 0
+        else:
+            names = [name.strip() for name in args.columns.split(",") if name.strip()]
+            filters = {"event": args.event, "since": args.since, "until": args.until}
+            if args.group_by:
+                doc = group_counts(args.store, args.group_by, **filters)
+                if not args.json:
+                    for label, count in doc.items():
+                        print(f"{count:>10,}  {label}")
+                    return 0
+            elif args.stats:
+                doc = column_stats(args.store, names, **filters)
+                if not args.json:
+                    for name, stats in doc.items():
+                        print(f"{name}: " + " ".join(f"{key}={value if key == 'top' else _format(value)}" for key, value in stats.items()))
+                    return 0
+            else:
+                names = names or ["event", "timestamp"]
+                rows: List[List[Any]] = []
+                for selected in scan(args.store, names, **filters):
+                    decoded = [selected[name].decode() for name in names]
+                    rows.extend(map(list, zip(*decoded)))
+                    if args.limit and len(rows) >= args.limit:
+                        rows = rows[: args.limit]
+                        break
+                doc = [dict(zip(names, row)) for row in rows]
+                if not args.json:
+                    print("\t".join(names))
+                    for row in rows:
+                        print("\t".join("" if value is None else str(value) for value in row))
+                    return 0
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps(doc, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Compile ``TelemetryServer`` event specs into specialised Python validators.
+
+``telemetry_spec`` reads ``EVENT_SPECS`` from the Luau source; this module turns
+each spec into two generated functions with every field unrolled:
+
+* ``normalize_<Event>(raw)`` mirrors ``normalizeEventData`` for that event
+  (source-key fallbacks, defaults, ``coerce*`` transform, extra simple values).
+* ``validate_<Event>(payload)`` checks a logged ``[Telemetry]`` payload against
+  what ``buildPayload`` can produce and returns a list of problems.
+
+Both are reached through a dict keyed by event name (every alias and canonical
+key is pre-registered), so per-event cost is one lookup plus straight-line
+code. The generated module is written to ``tools/.telemetry_validators.py`` with
+the SHA-256 of ``TelemetryServer.lua`` and is regenerated only when that hash
+(or the generator version) changes.
+
+Usage::
+
+    python tools/telemetry_validators.py check logs/ [--jobs N] [--json]
+    python tools/telemetry_validators.py generate [--print]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from telemetry_logs import MAX_EVENTS, OVERFLOW_KEY, Shard, expand_inputs, iter_events, map_shards, plan_shards
+from telemetry_spec import REPO_ROOT, TELEMETRY_SOURCE, TelemetrySpec, load_spec
+
+MANIFEST_DIR = REPO_ROOT / "manifest"
+if str(MANIFEST_DIR) not in sys.path:
+    sys.path.append(str(MANIFEST_DIR))
+from split_manifest import write_if_changed  # noqa: E402
+
+CACHE_PATH = Path(__file__).resolve().parent / ".telemetry_validators.py"
+# Bump whenever the generated code changes so stale caches are rebuilt.
+GENERATOR_VERSION = 1
+# Problems kept per (event, message) pair in reports; counts are always exact.
+MAX_EXAMPLES = 3
+# The version/hash constants sit near the top of the generated file.
+HEADER_LINES = 40
+
+COERCER_NAMES = {
+    "coerceInteger": "coerce_integer",
+    "coerceNumber": "coerce_number",
+    "coerceSeconds": "coerce_seconds",
+    "coerceString": "coerce_string",
+    "coerceIdentifier": "coerce_identifier",
+    "coerceBoolean": "coerce_boolean",
+}
+
+# Inline handling of the common already-typed case; anything else calls the coercer.
+FAST_PATHS = {
+    "coerceInteger": ("v.__class__ is int", None),
+    "coerceNumber": ("v.__class__ is int", None),
+    "coerceString": ("v.__class__ is str", "v = v.strip() or None"),
+    "coerceIdentifier": ("v.__class__ is str", "v = v.strip() or None"),
+    "coerceBoolean": ("v.__class__ is bool", None),
+}
+
+# Expression (over ``v``) that is true when a logged value has the wrong shape.
+TYPE_CHECKS = {
+    "coerceInteger": "type(v) is not int",
+    "coerceNumber": "type(v) is not int and type(v) is not float",
+    "coerceSeconds": "(type(v) is not int and type(v) is not float) or coerce_seconds(v) != v",
+    "coerceString": "type(v) is not str or not v or v != v.strip()",
+    "coerceIdentifier": "type(v) is not str or not v or v != v.strip()",
+    "coerceBoolean": "type(v) is not bool",
+}
+
+
+def _identifier(name: str) -> str:
+    return re.sub(r"\W", "_", name)
+
+
+def _emit_normalizer(lines: List[str], spec: TelemetrySpec, event_name: str) -> str:
+    event = spec.events[event_name]
+    func = f"normalize_{_identifier(event_name)}"
+    lines.append(f"def {func}(raw):")
+    lines.append("    out = {}")
+    lines.append("    if raw.__class__ is not dict:")
+    lines.append("        raw = None")
+    for field in event.fields:
+        if not field.name:
+            continue
+        lines.append("    v = None")
+        lines.append("    if raw is not None:")
+        for position, source in enumerate(field.sources):
+            indent = "        " + "    " * position
+            lines.append(f"{indent}v = raw.get({source!r})")
+            if position + 1 < len(field.sources):
+                lines.append(f"{indent}if v is None:")
+        if field.default is not None:
+            lines.append("    if v is None:")
+            lines.append(f"        v = {field.default!r}")
+        if field.transform in COERCER_NAMES:
+            fast = FAST_PATHS.get(field.transform)
+            if fast is not None:
+                test, action = fast
+                lines.append(f"    if v is None or {test}:")
+                if action:
+                    lines.append("        if v is not None:")
+                    lines.append(f"            {action}")
+                else:
+                    lines.append("        pass")
+                lines.append("    else:")
+            else:
+                lines.append("    if v is not None:")
+            lines.append("        try:")
+            lines.append(f"            v = {COERCER_NAMES[field.transform]}(v)")
+            lines.append("        except Exception:")
+            lines.append("            v = None")
+        lines.append("    if v is not None:")
+        lines.append(f"        out[{field.name!r}] = v")
+    if event.copy_unknown_simple:
+        lines.append("    if raw is not None:")
+        lines.append("        added = 0")
+        lines.append("        for key, value in raw.items():")
+        lines.append("            if key.__class__ is str and key not in out and key not in RESERVED and value.__class__ in SIMPLE:")
+        lines.append("                out[key] = value")
+        lines.append("                added += 1")
+        lines.append(f"                if added >= {event.extra_limit}:")
+        lines.append("                    break")
+    for key, value in event.defaults.items():
+        lines.append(f"    out.setdefault({key!r}, {value!r})")
+    lines.append(f"    return {event_name!r}, out")
+    lines.append("")
+    lines.append("")
+    return func
+
+
+def _emit_validator(lines: List[str], spec: TelemetrySpec, event_name: str) -> str:
+    event = spec.events[event_name]
+    func = f"validate_{_identifier(event_name)}"
+    known = tuple(field.name for field in event.fields)
+    lines.append(f"def {func}(payload):")
+    lines.append("    problems = []")
+    for field in event.fields:
+        check = TYPE_CHECKS.get(field.transform or "")
+        if check is None:
+            continue
+        lines.append(f"    v = payload.get({field.name!r})")
+        lines.append(f"    if v is not None and ({check}):")
+        lines.append(f"        problems.append({field.name + ': not a ' + field.column_type + ' from ' + field.transform!r})")
+    lines.append("    extras = 0")
+    lines.append("    for key, value in payload.items():")
+    # A set literal in an ``in`` test is folded into a frozenset constant.
+    known_test = f" or key in {{{', '.join(repr(name) for name in sorted(set(known)))}}}" if known else ""
+    lines.append(f"        if key in RESERVED{known_test}:")
+    lines.append("            continue")
+    if event.copy_unknown_simple:
+        lines.append("        extras += 1")
+        lines.append("        if value.__class__ not in SIMPLE:")
+        lines.append("            problems.append(key + ': extra value is not a string, number or boolean')")
+        lines.append(f"    if extras > {event.extra_limit}:")
+        lines.append(f"        problems.append('more than {event.extra_limit} extra fields')")
+    else:
+        lines.append("        problems.append(key + ': not a field of this event')")
+    lines.append("    return problems")
+    lines.append("")
+    lines.append("")
+    return func
+
+
+def generate_source(spec: TelemetrySpec) -> str:
+    """Render the specialised module for ``spec`` as Python source."""
+
+    lines = [
+        '"""Generated by tools/telemetry_validators.py from TelemetryServer.lua; do not edit."""',
+        "from telemetry_spec import (",
+        "    canonicalize_event_key,",
+        *(f"    {name}," for name in sorted(COERCER_NAMES.values())),
+        ")",
+        "",
+        f"GENERATOR_VERSION = {GENERATOR_VERSION}",
+        f"SOURCE_SHA256 = {spec.source_sha256!r}",
+        f"RESERVED = frozenset({sorted(spec.reserved_extra_keys)!r})",
+        "SIMPLE = (str, int, float, bool)",
+        "",
+        "",
+    ]
+    normalizers: Dict[str, str] = {}
+    validators: Dict[str, str] = {}
+    for event_name in spec.events:
+        normalizers[event_name] = _emit_normalizer(lines, spec, event_name)
+        validators[event_name] = _emit_validator(lines, spec, event_name)
+
+    # Every spelling that resolves to a spec maps straight to its function, so
+    # the common case skips canonicalisation entirely.
+    dispatch: Dict[str, str] = {}
+    for key, event in spec.lookup.items():
+        dispatch[key] = event.name
+    for event_name, event in spec.events.items():
+        for alias in (event_name, *event.aliases):
+            if spec.resolve(alias) is event:
+                dispatch[alias] = event_name
+    lines.append("NORMALIZERS = {")
+    lines.extend(f"    {key!r}: {normalizers[name]}," for key, name in sorted(dispatch.items()))
+    lines.append("}")
+    lines.append("VALIDATORS = {")
+    lines.extend(f"    {name!r}: {func}," for name, func in validators.items())
+    lines.append("}")
+    lines.append("")
+    lines.append("")
+    lines.extend(
+        [
+            "def normalize(event_name, data):",
+            '    """``normalizeEventData``: returns (normalized name, normalized fields)."""',
+            "    func = NORMALIZERS.get(event_name)",
+            "    if func is None:",
+            "        func = NORMALIZERS.get(canonicalize_event_key(event_name))",
+            "    if func is not None:",
+            "        return func(data)",
+            "    if data.__class__ is dict:",
+            "        return event_name, {key: value for key, value in data.items() if key.__class__ is str}",
+            "    return event_name, ({} if data is None else {'value': data})",
+            "",
+            "",
+            "def validate(payload):",
+            '    """Problems with one logged payload; ``None`` when the event has no spec."""',
+            "    func = VALIDATORS.get(payload.get('event'))",
+            "    if func is None:",
+            "        return None",
+            "    return func(payload)",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def _cached_hash(path: Path) -> Optional[Tuple[int, str]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            head = [next(handle, "") for _ in range(HEADER_LINES)]
+    except OSError:
+        return None
+    version = sha = None
+    for line in head:
+        if line.startswith("GENERATOR_VERSION = "):
+            version = int(line.split("=", 1)[1])
+        elif line.startswith("SOURCE_SHA256 = "):
+            sha = line.split("=", 1)[1].strip().strip("'\"")
+    return (version, sha) if version is not None and sha else None
+
+
+def ensure_generated(source: Path = TELEMETRY_SOURCE, cache: Path = CACHE_PATH) -> Path:
+    """Regenerate ``cache`` when the Luau source hash or generator version moved."""
+
+    digest = hashlib.sha256(Path(source).read_bytes()).hexdigest()
+    if _cached_hash(cache) == (GENERATOR_VERSION, digest):
+        return cache
+    write_if_changed(cache, generate_source(load_spec(source)))
+    return cache
+
+
+def load_validators(source: Path = TELEMETRY_SOURCE, cache: Path = CACHE_PATH) -> ModuleType:
+    """Import the generated module, regenerating it first if it is stale."""
+
+    path = ensure_generated(source, cache)
+    module_spec = importlib.util.spec_from_file_location("telemetry_validators_generated", path)
+    assert module_spec is not None and module_spec.loader is not None
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+# -- log checking ----------------------------------------------------------------
+
+_generated: Optional[ModuleType] = None
+
+
+def check_shard(shard: Shard) -> Dict[str, Dict[str, list]]:
+    """Per event: ``{"count": [n], "problems": {message: [count, examples...]}}``."""
+
+    global _generated
+    if _generated is None:
+        _generated = load_validators()
+    validate = _generated.validate
+    report: Dict[str, dict] = {}
+    for payload in iter_events(shard):
+        name = payload.get("event")
+        name = name if isinstance(name, str) else OVERFLOW_KEY
+        entry = report.get(name)
+        if entry is None:
+            if len(report) >= MAX_EVENTS:
+                name = OVERFLOW_KEY
+                entry = report.get(name)
+            if entry is None:
+                entry = report[name] = {"count": 0, "unspecified": 0, "problems": {}}
+        entry["count"] += 1
+        problems = validate(payload)
+        if problems is None:
+            entry["unspecified"] += 1
+            continue
+        for message in problems:
+            slot = entry["problems"].setdefault(message, [0])
+            slot[0] += 1
+            if len(slot) <= MAX_EXAMPLES:
+                slot.append(payload)
+    return report
+
+
+def merge_reports(target: Dict[str, dict], other: Dict[str, dict]) -> None:
+    for name, entry in other.items():
+        current = target.get(name)
+        if current is None:
+            target[name] = entry
+            continue
+        current["count"] += entry["count"]
+        current["unspecified"] += entry["unspecified"]
+        for message, slot in entry["problems"].items():
+            mine = current["problems"].setdefault(message, [0])
+            mine[0] += slot[0]
+            mine.extend(slot[1 : 1 + MAX_EXAMPLES - (len(mine) - 1)])
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("check", help="Validate [Telemetry] payloads in logs")
+    check.add_argument("inputs", nargs="+", help="Log files or directories (plain or .gz)")
+    check.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    check.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    generate = commands.add_parser("generate", help="Regenerate the validator module if stale")
+    generate.add_argument("--print", action="store_true", help="Print the generated source")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        path = ensure_generated()
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.command == "generate":
+        if args.print:
+            print(path.read_text(encoding="utf-8"), end="")
+        else:
+            print(f"Validators up to date in {path.name}")
+        return 0
+
+    try:
+        shards = plan_shards(expand_inputs(args.inputs))
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    report: Dict[str, dict] = {}
+    for partial in map_shards(check_shard, shards, args.jobs):
+        merge_reports(report, partial)
+
+    invalid = sum(slot[0] for entry in report.values() for slot in entry["problems"].values())
+    if args.json:
+        doc = {
+            name: {
+                "count": entry["count"],
+                "unspecified": entry["unspecified"],
+                "problems": {message: {"count": slot[0], "examples": slot[1:]} for message, slot in entry["problems"].items()},
+            }
+            for name, entry in sorted(report.items())
+        }
+        print(json.dumps(doc, indent=2))
+    else:
+        for name, entry in sorted(report.items(), key=lambda item: -item[1]["count"]):
+            note = " (no spec)" if entry["unspecified"] == entry["count"] else ""
+            print(f"{name}: {entry['count']:,} events{note}")
+            for message, slot in sorted(entry["problems"].items(), key=lambda item: -item[1][0]):
+                print(f"  {slot[0]:>8,}  {message}")
+        print(f"\n{invalid:,} problem(s) found.")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""Monte Carlo simulation of turret waves per level, driven by the Luau config.
+
+Each level runs ``--trials`` independent matches at once as NumPy arrays, using
+the same rules as the servers:
+
+* ``TurretControllerServer``: shots per second
+  ``BaseShotsPerSecond * (1 + ShotsPerLevelPct * (level - 1))``, scaled by the
+  lane-expansion penalty; 2- and 3-lane bursts from ``computeBurstCount``;
+  least-fired lane selection (round-robin); fruit drawn from a shuffled bag
+  with ``round(weight)`` copies per fruit.
+* ``RoundDirectorServer``: lane unlocks from ``C.Lanes``, the temporary rate
+  penalty after an unlock and the ``ROSTER_BANDS`` roster/weights per level.
+* ``FruitSpawnerServer``: grape bundles spawn ``BundleCount..BundleCountMax``
+  projectiles.
+* ``TargetHealthServer``: lane HP ``StartHP * (1 + band * TenLevelBandScalePct)``,
+  reset per level; the match is lost when any lane reaches 0.
+
+Players are modelled by ``--intercept``, the chance that a projectile is
+smashed before it reaches its target (at a uniformly random point of its
+flight). Flight time is ``--lane-length`` divided by the fruit's ``Speed``.
+
+Output per level: fruit spawned per second, peak concurrent projectiles, the
+probability that every lane target survives the level and the survival of a
+run from level 1. Levels are simulated in parallel.
+
+Usage::
+
+    python tools/wave_sim.py [--levels 1-100] [--trials 500] [--intercept 0.85] [--csv FILE] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from luau_config import ConfigError, load_config
+from luau_literals import LiteralError, evaluate_locals
+from luau_syntax_checker import Lexer, SyntaxError as LuauSyntaxError
+from telemetry_logs import map_shards
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ROUND_DIRECTOR_SOURCE = REPO_ROOT / "ServerScriptService" / "GameServer" / "RoundDirectorServer.lua"
+BANDS_LOCAL = "ROSTER_BANDS"
+
+# RoundDirectorServer fallbacks while GameConfig has no ``Rounds`` table.
+DEFAULT_WAVE_SECONDS = 45.0
+DEFAULT_WAVES_PER_LEVEL = 5
+# computeBurstCount constants in TurretControllerServer.
+BURST_THREE = (0.15, 0.02, 0.45)
+BURST_TWO = (0.55, 0.02, 0.9)
+MAX_BURST = 3
+MAX_RATE_PENALTY = 0.95
+
+DEFAULT_TRIALS = 500
+DEFAULT_INTERCEPT = 0.85
+DEFAULT_LANE_LENGTH = 80.0
+DEFAULT_SEED = 1
+
+
+class SimulationError(ValueError):
+    """Raised when the config needed by the simulator is missing or invalid."""
+
+
+@dataclass(frozen=True)
+class FruitStats:
+    speed: float
+    damage: float
+    count_min: int
+    count_max: int
+
+
+@dataclass(frozen=True)
+class WaveModel:
+    """Everything one level simulation needs, read from the Luau sources."""
+
+    base_shots: float
+    shots_per_level_pct: float
+    two_at_once_level: float
+    three_at_once_level: float
+    lane_start: int
+    lane_max: Optional[int]
+    unlock_levels: Tuple[int, ...]
+    smoothing_levels: float
+    expansion_penalty: float
+    start_hp: float
+    band_scale_pct: float
+    wave_seconds: float
+    waves_per_level: int
+    bands: Tuple[Tuple[int, Tuple[str, ...]], ...]
+    fruit_ids: Tuple[str, ...]
+    fruit: Tuple[FruitStats, ...]
+    lane_length: float
+    intercept: float
+
+    # -- server rules, ported one-to-one -------------------------------------
+
+    def lane_count(self, level: int) -> int:
+        count = self.lane_start + sum(1 for unlock in self.unlock_levels if level >= unlock)
+        if self.lane_max is not None:
+            count = min(count, self.lane_max)
+        return max(count, 0)
+
+    def rate_multiplier(self, level: int) -> float:
+        """``resolveLaneRateMultiplier`` for a run that reached ``level`` from level 1."""
+
+        if self.expansion_penalty <= 0:
+            return 1.0
+        start = None
+        for previous in range(1, level):
+            if self.lane_count(previous + 1) > self.lane_count(previous):
+                start = previous + 1
+        if start is None:
+            return 1.0
+        delta = level - start
+        if self.smoothing_levels <= 0:
+            return 1.0 if delta > 0 else 1.0 - self.expansion_penalty
+        if delta >= self.smoothing_levels:
+            return 1.0
+        fraction = min(max(1 - delta / self.smoothing_levels, 0.0), 1.0)
+        return 1.0 - self.expansion_penalty * fraction
+
+    def shots_per_second(self, level: int) -> float:
+        base = self.base_shots * (1 + self.shots_per_level_pct * max(level - 1, 0))
+        return base * min(max(self.rate_multiplier(level), 0.0), 1.0)
+
+    def burst_chances(self, level: int, lanes: int) -> Tuple[float, float]:
+        """Chance of a 3-lane and (otherwise) a 2-lane burst."""
+
+        three = two = 0.0
+        if lanes >= 3 and level >= self.three_at_once_level:
+            base, step, cap = BURST_THREE
+            three = min(max(base + max(level - self.three_at_once_level, 0) * step, base), cap)
+        if lanes >= 2 and level >= self.two_at_once_level:
+            base, step, cap = BURST_TWO
+            two = min(max(base + max(level - self.two_at_once_level, 0) * step, base), cap)
+        return three, two
+
+    def max_hp(self, level: int) -> int:
+        band = math.floor((max(level, 1) - 1) / 10)
+        return max(1, math.floor(self.start_hp * (1 + band * self.band_scale_pct) + 0.5))
+
+    def bag(self, level: int) -> np.ndarray:
+        """Fruit indices in the sorted bag for the roster band of ``level``."""
+
+        selected = self.bands[0][1]
+        for min_level, bag in self.bands:
+            if level >= min_level:
+                selected = bag
+            else:
+                break
+        index = {fruit_id: position for position, fruit_id in enumerate(self.fruit_ids)}
+        return np.array([index[fruit_id] for fruit_id in selected], dtype=np.int64)
+
+
+def _number(table: Dict[str, Any], key: str, default: float) -> float:
+    value = table.get(key) if isinstance(table, dict) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return default
+    return float(value)
+
+
+def load_roster_bands(source: Path = ROUND_DIRECTOR_SOURCE) -> List[Dict[str, Any]]:
+    try:
+        tokens = list(Lexer(Path(source).read_text(encoding="utf-8")).tokens())
+        bands = evaluate_locals(tokens, {BANDS_LOCAL}).get(BANDS_LOCAL)
+    except (OSError, LiteralError, LuauSyntaxError) as exc:
+        raise SimulationError(f"{source}: {exc}") from exc
+    if not isinstance(bands, list) or not bands:
+        raise SimulationError(f"{source}: {BANDS_LOCAL} not found")
+    return bands
+
+
+def build_model(lane_length: float, intercept: float) -> WaveModel:
+    """Assemble a ``WaveModel`` from GameConfig, FruitConfig and ROSTER_BANDS."""
+
+    game = load_config("GameConfig").exports
+    roster = load_config("FruitConfig").exports
+    if not isinstance(game, dict) or not isinstance(roster, dict) or not isinstance(roster.get("Roster"), dict):
+        raise SimulationError("GameConfig or FruitConfig.Roster could not be evaluated")
+    turrets = game.get("Turrets") or {}
+    lanes = game.get("Lanes") or {}
+    targets = game.get("Targets") or {}
+    rounds = game.get("Rounds") or {}
+
+    fruit_ids = tuple(sorted(roster["Roster"]))
+    fruit = []
+    for fruit_id in fruit_ids:
+        entry = roster["Roster"][fruit_id]
+        count_min = max(1, int(_number(entry, "BundleCount", 1)))
+        count_max = max(int(_number(entry, "BundleCountMax", count_min)), count_min)
+        fruit.append(FruitStats(_number(entry, "Speed", 12), _number(entry, "Damage", 5), count_min, count_max))
+
+    bands = []
+    for band in sorted(load_roster_bands(), key=lambda band: band.get("minLevel", 1)):
+        weights = band.get("weights") or {}
+        bag: List[str] = []
+        for fruit_id in band.get("roster") or []:
+            weight = weights.get(fruit_id, 1) if weights else 1
+            if fruit_id in roster["Roster"] and weight > 0:
+                bag.extend([fruit_id] * max(1, math.floor(weight + 0.5)))
+        if bag:
+            bands.append((int(band.get("minLevel", 1)), tuple(sorted(bag))))
+    if not bands:
+        raise SimulationError(f"{BANDS_LOCAL} has no usable roster")
+
+    lane_start = max(0, math.floor(_number(lanes, "StartCount", 0) + 0.5))
+    lane_max = lanes.get("MaxCount")
+    unlocks = lanes.get("UnlockAt") or []
+    return WaveModel(
+        base_shots=_number(turrets, "BaseShotsPerSecond", 0),
+        shots_per_level_pct=_number(turrets, "ShotsPerLevelPct", 0),
+        two_at_once_level=_number(turrets, "TwoAtOnceLevel", math.inf),
+        three_at_once_level=_number(turrets, "ThreeAtOnceLevel", math.inf),
+        lane_start=lane_start,
+        lane_max=max(lane_start, math.floor(lane_max + 0.5)) if isinstance(lane_max, (int, float)) else None,
+        unlock_levels=tuple(sorted(max(1, math.floor(u + 0.5)) for u in unlocks if isinstance(u, (int, float)))),
+        smoothing_levels=max(_number(lanes, "ExpansionSmoothingLevels", 0), 0),
+        expansion_penalty=min(max(_number(lanes, "ExpansionTemporaryRatePenalty", 0), 0), MAX_RATE_PENALTY),
+        start_hp=_number(targets, "StartHP", 200),
+        band_scale_pct=_number(targets, "TenLevelBandScalePct", 0.10),
+        wave_seconds=_number(rounds, "WaveDurationSeconds", DEFAULT_WAVE_SECONDS),
+        waves_per_level=int(_number(rounds, "WavesPerLevel", DEFAULT_WAVES_PER_LEVEL)),
+        bands=tuple(bands),
+        fruit_ids=fruit_ids,
+        fruit=tuple(fruit),
+        lane_length=lane_length,
+        intercept=intercept,
+    )
+
+
+# -- simulation ------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class LevelTask:
+    model: WaveModel
+    level: int
+    trials: int
+    seed: int
+
+
+def _bag_draws(rng: np.random.Generator, bag: np.ndarray, trials: int, count: int) -> np.ndarray:
+    """``count`` draws per trial from a bag reshuffled each time it runs out."""
+
+    cycles = max(1, -(-count // bag.size))
+    order = np.argsort(rng.random((trials, cycles, bag.size)), axis=2)
+    return bag.take(order).reshape(trials, cycles * bag.size)[:, :count]
+
+
+def simulate_level(task: LevelTask) -> Dict[str, Any]:
+    """Simulate ``task.trials`` matches of one level; return summary statistics."""
+
+    model, level, trials = task.model, task.level, task.trials
+    rng = np.random.default_rng([task.seed, level])
+    lanes = model.lane_count(level)
+    sps = model.shots_per_second(level) if lanes > 0 else 0.0
+    max_hp = model.max_hp(level)
+    shots_per_wave = math.floor(model.wave_seconds * sps) if sps > 0 else 0
+    shots = shots_per_wave * model.waves_per_level
+    level_seconds = model.wave_seconds * model.waves_per_level
+    result: Dict[str, Any] = {
+        "level": level,
+        "lanes": lanes,
+        "rate_multiplier": model.rate_multiplier(level),
+        "shots_per_second": sps,
+        "target_hp": max_hp,
+    }
+    if shots == 0:
+        result.update(
+            fruit_per_second=0.0, peak_p50=0.0, peak_p95=0.0, peak_max=0.0,
+            lane_damage_mean=0.0, survival=1.0, hp_left_p10=1.0,
+        )
+        return result
+
+    # Burst size per shot, clamped to the lane count like runArena does. One
+    # uniform covers both rolls: P(3) = three, P(2) = (1 - three) * two.
+    three, two = model.burst_chances(level, lanes)
+    roll = rng.random((trials, shots), dtype=np.float32)
+    burst = np.minimum(np.where(roll < three, 3, np.where(roll < three + (1 - three) * two, 2, 1)), lanes).ravel()
+
+    # One row per lane slot that fires, trial-major like the shots themselves.
+    per_trial = burst.reshape(trials, shots).sum(axis=1)
+    trial = np.repeat(np.arange(trials), per_trial)
+    shot = np.repeat(np.tile(np.arange(shots), trials), burst)
+    starts = np.cumsum(per_trial) - per_trial
+    slot = np.arange(trial.size) - np.repeat(starts, per_trial)
+
+    draws = _bag_draws(rng, model.bag(level), trials, int(per_trial.max()))
+    fruit = draws[trial, slot]
+    speed = np.array([f.speed for f in model.fruit]).take(fruit)
+    damage = np.array([f.damage for f in model.fruit]).take(fruit)
+    count = np.array([f.count_min for f in model.fruit]).take(fruit)
+    spread = np.array([f.count_max - f.count_min for f in model.fruit]).take(fruit)
+    bundle = np.flatnonzero(spread)
+    count[bundle] += (rng.random(bundle.size) * (spread[bundle] + 1)).astype(count.dtype)
+    # Binomial draws, one grape at a time; most slots spawn a single fruit.
+    missed = (rng.random(fruit.size) >= model.intercept).astype(np.int64)
+    for extra in range(1, int(count.max())):
+        bundle = np.flatnonzero(count > extra)
+        missed[bundle] += rng.random(bundle.size) >= model.intercept
+
+    # Lanes are filled round-robin, so slot n of a trial lands on lane n % lanes.
+    lane_damage = np.bincount(
+        trial * lanes + slot % lanes, weights=missed * damage, minlength=trials * lanes
+    ).reshape(trials, lanes)
+    worst = lane_damage.max(axis=1)
+
+    # Concurrent projectiles, in bins of one shot interval: smashed fruit leave
+    # at a random point of their flight, the rest when they reach the target.
+    interval = 1.0 / sps
+    flight = model.lane_length / np.maximum(speed, 1e-9) / interval
+    miss_bins = np.ceil(flight).astype(np.int64)
+    smash_bins = np.maximum(np.ceil(rng.random(fruit.size) * flight), 1).astype(np.int64)
+    bins = shots + int(miss_bins.max()) + 1
+    spawn = trial * bins + shot
+    alive = np.bincount(spawn, weights=count, minlength=trials * bins)
+    alive -= np.bincount(spawn + miss_bins, weights=missed, minlength=trials * bins)
+    alive -= np.bincount(spawn + smash_bins, weights=count - missed, minlength=trials * bins)
+    peak = np.cumsum(alive.reshape(trials, bins), axis=1).max(axis=1)
+
+    result.update(
+        fruit_per_second=float(count.sum() / trials / level_seconds),
+        peak_p50=float(np.quantile(peak, 0.5)),
+        peak_p95=float(np.quantile(peak, 0.95)),
+        peak_max=float(peak.max()),
+        lane_damage_mean=float(worst.mean()),
+        survival=float((worst < max_hp).mean()),
+        hp_left_p10=float(np.quantile(np.clip(1 - worst / max_hp, 0, 1), 0.1)),
+    )
+    return result
+
+
+def simulate(
+    model: WaveModel,
+    levels: Sequence[int],
+    trials: int,
+    seed: int,
+    jobs: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Simulate every level (in parallel) and add cumulative run survival."""
+
+    tasks = [LevelTask(model, level, trials, seed) for level in levels]
+    rows = list(map_shards(simulate_level, tasks, jobs))
+    run_survival = 1.0
+    for row in rows:
+        run_survival *= row["survival"]
+        row["run_survival"] = run_survival
+    return rows
+
+
+# -- output ----------------------------------------------------------------------
+
+COLUMNS = (
+    ("level", "level", "{:d}"),
+    ("lanes", "lanes", "{:d}"),
+    ("shots_per_second", "shots/s", "{:.2f}"),
+    ("fruit_per_second", "fruit/s", "{:.2f}"),
+    ("peak_p50", "peak p50", "{:.0f}"),
+    ("peak_p95", "peak p95", "{:.0f}"),
+    ("target_hp", "lane HP", "{:d}"),
+    ("lane_damage_mean", "worst dmg", "{:.0f}"),
+    ("hp_left_p10", "HP left p10", "{:.0%}"),
+    ("survival", "survive", "{:.1%}"),
+    ("run_survival", "run survive", "{:.1%}"),
+)
+
+
+def parse_levels(text: str) -> List[int]:
+    levels: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            low, high = (int(value) for value in part.split("-", 1))
+            levels.extend(range(low, high + 1))
+        else:
+            levels.append(int(part))
+    if not levels or min(levels) < 1:
+        raise ValueError("levels must be positive integers, e.g. 1-100")
+    return sorted(set(levels))
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default="1-100", help="Levels to simulate, e.g. 1-100 or 1,5,10-20 (default: 1-100)")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS, help="Matches per level (default: 500)")
+    parser.add_argument(
+        "--intercept",
+        type=float,
+        default=DEFAULT_INTERCEPT,
+        help="Chance a projectile is smashed before reaching its target (default: 0.85)",
+    )
+    parser.add_argument(
+        "--lane-length", type=float, default=DEFAULT_LANE_LENGTH, help="Turret-to-target distance in studs (default: 80)"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (default: 1)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--csv", type=Path, default=None, help="Also write the table as CSV")
+    parser.add_argument("--json", action="store_true", help="Emit the rows as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        levels = parse_levels(args.levels)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.trials < 1 or not 0 <= args.intercept <= 1 or args.lane_length <= 0:
+        print("error: --trials must be >= 1, --intercept in [0, 1] and --lane-length > 0", file=sys.stderr)
+        return 1
+    try:
+        model = build_model(args.lane_length, args.intercept)
+    except (ConfigError, SimulationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    rows = simulate(model, levels, args.trials, args.seed, args.jobs)
+    if args.csv is not None:
+        with open(args.csv, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(
+        f"{args.trials} trials per level, {model.waves_per_level} x {model.wave_seconds:g}s waves, "
+        f"intercept {args.intercept:.0%}, lane length {args.lane_length:g} studs"
+    )
+    print("".join(f"{label:>12}" for _, label, _ in COLUMNS))
+    for row in rows:
+        print("".join(f"{fmt.format(row[key]):>12}" for key, _, fmt in COLUMNS))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
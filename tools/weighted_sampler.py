@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Batch weighted sampling with the semantics of WeightedTable.Pick.
+
+``ReplicatedStorage/Shared/Systems/WeightedTable.lua`` sums the positive
+weights, draws a threshold in ``[0, total]`` and returns the first entry whose
+running total reaches it (``threshold <= cumulative``). Entries with a missing,
+zero or negative ``Weight`` are never picked; with no positive weight the pick
+is ``nil``.
+
+``AliasTable`` builds a Vose alias table once and then draws whole NumPy
+batches in O(1) per sample. ``pick_linear`` and ``pick_linear_batch`` are
+straight ports of the linear scan, kept as the reference the ``check``
+command compares against with a chi-square test.
+
+Usage::
+
+    python tools/weighted_sampler.py check [--draws 1000000] [--seed 1]
+    python tools/weighted_sampler.py sample ShopConfig Gacha.Table [--draws 1000000] [--seed 1] [--label ItemId]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from luau_config import ConfigError, load_config
+
+#: Index returned for a pick that Luau would answer with ``nil``.
+NONE = -1
+
+DEFAULT_DRAWS = 1_000_000
+DEFAULT_SEED = 1
+#: Significance level for each chi-square comparison in ``check``.
+ALPHA = 1e-3
+
+
+def entry_weights(entries: Iterable[Any], key: str = "Weight") -> List[float]:
+    """``entry.Weight or 0`` for each entry; non-numbers count as 0."""
+
+    weights = []
+    for entry in entries:
+        value = entry.get(key) if isinstance(entry, dict) else None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            value = 0
+        weights.append(float(value))
+    return weights
+
+
+# -- reference port ----------------------------------------------------------------
+
+
+def pick_linear(weights: Sequence[float], threshold: float) -> int:
+    """``WeightedTable.Pick`` for a given threshold; returns an index or ``NONE``."""
+
+    cumulative = 0.0
+    for index, weight in enumerate(weights):
+        if weight > 0:
+            cumulative += weight
+            if threshold <= cumulative:
+                return index
+    return NONE
+
+
+def pick_linear_batch(weights: Sequence[float], thresholds: np.ndarray) -> np.ndarray:
+    """Vectorised ``pick_linear``: the first positive entry with ``threshold <= cumulative``."""
+
+    weights = np.asarray(weights, dtype=np.float64)
+    positive = np.flatnonzero(weights > 0)
+    if positive.size == 0:
+        return np.full(np.shape(thresholds), NONE, dtype=np.int64)
+    cumulative = np.cumsum(weights[positive])
+    slot = np.searchsorted(cumulative, thresholds, side="left")
+    return np.where(slot < positive.size, positive[np.minimum(slot, positive.size - 1)], NONE)
+
+
+def linear_draws(weights: Sequence[float], size: int, rng: np.random.Generator) -> np.ndarray:
+    """``size`` picks the way the Luau loop makes them: a uniform threshold each."""
+
+    total = float(sum(weight for weight in weights if weight > 0))
+    return pick_linear_batch(weights, rng.random(size) * total)
+
+
+# -- alias table -------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class AliasTable:
+    """Vose alias table over the positive weights of an entry list.
+
+    ``sample`` returns indices into the original list, so callers can keep
+    their entries (or ``ItemId`` labels) as they are.
+    """
+
+    indices: np.ndarray
+    probability: np.ndarray
+    alias: np.ndarray
+
+    @classmethod
+    def build(cls, weights: Sequence[float]) -> "AliasTable":
+        weights = np.asarray(weights, dtype=np.float64)
+        indices = np.flatnonzero(weights > 0)
+        count = indices.size
+        probability = np.ones(count)
+        alias = np.arange(count)
+        if count == 0:
+            return cls(indices, probability, alias)
+
+        scaled = weights[indices] * (count / weights[indices].sum())
+        small = [slot for slot in range(count) if scaled[slot] < 1.0]
+        large = [slot for slot in range(count) if scaled[slot] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error.
+        for slot in small + large:
+            probability[slot] = 1.0
+        return cls(indices, probability, alias)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any], key: str = "Weight") -> "AliasTable":
+        return cls.build(entry_weights(entries, key))
+
+    @property
+    def empty(self) -> bool:
+        return self.indices.size == 0
+
+    def sample(self, size: Any, rng: np.random.Generator) -> np.ndarray:
+        """Draw ``size`` (an int or shape) entry indices; ``NONE`` when nothing is pickable."""
+
+        if self.empty:
+            return np.full(size, NONE, dtype=np.int64)
+        column = rng.integers(0, self.indices.size, size=size)
+        keep = rng.random(size) < self.probability[column]
+        return self.indices[np.where(keep, column, self.alias[column])]
+
+    def shares(self) -> np.ndarray:
+        """Probability of each slot implied by the table, for checking the build."""
+
+        count = self.indices.size
+        shares = self.probability / max(count, 1)
+        np.add.at(shares, self.alias, (1.0 - self.probability) / max(count, 1))
+        return shares
+
+
+# -- equivalence check -------------------------------------------------------------
+
+
+def chi_square_homogeneity(first: np.ndarray, second: np.ndarray) -> tuple:
+    """Two-sample chi-square statistic, degrees of freedom and p-value.
+
+    The p-value uses the Wilson-Hilferty normal approximation, which is
+    accurate to well below the ``ALPHA`` used here for any practical ``dof``.
+    """
+
+    used = (first + second) > 0
+    first, second = first[used].astype(np.float64), second[used].astype(np.float64)
+    dof = max(first.size - 1, 0)
+    if dof == 0:
+        return 0.0, 0, 1.0
+    total = first.sum() + second.sum()
+    statistic = 0.0
+    for counts in (first, second):
+        expected = (first + second) * counts.sum() / total
+        statistic += float((((counts - expected) ** 2) / expected).sum())
+    cube = (statistic / dof) ** (1 / 3)
+    z = (cube - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return statistic, dof, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def check_cases(rng: np.random.Generator) -> List[tuple]:
+    cases = [
+        ("equal pair", [1, 1]),
+        ("skipped weights", [0, 5, -3, 0, 2, 0]),
+        ("wide range", [1e-4, 1, 1000]),
+        ("single entry", [7]),
+        ("fifty random", list(rng.gamma(0.5, size=50))),
+    ]
+    try:
+        gacha = load_config("ShopConfig").exports["Gacha"]["Table"]
+        cases.append(("ShopConfig.Gacha.Table", entry_weights(gacha)))
+    except (ConfigError, KeyError, TypeError):
+        pass
+    return cases
+
+
+def run_check(draws: int, seed: int) -> int:
+    rng = np.random.default_rng(seed)
+    failures = 0
+
+    # Exact cases: nil picks and the inclusive threshold on a boundary.
+    exact = [
+        (pick_linear([0, -1], 0.0), NONE),
+        (pick_linear([2, 0, 3], 2.0), 0),
+        (pick_linear([2, 0, 3], 2.0000001), 2),
+        (pick_linear([0, 4], 0.0), 1),
+        (int(AliasTable.build([0, -2]).sample(1, rng)[0]), NONE),
+    ]
+    for got, expected in exact:
+        if got != expected:
+            failures += 1
+            print(f"FAIL exact pick: got {got}, expected {expected}")
+
+    print(f"{'case':<24}{'entries':>8}{'chi2':>12}{'dof':>5}{'p':>10}  result")
+    for name, weights in check_cases(rng):
+        table = AliasTable.build(weights)
+        thresholds = rng.random(1000) * sum(w for w in weights if w > 0)
+        ported = [pick_linear(weights, float(t)) for t in thresholds]
+        if ported != pick_linear_batch(weights, thresholds).tolist():
+            failures += 1
+            print(f"FAIL {name}: pick_linear_batch disagrees with pick_linear")
+
+        shares = np.zeros(len(weights))
+        shares[table.indices] = table.shares()
+        positive = np.clip(weights, 0, None)
+        if not np.allclose(shares, positive / positive.sum()):
+            failures += 1
+            print(f"FAIL {name}: alias table shares do not match the weights")
+
+        fast = np.bincount(table.sample(draws, rng), minlength=len(weights))
+        slow = np.bincount(linear_draws(weights, draws, rng), minlength=len(weights))
+        statistic, dof, p_value = chi_square_homogeneity(fast, slow)
+        ignored = fast[np.asarray(weights) <= 0].sum()
+        ok = p_value >= ALPHA and ignored == 0
+        failures += not ok
+        print(f"{name:<24}{len(weights):>8}{statistic:>12.2f}{dof:>5}{p_value:>10.4f}  {'ok' if ok else 'FAIL'}")
+
+    weights = check_cases(rng)[-1][1]
+    table = AliasTable.build(weights)
+    started = time.perf_counter()
+    table.sample(draws, rng)
+    alias_rate = draws / max(time.perf_counter() - started, 1e-9)
+    started = time.perf_counter()
+    for threshold in rng.random(10_000) * sum(w for w in weights if w > 0):
+        pick_linear(weights, float(threshold))
+    linear_rate = 10_000 / max(time.perf_counter() - started, 1e-9)
+    print(f"alias table: {alias_rate / 1e6:.1f}M draws/s; linear Pick port, one draw at a time: {linear_rate / 1e6:.2f}M draws/s")
+    return 1 if failures else 0
+
+
+# -- CLI ---------------------------------------------------------------------------
+
+
+def resolve_path(value: Any, dotted: str) -> Any:
+    for part in dotted.split(".") if dotted else []:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and 1 <= int(part) <= len(value):
+            value = value[int(part) - 1]
+        else:
+            raise KeyError(dotted)
+    return value
+
+
+def run_sample(module: str, path: str, label: Optional[str], draws: int, seed: int) -> int:
+    try:
+        entries = resolve_path(load_config(module).exports, path)
+    except ConfigError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    except KeyError:
+        print(f"error: {module} has no {path}", file=sys.stderr)
+        return 1
+    if not isinstance(entries, list):
+        print(f"error: {module}.{path} is not an entry list", file=sys.stderr)
+        return 1
+
+    weights = entry_weights(entries)
+    table = AliasTable.build(weights)
+    counts = np.bincount(table.sample(draws, np.random.default_rng(seed)) + 1, minlength=len(entries) + 1)
+    total = sum(weight for weight in weights if weight > 0)
+    print(f"{'entry':<24}{'weight':>10}{'expected':>10}{'observed':>10}")
+    for index, (entry, weight) in enumerate(zip(entries, weights)):
+        name = entry.get(label) if label and isinstance(entry, dict) else None
+        expected = weight / total if weight > 0 else 0.0
+        print(f"{str(name or index + 1):<24}{weight:>10g}{expected:>10.2%}{counts[index + 1] / draws:>10.2%}")
+    if counts[0]:
+        print(f"{'(nil)':<24}{'':>10}{'':>10}{counts[0] / draws:>10.2%}")
+    return 0
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--draws", type=int, default=DEFAULT_DRAWS, help="Draws per table (default: 1000000)")
+    common.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (default: 1)")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", parents=[common], help="Compare the alias table with the linear Pick port")
+    sample = commands.add_parser("sample", parents=[common], help="Sample an entry list from a config module")
+    sample.add_argument("module", help="Config module name or path, e.g. ShopConfig")
+    sample.add_argument("path", help="Dotted path to the entry list, e.g. Gacha.Table")
+    sample.add_argument("--label", default="ItemId", help="Entry field used as the row label (default: ItemId)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.draws < 1:
+        print("error: --draws must be >= 1", file=sys.stderr)
+        return 1
+    if args.command == "check":
+        return run_check(args.draws, args.seed)
+    return run_sample(args.module, args.path, args.label, args.draws, args.seed)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))